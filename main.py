@@ -5,12 +5,23 @@ Aplikacja desktopowa do szyfrowania i deszyfrowania
 Autor: Python Developer
 """
 
+import os
 import sys
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                             QHBoxLayout, QPushButton, QLabel, QFrame)
-from PyQt5.QtCore import Qt
+import time
+
+# Punkt odniesienia dla pomiaru czasu startu (przed importem PyQt5)
+_START_TIME = time.perf_counter()
+
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
+                             QHBoxLayout, QLabel)
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont
+from views.theme import apply_theme, make_button, make_title, make_frame, set_variant
 from utils.logger import app_logger
+from utils.profiler import is_profiling_enabled
+
+# Budżet czasu od uruchomienia do pierwszego wyświetlenia głównego okna [ms]
+STARTUP_BUDGET_MS = float(os.environ.get("KTK_STARTUP_BUDGET_MS", "1500"))
 
 
 class CryptoApp(QMainWindow):
@@ -21,7 +32,6 @@ class CryptoApp(QMainWindow):
         self.key = None
         app_logger.log_app_start()
         self.init_ui()
-        self.setup_styles()
         
     def init_ui(self):
         """Inicjalizacja interfejsu użytkownika"""
@@ -40,83 +50,22 @@ class CryptoApp(QMainWindow):
         main_layout.setContentsMargins(30, 30, 30, 30)
         
         # Tytuł aplikacji
-        title_label = QLabel("🔐 Aplikacja Szyfrowania")
-        title_label.setAlignment(Qt.AlignCenter)
-        title_label.setFont(QFont("Arial", 24, QFont.Bold))
-        title_label.setStyleSheet("""
-            QLabel {
-                color: #2c3e50;
-                margin: 20px 0;
-                padding: 15px;
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #3498db, stop:1 #2980b9);
-                border-radius: 10px;
-                color: white;
-            }
-        """)
+        title_label = make_title("🔐 Aplikacja Szyfrowania", "banner", font_size=24)
         main_layout.addWidget(title_label)
         
         # Przyciski główne
-        buttons_frame = QFrame()
-        buttons_frame.setFrameStyle(QFrame.StyledPanel)
-        buttons_frame.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 15px;
-                border: 2px solid #bdc3c7;
-            }
-        """)
+        buttons_frame = make_frame("panel")
         buttons_layout = QHBoxLayout(buttons_frame)
         buttons_layout.setSpacing(30)
         buttons_layout.setContentsMargins(40, 30, 40, 30)
         
         # Przycisk szyfrowania
-        self.encrypt_btn = QPushButton("🔒 Szyfrowanie")
-        self.encrypt_btn.setMinimumSize(200, 80)
-        self.encrypt_btn.setFont(QFont("Arial", 14, QFont.Bold))
-        self.encrypt_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #27ae60, stop:1 #229954);
-                color: white;
-                border: none;
-                border-radius: 15px;
-                padding: 15px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #229954, stop:1 #1e8449);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #1e8449, stop:1 #196f3d);
-            }
-        """)
+        self.encrypt_btn = make_button("🔒 Szyfrowanie", "tile-green", min_size=(200, 80), font_size=14)
         self.encrypt_btn.clicked.connect(self.show_encrypt_window)
         buttons_layout.addWidget(self.encrypt_btn)
         
         # Przycisk deszyfrowania
-        self.decrypt_btn = QPushButton("🔓 Deszyfrowanie")
-        self.decrypt_btn.setMinimumSize(200, 80)
-        self.decrypt_btn.setFont(QFont("Arial", 14, QFont.Bold))
-        self.decrypt_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #e74c3c, stop:1 #c0392b);
-                color: white;
-                border: none;
-                border-radius: 15px;
-                padding: 15px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #c0392b, stop:1 #a93226);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #a93226, stop:1 #922b21);
-            }
-        """)
+        self.decrypt_btn = make_button("🔓 Deszyfrowanie", "tile-red", min_size=(200, 80), font_size=14)
         self.decrypt_btn.clicked.connect(self.show_decrypt_window)
         buttons_layout.addWidget(self.decrypt_btn)
         
@@ -126,32 +75,31 @@ class CryptoApp(QMainWindow):
         info_label = QLabel("Wybierz opcję aby rozpocząć szyfrowanie lub deszyfrowanie tekstu")
         info_label.setAlignment(Qt.AlignCenter)
         info_label.setFont(QFont("Arial", 12))
-        info_label.setStyleSheet("""
-            QLabel {
-                color: #7f8c8d;
-                padding: 10px;
-            }
-        """)
+        set_variant(info_label, "hint")
         main_layout.addWidget(info_label)
         
+        # Kolejka zadań plikowych
+        self.jobs_btn = make_button("📋 Kolejka zadań", "purple", min_size=(200, 40))
+        self.jobs_btn.clicked.connect(self.show_jobs_window)
+        main_layout.addWidget(self.jobs_btn, alignment=Qt.AlignCenter)
+        
+        # Statystyki wydajności (tylko przy włączonej instrumentacji)
+        if is_profiling_enabled():
+            self.stats_btn = make_button("📊 Statystyki wydajności", "blue", min_size=(200, 40))
+            self.stats_btn.clicked.connect(self.show_stats_window)
+            main_layout.addWidget(self.stats_btn, alignment=Qt.AlignCenter)
+        
         # Dodaj elastyczność
         main_layout.addStretch()
         
-    def setup_styles(self):
-        """Ustawienie stylów aplikacji"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #ecf0f1, stop:1 #bdc3c7);
-            }
-        """)
-        
     def show_encrypt_window(self):
         """Pokazuje okno wyboru szyfrowania"""
         app_logger.log_user_action("wybrano szyfrowanie")
         app_logger.log_window_open("ChoiceWindow (szyfrowanie)")
         from views.choice_window import ChoiceWindow
-        self.choice_window = ChoiceWindow(self, "encrypt")
+        from views.navigator import window_registry
+        self.choice_window = window_registry.get(
+            self, "encrypt", lambda: ChoiceWindow(self, "encrypt"))
         self.choice_window.show()
         
     def show_decrypt_window(self):
@@ -159,23 +107,101 @@ class CryptoApp(QMainWindow):
         app_logger.log_user_action("wybrano deszyfrowanie")
         app_logger.log_window_open("ChoiceWindow (deszyfrowanie)")
         from views.choice_window import ChoiceWindow
-        self.choice_window = ChoiceWindow(self, "decrypt")
+        from views.navigator import window_registry
+        self.choice_window = window_registry.get(
+            self, "decrypt", lambda: ChoiceWindow(self, "decrypt"))
         self.choice_window.show()
+        
+    def show_jobs_window(self):
+        """Pokazuje okno kolejki zadań (zadania działają dalej po zamknięciu okna)"""
+        app_logger.log_window_open("JobQueueWindow")
+        from views.job_queue_window import JobQueueWindow
+        from views.navigator import window_registry
+        self.jobs_window = window_registry.get(self, "jobs", lambda: JobQueueWindow(self))
+        self.jobs_window.show()
+        self.jobs_window.raise_()
+        
+    def show_stats_window(self):
+        """Pokazuje okno statystyk wydajności"""
+        app_logger.log_window_open("ProfilingWindow")
+        from views.profiling_window import ProfilingWindow
+        self.stats_window = ProfilingWindow(self)
+        self.stats_window.show()
+
+
 
 
+def report_startup_time(exit_after=False):
+    """
+    Loguje czas startu i porównuje go z budżetem STARTUP_BUDGET_MS
+    
+    Args:
+        exit_after: Zakończ aplikację po pomiarze (kod 1 przy przekroczeniu budżetu)
+    """
+    elapsed_ms = (time.perf_counter() - _START_TIME) * 1000
+    within_budget = elapsed_ms <= STARTUP_BUDGET_MS
+    if within_budget:
+        app_logger.info("Start aplikacji: %.0f ms (budżet %.0f ms)", elapsed_ms, STARTUP_BUDGET_MS)
+    else:
+        app_logger.warning("Start aplikacji przekroczył budżet: %.0f ms (budżet %.0f ms)",
+                           elapsed_ms, STARTUP_BUDGET_MS)
+    if exit_after:
+        QApplication.exit(0 if within_budget else 1)
+
+
+def benchmark_window_construction(repeats=5):
+    """
+    Mierzy średni czas budowy każdego okna szyfru (uruchamiane flagą --bench-views)
+    
+    Args:
+        repeats: Liczba budów każdego okna (pierwsza, z importem modułu, nie jest liczona)
+        
+    Returns:
+        dict: nazwa klasy okna -> średni czas budowy [ms]
+    """
+    from views import CIPHER_VIEWS, load_class
+    
+    app = QApplication.instance()
+    results = {}
+    for module_name, class_name in CIPHER_VIEWS.values():
+        window_class = load_class(module_name, class_name)
+        window_class().deleteLater()
+        
+        start = time.perf_counter()
+        for _ in range(repeats):
+            window = window_class()
+            app.processEvents()
+            window.close()
+            window.deleteLater()
+        results[class_name] = (time.perf_counter() - start) * 1000 / repeats
+        app.processEvents()
+    
+    for class_name, elapsed_ms in results.items():
+        app_logger.info("Budowa okna %-28s %7.2f ms", class_name, elapsed_ms)
+    app_logger.info("Średni czas budowy okna: %.2f ms", sum(results.values()) / len(results))
+    return results
 
 
 def main():
     """Główna funkcja aplikacji"""
     app = QApplication(sys.argv)
     
-    # Ustawienie stylu aplikacji
+    # Ustawienie stylu aplikacji i wspólnego arkusza stylów
     app.setStyle('Fusion')
+    apply_theme(app)
+    
+    if "--bench-views" in sys.argv:
+        benchmark_window_construction()
+        return
     
     # Utworzenie i wyświetlenie głównego okna
     window = CryptoApp()
     window.show()
     
+    # Pomiar po pierwszym przebiegu pętli zdarzeń (pierwsze odrysowanie okna);
+    # "--startup-check" kończy aplikację zaraz po pomiarze
+    QTimer.singleShot(0, lambda: report_startup_time("--startup-check" in sys.argv))
+    
     sys.exit(app.exec_())
 
 
@@ -5,10 +5,33 @@ Implementacja szyfru AES od podstaw bez korzystania z gotowych bibliotek
 
 import os
 import hashlib
+import logging
+import threading
+from collections import OrderedDict
 from typing import List, Tuple
-from utils.logger import AppLogger
+from utils import chunked_file, kdf
+from utils.atomic_write import atomic_open
+from utils.file_header import (MODE_BINARY, new_header, peek_header, check_header,
+                               check_length, read_encrypted)
+from utils.logger import get_logger
+from utils.pipeline import BlockTransform, run_pipeline, use_pipeline
+from utils.profiler import (instrumented, section, io_section, file_size,
+                            method_size, method_file_size)
+
+app_logger = get_logger('aes')
+
+# Liczba rozszerzonych kluczy w pamięci podręcznej (klucze rund są tylko czytane)
+ROUND_KEY_CACHE_SIZE = 32
+
+_round_keys_lock = threading.Lock()
+_round_keys = OrderedDict()
+
+
+def clear_round_key_cache():
+    """Czyści pamięć podręczną kluczy rund"""
+    with _round_keys_lock:
+        _round_keys.clear()
 
-app_logger = AppLogger()
 
 class AES:
     """
@@ -71,7 +94,47 @@ class AES:
         self.n_rounds = {128: 10, 192: 12, 256: 14}[key_size]
         self.n_key_words = {128: 4, 192: 6, 256: 8}[key_size]
         
-        app_logger.info(f"AES initialized with {key_size}-bit key, {self.n_rounds} rounds")
+        if app_logger.is_enabled_for(logging.INFO):
+            app_logger.info("AES initialized with %d-bit key, %d rounds", key_size, self.n_rounds)
+    
+    def _encryption_key(self, key: str) -> Tuple[bytes, bytes]:
+        """
+        Wyprowadza klucz szyfrowania z hasła (z solą, przez utils.kdf)
+        
+        Args:
+            key: Hasło
+            
+        Returns:
+            (nagłówek KDF do zapisania przed szyfrogramem, klucz)
+        """
+        salt = kdf.encryption_salt(key)
+        header = kdf.encode_header(kdf.DEFAULT_PARAMS, salt)
+        key_bytes = kdf.derive_key(key, salt, kdf.DEFAULT_PARAMS, self.key_size // 8)
+        return header, key_bytes
+    
+    def _decryption_key(self, data: bytes, key: str) -> Tuple[bytes, int]:
+        """
+        Wyprowadza klucz deszyfrowania na podstawie nagłówka KDF
+        
+        Dane bez nagłówka pochodzą ze starszych wersji, w których klucz
+        był skrótem SHA-256 hasła bez soli.
+        
+        Args:
+            data: Zaszyfrowane dane
+            key: Hasło
+            
+        Returns:
+            (klucz, pozycja początku szyfrogramu)
+        """
+        if kdf.has_header(data):
+            try:
+                params, salt, offset = kdf.parse_header(data)
+            except ValueError:
+                offset = None
+            # Szyfrogram to pełne bloki - inaczej to dane w starym formacie
+            if offset is not None and (len(data) - offset) % 16 == 0:
+                return kdf.derive_key(key, salt, params, self.key_size // 8), offset
+        return hashlib.sha256(key.encode()).digest()[:self.key_size // 8], 0
     
     def _pad_data(self, data: bytes) -> bytes:
         """
@@ -87,6 +150,25 @@ class AES:
         padding = bytes([padding_length] * padding_length)
         return data + padding
     
+    def _padding_length(self, data: bytes) -> int:
+        """
+        Sprawdza padding PKCS#7 na końcu danych
+        
+        Args:
+            data: Dane z paddingiem (wystarczy ostatni blok)
+            
+        Returns:
+            Długość paddingu lub 0, jeśli padding jest nieprawidłowy
+        """
+        if not data:
+            return 0
+        padding_length = data[-1]
+        if not 1 <= padding_length <= 16 or padding_length > len(data):
+            return 0
+        if data[-padding_length:] != bytes([padding_length]) * padding_length:
+            return 0
+        return padding_length
+    
     def _unpad_data(self, data: bytes) -> bytes:
         """
         Usuwanie paddingu PKCS#7
@@ -96,8 +178,13 @@ class AES:
             
         Returns:
             Dane bez paddingu
+            
+        Raises:
+            ValueError: Gdy padding jest nieprawidłowy (zwykle błędny klucz)
         """
-        padding_length = data[-1]
+        padding_length = self._padding_length(data)
+        if not padding_length:
+            raise ValueError("Nieprawidłowy padding - błędny klucz lub uszkodzone dane")
         return data[:-padding_length]
     
     def _bytes_to_matrix(self, data: bytes) -> List[List[int]]:
@@ -284,14 +371,30 @@ class AES:
     
     def _key_expansion(self, key: bytes) -> List[List[List[int]]]:
         """
-        Rozszerzanie klucza AES
+        Rozszerzanie klucza AES (z pamięci podręcznej, jeśli był już rozszerzany)
         
         Args:
             key: Klucz wejściowy
             
         Returns:
-            Lista kluczy rund
-        """
+            Lista kluczy rund (współdzielona - nie modyfikować)
+        """
+        cache_key = (self.key_size, bytes(key))
+        with _round_keys_lock:
+            round_keys = _round_keys.get(cache_key)
+            if round_keys is not None:
+                _round_keys.move_to_end(cache_key)
+                return round_keys
+        
+        round_keys = self._expand_key(key)
+        with _round_keys_lock:
+            _round_keys[cache_key] = round_keys
+            while len(_round_keys) > ROUND_KEY_CACHE_SIZE:
+                _round_keys.popitem(last=False)
+        return round_keys
+    
+    def _expand_key(self, key: bytes) -> List[List[List[int]]]:
+        """Oblicza klucze rund"""
         key_words = []
         for i in range(0, len(key), 4):
             word = [key[i], key[i+1], key[i+2], key[i+3]]
@@ -387,6 +490,7 @@ class AES:
         
         return self._matrix_to_bytes(state)
     
+    @instrumented("AES.encrypt", size=method_size)
     def encrypt(self, plaintext: str, key: str) -> str:
         """
         Szyfrowanie tekstu AES
@@ -399,35 +503,41 @@ class AES:
             Zaszyfrowany tekst (hex)
         """
         try:
-            app_logger.info(f"AES encryption started for text of length {len(plaintext)}")
+            log_info = app_logger.is_enabled_for(logging.INFO)
+            if log_info:
+                app_logger.info("AES encryption started for text of length %d", len(plaintext))
             
             # Generowanie klucza z hasła
-            key_bytes = hashlib.sha256(key.encode()).digest()[:self.key_size // 8]
+            header, key_bytes = self._encryption_key(key)
             
             # Padding danych
             data = plaintext.encode('utf-8')
             padded_data = self._pad_data(data)
             
             # Rozszerzanie klucza
-            round_keys = self._key_expansion(key_bytes)
+            with section("aes.key_schedule"):
+                round_keys = self._key_expansion(key_bytes)
             
             # Szyfrowanie bloków
             encrypted_blocks = []
-            for i in range(0, len(padded_data), 16):
-                block = padded_data[i:i+16]
-                encrypted_block = self._encrypt_block(block, round_keys)
-                encrypted_blocks.append(encrypted_block)
+            with section("aes.blocks"):
+                for i in range(0, len(padded_data), 16):
+                    block = padded_data[i:i+16]
+                    encrypted_block = self._encrypt_block(block, round_keys)
+                    encrypted_blocks.append(encrypted_block)
             
             # Konwersja na hex
-            encrypted_hex = ''.join(block.hex() for block in encrypted_blocks)
+            encrypted_hex = header.hex() + ''.join(block.hex() for block in encrypted_blocks)
             
-            app_logger.info(f"AES encryption completed successfully")
+            if log_info:
+                app_logger.info("AES encryption completed successfully")
             return encrypted_hex
             
         except Exception as e:
-            app_logger.error(f"AES encryption failed: {str(e)}")
+            app_logger.error("AES encryption failed: %s", e)
             raise
     
+    @instrumented("AES.decrypt", size=method_size)
     def decrypt(self, ciphertext: str, key: str) -> str:
         """
         Deszyfrowanie tekstu AES
@@ -440,35 +550,49 @@ class AES:
             Odszyfrowany tekst
         """
         try:
-            app_logger.info(f"AES decryption started for ciphertext of length {len(ciphertext)}")
-            
-            # Generowanie klucza z hasła
-            key_bytes = hashlib.sha256(key.encode()).digest()[:self.key_size // 8]
+            log_info = app_logger.is_enabled_for(logging.INFO)
+            if log_info:
+                app_logger.info("AES decryption started for ciphertext of length %d", len(ciphertext))
             
             # Konwersja hex na bajty
             cipher_bytes = bytes.fromhex(ciphertext)
             
+            # Generowanie klucza z hasła
+            key_bytes, offset = self._decryption_key(cipher_bytes, key)
+            
             # Rozszerzanie klucza
-            round_keys = self._key_expansion(key_bytes)
+            with section("aes.key_schedule"):
+                round_keys = self._key_expansion(key_bytes)
             
-            # Deszyfrowanie bloków
-            decrypted_blocks = []
-            for i in range(0, len(cipher_bytes), 16):
-                block = cipher_bytes[i:i+16]
-                decrypted_block = self._decrypt_block(block, round_keys)
-                decrypted_blocks.append(decrypted_block)
+            data_length = len(cipher_bytes) - offset
+            if data_length <= 0 or data_length % 16 != 0:
+                raise ValueError("Nieprawidłowa długość szyfrogramu (wymagana wielokrotność 16 bajtów)")
             
-            # Łączenie bloków i usuwanie paddingu
-            decrypted_data = b''.join(decrypted_blocks)
-            unpadded_data = self._unpad_data(decrypted_data)
+            # Ostatni blok najpierw - błędny klucz odrzucany jest po jednym bloku
+            last_block = self._decrypt_block(cipher_bytes[-16:], round_keys)
+            last_block = self._unpad_data(last_block)
             
-            app_logger.info(f"AES decryption completed successfully")
+            # Deszyfrowanie pozostałych bloków
+            decrypted_blocks = []
+            with section("aes.blocks"):
+                for i in range(offset, len(cipher_bytes) - 16, 16):
+                    block = cipher_bytes[i:i+16]
+                    decrypted_block = self._decrypt_block(block, round_keys)
+                    decrypted_blocks.append(decrypted_block)
+            decrypted_blocks.append(last_block)
+            
+            # Łączenie bloków
+            unpadded_data = b''.join(decrypted_blocks)
+            
+            if log_info:
+                app_logger.info("AES decryption completed successfully")
             return unpadded_data.decode('utf-8')
             
         except Exception as e:
-            app_logger.error(f"AES decryption failed: {str(e)}")
+            app_logger.error("AES decryption failed: %s", e)
             raise
     
+    @instrumented("AES.encrypt_file", size=method_file_size)
     def encrypt_file(self, input_file: str, output_file: str, key: str) -> bool:
         """
         Szyfrowanie pliku AES
@@ -482,36 +606,139 @@ class AES:
             True jeśli sukces, False w przeciwnym razie
         """
         try:
-            app_logger.info(f"AES file encryption started: {input_file} -> {output_file}")
+            app_logger.info("AES file encryption started: %s -> %s", input_file, output_file)
             
             # Generowanie klucza z hasła
-            key_bytes = hashlib.sha256(key.encode()).digest()[:self.key_size // 8]
+            kdf_header, key_bytes = self._encryption_key(key)
+            header = new_header("aes", MODE_BINARY, key_bytes, os.path.getsize(input_file),
+                                key_size=self.key_size, extra=kdf_header)
             
             # Rozszerzanie klucza
-            round_keys = self._key_expansion(key_bytes)
+            with section("aes.key_schedule"):
+                round_keys = self._key_expansion(key_bytes)
             
-            with open(input_file, 'rb') as f_in, open(output_file, 'wb') as f_out:
+            if use_pipeline(header.plaintext_length):
+                run_pipeline(input_file, output_file, BlockTransform(self, round_keys), header.pack())
+                app_logger.info("AES file encryption completed successfully")
+                return True
+            
+            with open(input_file, 'rb') as f_in, atomic_open(output_file) as f_out:
+                f_out.write(header.pack())
                 while True:
-                    chunk = f_in.read(16)
-                    if not chunk:
-                        break
+                    with io_section():
+                        chunk = f_in.read(16)
                     
-                    # Padding ostatniego bloku
-                    if len(chunk) < 16:
+                    # Padding PKCS#7 - pełny blok paddingu, gdy dane kończą się na granicy bloku
+                    padded = len(chunk) < 16
+                    if padded:
                         padding_length = 16 - len(chunk)
                         chunk += bytes([padding_length] * padding_length)
                     
                     # Szyfrowanie bloku
                     encrypted_chunk = self._encrypt_block(chunk, round_keys)
-                    f_out.write(encrypted_chunk)
+                    with io_section():
+                        f_out.write(encrypted_chunk)
+                    if padded:
+                        break
             
-            app_logger.info(f"AES file encryption completed successfully")
+            app_logger.info("AES file encryption completed successfully")
             return True
             
         except Exception as e:
-            app_logger.error(f"AES file encryption failed: {str(e)}")
+            app_logger.error("AES file encryption failed: %s", e)
+            return False
+    
+    @instrumented("AES.encrypt_file_chunked", size=method_file_size)
+    def encrypt_file_chunked(self, input_file: str, output_file: str, key: str,
+                             chunk_size: int = chunked_file.DEFAULT_CHUNK_SIZE,
+                             resume: bool = True) -> bool:
+        """
+        Szyfrowanie pliku AES porcjami z sumami kontrolnymi (utils.chunked_file)
+        
+        Przerwane szyfrowanie wznawiane jest od ostatniej poprawnej porcji.
+        
+        Args:
+            input_file: Ścieżka do pliku wejściowego
+            output_file: Ścieżka do pliku wyjściowego
+            key: Klucz szyfrowania
+            chunk_size: Rozmiar porcji w bajtach
+            resume: Wznów przerwane szyfrowanie
+            
+        Returns:
+            True jeśli sukces, False w przeciwnym razie
+        """
+        try:
+            app_logger.info("AES chunked file encryption started: %s -> %s", input_file, output_file)
+            chunked_file.encrypt_file(input_file, output_file, key, "aes", self.key_size,
+                                      chunk_size, resume)
+            app_logger.info("AES file encryption completed successfully")
+            return True
+        except Exception as e:
+            app_logger.error("AES file encryption failed: %s", e)
             return False
     
+    def _header_key(self, file_header, key: str) -> bytes:
+        """
+        Wyprowadza klucz z hasła według parametrów KDF z nagłówka pliku
+        
+        Args:
+            file_header: FileHeader z polem dodatkowym w formacie utils.kdf
+            key: Hasło
+            
+        Returns:
+            Klucz
+        """
+        params, salt, _ = kdf.parse_header(file_header.extra)
+        return kdf.derive_key(key, salt, params, self.key_size // 8)
+    
+    def _decrypt_file_with_header(self, file_header, input_file: str, output_file: str, key: str) -> bool:
+        """
+        Deszyfrowanie pliku z nagłówkiem (utils.file_header)
+        
+        Rozmiar klucza brany jest z nagłówka, a błędny klucz odrzucany
+        jest na podstawie wartości kontrolnej przed odczytem danych.
+        """
+        if file_header.chunked:
+            chunked_file.decrypt_file(input_file, output_file, key)
+            app_logger.info("AES file decryption completed successfully")
+            return True
+        
+        if file_header.key_size != self.key_size:
+            return AES(file_header.key_size)._decrypt_file_with_header(
+                file_header, input_file, output_file, key)
+        
+        key_bytes = self._header_key(file_header, key)
+        check_header(file_header, "aes", key_bytes)
+        
+        with section("aes.key_schedule"):
+            round_keys = self._key_expansion(key_bytes)
+        
+        if use_pipeline(file_header.plaintext_length):
+            run_pipeline(input_file, output_file, BlockTransform(self, round_keys, decrypt=True),
+                         input_offset=file_header.size, expected_length=file_header.plaintext_length)
+            app_logger.info("AES file decryption completed successfully")
+            return True
+        
+        with io_section():
+            _, encrypted_data = read_encrypted(input_file)
+        if not encrypted_data or len(encrypted_data) % 16 != 0:
+            raise ValueError("Nieprawidłowa długość danych (wymagana wielokrotność 16 bajtów)")
+        
+        decrypted_data = bytearray()
+        with section("aes.blocks"):
+            for i in range(0, len(encrypted_data), 16):
+                decrypted_data.extend(self._decrypt_block(encrypted_data[i:i+16], round_keys))
+        decrypted_data = self._unpad_data(decrypted_data)
+        check_length(file_header, decrypted_data)
+        
+        with io_section():
+            with atomic_open(output_file) as f_out:
+                f_out.write(decrypted_data)
+        
+        app_logger.info("AES file decryption completed successfully")
+        return True
+    
+    @instrumented("AES.decrypt_file", size=method_file_size)
     def decrypt_file(self, input_file: str, output_file: str, key: str) -> bool:
         """
         Deszyfrowanie pliku AES
@@ -525,29 +752,36 @@ class AES:
             True jeśli sukces, False w przeciwnym razie
         """
         try:
-            app_logger.info(f"AES file decryption started: {input_file} -> {output_file}")
+            app_logger.info("AES file decryption started: %s -> %s", input_file, output_file)
+            
+            file_header = peek_header(input_file)
+            if file_header is not None:
+                return self._decrypt_file_with_header(file_header, input_file, output_file, key)
+            
+            # Plik bez nagłówka (starsza wersja) - wczytaj cały plik do pamięci
+            with io_section():
+                with open(input_file, 'rb') as f_in:
+                    encrypted_data = f_in.read()
             
             # Generowanie klucza z hasła
-            key_bytes = hashlib.sha256(key.encode()).digest()[:self.key_size // 8]
+            key_bytes, offset = self._decryption_key(encrypted_data, key)
             
             # Rozszerzanie klucza
-            round_keys = self._key_expansion(key_bytes)
-            
-            # Wczytaj cały plik do pamięci
-            with open(input_file, 'rb') as f_in:
-                encrypted_data = f_in.read()
+            with section("aes.key_schedule"):
+                round_keys = self._key_expansion(key_bytes)
             
             # Sprawdź czy plik ma odpowiedni rozmiar (wielokrotność 16)
-            if len(encrypted_data) % 16 != 0:
+            if (len(encrypted_data) - offset) % 16 != 0:
                 app_logger.error("AES file decryption failed: Invalid file size (not multiple of 16)")
                 return False
             
             # Deszyfruj wszystkie bloki
             decrypted_data = bytearray()
-            for i in range(0, len(encrypted_data), 16):
-                block = encrypted_data[i:i+16]
-                decrypted_block = self._decrypt_block(block, round_keys)
-                decrypted_data.extend(decrypted_block)
+            with section("aes.blocks"):
+                for i in range(offset, len(encrypted_data), 16):
+                    block = encrypted_data[i:i+16]
+                    decrypted_block = self._decrypt_block(block, round_keys)
+                    decrypted_data.extend(decrypted_block)
             
             # Usuń padding z ostatniego bloku
             if len(decrypted_data) > 0:
@@ -564,18 +798,20 @@ class AES:
                         app_logger.warning("AES file decryption: Invalid padding detected, keeping original data")
             
             # Zapisz odszyfrowane dane
-            with open(output_file, 'wb') as f_out:
-                f_out.write(decrypted_data)
+            with io_section():
+                with atomic_open(output_file) as f_out:
+                    f_out.write(decrypted_data)
             
-            app_logger.info(f"AES file decryption completed successfully")
+            app_logger.info("AES file decryption completed successfully")
             return True
             
         except Exception as e:
-            app_logger.error(f"AES file decryption failed: {str(e)}")
+            app_logger.error("AES file decryption failed: %s", e)
             return False
 
 
 # Funkcje pomocnicze dla interfejsu
+@instrumented("aes.encrypt_text")
 def aes_encrypt_text(text: str, key: str, key_size: int = 128) -> str:
     """
     Szyfrowanie tekstu AES
@@ -592,6 +828,7 @@ def aes_encrypt_text(text: str, key: str, key_size: int = 128) -> str:
     return aes.encrypt(text, key)
 
 
+@instrumented("aes.decrypt_text")
 def aes_decrypt_text(ciphertext: str, key: str, key_size: int = 128) -> str:
     """
     Deszyfrowanie tekstu AES
@@ -608,6 +845,7 @@ def aes_decrypt_text(ciphertext: str, key: str, key_size: int = 128) -> str:
     return aes.decrypt(ciphertext, key)
 
 
+@instrumented("aes.encrypt_file", size=file_size)
 def aes_encrypt_file(input_file: str, output_file: str, key: str, key_size: int = 128) -> bool:
     """
     Szyfrowanie pliku AES
@@ -625,6 +863,27 @@ def aes_encrypt_file(input_file: str, output_file: str, key: str, key_size: int
     return aes.encrypt_file(input_file, output_file, key)
 
 
+@instrumented("aes.encrypt_file_chunked", size=file_size)
+def aes_encrypt_file_chunked(input_file: str, output_file: str, key: str, key_size: int = 128,
+                             resume: bool = True) -> bool:
+    """
+    Szyfrowanie pliku AES porcjami z sumami kontrolnymi (wznawialne)
+    
+    Args:
+        input_file: Ścieżka do pliku wejściowego
+        output_file: Ścieżka do pliku wyjściowego
+        key: Klucz szyfrowania
+        key_size: Rozmiar klucza (128, 192, 256)
+        resume: Wznów przerwane szyfrowanie
+        
+    Returns:
+        True jeśli sukces, False w przeciwnym razie
+    """
+    aes = AES(key_size)
+    return aes.encrypt_file_chunked(input_file, output_file, key, resume=resume)
+
+
+@instrumented("aes.decrypt_file", size=file_size)
 def aes_decrypt_file(input_file: str, output_file: str, key: str, key_size: int = 128) -> bool:
     """
     Deszyfrowanie pliku AES
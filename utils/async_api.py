@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Asynchroniczne API szyfrów (asyncio)
+
+Obliczenia i operacje na plikach wykonywane są w wykonawcy (domyślnie
+wykonawca pętli zdarzeń), a pliki czytane i zapisywane są porcjami, więc
+pętla nie jest blokowana. W przeciwieństwie do funkcji z utils, które
+zwracają True/False, funkcje asynchroniczne zgłaszają wyjątki.
+
+Pliki zapisywane są w formacie binarnym KTKF (utils.file_header) - takim
+samym jak z funkcji *_encrypt_binary_file i AES.encrypt_file - a wynik
+zapisywany jest atomowo (utils.atomic_write).
+
+Anulowanie zadania (task.cancel()) przerywa przetwarzanie po bieżącej
+porcji: operacja wykonywana w wątku jest dokańczana, plik tymczasowy
+usuwany, a asyncio.CancelledError przekazywany dalej.
+"""
+
+import asyncio
+import os
+from utils.atomic_write import AtomicFile
+from utils.file_header import MODE_BINARY, check_header, new_header, peek_header, read_header
+from utils.pipeline import (DEFAULT_BUFFER_SIZE, OVERHEAD, BlockTransform, ByteShiftTransform,
+                            XorStreamTransform)
+
+CIPHERS = ("caesar", "vigenere", "stream", "aes")
+
+# Rozmiar porcji odczytu (wielokrotność bloku AES)
+DEFAULT_CHUNK_SIZE = DEFAULT_BUFFER_SIZE
+
+
+async def _call(executor, func, *args):
+    """Wykonuje funkcję w wykonawcy; po anulowaniu czeka na zakończenie wątku"""
+    future = asyncio.get_running_loop().run_in_executor(executor, func, *args)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        # Wątku nie da się przerwać - plik może być zwolniony dopiero po nim
+        await asyncio.wait([future])
+        if not future.cancelled():
+            future.exception()
+        raise
+
+
+# Tekst
+
+async def caesar_encrypt_async(text, shift, executor=None):
+    """Szyfruje tekst szyfrem Cezara (caesar_encrypt w wykonawcy)"""
+    from utils.caesar_cipher import caesar_encrypt
+    return await _call(executor, caesar_encrypt, text, shift)
+
+
+async def caesar_decrypt_async(text, shift, executor=None):
+    """Deszyfruje tekst szyfrem Cezara (caesar_decrypt w wykonawcy)"""
+    from utils.caesar_cipher import caesar_decrypt
+    return await _call(executor, caesar_decrypt, text, shift)
+
+
+async def vigenere_encrypt_async(text, key, executor=None):
+    """Szyfruje tekst szyfrem Vigenère (vigenere_encrypt w wykonawcy)"""
+    from utils.vigenere_cipher import vigenere_encrypt
+    return await _call(executor, vigenere_encrypt, text, key)
+
+
+async def vigenere_decrypt_async(text, key, executor=None):
+    """Deszyfruje tekst szyfrem Vigenère (vigenere_decrypt w wykonawcy)"""
+    from utils.vigenere_cipher import vigenere_decrypt
+    return await _call(executor, vigenere_decrypt, text, key)
+
+
+async def stream_encrypt_async(text, key, executor=None):
+    """Szyfruje tekst szyfrem strumieniowym (stream_encrypt w wykonawcy)"""
+    from utils.stream_cipher import stream_encrypt
+    return await _call(executor, stream_encrypt, text, key)
+
+
+async def stream_decrypt_async(encrypted_hex, key, executor=None):
+    """Deszyfruje tekst szyfrem strumieniowym (stream_decrypt w wykonawcy)"""
+    from utils.stream_cipher import stream_decrypt
+    return await _call(executor, stream_decrypt, encrypted_hex, key)
+
+
+async def aes_encrypt_text_async(text, key, key_size=128, executor=None):
+    """Szyfruje tekst AES (aes_encrypt_text w wykonawcy)"""
+    from utils.aes_cipher import aes_encrypt_text
+    return await _call(executor, aes_encrypt_text, text, key, key_size)
+
+
+async def aes_decrypt_text_async(ciphertext, key, key_size=128, executor=None):
+    """Deszyfruje tekst AES (aes_decrypt_text w wykonawcy)"""
+    from utils.aes_cipher import aes_decrypt_text
+    return await _call(executor, aes_decrypt_text, ciphertext, key, key_size)
+
+
+# Porcje plików
+
+def _check_shift(shift):
+    """Sprawdza przesunięcie Cezara jak caesar_encrypt"""
+    if not isinstance(shift, int) or shift < 1 or shift > 25:
+        raise ValueError("Przesunięcie musi być liczbą całkowitą od 1 do 25")
+
+
+def _encryption_setup(cipher, key, size, key_size):
+    """Nagłówek KTKF (tryb binarny) i przekształcenie do szyfrowania"""
+    if cipher == "caesar":
+        _check_shift(key)
+        return new_header("caesar", MODE_BINARY, str(key), size), ByteShiftTransform([key])
+    if cipher == "vigenere":
+        from utils.vigenere_cipher import _shift_transform, clean_key
+        return new_header("vigenere", MODE_BINARY, clean_key(key), size), _shift_transform(key)
+    if cipher == "stream":
+        if not key or not key.strip():
+            raise ValueError("Klucz nie może być pusty")
+        return new_header("stream", MODE_BINARY, key, size), XorStreamTransform(key)
+    if cipher == "aes":
+        from utils.aes_cipher import AES
+        aes = AES(key_size)
+        kdf_header, key_bytes = aes._encryption_key(key)
+        header = new_header("aes", MODE_BINARY, key_bytes, size, key_size=key_size, extra=kdf_header)
+        return header, BlockTransform(aes, aes._key_expansion(key_bytes))
+    raise ValueError(f"Nieznany szyfr: {cipher}")
+
+
+def _decryption_transform(header, key):
+    """Sprawdza klucz z nagłówkiem i zwraca przekształcenie do deszyfrowania"""
+    if header.cipher == "caesar":
+        _check_shift(key)
+        check_header(header, "caesar", str(key))
+        return ByteShiftTransform([key], decrypt=True)
+    if header.cipher == "vigenere":
+        from utils.vigenere_cipher import _shift_transform, clean_key
+        check_header(header, "vigenere", clean_key(key))
+        return _shift_transform(key, decrypt=True)
+    if header.cipher == "stream":
+        check_header(header, "stream", key)
+        return XorStreamTransform(key)
+    from utils.aes_cipher import AES
+    aes = AES(header.key_size)
+    key_bytes = aes._header_key(header, key)
+    check_header(header, "aes", key_bytes)
+    return BlockTransform(aes, aes._key_expansion(key_bytes), decrypt=True)
+
+
+def _decrypt_whole(header, input_file, output_file, key):
+    """Deszyfruje plik tekstowy lub porcjowany funkcją synchroniczną (w wykonawcy)"""
+    if header.cipher == "caesar":
+        _check_shift(key)
+        from utils.caesar_cipher import _decrypt_with_header
+    elif header.cipher == "vigenere":
+        from utils.vigenere_cipher import _decrypt_with_header
+    elif header.cipher == "stream":
+        from utils.stream_cipher import _decrypt_with_header
+    else:
+        from utils.aes_cipher import AES
+        _decrypt_with_header = AES(header.key_size)._decrypt_file_with_header
+    return _decrypt_with_header(header, input_file, output_file, key)
+
+
+def _expect_cipher(header, cipher):
+    if header is None:
+        raise ValueError("Plik nie ma nagłówka - użyj funkcji synchronicznych szyfru")
+    if cipher is not None and header.cipher != cipher:
+        raise ValueError(f"Plik zaszyfrowano innym szyfrem ({header.cipher})")
+
+
+def _check_chunk_size(chunk_size):
+    if chunk_size <= 0 or chunk_size % 16:
+        raise ValueError("Rozmiar porcji musi być dodatnią wielokrotnością 16 bajtów")
+
+
+def _fill(file, buffer, size):
+    """Wypełnia początek bufora size bajtami z pliku"""
+    view = memoryview(buffer)[:size]
+    length = 0
+    while length < size:
+        count = file.readinto(view[length:])
+        if not count:
+            raise ValueError("Plik wejściowy skrócił się podczas odczytu")
+        length += count
+    return length
+
+
+async def _transformed(file, size, transform, chunk_size, executor):
+    """Przekształca size bajtów pliku od bieżącej pozycji, porcja po porcji"""
+    buffer = bytearray(chunk_size + OVERHEAD)
+    offset = 0
+    while True:
+        length = await _call(executor, _fill, file, buffer, min(chunk_size, size - offset))
+        final = offset + length >= size
+        output_length = await _call(executor, transform.process, buffer, length, offset, final)
+        # Bufor jest używany ponownie - odbiorca dostaje kopię porcji
+        yield bytes(buffer[:output_length])
+        if final:
+            return
+        offset += length
+
+
+async def encrypt_chunks(cipher, input_file, key, key_size=128,
+                         chunk_size=DEFAULT_CHUNK_SIZE, executor=None):
+    """
+    Asynchroniczny iterator po zaszyfrowanym pliku
+
+    Pierwszy element to nagłówek KTKF, kolejne to zaszyfrowane porcje -
+    połączone dają plik jak z *_encrypt_binary_file.
+
+    Args:
+        cipher: "caesar", "vigenere", "stream" lub "aes"
+        input_file: Ścieżka do pliku wejściowego
+        key: Klucz (przesunięcie dla Cezara)
+        key_size: Rozmiar klucza AES
+        chunk_size: Rozmiar porcji (wielokrotność 16 bajtów)
+        executor: Wykonawca (domyślnie wykonawca pętli)
+
+    Yields:
+        bytes: Nagłówek, potem zaszyfrowane porcje
+    """
+    _check_chunk_size(chunk_size)
+    file = await _call(executor, open, input_file, 'rb')
+    try:
+        size = os.fstat(file.fileno()).st_size
+        header, transform = await _call(executor, _encryption_setup, cipher, key, size, key_size)
+        yield header.pack()
+        async for chunk in _transformed(file, size, transform, chunk_size, executor):
+            yield chunk
+    finally:
+        file.close()
+
+
+async def decrypt_chunks(input_file, key, cipher=None, chunk_size=DEFAULT_CHUNK_SIZE, executor=None):
+    """
+    Asynchroniczny iterator po odszyfrowanym pliku binarnym KTKF
+
+    Klucz sprawdzany jest z nagłówkiem przed odczytem danych, a długość
+    wyniku - po ostatniej porcji (ValueError, gdy plik jest uszkodzony).
+
+    Args:
+        input_file: Ścieżka do zaszyfrowanego pliku
+        key: Klucz (przesunięcie dla Cezara)
+        cipher: Oczekiwany szyfr (domyślnie szyfr z nagłówka)
+        chunk_size: Rozmiar porcji (wielokrotność 16 bajtów)
+        executor: Wykonawca (domyślnie wykonawca pętli)
+
+    Yields:
+        bytes: Odszyfrowane porcje
+    """
+    _check_chunk_size(chunk_size)
+    file = await _call(executor, open, input_file, 'rb')
+    try:
+        header = await _call(executor, read_header, file)
+        _expect_cipher(header, cipher)
+        if header.mode != MODE_BINARY:
+            raise ValueError("Porcjami odczytywane są tylko pliki binarne - użyj decrypt_file_async")
+        transform = await _call(executor, _decryption_transform, header, key)
+        size = os.fstat(file.fileno()).st_size - header.size
+        total = 0
+        async for chunk in _transformed(file, size, transform, chunk_size, executor):
+            total += len(chunk)
+            yield chunk
+        if total != header.plaintext_length:
+            raise ValueError("Długość odszyfrowanych danych nie zgadza się z nagłówkiem - plik uszkodzony")
+    finally:
+        file.close()
+
+
+async def _write_chunks(output_file, chunks, executor):
+    """Zapisuje porcje atomowo; przy błędzie lub anulowaniu plik nie powstaje"""
+    try:
+        output = await _call(executor, AtomicFile, output_file)
+        written = 0
+        try:
+            async for chunk in chunks:
+                await _call(executor, output.write, chunk)
+                written += len(chunk)
+        except BaseException:
+            output.discard()
+            raise
+        await _call(executor, output.commit)
+        return written
+    finally:
+        await chunks.aclose()
+
+
+# Pliki
+
+async def encrypt_file_async(cipher, input_file, output_file, key, key_size=128,
+                             chunk_size=DEFAULT_CHUNK_SIZE, executor=None):
+    """
+    Szyfruje plik porcjami bez blokowania pętli zdarzeń
+
+    Args:
+        cipher: "caesar", "vigenere", "stream" lub "aes"
+        input_file: Ścieżka do pliku wejściowego
+        output_file: Ścieżka do pliku wyjściowego
+        key: Klucz (przesunięcie dla Cezara)
+        key_size: Rozmiar klucza AES
+        chunk_size: Rozmiar porcji (wielokrotność 16 bajtów)
+        executor: Wykonawca (domyślnie wykonawca pętli)
+
+    Returns:
+        int: Rozmiar zapisanego pliku
+    """
+    chunks = encrypt_chunks(cipher, input_file, key, key_size, chunk_size, executor)
+    return await _write_chunks(output_file, chunks, executor)
+
+
+async def decrypt_file_async(input_file, output_file, key, cipher=None,
+                             chunk_size=DEFAULT_CHUNK_SIZE, executor=None):
+    """
+    Deszyfruje plik z nagłówkiem KTKF bez blokowania pętli zdarzeń
+
+    Pliki binarne deszyfrowane są porcjami; pliki tekstowe i porcjowane
+    (utils.chunked_file) - w całości w wykonawcy.
+
+    Args:
+        input_file: Ścieżka do zaszyfrowanego pliku
+        output_file: Ścieżka do pliku wyjściowego
+        key: Klucz (przesunięcie dla Cezara)
+        cipher: Oczekiwany szyfr (domyślnie szyfr z nagłówka)
+        chunk_size: Rozmiar porcji (wielokrotność 16 bajtów)
+        executor: Wykonawca (domyślnie wykonawca pętli)
+
+    Returns:
+        int: Rozmiar tekstu jawnego z nagłówka
+
+    Raises:
+        ValueError: Gdy plik nie ma nagłówka, jest uszkodzony lub zaszyfrowano go innym szyfrem
+        WrongKeyError: Gdy klucz jest nieprawidłowy
+    """
+    header = await _call(executor, peek_header, input_file)
+    _expect_cipher(header, cipher)
+    if header.mode != MODE_BINARY:
+        await _call(executor, _decrypt_whole, header, input_file, output_file, key)
+        return header.plaintext_length
+    chunks = decrypt_chunks(input_file, key, cipher, chunk_size, executor)
+    return await _write_chunks(output_file, chunks, executor)
+
+
+async def caesar_encrypt_file_async(input_file, output_file, shift, executor=None):
+    """Szyfruje plik szyfrem Cezara (format binarny KTKF)"""
+    return await encrypt_file_async("caesar", input_file, output_file, shift, executor=executor)
+
+
+async def caesar_decrypt_file_async(input_file, output_file, shift, executor=None):
+    """Deszyfruje plik zaszyfrowany szyfrem Cezara"""
+    return await decrypt_file_async(input_file, output_file, shift, "caesar", executor=executor)
+
+
+async def vigenere_encrypt_file_async(input_file, output_file, key, executor=None):
+    """Szyfruje plik szyfrem Vigenère (format binarny KTKF)"""
+    return await encrypt_file_async("vigenere", input_file, output_file, key, executor=executor)
+
+
+async def vigenere_decrypt_file_async(input_file, output_file, key, executor=None):
+    """Deszyfruje plik zaszyfrowany szyfrem Vigenère"""
+    return await decrypt_file_async(input_file, output_file, key, "vigenere", executor=executor)
+
+
+async def stream_encrypt_file_async(input_file, output_file, key, executor=None):
+    """Szyfruje plik szyfrem strumieniowym (format binarny KTKF)"""
+    return await encrypt_file_async("stream", input_file, output_file, key, executor=executor)
+
+
+async def stream_decrypt_file_async(input_file, output_file, key, executor=None):
+    """Deszyfruje plik zaszyfrowany szyfrem strumieniowym"""
+    return await decrypt_file_async(input_file, output_file, key, "stream", executor=executor)
+
+
+async def aes_encrypt_file_async(input_file, output_file, key, key_size=128, executor=None):
+    """Szyfruje plik AES (format jak AES.encrypt_file)"""
+    return await encrypt_file_async("aes", input_file, output_file, key, key_size, executor=executor)
+
+
+async def aes_decrypt_file_async(input_file, output_file, key, executor=None):
+    """Deszyfruje plik AES (rozmiar klucza z nagłówka)"""
+    return await decrypt_file_async(input_file, output_file, key, "aes", executor=executor)
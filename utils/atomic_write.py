@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Atomowy zapis plików wynikowych
+
+Dane zapisywane są do pliku tymczasowego w katalogu pliku docelowego,
+a po udanym zapisie plik tymczasowy zastępuje docelowy przez os.replace.
+Przerwany lub nieudany zapis nie zostawia częściowego pliku wynikowego -
+plik tymczasowy jest usuwany (pliki wznawialne, np. utils.chunked_file,
+zachowują go przy błędzie, ale nie przy anulowaniu).
+
+Polityka fsync (zmienna środowiskowa KTK_FSYNC lub set_fsync_policy()):
+- "none": bez fsync - najszybciej, po awarii systemu plik może być pusty,
+- "end": fsync pliku przed zamianą i katalogu po niej (domyślnie),
+- "periodic": dodatkowo fsync co PERIODIC_FSYNC_BYTES bajtów.
+
+Anulowanie: funkcja przekazana do cancellation() sprawdzana jest przy
+każdym zapisie w tym wątku; zwrócenie True przerywa zapis wyjątkiem
+WriteCancelled.
+"""
+
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+FSYNC_NONE = "none"
+FSYNC_END = "end"
+FSYNC_PERIODIC = "periodic"
+FSYNC_POLICIES = (FSYNC_NONE, FSYNC_END, FSYNC_PERIODIC)
+
+# Odstęp między wywołaniami fsync w polityce "periodic"
+PERIODIC_FSYNC_BYTES = 8 << 20
+
+# Przyrostek pliku częściowego zachowywanego do wznowienia zapisu
+PARTIAL_SUFFIX = ".part"
+
+
+def _policy_from_env():
+    policy = os.environ.get("KTK_FSYNC", FSYNC_END).strip().lower()
+    return policy if policy in FSYNC_POLICIES else FSYNC_END
+
+
+_fsync_policy = _policy_from_env()
+
+_local = threading.local()
+_lock = threading.Lock()
+_active = {}
+
+
+class WriteCancelled(Exception):
+    """Zapis przerwany na żądanie użytkownika"""
+
+    def __init__(self, message="Operacja anulowana"):
+        super().__init__(message)
+
+
+def set_fsync_policy(policy):
+    """Ustawia domyślną politykę fsync ("none", "end" lub "periodic")"""
+    global _fsync_policy
+    if policy not in FSYNC_POLICIES:
+        raise ValueError(f"Nieznana polityka fsync: {policy}")
+    _fsync_policy = policy
+
+
+def get_fsync_policy():
+    """Zwraca domyślną politykę fsync"""
+    return _fsync_policy
+
+
+@contextmanager
+def cancellation(is_cancelled):
+    """
+    Sprawdza anulowanie przy zapisach atomowych w bieżącym wątku
+
+    Args:
+        is_cancelled: Funkcja bez argumentów zwracająca True po anulowaniu
+    """
+    previous = getattr(_local, "is_cancelled", None)
+    _local.is_cancelled = is_cancelled
+    try:
+        yield
+    finally:
+        _local.is_cancelled = previous
+
+
+def check_cancelled():
+    """Zgłasza WriteCancelled, jeśli bieżące zadanie zostało anulowane"""
+    is_cancelled = getattr(_local, "is_cancelled", None)
+    if is_cancelled is not None and is_cancelled():
+        raise WriteCancelled()
+
+
+def bytes_written(path):
+    """
+    Liczba danych zapisanych dotąd do pliku docelowego w toku zapisu
+
+    Returns:
+        int lub None, gdy plik nie jest zapisywany
+    """
+    with _lock:
+        atomic_file = _active.get(os.path.abspath(path))
+    return atomic_file.written if atomic_file is not None else None
+
+
+def _create_temp(directory, name):
+    """
+    Tworzy unikalny plik tymczasowy obok pliku docelowego
+
+    Uprawnienia jak przy open(): 0666 z bieżącą maską umask procesu
+    (mkstemp tworzy pliki 0600).
+
+    Returns:
+        tuple: (deskryptor, ścieżka)
+    """
+    flags = os.O_RDWR | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    for _ in range(tempfile.TMP_MAX):
+        path = os.path.join(directory, f".{name}.{os.urandom(4).hex()}.tmp")
+        try:
+            return os.open(path, flags, 0o666), path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"Nie można utworzyć pliku tymczasowego w {directory}")
+
+
+def _fsync_directory(directory):
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class AtomicFile:
+    """
+    Plik zapisywany atomowo (obiekt plikowy z commit()/discard())
+
+    Użycie jako menedżer kontekstu zatwierdza zapis po wyjściu z bloku,
+    a przy wyjątku usuwa plik tymczasowy.
+    """
+
+    def __init__(self, path, mode='wb', encoding=None, fsync=None,
+                 temp_path=None, keep_on_error=False):
+        """
+        Args:
+            path: Ścieżka pliku docelowego
+            mode: 'wb', 'w' lub 'r+b' (kontynuacja istniejącego temp_path)
+            encoding: Kodowanie w trybie tekstowym
+            fsync: Polityka fsync (domyślnie get_fsync_policy())
+            temp_path: Stała ścieżka pliku tymczasowego (zapis wznawialny)
+            keep_on_error: Zachowaj plik tymczasowy przy błędzie (nie przy anulowaniu)
+        """
+        if mode not in ('wb', 'w', 'r+b'):
+            raise ValueError(f"Nieobsługiwany tryb zapisu: {mode}")
+        self.path = os.path.abspath(path)
+        self.fsync = fsync or _fsync_policy
+        if self.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Nieznana polityka fsync: {self.fsync}")
+        self.keep_on_error = keep_on_error
+        self.written = 0
+        self._unsynced = 0
+
+        directory = os.path.dirname(self.path)
+        if temp_path is None:
+            fd, self.temp_path = _create_temp(directory, os.path.basename(self.path))
+            try:
+                self.file = os.fdopen(fd, mode, encoding=encoding)
+            except BaseException:
+                os.close(fd)
+                os.remove(self.temp_path)
+                raise
+        else:
+            self.temp_path = os.path.abspath(temp_path)
+            self.file = open(self.temp_path, mode, encoding=encoding)
+
+        with _lock:
+            _active[self.path] = self
+
+    def write(self, data):
+        check_cancelled()
+        count = self.file.write(data)
+        self.written += count
+        if self.fsync == FSYNC_PERIODIC:
+            self._unsynced += count
+            if self._unsynced >= PERIODIC_FSYNC_BYTES:
+                self.sync()
+        return count
+
+    def sync(self):
+        """Zapisuje bufory i wykonuje fsync pliku tymczasowego"""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self._unsynced = 0
+
+    def __getattr__(self, name):
+        if name == "file":
+            raise AttributeError(name)
+        return getattr(self.file, name)
+
+    def _release(self):
+        with _lock:
+            if _active.get(self.path) is self:
+                del _active[self.path]
+
+    def commit(self):
+        """Zamyka plik tymczasowy i zastępuje nim plik docelowy"""
+        try:
+            if self.fsync == FSYNC_NONE:
+                self.file.close()
+            else:
+                self.sync()
+                self.file.close()
+            os.replace(self.temp_path, self.path)
+            if self.fsync != FSYNC_NONE:
+                _fsync_directory(os.path.dirname(self.path))
+        except BaseException:
+            self.discard()
+            raise
+        finally:
+            self._release()
+
+    def discard(self, keep=False):
+        """Zamyka i usuwa plik tymczasowy (z keep=True tylko zamyka)"""
+        try:
+            self.file.close()
+        except OSError:
+            pass
+        finally:
+            self._release()
+            if not keep and os.path.exists(self.temp_path):
+                os.remove(self.temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            keep = self.keep_on_error and not issubclass(exc_type, WriteCancelled)
+            self.discard(keep)
+        return False
+
+
+def atomic_open(path, mode='wb', encoding=None, fsync=None):
+    """
+    Otwiera plik do zapisu atomowego
+
+    Args:
+        path: Ścieżka pliku docelowego
+        mode: 'wb' lub 'w'
+        encoding: Kodowanie w trybie tekstowym
+        fsync: Polityka fsync (domyślnie get_fsync_policy())
+
+    Returns:
+        AtomicFile: do użycia w bloku with
+    """
+    return AtomicFile(path, mode, encoding, fsync)
+
+
+def partial_path(path):
+    """Ścieżka pliku częściowego zapisu wznawialnego"""
+    return path + PARTIAL_SUFFIX
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Wsadowe przetwarzanie wielu plików
+
+Pliki przetwarzane są równolegle w ThreadPoolExecutor istniejącymi funkcjami
+plikowymi z utils (przez rejestr utils.file_ciphers). Wątki nakładają na
+siebie odczyt i zapis plików; obliczenia szyfrów w czystym Pythonie nadal
+dzielą GIL.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.logger import app_logger
+
+# Domyślna liczba plików przetwarzanych równocześnie
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+
+class BatchResult:
+    """Wynik przetworzenia pojedynczego pliku"""
+
+    __slots__ = ("input_file", "output_file", "success", "error", "elapsed")
+
+    def __init__(self, input_file, output_file, success, error="", elapsed=0.0):
+        self.input_file = input_file
+        self.output_file = output_file
+        self.success = success
+        self.error = error
+        self.elapsed = elapsed
+
+
+def collect_files(paths):
+    """
+    Rozwija listę plików i folderów do listy plików
+
+    Args:
+        paths: Ścieżki plików i folderów (foldery przeszukiwane rekurencyjnie)
+
+    Returns:
+        list: Ścieżki plików bez powtórzeń, w kolejności podania
+    """
+    files = []
+    seen = set()
+    for path in paths:
+        if os.path.isdir(path):
+            found = []
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                found.extend(os.path.join(root, name) for name in sorted(names))
+        elif os.path.isfile(path):
+            found = [path]
+        else:
+            continue
+        for file_path in found:
+            if file_path not in seen:
+                seen.add(file_path)
+                files.append(file_path)
+    return files
+
+
+def plan_outputs(cipher, files, operation, output_dir=None):
+    """
+    Przypisuje plikom wejściowym unikalne ścieżki wynikowe
+
+    Args:
+        cipher: FileCipher z utils.file_ciphers
+        files: Lista plików wejściowych
+        operation: "encrypt" lub "decrypt"
+        output_dir: Katalog docelowy (domyślnie katalog każdego pliku)
+
+    Returns:
+        list: Pary (plik_wejściowy, plik_wynikowy)
+    """
+    reserved = set(files)
+    tasks = []
+    for file_path in files:
+        output_file = cipher.output_path(file_path, operation, output_dir, reserved)
+        reserved.add(output_file)
+        tasks.append((file_path, output_file))
+    return tasks
+
+
+def _run_task(process, input_file, output_file):
+    start = time.perf_counter()
+    try:
+        success = bool(process(input_file, output_file))
+        error = "" if success else "Operacja nie powiodła się"
+    except Exception as e:
+        success, error = False, str(e)
+    return BatchResult(input_file, output_file, success, error, time.perf_counter() - start)
+
+
+def run_batch(tasks, process, max_workers=DEFAULT_WORKERS, on_result=None):
+    """
+    Przetwarza pliki równolegle
+
+    Args:
+        tasks: Lista par (plik_wejściowy, plik_wynikowy)
+        process: Funkcja (plik_wejściowy, plik_wynikowy) -> bool
+        max_workers: Liczba plików przetwarzanych równocześnie
+        on_result: Opcjonalna funkcja wywoływana z BatchResult po każdym pliku
+
+    Returns:
+        list: BatchResult w kolejności zadań
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(_run_task, process, input_file, output_file): index
+                   for index, (input_file, output_file) in enumerate(tasks)}
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            if not result.success:
+                app_logger.log_error(f"przetwarzania wsadowego {result.input_file}", result.error)
+            if on_result is not None:
+                on_result(result)
+    return [results[index] for index in range(len(tasks))]
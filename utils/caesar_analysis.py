@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kryptoanaliza szyfru Cezara - odgadywanie przesunięcia z częstości liter
+
+Tekst przeglądany jest raz (histogram liter), a wszystkie przesunięcia
+oceniane są testem chi-kwadrat na przesuniętym histogramie: O(n + 26·26)
+zamiast 25 pełnych deszyfrowań. Szyfr przesuwa tylko litery A-Z, dlatego
+profile języków obejmują wyłącznie te litery (polskie znaki diakrytyczne
+pominięto, a częstości pozostałych liter znormalizowano).
+"""
+
+import string
+from collections import Counter
+from utils.caesar_cipher import caesar_decrypt
+from utils.profiler import instrumented
+
+ALPHABET = string.ascii_lowercase
+
+
+def _profile(percentages):
+    total = sum(percentages)
+    return [value / total for value in percentages]
+
+
+# Częstości liter a-z [%]
+LANGUAGE_PROFILES = {
+    "pl": _profile([8.91, 1.47, 3.96, 3.25, 7.66, 0.30, 1.42, 1.08, 8.21, 2.28,
+                    3.51, 2.10, 2.80, 5.52, 7.75, 3.13, 0.14, 4.69, 4.32, 3.98,
+                    2.50, 0.04, 4.65, 0.02, 3.76, 5.64]),
+    "en": _profile([8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966, 0.153,
+                    0.772, 4.025, 2.406, 6.749, 7.507, 1.929, 0.095, 5.987, 6.327, 9.056,
+                    2.758, 0.978, 2.360, 0.150, 1.974, 0.074]),
+}
+
+LANGUAGE_NAMES = {"pl": "polski", "en": "angielski"}
+
+
+class ShiftCandidate:
+    """Kandydat na przesunięcie z oceną dopasowania do języka"""
+
+    __slots__ = ("shift", "language", "score")
+
+    def __init__(self, shift, language, score):
+        self.shift = shift
+        self.language = language
+        self.score = score
+
+    def __repr__(self):
+        return f"ShiftCandidate(shift={self.shift}, language={self.language!r}, score={self.score:.2f})"
+
+
+def letter_histogram(text):
+    """
+    Zlicza litery A-Z (bez rozróżniania wielkości)
+
+    Args:
+        text: Tekst
+
+    Returns:
+        list: 26 liczników dla liter a-z
+    """
+    counts = Counter(text)
+    return [counts[letter] + counts[letter.upper()] for letter in ALPHABET]
+
+
+def chi_squared(histogram, profile, shift=0):
+    """
+    Test chi-kwadrat histogramu tekstu odszyfrowanego przesunięciem shift
+
+    Args:
+        histogram: Histogram szyfrogramu (letter_histogram)
+        profile: Częstości liter języka (sumujące się do 1)
+        shift: Przesunięcie użyte przy szyfrowaniu
+
+    Returns:
+        float: Wartość chi-kwadrat (mniejsza = lepsze dopasowanie)
+    """
+    total = sum(histogram)
+    score = 0.0
+    for index, probability in enumerate(profile):
+        # Litera jawna index została zaszyfrowana jako (index + shift) mod 26
+        observed = histogram[(index + shift) % 26]
+        expected = total * probability
+        score += (observed - expected) ** 2 / expected
+    return score
+
+
+@instrumented("caesar.rank_shifts")
+def rank_shifts(text, languages=("pl", "en")):
+    """
+    Ocenia wszystkie przesunięcia (1-25) dla podanych języków
+
+    Args:
+        text: Szyfrogram
+        languages: Klucze LANGUAGE_PROFILES
+
+    Returns:
+        list: ShiftCandidate od najlepszego; dla każdego przesunięcia
+              wybierany jest najlepiej pasujący język
+
+    Raises:
+        ValueError: Gdy tekst nie zawiera liter lub język jest nieznany
+    """
+    histogram = letter_histogram(text)
+    if not any(histogram):
+        raise ValueError("Tekst nie zawiera liter do analizy")
+    for language in languages:
+        if language not in LANGUAGE_PROFILES:
+            raise ValueError(f"Nieznany język: {language}")
+
+    candidates = []
+    for shift in range(1, 26):
+        score, language = min((chi_squared(histogram, LANGUAGE_PROFILES[language], shift), language)
+                              for language in languages)
+        candidates.append(ShiftCandidate(shift, language, score))
+    candidates.sort(key=lambda candidate: candidate.score)
+    return candidates
+
+
+def crack_caesar(text, languages=("pl", "en")):
+    """
+    Odgaduje przesunięcie i odszyfrowuje tekst
+
+    Args:
+        text: Szyfrogram
+        languages: Klucze LANGUAGE_PROFILES
+
+    Returns:
+        tuple: (najlepszy ShiftCandidate, odszyfrowany tekst)
+    """
+    best = rank_shifts(text, languages)[0]
+    return best, caesar_decrypt(text, best.shift)
@@ -4,6 +4,16 @@
 Implementacja szyfru Cezara
 """
 
+import os
+from utils.atomic_write import atomic_open
+from utils.file_header import (MODE_BINARY, MODE_TEXT, new_header, peek_header, check_header,
+                               check_length, read_encrypted, text_payload, write_encrypted,
+                               write_output)
+from utils.pipeline import ByteShiftTransform, run_pipeline, use_pipeline
+from utils.profiler import instrumented, io_section, file_size
+
+
+@instrumented("caesar.encrypt")
 def caesar_encrypt(text, shift):
     """
     Szyfruje tekst szyfrem Cezara
@@ -35,6 +45,7 @@ def caesar_encrypt(text, shift):
     return result
 
 
+@instrumented("caesar.decrypt")
 def caesar_decrypt(text, shift):
     """
     Deszyfruje tekst szyfrem Cezara
@@ -66,6 +77,44 @@ def caesar_decrypt(text, shift):
     return result
 
 
+def caesar_shift_bytes(data, shift):
+    """
+    Przesuwa każdy bajt o podaną wartość modulo 256 (pliki binarne)
+    
+    Args:
+        data: Bajty do przekształcenia
+        shift: Przesunięcie (ujemne przy deszyfrowaniu)
+        
+    Returns:
+        bytes: Przekształcone bajty
+    """
+    table = bytes((byte + shift) % 256 for byte in range(256))
+    return bytes(data).translate(table)
+
+
+def _decrypt_with_header(header, input_file, output_file, shift):
+    """Deszyfruje plik z nagłówkiem w trybie zapisanym w nagłówku"""
+    check_header(header, "caesar", str(shift))
+    if header.binary and use_pipeline(header.plaintext_length):
+        run_pipeline(input_file, output_file, ByteShiftTransform([shift], decrypt=True),
+                     input_offset=header.size, expected_length=header.plaintext_length)
+        return True
+    
+    with io_section():
+        _, content = read_encrypted(input_file)
+    
+    if header.binary:
+        decrypted = caesar_shift_bytes(content, -shift)
+        check_length(header, decrypted)
+    else:
+        decrypted = caesar_decrypt(text_payload(content), shift)
+    
+    with io_section():
+        write_output(output_file, decrypted)
+    return True
+
+
+@instrumented("caesar.encrypt_file", size=file_size)
 def caesar_encrypt_file(input_file, output_file, shift):
     """
     Szyfruje plik szyfrem Cezara
@@ -79,13 +128,15 @@ def caesar_encrypt_file(input_file, output_file, shift):
         bool: True jeśli sukces, False jeśli błąd
     """
     try:
-        with open(input_file, 'r', encoding='utf-8') as file:
-            content = file.read()
+        with io_section():
+            with open(input_file, 'r', encoding='utf-8') as file:
+                content = file.read()
         
         encrypted_content = caesar_encrypt(content, shift)
+        header = new_header("caesar", MODE_TEXT, str(shift), os.path.getsize(input_file))
         
-        with open(output_file, 'w', encoding='utf-8') as file:
-            file.write(encrypted_content)
+        with io_section():
+            write_encrypted(output_file, header, encrypted_content)
         
         return True
     except Exception as e:
@@ -93,6 +144,7 @@ def caesar_encrypt_file(input_file, output_file, shift):
         return False
 
 
+@instrumented("caesar.decrypt_file", size=file_size)
 def caesar_decrypt_file(input_file, output_file, shift):
     """
     Deszyfruje plik szyfrem Cezara
@@ -106,13 +158,19 @@ def caesar_decrypt_file(input_file, output_file, shift):
         bool: True jeśli sukces, False jeśli błąd
     """
     try:
-        with open(input_file, 'r', encoding='utf-8') as file:
-            content = file.read()
+        header = peek_header(input_file)
+        if header is not None:
+            return _decrypt_with_header(header, input_file, output_file, shift)
+        
+        with io_section():
+            with open(input_file, 'r', encoding='utf-8') as file:
+                content = file.read()
         
         decrypted_content = caesar_decrypt(content, shift)
         
-        with open(output_file, 'w', encoding='utf-8') as file:
-            file.write(decrypted_content)
+        with io_section():
+            with atomic_open(output_file, 'w', encoding='utf-8') as file:
+                file.write(decrypted_content)
         
         return True
     except Exception as e:
@@ -120,6 +178,7 @@ def caesar_decrypt_file(input_file, output_file, shift):
         return False
 
 
+@instrumented("caesar.encrypt_binary_file", size=file_size)
 def caesar_encrypt_binary_file(input_file, output_file, shift):
     """
     Szyfruje plik binarny (PDF, obrazy, itp.) szyfrem Cezara na poziomie bajtów
@@ -133,18 +192,22 @@ def caesar_encrypt_binary_file(input_file, output_file, shift):
         bool: True jeśli sukces, False jeśli błąd
     """
     try:
-        with open(input_file, 'rb') as file:
-            content = file.read()
+        size = os.path.getsize(input_file)
+        if use_pipeline(size):
+            header = new_header("caesar", MODE_BINARY, str(shift), size)
+            run_pipeline(input_file, output_file, ByteShiftTransform([shift]), header.pack())
+            return True
+        
+        with io_section():
+            with open(input_file, 'rb') as file:
+                content = file.read()
         
-        # Szyfruj każdy bajt osobno
-        encrypted_bytes = bytearray()
-        for byte in content:
-            # Zastosuj przesunięcie modulo 256
-            encrypted_byte = (byte + shift) % 256
-            encrypted_bytes.append(encrypted_byte)
+        # Szyfruj każdy bajt (przesunięcie modulo 256)
+        encrypted_bytes = caesar_shift_bytes(content, shift)
+        header = new_header("caesar", MODE_BINARY, str(shift), len(content))
         
-        with open(output_file, 'wb') as file:
-            file.write(encrypted_bytes)
+        with io_section():
+            write_encrypted(output_file, header, encrypted_bytes)
         
         return True
     except Exception as e:
@@ -152,6 +215,7 @@ def caesar_encrypt_binary_file(input_file, output_file, shift):
         return False
 
 
+@instrumented("caesar.decrypt_binary_file", size=file_size)
 def caesar_decrypt_binary_file(input_file, output_file, shift):
     """
     Deszyfruje plik binarny (PDF, obrazy, itp.) szyfrem Cezara na poziomie bajtów
@@ -165,18 +229,20 @@ def caesar_decrypt_binary_file(input_file, output_file, shift):
         bool: True jeśli sukces, False jeśli błąd
     """
     try:
-        with open(input_file, 'rb') as file:
-            content = file.read()
-        
-        # Deszyfruj każdy bajt osobno
-        decrypted_bytes = bytearray()
-        for byte in content:
-            # Zastosuj odwrotne przesunięcie modulo 256
-            decrypted_byte = (byte - shift) % 256
-            decrypted_bytes.append(decrypted_byte)
-        
-        with open(output_file, 'wb') as file:
-            file.write(decrypted_bytes)
+        header = peek_header(input_file)
+        if header is not None:
+            return _decrypt_with_header(header, input_file, output_file, shift)
+        
+        with io_section():
+            with open(input_file, 'rb') as file:
+                content = file.read()
+        
+        # Deszyfruj każdy bajt (odwrotne przesunięcie modulo 256)
+        decrypted_bytes = caesar_shift_bytes(content, -shift)
+        
+        with io_section():
+            with atomic_open(output_file) as file:
+                file.write(decrypted_bytes)
         
         return True
     except Exception as e:
@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pliki dzielone na porcje z sumami kontrolnymi i indeksem (szyfrowanie wznawialne)
+
+Układ: nagłówek KTKF w trybie MODE_CHUNKED, rekordy porcji, indeks, stopka.
+Rekord to numer porcji, długość szyfrogramu i HMAC, a po nim szyfrogram
+porcji tekstu jawnego o stałym rozmiarze. HMAC liczony jest kluczem
+wyprowadzonym z klucza szyfru, więc:
+- uszkodzenie wykrywane jest w obrębie jednej porcji - pozostałe porcje
+  dają się odszyfrować,
+- przerwane szyfrowanie wznawiane jest od ostatniej poprawnej porcji
+  zamiast od początku pliku.
+Indeks (pozycje, długości i HMAC porcji) i stopka zapisywane są na końcu -
+ich brak oznacza niedokończony plik.
+
+Obsługiwane szyfry: "stream" (strumień klucza od pozycji porcji, zgodny
+z stream_encrypt_binary_file) i "aes" (bloki porcji, padding PKCS#7 tylko
+w ostatniej porcji).
+"""
+
+import hashlib
+import hmac
+import os
+import struct
+from utils.atomic_write import AtomicFile, atomic_open, partial_path
+from utils.file_header import (MODE_CHUNKED, SALT_SIZE, new_header, read_header,
+                               check_header)
+from utils.logger import get_logger
+from utils.profiler import instrumented, section, io_section, file_size
+
+app_logger = get_logger('chunked')
+
+# Rozmiar porcji tekstu jawnego - wielokrotność bloku AES i skrótu strumienia klucza
+DEFAULT_CHUNK_SIZE = 1 << 20
+CHUNK_ALIGNMENT = 32
+
+MAC_SIZE = 16
+TRAILER_MAGIC = b"KTKE"
+
+# Koniec pola dodatkowego nagłówka: rozmiar porcji, czas modyfikacji źródła [ns]
+_PARAMS = struct.Struct(">IQ")
+# Rekord porcji i wpis indeksu: numer/pozycja, długość szyfrogramu, HMAC
+_RECORD = struct.Struct(">QI16s")
+_INDEX_ENTRY = struct.Struct(">QI16s")
+# Stopka: pozycja indeksu, liczba porcji, HMAC indeksu, magic
+_TRAILER = struct.Struct(">QQ16s4s")
+
+
+class DamagedChunksError(ValueError):
+    """Plik zawiera uszkodzone porcje"""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        numbers = ", ".join(str(index) for index in self.chunks[:10])
+        if len(self.chunks) > 10:
+            numbers += ", ..."
+        super().__init__(f"Uszkodzone porcje pliku ({len(self.chunks)}): {numbers}")
+
+
+def chunk_count(plaintext_length, chunk_size):
+    """Liczba porcji pliku (co najmniej jedna, także dla pustego pliku)"""
+    return max(1, -(-plaintext_length // chunk_size))
+
+
+def chunk_params(header):
+    """
+    Parametry porcji z nagłówka
+
+    Returns:
+        tuple: (rozmiar porcji, czas modyfikacji źródła [ns])
+    """
+    if len(header.extra) < _PARAMS.size:
+        raise ValueError("Uszkodzony nagłówek pliku")
+    chunk_size, source_mtime = _PARAMS.unpack_from(header.extra, len(header.extra) - _PARAMS.size)
+    if not chunk_size or chunk_size % CHUNK_ALIGNMENT:
+        raise ValueError("Nieprawidłowy rozmiar porcji w nagłówku")
+    return chunk_size, source_mtime
+
+
+class _StreamChunks:
+    """Porcje szyfru strumieniowego (XOR ze strumieniem klucza od pozycji porcji)"""
+
+    cipher = "stream"
+    key_size = 0
+
+    def __init__(self, key, extra):
+        if not key or not key.strip():
+            raise ValueError("Klucz nie może być pusty")
+        self.key = key
+        self.material = key
+        self.extra = extra
+
+    def _xor(self, offset, data):
+        from utils.stream_cipher import generate_key_stream
+        if not data:
+            return b""
+        key_stream = generate_key_stream(self.key, len(data), offset)
+        return (int.from_bytes(data, 'big') ^ int.from_bytes(key_stream, 'big')).to_bytes(len(data), 'big')
+
+    def encrypt(self, offset, data, final):
+        return self._xor(offset, data)
+
+    def decrypt(self, offset, data, final):
+        return self._xor(offset, data)
+
+
+class _AESChunks:
+    """Porcje AES (bloki szyfrowane niezależnie, padding w ostatniej porcji)"""
+
+    cipher = "aes"
+
+    def __init__(self, aes, key_bytes, extra):
+        self.aes = aes
+        self.key_size = aes.key_size
+        self.material = key_bytes
+        self.extra = extra
+        with section("aes.key_schedule"):
+            self.round_keys = aes._key_expansion(key_bytes)
+
+    def encrypt(self, offset, data, final):
+        if final:
+            data = self.aes._pad_data(data)
+        encrypt_block = self.aes._encrypt_block
+        with section("aes.blocks"):
+            return b''.join(encrypt_block(data[i:i+16], self.round_keys)
+                            for i in range(0, len(data), 16))
+
+    def decrypt(self, offset, data, final):
+        if not data or len(data) % 16 != 0:
+            raise ValueError("Nieprawidłowa długość porcji (wymagana wielokrotność 16 bajtów)")
+        decrypt_block = self.aes._decrypt_block
+        with section("aes.blocks"):
+            decrypted = b''.join(decrypt_block(data[i:i+16], self.round_keys)
+                                 for i in range(0, len(data), 16))
+        return self.aes._unpad_data(decrypted) if final else decrypted
+
+
+def _new_chunks(cipher, key, key_size):
+    """Porcje dla nowego pliku (losowa sól lub nowy nagłówek KDF)"""
+    if cipher == "stream":
+        return _StreamChunks(key, os.urandom(SALT_SIZE))
+    if cipher == "aes":
+        from utils.aes_cipher import AES
+        aes = AES(key_size)
+        kdf_header, key_bytes = aes._encryption_key(key)
+        return _AESChunks(aes, key_bytes, kdf_header)
+    raise ValueError(f"Szyfr {cipher} nie obsługuje plików dzielonych na porcje")
+
+
+def _header_chunks(header, key):
+    """Porcje dla pliku z nagłówkiem (klucz wyprowadzany z parametrów nagłówka)"""
+    extra = header.extra[:-_PARAMS.size]
+    if header.cipher == "stream":
+        return _StreamChunks(key, extra)
+    if header.cipher == "aes":
+        from utils.aes_cipher import AES
+        aes = AES(header.key_size)
+        return _AESChunks(aes, aes._header_key(header, key), extra)
+    raise ValueError(f"Szyfr {header.cipher} nie obsługuje plików dzielonych na porcje")
+
+
+class _Macs:
+    """HMAC porcji i indeksu kluczem wyprowadzonym z klucza szyfru"""
+
+    def __init__(self, material, extra):
+        if isinstance(material, str):
+            material = material.encode('utf-8')
+        self.key = hmac.new(material, b"KTKC-MAC" + extra, hashlib.sha256).digest()
+
+    def chunk(self, index, data):
+        mac = hmac.new(self.key, struct.pack(">QI", index, len(data)), hashlib.sha256)
+        mac.update(data)
+        return mac.digest()[:MAC_SIZE]
+
+    def index(self, data):
+        return hmac.new(self.key, b"index" + data, hashlib.sha256).digest()[:MAC_SIZE]
+
+
+def _read_record(file, index, macs, chunk_size):
+    """
+    Odczytuje rekord porcji od bieżącej pozycji
+
+    Returns:
+        tuple: (szyfrogram, HMAC) lub None, gdy rekord jest uszkodzony lub niepełny
+    """
+    record = file.read(_RECORD.size)
+    if len(record) != _RECORD.size:
+        return None
+    stored_index, length, mac = _RECORD.unpack(record)
+    # Szyfrogram porcji jest najwyżej o blok paddingu dłuższy od porcji
+    if stored_index != index or length > chunk_size + 16:
+        return None
+    data = file.read(length)
+    if len(data) != length or not hmac.compare_digest(macs.chunk(index, data), mac):
+        return None
+    return data, mac
+
+
+def _read_index(file, header, macs):
+    """
+    Odczytuje indeks ze stopki pliku
+
+    Returns:
+        list: Wpisy (pozycja rekordu, długość, HMAC) lub None, gdy stopki brak
+              albo jest uszkodzona
+    """
+    file.seek(0, os.SEEK_END)
+    end = file.tell()
+    if end < header.size + _TRAILER.size:
+        return None
+    file.seek(end - _TRAILER.size)
+    index_position, count, index_mac, magic = _TRAILER.unpack(file.read(_TRAILER.size))
+    index_size = count * _INDEX_ENTRY.size
+    if magic != TRAILER_MAGIC or index_position + index_size != end - _TRAILER.size:
+        return None
+    file.seek(index_position)
+    data = file.read(index_size)
+    if not hmac.compare_digest(macs.index(data), index_mac):
+        return None
+    return [_INDEX_ENTRY.unpack_from(data, offset) for offset in range(0, index_size, _INDEX_ENTRY.size)]
+
+
+def _scan_records(file, header, macs, count):
+    """Odczytuje kolejne poprawne rekordy od początku pliku (bez indeksu)"""
+    chunk_size, _ = chunk_params(header)
+    file.seek(header.size)
+    entries = []
+    for index in range(count):
+        position = file.tell()
+        record = _read_record(file, index, macs, chunk_size)
+        if record is None:
+            break
+        data, mac = record
+        entries.append((position, len(data), mac))
+    return entries
+
+
+def _write_index(file, entries, macs):
+    index_position = file.tell()
+    data = b''.join(_INDEX_ENTRY.pack(*entry) for entry in entries)
+    file.write(data)
+    file.write(_TRAILER.pack(index_position, len(entries), macs.index(data), TRAILER_MAGIC))
+
+
+def _resume_point(output_file, chunks_key, cipher, key_size, chunk_size, source):
+    """
+    Sprawdza, czy plik wynikowy jest przerwanym szyfrowaniem tego samego źródła
+
+    Returns:
+        tuple: (nagłówek, porcje, wpisy poprawnych porcji, pozycja końca
+               ostatniej poprawnej porcji, czy plik jest kompletny) lub None
+    """
+    try:
+        with open(output_file, 'rb') as file:
+            header = read_header(file)
+            if (header is None or not header.chunked or header.cipher != cipher
+                    or header.key_size != key_size or header.plaintext_length != source.st_size
+                    or chunk_params(header) != (chunk_size, source.st_mtime_ns)):
+                return None
+            chunks = _header_chunks(header, chunks_key)
+            if not header.matches_key(chunks.material):
+                return None
+            macs = _Macs(chunks.material, chunks.extra)
+            count = chunk_count(header.plaintext_length, chunk_size)
+
+            entries = _read_index(file, header, macs)
+            if entries is not None and len(entries) == count:
+                return header, chunks, entries, None, True
+            entries = _scan_records(file, header, macs, count)
+            end = entries[-1][0] + _RECORD.size + entries[-1][1] if entries else header.size
+            return header, chunks, entries, end, False
+    except (OSError, ValueError):
+        return None
+
+
+@instrumented("chunked.encrypt_file", size=file_size)
+def encrypt_file(input_file, output_file, key, cipher, key_size=0,
+                 chunk_size=DEFAULT_CHUNK_SIZE, resume=True, progress=None):
+    """
+    Szyfruje plik porcjami z sumami kontrolnymi
+
+    Porcje zapisywane są do pliku częściowego (atomic_write.partial_path),
+    który po zapisaniu indeksu zastępuje plik wynikowy. Jeśli plik częściowy
+    pochodzi z przerwanego szyfrowania tego samego pliku (ten sam rozmiar
+    i czas modyfikacji źródła, szyfr i klucz), szyfrowanie wznawiane jest
+    od ostatniej poprawnej porcji.
+
+    Args:
+        input_file: Ścieżka do pliku wejściowego
+        output_file: Ścieżka do pliku wyjściowego
+        key: Klucz szyfrowania
+        cipher: "stream" lub "aes"
+        key_size: Rozmiar klucza AES (dla "stream" ignorowany)
+        chunk_size: Rozmiar porcji tekstu jawnego (wielokrotność CHUNK_ALIGNMENT)
+        resume: Wznów przerwane szyfrowanie zamiast zaczynać od nowa
+        progress: Opcjonalna funkcja (gotowe porcje, wszystkie porcje)
+
+    Returns:
+        int: Liczba porcji przejętych z przerwanego szyfrowania
+    """
+    if not chunk_size or chunk_size % CHUNK_ALIGNMENT:
+        raise ValueError(f"Rozmiar porcji musi być wielokrotnością {CHUNK_ALIGNMENT} bajtów")
+    if cipher == "stream":
+        key_size = 0
+    source = os.stat(input_file)
+    count = chunk_count(source.st_size, chunk_size)
+
+    partial = partial_path(output_file)
+    state = None
+    if resume:
+        if os.path.exists(output_file):
+            done = _resume_point(output_file, key, cipher, key_size, chunk_size, source)
+            if done is not None and done[4]:
+                app_logger.info("Chunked file already complete: %s", output_file)
+                return count
+        if os.path.exists(partial):
+            state = _resume_point(partial, key, cipher, key_size, chunk_size, source)
+    if state is not None:
+        header, chunks, entries, end, complete = state
+        if complete:
+            # Przerwano po zapisaniu indeksu, a przed zamianą pliku
+            os.replace(partial, output_file)
+            return count
+        app_logger.info("Resuming chunked encryption of %s at chunk %d/%d",
+                        input_file, len(entries), count)
+    else:
+        chunks = _new_chunks(cipher, key, key_size)
+        extra = chunks.extra + _PARAMS.pack(chunk_size, source.st_mtime_ns)
+        header = new_header(cipher, MODE_CHUNKED, chunks.material, source.st_size,
+                            key_size=key_size, extra=extra)
+        entries, end = [], None
+    resumed = len(entries)
+    macs = _Macs(chunks.material, chunks.extra)
+
+    # Plik częściowy zostaje po błędzie lub przerwaniu (do wznowienia), a po
+    # anulowaniu jest usuwany; plik wynikowy pojawia się dopiero z indeksem
+    with open(input_file, 'rb') as f_in, AtomicFile(output_file, 'r+b' if end else 'wb',
+                                                    temp_path=partial, keep_on_error=True) as f_out:
+        if end:
+            # Odrzuć niepełny rekord za ostatnią poprawną porcją
+            f_out.truncate(end)
+            f_out.seek(end)
+            f_in.seek(resumed * chunk_size)
+        else:
+            f_out.write(header.pack())
+
+        for index in range(resumed, count):
+            offset = index * chunk_size
+            with io_section():
+                data = f_in.read(chunk_size)
+            if len(data) != min(chunk_size, source.st_size - offset):
+                raise ValueError("Plik wejściowy zmienił się podczas szyfrowania")
+            encrypted = chunks.encrypt(offset, data, index == count - 1)
+            mac = macs.chunk(index, encrypted)
+            entries.append((f_out.tell(), len(encrypted), mac))
+            with io_section():
+                f_out.write(_RECORD.pack(index, len(encrypted), mac))
+                f_out.write(encrypted)
+                # Porcja trafia do systemu od razu - po przerwaniu jest do odzyskania
+                f_out.flush()
+            if progress is not None:
+                progress(index + 1, count)
+
+        with io_section():
+            _write_index(f_out, entries, macs)
+    return resumed
+
+
+def _chunks_for_decryption(header, key):
+    chunks = _header_chunks(header, key)
+    check_header(header, header.cipher, chunks.material)
+    return chunks, _Macs(chunks.material, chunks.extra)
+
+
+def _entries(file, header, macs, count):
+    """Wpisy porcji z indeksu albo (dla niedokończonego pliku) z kolejnych rekordów"""
+    entries = _read_index(file, header, macs)
+    if entries is not None and len(entries) == count:
+        return entries
+    entries = _scan_records(file, header, macs, count)
+    if len(entries) != count:
+        raise ValueError(f"Plik niekompletny - zapisano {len(entries)} z {count} porcji "
+                         "(szyfrowanie zostało przerwane, wznów je)")
+    return entries
+
+
+def _verified_chunks(file, header, macs):
+    """
+    Odczytuje porcje według indeksu
+
+    Yields:
+        tuple: (numer, szyfrogram lub None dla uszkodzonej porcji)
+    """
+    chunk_size, _ = chunk_params(header)
+    count = chunk_count(header.plaintext_length, chunk_size)
+    for index, (position, length, mac) in enumerate(_entries(file, header, macs, count)):
+        file.seek(position)
+        with io_section():
+            record = _read_record(file, index, macs, chunk_size)
+        if record is None or record[1] != mac:
+            yield index, None
+        else:
+            yield index, record[0]
+
+
+@instrumented("chunked.verify_file", size=file_size)
+def verify_file(input_file, key):
+    """
+    Sprawdza sumy kontrolne porcji bez deszyfrowania
+
+    Args:
+        input_file: Ścieżka do pliku dzielonego na porcje
+        key: Klucz
+
+    Returns:
+        list: Numery uszkodzonych porcji (pusta lista - plik poprawny)
+
+    Raises:
+        ValueError: Gdy plik nie jest podzielony na porcje lub jest niekompletny
+        WrongKeyError: Gdy klucz jest nieprawidłowy
+    """
+    with open(input_file, 'rb') as file:
+        header = read_header(file)
+        if header is None or not header.chunked:
+            raise ValueError("Plik nie jest podzielony na porcje")
+        _, macs = _chunks_for_decryption(header, key)
+        return [index for index, data in _verified_chunks(file, header, macs) if data is None]
+
+
+@instrumented("chunked.decrypt_file", size=file_size)
+def decrypt_file(input_file, output_file, key, skip_damaged=False):
+    """
+    Deszyfruje plik dzielony na porcje
+
+    Każda porcja jest sprawdzana przed zapisem. Uszkodzona porcja przerywa
+    deszyfrowanie, a z skip_damaged=True zastępowana jest zerami (pozostałe
+    dane zachowują swoje pozycje). Plik wynikowy zapisywany jest atomowo.
+
+    Args:
+        input_file: Ścieżka do pliku dzielonego na porcje
+        output_file: Ścieżka do pliku wyjściowego
+        key: Klucz deszyfrowania
+        skip_damaged: Zastąp uszkodzone porcje zerami zamiast przerywać
+
+    Returns:
+        list: Numery porcji zastąpionych zerami
+
+    Raises:
+        DamagedChunksError: Gdy plik ma uszkodzone porcje (bez skip_damaged)
+        WrongKeyError: Gdy klucz jest nieprawidłowy
+    """
+    damaged = []
+    with open(input_file, 'rb') as f_in:
+        header = read_header(f_in)
+        if header is None or not header.chunked:
+            raise ValueError("Plik nie jest podzielony na porcje")
+        chunks, macs = _chunks_for_decryption(header, key)
+        chunk_size, _ = chunk_params(header)
+        count = chunk_count(header.plaintext_length, chunk_size)
+
+        with atomic_open(output_file) as f_out:
+            for index, data in _verified_chunks(f_in, header, macs):
+                offset = index * chunk_size
+                expected = min(chunk_size, header.plaintext_length - offset)
+                if data is None:
+                    if not skip_damaged:
+                        raise DamagedChunksError([index])
+                    damaged.append(index)
+                    decrypted = bytes(expected)
+                else:
+                    decrypted = chunks.decrypt(offset, data, index == count - 1)
+                    if len(decrypted) != expected:
+                        raise ValueError(f"Porcja {index} ma nieprawidłową długość")
+                with io_section():
+                    f_out.write(decrypted)
+
+    if damaged:
+        app_logger.warning("Chunked decryption of %s: %d damaged chunk(s) replaced with zeros",
+                           input_file, len(damaged))
+    return damaged
@@ -5,18 +5,153 @@ Wspólne funkcje szyfrowania i deszyfrowania
 """
 
 import base64
-from cryptography.fernet import Fernet
+import os
+import struct
+import threading
+from collections import OrderedDict
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, MultiFernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from utils import kdf
+from utils.atomic_write import atomic_open
+from utils.profiler import instrumented, io_section, file_size, status_failed
 
+# Maksymalna liczba obiektów Fernet/MultiFernet w pamięci podręcznej
+FERNET_CACHE_SIZE = 16
 
-def generate_key_from_password(password: str) -> bytes:
-    """Generuje klucz z hasła"""
-    return base64.urlsafe_b64encode(password.encode()[:32].ljust(32, b'0'))
+# Oddziela nagłówek KDF1 (base64) od tokenu Fernet w tekście szyfrowanym hasłem
+TEXT_HEADER_SEPARATOR = "."
 
+_contexts_lock = threading.Lock()
+_contexts = OrderedDict()
 
+
+def _key_bytes(key) -> bytes:
+    return key.encode() if isinstance(key, str) else bytes(key)
+
+
+def _cached_context(cache_key, factory):
+    with _contexts_lock:
+        context = _contexts.get(cache_key)
+        if context is not None:
+            _contexts.move_to_end(cache_key)
+            return context
+    context = factory()
+    with _contexts_lock:
+        _contexts[cache_key] = context
+        while len(_contexts) > FERNET_CACHE_SIZE:
+            _contexts.popitem(last=False)
+    return context
+
+
+def get_fernet(key):
+    """
+    Zwraca obiekt Fernet dla klucza (z pamięci podręcznej)
+    
+    Args:
+        key: Klucz Fernet (str lub bytes)
+        
+    Returns:
+        Fernet
+    """
+    key = _key_bytes(key)
+    return _cached_context(key, lambda: Fernet(key))
+
+
+def get_multi_fernet(keys):
+    """
+    Zwraca MultiFernet dla listy kluczy (z pamięci podręcznej)
+    
+    Pierwszy klucz służy do szyfrowania, pozostałe tylko do deszyfrowania
+    starszych tokenów - tak jak przy rotacji kluczy w cryptography.
+    
+    Args:
+        keys: Lista kluczy Fernet, od najnowszego
+        
+    Returns:
+        MultiFernet
+    """
+    keys = tuple(_key_bytes(key) for key in keys)
+    if not keys:
+        raise ValueError("Lista kluczy jest pusta")
+    return _cached_context(keys, lambda: MultiFernet([get_fernet(key) for key in keys]))
+
+
+def _fernet_context(keys):
+    """Fernet dla pojedynczego klucza, MultiFernet dla listy kluczy"""
+    if isinstance(keys, (str, bytes)):
+        return get_fernet(keys)
+    return get_multi_fernet(keys)
+
+
+def clear_fernet_cache():
+    """Czyści pamięć podręczną obiektów Fernet"""
+    with _contexts_lock:
+        _contexts.clear()
+
+
+@instrumented("fernet.generate_key_from_password")
+def generate_key_from_password(password: str, salt: bytes,
+                               params: kdf.KdfParams = kdf.DEFAULT_PARAMS) -> bytes:
+    """
+    Generuje klucz Fernet z hasła (PBKDF2/scrypt z solą, utils.kdf)
+    
+    Ten sam klucz można odtworzyć tylko z tą samą solą i parametrami -
+    należy je zapisać obok danych (kdf.encode_header).
+    
+    Args:
+        password: Hasło
+        salt: Sól
+        params: Parametry wyprowadzania klucza
+        
+    Returns:
+        bytes: Klucz Fernet (base64)
+    """
+    return base64.urlsafe_b64encode(kdf.derive_key(password, salt, params, 32))
+
+
+def _password_key(password: str) -> tuple:
+    """Klucz Fernet z hasła i nagłówek KDF1 (parametry i sól) do zapisania przed danymi"""
+    params = kdf.DEFAULT_PARAMS
+    salt = kdf.encryption_salt(password, params)
+    return kdf.encode_header(params, salt), generate_key_from_password(password, salt, params)
+
+
+def _header_key(data: bytes, password: str) -> tuple:
+    """Klucz Fernet z hasła i nagłówka KDF1 na początku danych; zwraca (klucz, długość nagłówka)"""
+    params, salt, end = kdf.parse_header(data)
+    return generate_key_from_password(password, salt, params), end
+
+
+def _split_text(encrypted_text: str) -> tuple:
+    """Dzieli tekst na nagłówek KDF1 (bytes lub None) i token Fernet"""
+    header, separator, token = encrypted_text.strip().rpartition(TEXT_HEADER_SEPARATOR)
+    if not separator:
+        return None, token
+    return base64.urlsafe_b64decode(header), token
+
+
+def _decryption_key(header, key, password):
+    """Klucz do deszyfrowania: podany klucz albo klucz z hasła i nagłówka KDF1"""
+    if password:
+        if header is None:
+            raise ValueError("Dane nie mają nagłówka KDF - deszyfruj kluczem")
+        return _header_key(header, password)[0]
+    if not key:
+        raise ValueError("Podaj klucz lub hasło")
+    return key
+
+
+@instrumented("fernet.encrypt_text")
 def encrypt_text(text: str, password: str = None) -> tuple:
     """
     Szyfruje tekst
     
+    Przy szyfrowaniu hasłem tekst zaczyna się nagłówkiem KDF1 (base64)
+    i separatorem, więc do odszyfrowania wystarcza hasło.
+    
     Args:
         text: Tekst do szyfrowania
         password: Opcjonalne hasło
@@ -24,37 +159,90 @@ def encrypt_text(text: str, password: str = None) -> tuple:
     Returns:
         tuple: (zaszyfrowany_tekst, klucz)
     """
+    prefix = ""
     if password:
-        key = generate_key_from_password(password)
+        header, key = _password_key(password)
+        prefix = base64.urlsafe_b64encode(header).decode() + TEXT_HEADER_SEPARATOR
     else:
         key = Fernet.generate_key()
     
-    fernet = Fernet(key)
+    fernet = get_fernet(key)
     encrypted_text = fernet.encrypt(text.encode())
     
-    return encrypted_text.decode(), key.decode()
+    return prefix + encrypted_text.decode(), key.decode()
 
 
-def decrypt_text(encrypted_text: str, key: str) -> str:
+@instrumented("fernet.decrypt_text")
+def decrypt_text(encrypted_text: str, key: str = None, password: str = None) -> str:
     """
     Deszyfruje tekst
     
     Args:
         encrypted_text: Zaszyfrowany tekst
         key: Klucz do deszyfrowania
+        password: Hasło (zamiast klucza, dla tekstu z nagłówkiem KDF1)
         
     Returns:
         str: Odszyfrowany tekst
     """
-    fernet = Fernet(key.encode())
-    decrypted_text = fernet.decrypt(encrypted_text.encode())
+    header, token = _split_text(encrypted_text)
+    fernet = get_fernet(_decryption_key(header, key, password))
+    decrypted_text = fernet.decrypt(token.encode())
     return decrypted_text.decode()
 
 
+def encrypt_many(texts, keys):
+    """
+    Szyfruje wiele tekstów jednym obiektem Fernet
+    
+    Args:
+        texts: Lista lub iterator tekstów
+        keys: Klucz lub lista kluczy (szyfruje pierwszy klucz)
+        
+    Returns:
+        Iterator zaszyfrowanych tekstów (przetwarzanych na bieżąco)
+    """
+    fernet = _fernet_context(keys)
+    return (fernet.encrypt(text.encode()).decode() for text in texts)
+
+
+def decrypt_many(encrypted_texts, keys):
+    """
+    Deszyfruje wiele tekstów jednym obiektem Fernet/MultiFernet
+    
+    Args:
+        encrypted_texts: Lista lub iterator zaszyfrowanych tekstów
+        keys: Klucz lub lista kluczy (każdy token próbowany jest kolejnymi kluczami)
+        
+    Returns:
+        Iterator odszyfrowanych tekstów (przetwarzanych na bieżąco)
+    """
+    fernet = _fernet_context(keys)
+    return (fernet.decrypt(_split_text(text)[1].encode()).decode() for text in encrypted_texts)
+
+
+def rotate_many(encrypted_texts, keys):
+    """
+    Przeszyfrowuje teksty najnowszym kluczem (rotacja kluczy)
+    
+    Args:
+        encrypted_texts: Lista lub iterator zaszyfrowanych tekstów
+        keys: Lista kluczy, od najnowszego; starsze służą do odczytu tokenów
+        
+    Returns:
+        Iterator tekstów zaszyfrowanych pierwszym kluczem
+    """
+    fernet = get_multi_fernet(keys)
+    return (fernet.rotate(_split_text(text)[1].encode()).decode() for text in encrypted_texts)
+
+
+@instrumented("fernet.encrypt_file", size=file_size, failed=status_failed)
 def encrypt_file(file_path: str, output_path: str, password: str = None) -> tuple:
     """
     Szyfruje plik
     
+    Przy szyfrowaniu hasłem plik zaczyna się nagłówkiem KDF1.
+    
     Args:
         file_path: Ścieżka do pliku do szyfrowania
         output_path: Ścieżka do zapisania zaszyfrowanego pliku
@@ -64,26 +252,31 @@ def encrypt_file(file_path: str, output_path: str, password: str = None) -> tupl
         tuple: (sukces, klucz_lub_błąd)
     """
     try:
-        with open(file_path, 'rb') as file:
-            file_data = file.read()
+        with io_section():
+            with open(file_path, 'rb') as file:
+                file_data = file.read()
         
+        header = b""
         if password:
-            key = generate_key_from_password(password)
+            header, key = _password_key(password)
         else:
             key = Fernet.generate_key()
         
-        fernet = Fernet(key)
+        fernet = get_fernet(key)
         encrypted_data = fernet.encrypt(file_data)
         
-        with open(output_path, 'wb') as file:
-            file.write(encrypted_data)
+        with io_section():
+            with atomic_open(output_path) as file:
+                file.write(header)
+                file.write(encrypted_data)
         
         return True, key.decode()
     except Exception as e:
         return False, str(e)
 
 
-def decrypt_file(file_path: str, output_path: str, key: str) -> tuple:
+@instrumented("fernet.decrypt_file", size=file_size, failed=status_failed)
+def decrypt_file(file_path: str, output_path: str, key: str = None, password: str = None) -> tuple:
     """
     Deszyfruje plik
     
@@ -91,21 +284,242 @@ def decrypt_file(file_path: str, output_path: str, key: str) -> tuple:
         file_path: Ścieżka do zaszyfrowanego pliku
         output_path: Ścieżka do zapisania odszyfrowanego pliku
         key: Klucz do deszyfrowania
+        password: Hasło (zamiast klucza, dla pliku z nagłówkiem KDF1)
         
     Returns:
         tuple: (sukces, błąd_lub_None)
     """
     try:
-        with open(file_path, 'rb') as file:
-            encrypted_data = file.read()
+        with io_section():
+            with open(file_path, 'rb') as file:
+                encrypted_data = file.read()
         
-        fernet = Fernet(key.encode())
+        header = None
+        if kdf.has_header(encrypted_data):
+            _, _, end = kdf.parse_header(encrypted_data)
+            header, encrypted_data = encrypted_data[:end], encrypted_data[end:]
+        fernet = get_fernet(_decryption_key(header, key, password))
         decrypted_data = fernet.decrypt(encrypted_data)
         
-        with open(output_path, 'wb') as file:
-            file.write(decrypted_data)
+        with io_section():
+            with atomic_open(output_path) as file:
+                file.write(decrypted_data)
         
         return True, None
     except Exception as e:
         return False, str(e)
 
+
+
+# Strumieniowy format plików: nagłówek + niezależnie uwierzytelniane segmenty
+# AES-GCM. Segment i zajmuje stałe miejsce w pliku, więc można go odszyfrować
+# bez reszty pliku; flaga ostatniego segmentu w AAD wykrywa obcięcie pliku.
+STREAM_MAGIC = b"KTKG"
+STREAM_VERSION = 1
+DEFAULT_SEGMENT_SIZE = 64 * 1024
+STREAM_SALT_SIZE = 16
+GCM_TAG_SIZE = 16
+
+# Przy szyfrowaniu hasłem przed nagłówkiem zapisywany jest nagłówek KDF1.
+# magic, wersja, rozmiar segmentu, sól klucza pliku
+_STREAM_HEADER = struct.Struct(">4sBI16s")
+_SEGMENT_AAD = struct.Struct(">Q?")
+
+
+def _segment_cipher(key: str, salt: bytes) -> AESGCM:
+    """Klucz AES-GCM pliku wyprowadzony (HKDF) z klucza Fernet i soli pliku"""
+    master = base64.urlsafe_b64decode(key)
+    if len(master) != 32:
+        raise ValueError("Nieprawidłowy klucz")
+    hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=b"ktk-stream-v1")
+    return AESGCM(hkdf.derive(master))
+
+
+def _segment_nonce(index: int) -> bytes:
+    # Klucz jest inny dla każdego pliku, więc numer segmentu wystarcza jako nonce
+    return index.to_bytes(12, 'big')
+
+
+def _read_kdf_header(file) -> bytes:
+    """Odczytuje nagłówek KDF1 z początku pliku (b"" gdy go brak); plik ustawiany jest za nim"""
+    with io_section():
+        start = file.read(kdf.MAX_HEADER_SIZE)
+    end = kdf.parse_header(start)[2] if kdf.has_header(start) else 0
+    file.seek(end)
+    return start[:end]
+
+
+def _read_stream_header(file) -> tuple:
+    """Odczytuje nagłówek od bieżącej pozycji; zwraca (nagłówek, rozmiar segmentu, sól)"""
+    with io_section():
+        header = file.read(_STREAM_HEADER.size)
+    if len(header) != _STREAM_HEADER.size:
+        raise ValueError("Plik jest za krótki")
+    magic, version, segment_size, salt = _STREAM_HEADER.unpack(header)
+    if magic != STREAM_MAGIC:
+        raise ValueError("Plik nie jest w formacie strumieniowym")
+    if version != STREAM_VERSION:
+        raise ValueError(f"Nieobsługiwana wersja formatu: {version}")
+    if segment_size <= 0:
+        raise ValueError("Nieprawidłowy rozmiar segmentu")
+    return header, segment_size, salt
+
+
+@instrumented("fernet.encrypt_file_stream", size=file_size, failed=status_failed)
+def encrypt_file_stream(file_path: str, output_path: str, password: str = None,
+                        segment_size: int = DEFAULT_SEGMENT_SIZE) -> tuple:
+    """
+    Szyfruje plik strumieniowo segmentami AES-GCM (stałe zużycie pamięci)
+    
+    Args:
+        file_path: Ścieżka do pliku do szyfrowania
+        output_path: Ścieżka do zapisania zaszyfrowanego pliku
+        password: Opcjonalne hasło
+        segment_size: Rozmiar segmentu tekstu jawnego w bajtach
+        
+    Returns:
+        tuple: (sukces, klucz_lub_błąd) - klucz w formacie kluczy Fernet
+    """
+    try:
+        kdf_header = b""
+        if password:
+            kdf_header, key = _password_key(password)
+        else:
+            key = Fernet.generate_key()
+        key = key.decode()
+        
+        salt = os.urandom(STREAM_SALT_SIZE)
+        header = _STREAM_HEADER.pack(STREAM_MAGIC, STREAM_VERSION, segment_size, salt)
+        aead = _segment_cipher(key, salt)
+        
+        with open(file_path, 'rb') as f_in, atomic_open(output_path) as f_out:
+            with io_section():
+                f_out.write(kdf_header)
+                f_out.write(header)
+                segment = f_in.read(segment_size)
+            index = 0
+            while True:
+                # Odczyt z wyprzedzeniem - ostatni segment oznaczany jest w AAD
+                with io_section():
+                    next_segment = f_in.read(segment_size)
+                final = not next_segment
+                aad = header + _SEGMENT_AAD.pack(index, final)
+                encrypted = aead.encrypt(_segment_nonce(index), segment, aad)
+                with io_section():
+                    f_out.write(encrypted)
+                if final:
+                    break
+                segment = next_segment
+                index += 1
+        
+        return True, key
+    except Exception as e:
+        return False, str(e)
+
+
+@instrumented("fernet.decrypt_file_stream", size=file_size, failed=status_failed)
+def decrypt_file_stream(file_path: str, output_path: str, key: str = None,
+                        password: str = None) -> tuple:
+    """
+    Deszyfruje strumieniowo plik zaszyfrowany przez encrypt_file_stream
+    
+    Każdy segment jest weryfikowany przed zapisem; plik wynikowy zapisywany
+    jest atomowo, więc przy błędzie nie powstaje częściowy plik.
+    
+    Args:
+        file_path: Ścieżka do zaszyfrowanego pliku
+        output_path: Ścieżka do zapisania odszyfrowanego pliku
+        key: Klucz do deszyfrowania
+        password: Hasło (zamiast klucza, dla pliku z nagłówkiem KDF1)
+        
+    Returns:
+        tuple: (sukces, błąd_lub_None)
+    """
+    try:
+        with open(file_path, 'rb') as f_in, atomic_open(output_path) as f_out:
+            kdf_header = _read_kdf_header(f_in)
+            header, segment_size, salt = _read_stream_header(f_in)
+            aead = _segment_cipher(_stream_key(kdf_header, key, password), salt)
+            stored_size = segment_size + GCM_TAG_SIZE
+            
+            with io_section():
+                segment = f_in.read(stored_size)
+            index = 0
+            while True:
+                with io_section():
+                    next_segment = f_in.read(stored_size)
+                final = not next_segment
+                aad = header + _SEGMENT_AAD.pack(index, final)
+                try:
+                    decrypted = aead.decrypt(_segment_nonce(index), segment, aad)
+                except InvalidTag:
+                    raise ValueError(f"Segment {index} jest uszkodzony, plik obcięty lub klucz nieprawidłowy")
+                with io_section():
+                    f_out.write(decrypted)
+                if final:
+                    break
+                segment = next_segment
+                index += 1
+        
+        return True, None
+    except Exception as e:
+        return False, str(e)
+
+
+def _stream_key(kdf_header: bytes, key, password) -> str:
+    key = _decryption_key(kdf_header or None, key, password)
+    return key.decode() if isinstance(key, bytes) else key
+
+
+def stream_segment_count(file_path: str) -> int:
+    """
+    Zwraca liczbę segmentów pliku w formacie strumieniowym
+    
+    Args:
+        file_path: Ścieżka do zaszyfrowanego pliku
+        
+    Returns:
+        int: Liczba segmentów (co najmniej 1)
+    """
+    with open(file_path, 'rb') as f_in:
+        kdf_header = _read_kdf_header(f_in)
+        _, segment_size, _ = _read_stream_header(f_in)
+    payload = os.path.getsize(file_path) - len(kdf_header) - _STREAM_HEADER.size
+    return max(1, -(-payload // (segment_size + GCM_TAG_SIZE)))
+
+
+@instrumented("fernet.decrypt_segment")
+def decrypt_segment(file_path: str, key: str, index: int, password: str = None) -> bytes:
+    """
+    Deszyfruje pojedynczy segment bez czytania reszty pliku
+    
+    Args:
+        file_path: Ścieżka do zaszyfrowanego pliku
+        key: Klucz do deszyfrowania (None przy deszyfrowaniu hasłem)
+        index: Numer segmentu (od 0)
+        password: Hasło (zamiast klucza, dla pliku z nagłówkiem KDF1)
+        
+    Returns:
+        bytes: Odszyfrowany segment
+        
+    Raises:
+        ValueError: Gdy segment nie istnieje, jest uszkodzony lub klucz jest nieprawidłowy
+    """
+    count = stream_segment_count(file_path)
+    if not 0 <= index < count:
+        raise ValueError(f"Segment {index} poza zakresem (plik ma {count} segmentów)")
+    
+    with open(file_path, 'rb') as f_in:
+        kdf_header = _read_kdf_header(f_in)
+        header, segment_size, salt = _read_stream_header(f_in)
+        stored_size = segment_size + GCM_TAG_SIZE
+        with io_section():
+            f_in.seek(len(kdf_header) + _STREAM_HEADER.size + index * stored_size)
+            segment = f_in.read(stored_size)
+    
+    aad = header + _SEGMENT_AAD.pack(index, index == count - 1)
+    key = _stream_key(kdf_header, key, password)
+    try:
+        return _segment_cipher(key, salt).decrypt(_segment_nonce(index), segment, aad)
+    except InvalidTag:
+        raise ValueError(f"Segment {index} jest uszkodzony lub klucz jest nieprawidłowy")
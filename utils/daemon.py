@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Demon szyfrujący - szyfry z utils przez gniazdo Unix
+
+Długo działający proces nie płaci przy każdej operacji za start
+interpretera i import modułów, a wyprowadzone klucze (utils.kdf) i klucze
+rund AES zostają w pamięci podręcznej między żądaniami. Połączenia
+obsługiwane są w pętli asyncio, a obliczenia wykonuje pula wątków; dane
+binarne przetwarzane są porcjami w miarę napływu (przekształcenia
+z utils.pipeline), więc rozmiar danych nie jest ograniczony pamięcią.
+Obliczenia w czystym Pythonie (AES) nadal dzielą GIL.
+
+Protokół i klient: utils.daemon_client.
+
+Użycie:
+    python -m utils.daemon [--socket ŚCIEŻKA] [--workers N]
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from utils import kdf
+from utils.async_api import CIPHERS, _call, _decryption_transform, _encryption_setup, _expect_cipher
+from utils.daemon_client import (FRAME, MAX_FRAME_SIZE, DaemonError, check_socket, decode_message,
+                                 default_socket_path, encode_message, make_socket_dir)
+from utils.file_header import MODE_BINARY, header_length, parse_header
+from utils.logger import get_logger
+from utils.pipeline import OVERHEAD
+
+app_logger = get_logger('daemon')
+
+# Domyślna liczba wątków obliczeniowych
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+# Rozmiar pamięci podręcznej kluczy (kdf i kluczy rund AES) w demonie
+DEFAULT_CACHE_SIZE = 256
+
+# Maksymalny rozmiar tekstu w trybie tekstowym
+MAX_TEXT_SIZE = 64 << 20
+
+
+class _ProtocolError(Exception):
+    """Naruszenie protokołu - połączenie jest zamykane"""
+
+
+def _caesar_shift(key):
+    """Przesunięcie z żądania (liczba lub tekst) sprawdzane jak w oknach plików"""
+    from utils.file_ciphers import _parse_shift
+    return _parse_shift(str(key))
+
+
+def _cipher_key(cipher, key):
+    if cipher == "caesar":
+        return _caesar_shift(key)
+    if not isinstance(key, str):
+        raise ValueError("Klucz musi być tekstem")
+    return key
+
+
+def _aligned(length):
+    """Długość do przetworzenia przed końcem strumienia (ostatni blok zostaje w buforze)"""
+    return max(0, (length - 1) // 16 * 16)
+
+
+class _BinarySession:
+    """Przekształcenie strumienia danych binarnych porcja po porcji"""
+
+    def __init__(self):
+        self.transform = None
+        self.pending = bytearray()
+        self.offset = 0
+        self.produced = 0
+
+    def _process(self, count, final):
+        if not count and not final:
+            return b""
+        buffer = bytearray(count + OVERHEAD)
+        buffer[:count] = self.pending[:count]
+        del self.pending[:count]
+        length = self.transform.process(buffer, count, self.offset, final)
+        self.offset += count
+        self.produced += length
+        return bytes(buffer[:length])
+
+
+class _EncryptSession(_BinarySession):
+    """Szyfrowanie do formatu binarnego KTKF"""
+
+    def __init__(self, cipher, key, length, key_size):
+        super().__init__()
+        if not isinstance(length, int) or length < 0:
+            raise ValueError("Szyfrowanie binarne wymaga długości danych (length)")
+        header, self.transform = _encryption_setup(cipher, key, length, key_size)
+        self.length = length
+        self.prefix = header.pack()
+
+    def feed(self, data):
+        self.pending += data
+        if self.offset + len(self.pending) > self.length:
+            raise ValueError("Dane są dłuższe niż zadeklarowana długość")
+        output = self._process(_aligned(len(self.pending)), False)
+        if self.prefix:
+            output, self.prefix = self.prefix + output, b""
+        return output
+
+    def finish(self):
+        if self.offset + len(self.pending) != self.length:
+            raise ValueError("Dane są krótsze niż zadeklarowana długość")
+        output = self._process(len(self.pending), True)
+        if self.prefix:
+            output, self.prefix = self.prefix + output, b""
+        return output
+
+
+class _DecryptSession(_BinarySession):
+    """Deszyfrowanie danych binarnych KTKF (klucz sprawdzany po odczycie nagłówka)"""
+
+    def __init__(self, cipher, key):
+        super().__init__()
+        self.cipher = cipher
+        self.key = key
+        self.header = None
+
+    def feed(self, data):
+        self.pending += data
+        if self.header is None:
+            size = header_length(self.pending)
+            if size == 0:
+                raise ValueError("Dane nie zaczynają się nagłówkiem KTKF")
+            if size is None or len(self.pending) < size:
+                return b""
+            header = parse_header(self.pending[:size])
+            _expect_cipher(header, self.cipher)
+            if header.mode != MODE_BINARY:
+                raise ValueError("Strumieniowo deszyfrowane są tylko dane binarne KTKF")
+            self.transform = _decryption_transform(header, _cipher_key(header.cipher, self.key))
+            self.header = header
+            del self.pending[:size]
+        return self._process(_aligned(len(self.pending)), False)
+
+    def finish(self):
+        if self.header is None:
+            raise ValueError("Niepełny nagłówek KTKF")
+        output = self._process(len(self.pending), True)
+        if self.produced != self.header.plaintext_length:
+            raise ValueError("Długość odszyfrowanych danych nie zgadza się z nagłówkiem - plik uszkodzony")
+        return output
+
+
+class _TextSession:
+    """Tekst zbierany w całości i przetwarzany funkcją tekstową szyfru"""
+
+    def __init__(self, function, *args):
+        self.function = function
+        self.args = args
+        self.pending = bytearray()
+
+    def feed(self, data):
+        self.pending += data
+        if len(self.pending) > MAX_TEXT_SIZE:
+            raise ValueError("Za długi tekst - użyj trybu binarnego")
+        return b""
+
+    def finish(self):
+        try:
+            text = self.pending.decode('utf-8')
+        except UnicodeDecodeError:
+            raise ValueError("Tekst musi być zakodowany w UTF-8")
+        return self.function(text, *self.args).encode('utf-8')
+
+
+def _text_function(cipher, operation):
+    if cipher == "caesar":
+        from utils.caesar_cipher import caesar_decrypt, caesar_encrypt
+        return caesar_encrypt if operation == "encrypt" else caesar_decrypt
+    if cipher == "vigenere":
+        from utils.vigenere_cipher import vigenere_decrypt, vigenere_encrypt
+        return vigenere_encrypt if operation == "encrypt" else vigenere_decrypt
+    if cipher == "stream":
+        from utils.stream_cipher import stream_decrypt, stream_encrypt
+        return stream_encrypt if operation == "encrypt" else stream_decrypt
+    from utils.aes_cipher import aes_decrypt_text, aes_encrypt_text
+    return aes_encrypt_text if operation == "encrypt" else aes_decrypt_text
+
+
+def _open_session(request):
+    """Tworzy sesję dla żądania encrypt/decrypt (w puli - może wyprowadzać klucz)"""
+    operation = request.get("op")
+    cipher = request.get("cipher")
+    mode = request.get("mode", "binary")
+    key_size = request.get("key_size", 128)
+    if mode not in ("binary", "text"):
+        raise ValueError(f"Nieznany tryb: {mode}")
+    if key_size not in (128, 192, 256):
+        raise ValueError(f"Nieprawidłowy rozmiar klucza AES: {key_size}")
+
+    if operation == "decrypt" and mode == "binary":
+        if cipher is not None and cipher not in CIPHERS:
+            raise ValueError(f"Nieznany szyfr: {cipher}")
+        return _DecryptSession(cipher, request.get("key"))
+    if cipher not in CIPHERS:
+        raise ValueError(f"Nieznany szyfr: {cipher}")
+    key = _cipher_key(cipher, request.get("key"))
+    if mode == "binary":
+        return _EncryptSession(cipher, key, request.get("length"), key_size)
+    function = _text_function(cipher, operation)
+    return _TextSession(function, key, key_size) if cipher == "aes" else _TextSession(function, key)
+
+
+async def _read_frame(reader):
+    (size,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+    if size > MAX_FRAME_SIZE:
+        raise _ProtocolError("Za duża ramka")
+    return await reader.readexactly(size) if size else b""
+
+
+def _write_frame(writer, data):
+    writer.write(FRAME.pack(len(data)))
+    if data:
+        writer.write(data)
+
+
+class CipherDaemon:
+    """Serwer szyfrów na gnieździe Unix"""
+
+    def __init__(self, path=None, workers=DEFAULT_WORKERS):
+        """
+        Args:
+            path: Ścieżka gniazda (domyślnie default_socket_path())
+            workers: Liczba wątków obliczeniowych
+        """
+        self.path = path or default_socket_path()
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="daemon-worker")
+        self.stats = {"requests": 0, "errors": 0, "clients": 0, "active_clients": 0,
+                      "bytes_in": 0, "bytes_out": 0}
+        self._server = None
+        self._clients = set()
+
+    def _prepare_socket(self):
+        """
+        Usuwa nieaktualne gniazdo; zgłasza błąd, gdy demon już działa
+
+        Usuwane jest tylko gniazdo bieżącego użytkownika - inny plik pod tą
+        ścieżką zostaje nietknięty.
+        """
+        make_socket_dir(self.path)
+        if not os.path.lexists(self.path):
+            return
+        check_socket(self.path)
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            os.remove(self.path)
+        else:
+            raise RuntimeError(f"Demon już działa ({self.path})")
+        finally:
+            probe.close()
+
+    async def start(self):
+        """Otwiera gniazdo (dostępne tylko dla właściciela)"""
+        self._prepare_socket()
+        umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self._handle_client, self.path,
+                                                           limit=MAX_FRAME_SIZE + FRAME.size)
+        finally:
+            os.umask(umask)
+        app_logger.info("Daemon listening on %s", self.path)
+
+    async def serve(self):
+        """Obsługuje klientów do wywołania stop() lub anulowania"""
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await self.close()
+
+    def stop(self):
+        """Kończy serve() (wywoływać z wątku pętli)"""
+        if self._server is not None:
+            self._server.close()
+
+    async def close(self):
+        """Zamyka gniazdo, połączenia i pulę wątków"""
+        if self._server is not None:
+            self._server.close()
+            for task in list(self._clients):
+                task.cancel()
+            if self._clients:
+                await asyncio.wait(list(self._clients))
+            await self._server.wait_closed()
+            self._server = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            app_logger.info("Daemon stopped")
+        self.executor.shutdown(wait=True)
+
+    async def _handle_client(self, reader, writer):
+        task = asyncio.current_task()
+        self._clients.add(task)
+        self.stats["clients"] += 1
+        self.stats["active_clients"] += 1
+        try:
+            while True:
+                try:
+                    data = await _read_frame(reader)
+                except asyncio.IncompleteReadError as e:
+                    if e.partial:
+                        app_logger.warning("Client disconnected mid-frame")
+                    return
+                try:
+                    request = decode_message(data)
+                except Exception as e:
+                    raise _ProtocolError(str(e))
+                await self._handle_request(request, reader, writer)
+        except (_ProtocolError, asyncio.IncompleteReadError, ConnectionError) as e:
+            app_logger.warning("Client connection closed: %s", e)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.stats["active_clients"] -= 1
+            self._clients.discard(task)
+            writer.close()
+
+    async def _send(self, writer, data):
+        for start in range(0, len(data), MAX_FRAME_SIZE):
+            _write_frame(writer, data[start:start + MAX_FRAME_SIZE])
+        self.stats["bytes_out"] += len(data)
+        await writer.drain()
+
+    async def _handle_request(self, request, reader, writer):
+        """Obsługuje jedno żądanie; po błędzie dane żądania są odczytywane do końca"""
+        self.stats["requests"] += 1
+        operation = request.get("op")
+        status = {"ok": True}
+        session = None
+        error = None
+        if operation == "ping":
+            status["pid"] = os.getpid()
+        elif operation == "stats":
+            status["stats"] = dict(self.stats)
+        elif operation in ("encrypt", "decrypt"):
+            try:
+                session = await _call(self.executor, _open_session, request)
+            except Exception as e:
+                error = e
+        else:
+            error = ValueError(f"Nieznana operacja: {operation}")
+
+        while True:
+            data = await _read_frame(reader)
+            if not data:
+                break
+            self.stats["bytes_in"] += len(data)
+            if session is None or error is not None:
+                continue
+            try:
+                output = await _call(self.executor, session.feed, data)
+            except Exception as e:
+                error = e
+                continue
+            if output:
+                await self._send(writer, output)
+
+        if session is not None and error is None:
+            try:
+                output = await _call(self.executor, session.finish)
+            except Exception as e:
+                error = e
+            else:
+                if output:
+                    await self._send(writer, output)
+
+        if error is not None:
+            self.stats["errors"] += 1
+            status = {"ok": False, "error": str(error), "type": type(error).__name__}
+            app_logger.warning("Request %s failed: %s", operation, error)
+        _write_frame(writer, b"")
+        _write_frame(writer, encode_message(status))
+        await writer.drain()
+
+
+def _set_cache_size(size):
+    from utils import aes_cipher
+    kdf.CACHE_SIZE = size
+    aes_cipher.ROUND_KEY_CACHE_SIZE = size
+
+
+async def _run(daemon):
+    await daemon.start()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, daemon.stop)
+    await daemon.serve()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Demon szyfrujący na gnieździe Unix")
+    parser.add_argument("--socket", default=None,
+                        help="Ścieżka gniazda (domyślnie KTK_DAEMON_SOCKET lub katalog użytkownika)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Liczba wątków obliczeniowych")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                        help="Liczba kluczy w pamięci podręcznej")
+    args = parser.parse_args(argv)
+
+    _set_cache_size(max(1, args.cache_size))
+    daemon = CipherDaemon(args.socket, args.workers)
+    try:
+        asyncio.run(_run(daemon))
+    except (OSError, RuntimeError, DaemonError) as e:
+        print(f"Błąd: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Klient demona szyfrującego (utils.daemon) i opis protokołu
+
+Protokół (gniazdo Unix, wiele żądań na jednym połączeniu):
+- ramka: długość [4 bajty, big-endian] i dane; pusta ramka kończy strumień,
+- żądanie: ramka JSON z polami op ("encrypt", "decrypt", "ping", "stats"),
+  cipher, key, mode ("binary" lub "text"), key_size (AES), length (długość
+  danych przy szyfrowaniu binarnym), a po niej ramki danych i pusta ramka,
+- odpowiedź: ramki wyniku, pusta ramka i ramka JSON ze statusem
+  ({"ok": true} lub {"ok": false, "error": ..., "type": ...}).
+
+Dane binarne szyfrowane są do formatu KTKF jak z *_encrypt_binary_file,
+więc wynik można odszyfrować zarówno przez demona, jak i funkcjami z utils.
+Tryb tekstowy zwraca wynik funkcji tekstowych (caesar_encrypt, stream_encrypt,
+aes_encrypt_text...).
+
+Moduł nie importuje szyfrów ani numpy (tylko biblioteka standardowa,
+utils.atomic_write i utils.file_header), więc jego import jest szybki.
+"""
+
+import json
+import os
+import socket
+import stat
+import struct
+import tempfile
+import threading
+from utils.atomic_write import atomic_open
+from utils.file_header import WrongKeyError
+
+# Długość ramki (big-endian)
+FRAME = struct.Struct(">I")
+
+# Maksymalny rozmiar ramki
+MAX_FRAME_SIZE = 16 << 20
+
+# Rozmiar ramek danych wysyłanych przez klienta
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+SOCKET_NAME = "ktk-cipher.sock"
+
+
+class DaemonError(Exception):
+    """Błąd połączenia lub protokołu demona"""
+
+
+def private_socket_dir():
+    """Prywatny katalog gniazda w katalogu tymczasowym (bez XDG_RUNTIME_DIR)"""
+    return os.path.join(tempfile.gettempdir(), f"ktk-cipher-{os.getuid()}")
+
+
+def default_socket_path():
+    """Ścieżka gniazda: KTK_DAEMON_SOCKET, katalog XDG_RUNTIME_DIR lub prywatny katalog tymczasowy"""
+    path = os.environ.get("KTK_DAEMON_SOCKET")
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, SOCKET_NAME)
+    return os.path.join(private_socket_dir(), SOCKET_NAME)
+
+
+def make_socket_dir(path):
+    """Tworzy prywatny katalog gniazda (0700), jeśli gniazdo ma w nim leżeć"""
+    directory = os.path.dirname(os.path.abspath(path))
+    if directory == private_socket_dir():
+        try:
+            os.mkdir(directory, 0o700)
+        except FileExistsError:
+            pass
+    check_socket_dir(path)
+
+
+def check_socket_dir(path):
+    """
+    Sprawdza prywatny katalog gniazda
+
+    Katalog w ogólnodostępnym katalogu tymczasowym musi być katalogiem
+    bieżącego użytkownika bez praw dla grupy i innych - inaczej ktoś inny
+    mógłby podmienić gniazdo. Inne katalogi (XDG_RUNTIME_DIR, --socket)
+    nie są sprawdzane.
+
+    Raises:
+        DaemonError: Gdy katalog nie jest prywatny
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    if directory != private_socket_dir():
+        return
+    try:
+        info = os.lstat(directory)
+    except FileNotFoundError:
+        return
+    if (not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid()
+            or stat.S_IMODE(info.st_mode) & 0o077):
+        raise DaemonError(f"Katalog gniazda {directory} nie jest prywatnym katalogiem użytkownika")
+
+
+def check_socket(path):
+    """
+    Sprawdza, czy ścieżka jest gniazdem należącym do bieżącego użytkownika
+
+    Raises:
+        FileNotFoundError: Gdy ścieżka nie istnieje
+        DaemonError: Gdy ścieżka nie jest gniazdem lub należy do innego użytkownika
+    """
+    check_socket_dir(path)
+    info = os.lstat(path)
+    if not stat.S_ISSOCK(info.st_mode):
+        raise DaemonError(f"{path} nie jest gniazdem")
+    if info.st_uid != os.getuid():
+        raise DaemonError(f"Gniazdo {path} należy do innego użytkownika")
+
+
+def _check_peer(sock):
+    """Sprawdza, czy po drugiej stronie gniazda jest proces bieżącego użytkownika (Linux)"""
+    if not hasattr(socket, "SO_PEERCRED"):
+        return
+    credentials = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", credentials)
+    if uid != os.getuid():
+        raise DaemonError("Demon działa jako inny użytkownik")
+
+
+def encode_message(message):
+    """Koduje słownik jako ramkę JSON (bez długości)"""
+    return json.dumps(message, ensure_ascii=False).encode('utf-8')
+
+
+def decode_message(data):
+    """Dekoduje ramkę JSON do słownika"""
+    try:
+        message = json.loads(data.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError):
+        raise DaemonError("Nieprawidłowa ramka JSON")
+    if not isinstance(message, dict):
+        raise DaemonError("Nieprawidłowa ramka JSON")
+    return message
+
+
+def raise_for_status(status):
+    """Zgłasza wyjątek dla statusu błędu z demona"""
+    if status.get("ok"):
+        return
+    error = status.get("error", "Nieznany błąd demona")
+    if status.get("type") == "WrongKeyError":
+        raise WrongKeyError(error)
+    raise ValueError(error)
+
+
+def _read_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    with open(path, 'rb') as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+class DaemonClient:
+    """
+    Klient demona szyfrującego (blokujący, jedno połączenie)
+
+    Wysyłanie danych odbywa się w osobnym wątku równolegle z odbiorem
+    wyniku, więc strumienie dowolnej długości nie blokują się na buforach
+    gniazda. Jednego klienta nie należy używać z wielu wątków naraz.
+    """
+
+    def __init__(self, path=None, timeout=None):
+        """
+        Args:
+            path: Ścieżka gniazda (domyślnie default_socket_path())
+            timeout: Limit czasu operacji na gnieździe [s]
+        """
+        self.path = path or default_socket_path()
+        self.timeout = timeout
+        self._socket = None
+
+    def connect(self):
+        """Łączy z demonem (wywoływane automatycznie przy pierwszym żądaniu)"""
+        if self._socket is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                check_socket(self.path)
+                sock.connect(self.path)
+                _check_peer(sock)
+            except OSError as e:
+                sock.close()
+                raise DaemonError(f"Nie można połączyć z demonem ({self.path}): {e}")
+            except DaemonError:
+                sock.close()
+                raise
+            self._socket = sock
+        return self._socket
+
+    def close(self):
+        """Zamyka połączenie"""
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+        return False
+
+    def _send_frame(self, data):
+        self._socket.sendall(FRAME.pack(len(data)))
+        if data:
+            self._socket.sendall(data)
+
+    def _receive_exactly(self, size):
+        data = bytearray()
+        while len(data) < size:
+            chunk = self._socket.recv(min(size - len(data), 1 << 20))
+            if not chunk:
+                raise DaemonError("Demon zamknął połączenie")
+            data += chunk
+        return bytes(data)
+
+    def _receive_frame(self):
+        (size,) = FRAME.unpack(self._receive_exactly(FRAME.size))
+        if size > MAX_FRAME_SIZE:
+            raise DaemonError("Za duża ramka odpowiedzi")
+        return self._receive_exactly(size) if size else b""
+
+    def request(self, message, chunks=(), sink=None):
+        """
+        Wysyła żądanie z danymi i odbiera odpowiedź
+
+        Args:
+            message: Nagłówek żądania (słownik)
+            chunks: Iterowalne porcje danych (bytes)
+            sink: Funkcja przyjmująca porcje wyniku (domyślnie wynik zbierany)
+
+        Returns:
+            tuple: (status, wynik - bytes lub None, gdy podano sink)
+
+        Raises:
+            DaemonError: Przy błędzie połączenia lub protokołu
+        """
+        self.connect()
+        collected = [] if sink is None else None
+        if sink is None:
+            sink = collected.append
+        errors = []
+
+        def send():
+            try:
+                self._send_frame(encode_message(message))
+                for chunk in chunks:
+                    for start in range(0, len(chunk), MAX_FRAME_SIZE):
+                        self._send_frame(chunk[start:start + MAX_FRAME_SIZE])
+                self._send_frame(b"")
+            except BaseException as e:
+                errors.append(e)
+                # Odblokuj odbiór - demon nie dostanie końca strumienia
+                self._shutdown()
+
+        sender = threading.Thread(target=send, name="daemon-client-sender", daemon=True)
+        sender.start()
+        try:
+            while True:
+                data = self._receive_frame()
+                if not data:
+                    break
+                sink(data)
+            status = decode_message(self._receive_frame())
+        except BaseException as e:
+            # Połączenie jest w nieznanym stanie - zamknij je
+            self._shutdown()
+            sender.join()
+            self.close()
+            if errors and not isinstance(errors[0], OSError):
+                raise errors[0]
+            if isinstance(e, OSError):
+                raise DaemonError(f"Błąd połączenia z demonem: {e}")
+            raise
+        sender.join()
+        if errors:
+            self.close()
+            raise errors[0]
+        return status, (b"".join(collected) if collected is not None else None)
+
+    def _shutdown(self):
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def _call(self, message, chunks=(), sink=None):
+        status, result = self.request(message, chunks, sink)
+        raise_for_status(status)
+        return result
+
+    def ping(self):
+        """Sprawdza czy demon odpowiada; zwraca status (m.in. pid)"""
+        status, _ = self.request({"op": "ping"})
+        raise_for_status(status)
+        return status
+
+    def stats(self):
+        """Statystyki demona (żądania, błędy, klienci, bajty)"""
+        status, _ = self.request({"op": "stats"})
+        raise_for_status(status)
+        return status.get("stats", {})
+
+    def encrypt_text(self, cipher, text, key, key_size=128):
+        """
+        Szyfruje tekst w demonie (jak caesar_encrypt, stream_encrypt, aes_encrypt_text...)
+
+        Args:
+            cipher: "caesar", "vigenere", "stream" lub "aes"
+            text: Tekst do szyfrowania
+            key: Klucz (przesunięcie dla Cezara)
+            key_size: Rozmiar klucza AES
+
+        Returns:
+            str: Zaszyfrowany tekst
+        """
+        message = {"op": "encrypt", "mode": "text", "cipher": cipher, "key": key, "key_size": key_size}
+        return self._call(message, [text.encode('utf-8')]).decode('utf-8')
+
+    def decrypt_text(self, cipher, text, key, key_size=128):
+        """Deszyfruje tekst w demonie (odwrotność encrypt_text)"""
+        message = {"op": "decrypt", "mode": "text", "cipher": cipher, "key": key, "key_size": key_size}
+        return self._call(message, [text.encode('utf-8')]).decode('utf-8')
+
+    def encrypt_stream(self, cipher, chunks, length, key, key_size=128, sink=None):
+        """
+        Szyfruje strumień danych do formatu binarnego KTKF
+
+        Args:
+            cipher: "caesar", "vigenere", "stream" lub "aes"
+            chunks: Iterowalne porcje danych (bytes)
+            length: Łączna długość danych (zapisywana w nagłówku)
+            key: Klucz (przesunięcie dla Cezara)
+            key_size: Rozmiar klucza AES
+            sink: Funkcja przyjmująca porcje wyniku (domyślnie wynik zwracany)
+
+        Returns:
+            bytes lub None, gdy podano sink
+        """
+        message = {"op": "encrypt", "mode": "binary", "cipher": cipher, "key": key,
+                   "key_size": key_size, "length": length}
+        return self._call(message, chunks, sink)
+
+    def decrypt_stream(self, chunks, key, cipher=None, sink=None):
+        """
+        Deszyfruje strumień w formacie binarnym KTKF
+
+        Args:
+            chunks: Iterowalne porcje zaszyfrowanych danych (bytes)
+            key: Klucz (przesunięcie dla Cezara)
+            cipher: Oczekiwany szyfr (domyślnie szyfr z nagłówka)
+            sink: Funkcja przyjmująca porcje wyniku (domyślnie wynik zwracany)
+
+        Returns:
+            bytes lub None, gdy podano sink
+        """
+        message = {"op": "decrypt", "mode": "binary", "cipher": cipher, "key": key}
+        return self._call(message, chunks, sink)
+
+    def encrypt_bytes(self, cipher, data, key, key_size=128):
+        """Szyfruje bajty do formatu binarnego KTKF"""
+        return self.encrypt_stream(cipher, [data], len(data), key, key_size)
+
+    def decrypt_bytes(self, data, key, cipher=None):
+        """Deszyfruje bajty w formacie binarnym KTKF"""
+        return self.decrypt_stream([data], key, cipher)
+
+    def encrypt_file(self, cipher, input_file, output_file, key, key_size=128):
+        """Szyfruje plik porcjami (wynik jak z *_encrypt_binary_file, zapis atomowy)"""
+        with atomic_open(output_file) as file:
+            self.encrypt_stream(cipher, _read_chunks(input_file), os.path.getsize(input_file),
+                                key, key_size, file.write)
+
+    def decrypt_file(self, input_file, output_file, key, cipher=None):
+        """Deszyfruje plik binarny KTKF porcjami (zapis atomowy)"""
+        with atomic_open(output_file) as file:
+            self.decrypt_stream(_read_chunks(input_file), key, cipher, file.write)
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rejestr szyfrów plikowych - wspólny interfejs dla kolejki zadań
+
+Każdy szyfr udostępnia funkcje encrypt/decrypt o sygnaturze
+(input_file, output_file, key, **options) -> bool. Moduły szyfrów
+importowane są dopiero przy pierwszym użyciu.
+"""
+
+import os
+from utils.file_header import peek_header
+
+# Rozszerzenia plików szyfrowanych na poziomie bajtów (jak w oknach plików)
+BINARY_EXTENSIONS = {'.pdf', '.jpg', '.jpeg', '.png', '.gif', '.bmp',
+                     '.tiff', '.ico', '.mp3', '.mp4', '.avi', '.mov',
+                     '.zip', '.rar', '.7z', '.exe', '.dll', '.so',
+                     '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx'}
+
+# Rozszerzenia dopisywane do zaszyfrowanych plików (Cezar, Vigenère)
+ENCRYPTED_SUFFIX = ".encrypted"
+VIGENERE_SUFFIX = ".vigenere_encrypted"
+
+OPERATIONS = ("encrypt", "decrypt")
+
+AES_KEY_SIZES = (128, 192, 256)
+
+
+def is_binary_file(file_path):
+    """
+    Sprawdza czy plik jest binarny (PDF, obrazy, itp.) na podstawie rozszerzenia
+
+    Dla plików zaszyfrowanych (z rozszerzeniem ENCRYPTED_SUFFIX) sprawdzane
+    jest rozszerzenie pliku oryginalnego.
+    """
+    path = file_path.lower()
+    for suffix in (VIGENERE_SUFFIX, ENCRYPTED_SUFFIX):
+        if path.endswith(suffix):
+            path = path[:-len(suffix)]
+            break
+    _, ext = os.path.splitext(path)
+    return ext in BINARY_EXTENSIONS
+
+
+def looks_binary(file_path):
+    """Sprawdza zawartość pliku: bajty null lub spoza ASCII oznaczają plik binarny"""
+    try:
+        with open(file_path, 'rb') as f:
+            chunk = f.read(1024)
+        return b'\0' in chunk or any(byte > 127 for byte in chunk)
+    except OSError:
+        return True  # W razie wątpliwości traktuj jako binarny
+
+
+def _parse_shift(key):
+    try:
+        shift = int(key.strip())
+    except ValueError:
+        raise ValueError("Przesunięcie musi być liczbą całkowitą!")
+    if shift < 1 or shift > 25:
+        raise ValueError("Przesunięcie musi być liczbą od 1 do 25!")
+    return shift
+
+
+def _parse_vigenere_key(key):
+    key = key.strip()
+    if not any(c.isalpha() for c in key):
+        raise ValueError("Klucz musi zawierać przynajmniej jedną literę!")
+    return key
+
+
+def _parse_stream_key(key):
+    from utils.stream_cipher import validate_key
+    key = key.strip()
+    if not validate_key(key):
+        raise ValueError("Klucz musi mieć minimum 4 znaki!")
+    return key
+
+
+def _parse_aes_key(key):
+    key = key.strip()
+    if not key:
+        raise ValueError("Wprowadź klucz szyfrowania!")
+    return key
+
+
+def _caesar(operation, input_file, output_file, key, **options):
+    from utils import caesar_cipher
+    binary = "_binary" if is_binary_file(input_file) else ""
+    func = getattr(caesar_cipher, f"caesar_{operation}{binary}_file")
+    return func(input_file, output_file, key)
+
+
+def _vigenere(operation, input_file, output_file, key, **options):
+    from utils import vigenere_cipher
+    binary = "_binary" if is_binary_file(input_file) else ""
+    func = getattr(vigenere_cipher, f"vigenere_{operation}{binary}_file")
+    return func(input_file, output_file, key)
+
+
+def _stream(operation, input_file, output_file, key, chunked=False, **options):
+    from utils import stream_cipher
+    if chunked and operation == "encrypt":
+        return stream_cipher.stream_encrypt_file_chunked(input_file, output_file, key)
+    # Tryb wybierany po zawartości pliku, tak jak w oknach szyfru strumieniowego
+    binary = "_binary" if looks_binary(input_file) else ""
+    func = getattr(stream_cipher, f"stream_{operation}{binary}_file")
+    return func(input_file, output_file, key)
+
+
+def _aes(operation, input_file, output_file, key, key_size=128, chunked=False, **options):
+    from utils import aes_cipher
+    if chunked and operation == "encrypt":
+        return aes_cipher.aes_encrypt_file_chunked(input_file, output_file, key, key_size)
+    func = getattr(aes_cipher, f"aes_{operation}_file")
+    return func(input_file, output_file, key, key_size)
+
+
+def _caesar_material(key, header):
+    return str(key)
+
+
+def _vigenere_material(key, header):
+    from utils.vigenere_cipher import clean_key
+    return clean_key(key)
+
+
+def _stream_material(key, header):
+    return key
+
+
+def _aes_material(key, header):
+    from utils.aes_cipher import AES
+    return AES(header.key_size)._header_key(header, key)
+
+
+def _suffix_name(suffix):
+    def name(file_name, operation):
+        if operation == "encrypt":
+            return file_name + suffix
+        return file_name.replace(suffix, '')
+    return name
+
+
+def _stream_name(file_name, operation):
+    base_name = os.path.splitext(file_name)[0]
+    if operation == "encrypt":
+        return f"{base_name}_encrypted_stream"
+    if base_name.endswith('_encrypted_stream'):
+        return base_name.replace('_encrypted_stream', '_decrypted')
+    return f"{base_name}_decrypted"
+
+
+def _aes_name(file_name, operation):
+    base_name = os.path.splitext(file_name)[0]
+    if operation == "encrypt":
+        return f"{base_name}_encrypted.aes"
+    if base_name.endswith("_encrypted"):
+        base_name = base_name[:-len("_encrypted")]
+    return f"{base_name}_decrypted"
+
+
+class FileCipher:
+    """Opis szyfru plikowego dostępnego w kolejce zadań"""
+
+    __slots__ = ("name", "label", "key_label", "parse_key", "_run", "_output_name",
+                 "_key_material")
+
+    def __init__(self, name, label, key_label, parse_key, run, output_name, key_material):
+        self.name = name
+        self.label = label
+        self.key_label = key_label
+        self.parse_key = parse_key
+        self._run = run
+        self._output_name = output_name
+        self._key_material = key_material
+
+    def run(self, operation, input_file, output_file, key, **options):
+        """
+        Wykonuje operację na pliku
+
+        Args:
+            operation: "encrypt" lub "decrypt"
+            input_file: Ścieżka do pliku wejściowego
+            output_file: Ścieżka do pliku wyjściowego
+            key: Klucz po parse_key()
+            options: Opcje szyfru (np. key_size dla AES, chunked=True dla
+                szyfrowania porcjami z sumami kontrolnymi - stream i AES)
+
+        Returns:
+            bool: True jeśli sukces, False jeśli błąd
+        """
+        if operation not in OPERATIONS:
+            raise ValueError(f"Nieznana operacja: {operation}")
+        return self._run(operation, input_file, output_file, key, **options)
+
+    def matches_key(self, header, key):
+        """
+        Sprawdza klucz z wartością kontrolną nagłówka pliku
+
+        Args:
+            header: FileHeader pliku zaszyfrowanego tym szyfrem
+            key: Klucz po parse_key()
+
+        Returns:
+            bool: True jeśli klucz jest prawidłowy
+        """
+        return header.matches_key(self._key_material(key, header))
+
+    def output_path(self, input_file, operation, output_dir=None, reserved=()):
+        """
+        Proponuje ścieżkę pliku wynikowego według konwencji okna szyfru,
+        nie nadpisując istniejących plików
+
+        Args:
+            input_file: Ścieżka do pliku wejściowego
+            operation: "encrypt" lub "decrypt"
+            output_dir: Katalog docelowy (domyślnie katalog pliku wejściowego)
+            reserved: Ścieżki zajęte przez zadania, które jeszcze nie zapisały wyniku
+
+        Returns:
+            str: Ścieżka pliku wynikowego
+        """
+        directory = output_dir or os.path.dirname(input_file)
+        name = self._output_name(os.path.basename(input_file), operation)
+        if name == os.path.basename(input_file):
+            name += ".decrypted"
+
+        # Numer dopisywany jest przed pierwszym rozszerzeniem (plik_1.png.encrypted)
+        stem, dot, ext = name.partition('.')
+        path = os.path.join(directory, name)
+        counter = 1
+        while os.path.exists(path) or path in reserved:
+            path = os.path.join(directory, f"{stem}_{counter}{dot}{ext}")
+            counter += 1
+        return path
+
+
+FILE_CIPHERS = {
+    "caesar": FileCipher("caesar", "Cezar", "Przesunięcie (1-25)", _parse_shift,
+                         _caesar, _suffix_name(ENCRYPTED_SUFFIX), _caesar_material),
+    "vigenere": FileCipher("vigenere", "Vigenère", "Klucz (litery)", _parse_vigenere_key,
+                           _vigenere, _suffix_name(VIGENERE_SUFFIX), _vigenere_material),
+    "stream": FileCipher("stream", "Klucz bieżący", "Klucz (min. 4 znaki)", _parse_stream_key,
+                         _stream, _stream_name, _stream_material),
+    "aes": FileCipher("aes", "AES", "Klucz AES", _parse_aes_key, _aes, _aes_name,
+                      _aes_material),
+}
+
+
+def get_file_cipher(name):
+    """
+    Zwraca szyfr plikowy o podanej nazwie
+
+    Args:
+        name: "caesar", "vigenere", "stream" lub "aes"
+
+    Returns:
+        FileCipher
+    """
+    try:
+        return FILE_CIPHERS[name]
+    except KeyError:
+        raise ValueError(f"Nieznany szyfr: {name}")
+
+
+def verify_file_key(input_file, key):
+    """
+    Sprawdza klucz z nagłówkiem pliku bez deszyfrowania danych
+
+    Args:
+        input_file: Ścieżka do zaszyfrowanego pliku
+        key: Klucz wpisany przez użytkownika (przed parse_key())
+
+    Returns:
+        bool lub None: Wynik sprawdzenia albo None, gdy plik nie ma nagłówka
+    """
+    header = peek_header(input_file)
+    if header is None:
+        return None
+    cipher = get_file_cipher(header.cipher)
+    return cipher.matches_key(header, cipher.parse_key(key))
+
+
+def decrypt_file_auto(input_file, output_file, key):
+    """
+    Deszyfruje plik szyfrem, trybem i rozmiarem klucza zapisanymi w nagłówku
+
+    Args:
+        input_file: Ścieżka do zaszyfrowanego pliku (z nagłówkiem)
+        output_file: Ścieżka do pliku wyjściowego
+        key: Klucz wpisany przez użytkownika (przed parse_key())
+
+    Returns:
+        bool: True jeśli sukces, False jeśli błąd
+
+    Raises:
+        ValueError: Gdy plik nie ma nagłówka lub klucz jest nieprawidłowy
+    """
+    header = peek_header(input_file)
+    if header is None:
+        raise ValueError("Plik nie ma nagłówka - wybierz szyfr ręcznie")
+    cipher = get_file_cipher(header.cipher)
+    options = {"key_size": header.key_size} if header.key_size else {}
+    return cipher.run("decrypt", input_file, output_file, cipher.parse_key(key), **options)
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Wspólny nagłówek zaszyfrowanych plików (KTKF)
+
+Nagłówek opisuje szyfr, tryb (tekstowy/binarny/porcjowany), rozmiar klucza, długość
+tekstu jawnego i krótką wartość kontrolną klucza (KCV). Dzięki niemu
+deszyfrowanie samo wybiera tryb i rozmiar klucza, a błędny klucz odrzucany
+jest przed przetwarzaniem danych. Pliki bez nagłówka (starsze wersje)
+obsługiwane są jak dotychczas.
+
+Układ: magic, wersja, szyfr, tryb, rozmiar klucza [bity], długość tekstu
+jawnego [bajty], KCV, długość pola dodatkowego, pole dodatkowe (sól lub
+nagłówek KDF).
+"""
+
+import hashlib
+import hmac
+import io
+import os
+import struct
+from utils.atomic_write import atomic_open
+
+FILE_MAGIC = b"KTKF"
+FILE_VERSION = 1
+
+MODE_TEXT = 0
+MODE_BINARY = 1
+# Plik dzielony na porcje z sumami kontrolnymi (utils.chunked_file)
+MODE_CHUNKED = 2
+
+# Identyfikatory szyfrów (nazwy jak w utils.file_ciphers.FILE_CIPHERS)
+CIPHER_IDS = {"caesar": 1, "vigenere": 2, "stream": 3, "aes": 4}
+CIPHER_NAMES = {cipher_id: name for name, cipher_id in CIPHER_IDS.items()}
+
+SALT_SIZE = 16
+KCV_SIZE = 4
+
+_HEADER = struct.Struct(">4sBBBHQ4sH")
+
+
+class WrongKeyError(ValueError):
+    """Klucz nie zgadza się z wartością kontrolną z nagłówka"""
+
+
+class FileHeader:
+    """Nagłówek zaszyfrowanego pliku"""
+
+    __slots__ = ("cipher", "mode", "key_size", "plaintext_length", "kcv", "extra")
+
+    def __init__(self, cipher, mode, key_size, plaintext_length, kcv, extra):
+        self.cipher = cipher
+        self.mode = mode
+        self.key_size = key_size
+        self.plaintext_length = plaintext_length
+        self.kcv = kcv
+        self.extra = extra
+
+    @property
+    def size(self):
+        """Długość nagłówka w pliku"""
+        return _HEADER.size + len(self.extra)
+
+    @property
+    def binary(self):
+        return self.mode != MODE_TEXT
+
+    @property
+    def chunked(self):
+        return self.mode == MODE_CHUNKED
+
+    def pack(self):
+        """Zwraca nagłówek jako bajty"""
+        return _HEADER.pack(FILE_MAGIC, FILE_VERSION, CIPHER_IDS[self.cipher], self.mode,
+                            self.key_size, self.plaintext_length, self.kcv,
+                            len(self.extra)) + self.extra
+
+    def matches_key(self, key_material):
+        """Sprawdza klucz z wartością kontrolną"""
+        return hmac.compare_digest(key_check_value(key_material, self.extra), self.kcv)
+
+
+def key_check_value(key_material, salt):
+    """
+    Wartość kontrolna klucza (KCV_SIZE bajtów HMAC-SHA256)
+
+    Args:
+        key_material: Klucz w postaci używanej przez szyfr (str lub bytes)
+        salt: Sól z nagłówka (pole dodatkowe)
+
+    Returns:
+        bytes: Wartość kontrolna
+    """
+    if isinstance(key_material, str):
+        key_material = key_material.encode('utf-8')
+    return hmac.new(key_material, b"KTKF-KCV" + salt, hashlib.sha256).digest()[:KCV_SIZE]
+
+
+def new_header(cipher, mode, key_material, plaintext_length, key_size=0, extra=None):
+    """
+    Tworzy nagłówek dla szyfrowanego pliku
+
+    Args:
+        cipher: Nazwa szyfru ("caesar", "vigenere", "stream", "aes")
+        mode: MODE_TEXT, MODE_BINARY lub MODE_CHUNKED
+        key_material: Klucz w postaci używanej przez szyfr (do KCV)
+        plaintext_length: Długość tekstu jawnego w bajtach
+        key_size: Rozmiar klucza w bitach (AES) lub 0
+        extra: Pole dodatkowe (domyślnie losowa sól)
+
+    Returns:
+        FileHeader
+    """
+    if extra is None:
+        extra = os.urandom(SALT_SIZE)
+    return FileHeader(cipher, mode, key_size, plaintext_length,
+                      key_check_value(key_material, extra), bytes(extra))
+
+
+def parse_header(data):
+    """
+    Odczytuje nagłówek z początku danych
+
+    Args:
+        data: Początek pliku
+
+    Returns:
+        FileHeader lub None, gdy dane nie zaczynają się nagłówkiem
+    """
+    if len(data) < _HEADER.size or bytes(data[:len(FILE_MAGIC)]) != FILE_MAGIC:
+        return None
+    (_, version, cipher_id, mode, key_size, plaintext_length,
+     kcv, extra_size) = _HEADER.unpack_from(data)
+    if version != FILE_VERSION:
+        raise ValueError(f"Nieobsługiwana wersja nagłówka pliku: {version}")
+    if cipher_id not in CIPHER_NAMES or mode not in (MODE_TEXT, MODE_BINARY, MODE_CHUNKED):
+        raise ValueError("Uszkodzony nagłówek pliku")
+    extra = bytes(data[_HEADER.size:_HEADER.size + extra_size])
+    if len(extra) != extra_size:
+        raise ValueError("Uszkodzony nagłówek pliku")
+    return FileHeader(CIPHER_NAMES[cipher_id], mode, key_size, plaintext_length, kcv, extra)
+
+
+def header_length(data):
+    """
+    Długość nagłówka na początku danych (do odczytu ze strumienia)
+
+    Returns:
+        int: Długość nagłówka, 0 gdy dane nie zaczynają się nagłówkiem,
+        None gdy danych jest za mało, by to rozstrzygnąć
+    """
+    start = bytes(data[:len(FILE_MAGIC)])
+    if not FILE_MAGIC.startswith(start):
+        return 0
+    if len(data) < _HEADER.size:
+        return None
+    return _HEADER.size + struct.unpack_from(">H", data, _HEADER.size - 2)[0]
+
+
+def read_header(file):
+    """
+    Odczytuje nagłówek z otwartego pliku binarnego
+
+    Plik ustawiany jest za nagłówkiem albo na początku, gdy nagłówka brak.
+
+    Returns:
+        FileHeader lub None
+    """
+    start = file.read(_HEADER.size)
+    header = None
+    if len(start) == _HEADER.size and start[:len(FILE_MAGIC)] == FILE_MAGIC:
+        extra_size = struct.unpack_from(">H", start, _HEADER.size - 2)[0]
+        header = parse_header(start + file.read(extra_size))
+    if header is None:
+        file.seek(0)
+    return header
+
+
+def peek_header(path):
+    """Zwraca nagłówek pliku lub None (czyta tylko nagłówek)"""
+    with open(path, 'rb') as file:
+        return read_header(file)
+
+
+def check_header(header, cipher, key_material):
+    """
+    Sprawdza szyfr i klucz przed deszyfrowaniem
+
+    Raises:
+        ValueError: Gdy plik zaszyfrowano innym szyfrem
+        WrongKeyError: Gdy klucz nie zgadza się z wartością kontrolną
+    """
+    if header.cipher != cipher:
+        raise ValueError(f"Plik zaszyfrowano innym szyfrem ({header.cipher})")
+    if not header.matches_key(key_material):
+        raise WrongKeyError("Nieprawidłowy klucz")
+
+
+def check_length(header, data):
+    """Sprawdza długość odszyfrowanych danych z nagłówkiem"""
+    if len(data) != header.plaintext_length:
+        raise ValueError("Długość odszyfrowanych danych nie zgadza się z nagłówkiem - plik uszkodzony")
+
+
+def read_encrypted(path):
+    """
+    Wczytuje zaszyfrowany plik
+
+    Returns:
+        tuple: (FileHeader lub None, dane za nagłówkiem)
+    """
+    with open(path, 'rb') as file:
+        header = read_header(file)
+        return header, file.read()
+
+
+def text_payload(data):
+    """Dekoduje dane jako tekst UTF-8 (z konwersją końców linii jak przy open('r'))"""
+    return io.TextIOWrapper(io.BytesIO(data), encoding='utf-8').read()
+
+
+def write_encrypted(path, header, payload):
+    """
+    Zapisuje nagłówek i zaszyfrowane dane (atomowo, utils.atomic_write)
+
+    Args:
+        path: Ścieżka do pliku wyjściowego
+        header: FileHeader
+        payload: Tekst (zapisywany jak przy open('w')) lub bajty
+    """
+    with atomic_open(path) as file:
+        file.write(header.pack())
+        write_payload(file, payload)
+
+
+def write_payload(file, payload):
+    """Zapisuje tekst lub bajty do otwartego pliku binarnego"""
+    if isinstance(payload, str):
+        text = io.TextIOWrapper(file, encoding='utf-8')
+        text.write(payload)
+        text.flush()
+        text.detach()
+    else:
+        file.write(payload)
+
+
+def write_output(path, payload):
+    """Zapisuje odszyfrowany tekst lub bajty (atomowo, utils.atomic_write)"""
+    with atomic_open(path) as file:
+        write_payload(file, payload)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Wyprowadzanie kluczy z haseł (PBKDF2-HMAC-SHA256 lub scrypt z hashlib)
+
+Zaszyfrowane dane zaczynają się nagłówkiem KDF1 z algorytmem, parametrami
+i solą, więc odszyfrowanie nie wymaga pamiętania ustawień. Wyprowadzanie
+jest celowo wolne, dlatego klucze trzymane są w ograniczonej pamięci
+podręcznej (LRU) indeksowanej skrótem hasła, solą i parametrami - operacje
+wsadowe z tym samym hasłem płacą za nie raz.
+"""
+
+import hashlib
+import os
+import struct
+import threading
+from collections import OrderedDict
+from utils.profiler import section
+
+KDF_MAGIC = b"KDF1"
+
+PBKDF2_SHA256 = 1
+SCRYPT = 2
+
+SALT_SIZE = 16
+
+# Maksymalna liczba kluczy w pamięci podręcznej
+CACHE_SIZE = 32
+
+# Górne granice kosztu przyjmowane z nagłówka (ochrona przed spreparowanymi plikami)
+MAX_PBKDF2_ITERATIONS = 10_000_000
+MAX_SCRYPT_N = 2 ** 20
+MAX_SCRYPT_P = 4
+# Pamięć robocza scrypt (ok. 128 * N * r bajtów)
+MAX_SCRYPT_MEMORY = 64 << 20
+
+# Stały limit pamięci dla hashlib.scrypt (z zapasem na bufory zależne od p)
+_SCRYPT_MAXMEM = MAX_SCRYPT_MEMORY + (16 << 20)
+
+# magic, algorytm, koszt (iteracje PBKDF2 lub N scrypt), r, p, długość soli
+_HEADER = struct.Struct(">4sBIIIB")
+
+# Największa możliwa długość nagłówka (sól do 255 bajtów)
+MAX_HEADER_SIZE = _HEADER.size + 255
+
+
+class KdfParams:
+    """Parametry wyprowadzania klucza"""
+
+    __slots__ = ("algorithm", "cost", "r", "p")
+
+    def __init__(self, algorithm=PBKDF2_SHA256, cost=200_000, r=0, p=0):
+        if algorithm not in (PBKDF2_SHA256, SCRYPT):
+            raise ValueError(f"Nieznany algorytm KDF: {algorithm}")
+        self.algorithm = algorithm
+        self.cost = cost
+        self.r = r
+        self.p = p
+
+    def key(self):
+        """Krotka parametrów (do porównań i indeksowania)"""
+        return (self.algorithm, self.cost, self.r, self.p)
+
+    def __eq__(self, other):
+        return isinstance(other, KdfParams) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        if self.algorithm == SCRYPT:
+            return f"KdfParams(scrypt, n={self.cost}, r={self.r}, p={self.p})"
+        return f"KdfParams(pbkdf2-sha256, iterations={self.cost})"
+
+
+DEFAULT_PARAMS = KdfParams(PBKDF2_SHA256, 200_000)
+SCRYPT_PARAMS = KdfParams(SCRYPT, 2 ** 14, 8, 1)
+
+_lock = threading.Lock()
+_keys = OrderedDict()
+_salts = OrderedDict()
+
+
+def _password_hash(password):
+    if isinstance(password, str):
+        password = password.encode('utf-8')
+    return hashlib.sha256(password).digest(), password
+
+
+def _remember(cache, key, value):
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def _derive(password, salt, params, length):
+    if params.algorithm == SCRYPT:
+        return hashlib.scrypt(password, salt=salt, n=params.cost, r=params.r,
+                              p=params.p, maxmem=_SCRYPT_MAXMEM, dklen=length)
+    return hashlib.pbkdf2_hmac("sha256", password, salt, params.cost, dklen=length)
+
+
+def derive_key(password, salt, params=DEFAULT_PARAMS, length=32):
+    """
+    Wyprowadza klucz z hasła (z pamięci podręcznej, jeśli był już liczony)
+
+    Args:
+        password: Hasło (str lub bytes)
+        salt: Sól
+        params: KdfParams
+        length: Długość klucza w bajtach
+
+    Returns:
+        bytes: Klucz
+    """
+    digest, password = _password_hash(password)
+    cache_key = (digest, bytes(salt), params.key(), length)
+    with _lock:
+        key = _keys.get(cache_key)
+        if key is not None:
+            _keys.move_to_end(cache_key)
+            return key
+
+    with section("kdf.derive"):
+        key = _derive(password, bytes(salt), params, length)
+
+    with _lock:
+        _remember(_keys, cache_key, key)
+    return key
+
+
+def encryption_salt(password, params=DEFAULT_PARAMS):
+    """
+    Zwraca sól do szyfrowania hasłem
+
+    Sól losowana jest przy pierwszym użyciu hasła i parametrów, a potem
+    powtarzana w tym procesie, żeby kolejne pliki szyfrowane tym samym
+    hasłem nie wymagały ponownego wyprowadzania klucza.
+
+    Args:
+        password: Hasło (str lub bytes)
+        params: KdfParams
+
+    Returns:
+        bytes: Sól (SALT_SIZE bajtów)
+    """
+    digest, _ = _password_hash(password)
+    cache_key = (digest, params.key())
+    with _lock:
+        salt = _salts.get(cache_key)
+        if salt is None:
+            salt = os.urandom(SALT_SIZE)
+        _remember(_salts, cache_key, salt)
+    return salt
+
+
+def encode_header(params, salt):
+    """
+    Tworzy nagłówek KDF1 z parametrami i solą
+
+    Args:
+        params: KdfParams
+        salt: Sól
+
+    Returns:
+        bytes: Nagłówek
+    """
+    return _HEADER.pack(KDF_MAGIC, params.algorithm, params.cost,
+                        params.r, params.p, len(salt)) + bytes(salt)
+
+
+def has_header(data):
+    """Sprawdza czy dane zaczynają się nagłówkiem KDF1"""
+    return bytes(data[:len(KDF_MAGIC)]) == KDF_MAGIC
+
+
+def _acceptable(params):
+    """Czy koszt z nagłówka mieści się w granicach (czas i pamięć)"""
+    if params.algorithm == PBKDF2_SHA256:
+        return 0 < params.cost <= MAX_PBKDF2_ITERATIONS
+    return (0 < params.cost <= MAX_SCRYPT_N and 0 < params.r and 0 < params.p <= MAX_SCRYPT_P
+            and 128 * params.cost * params.r <= MAX_SCRYPT_MEMORY)
+
+
+def parse_header(data):
+    """
+    Odczytuje nagłówek KDF1
+
+    Args:
+        data: Dane zaczynające się nagłówkiem
+
+    Returns:
+        tuple: (KdfParams, sól, długość nagłówka)
+    """
+    if len(data) < _HEADER.size or not has_header(data):
+        raise ValueError("Brak nagłówka KDF")
+    _, algorithm, cost, r, p, salt_size = _HEADER.unpack_from(data)
+    end = _HEADER.size + salt_size
+    if len(data) < end:
+        raise ValueError("Uszkodzony nagłówek KDF")
+    params = KdfParams(algorithm, cost, r, p)
+    if not _acceptable(params):
+        raise ValueError(f"Nieobsługiwane parametry KDF: {params!r}")
+    return params, bytes(data[_HEADER.size:end]), end
+
+
+def clear_cache():
+    """Czyści pamięć podręczną kluczy i soli"""
+    with _lock:
+        _keys.clear()
+        _salts.clear()
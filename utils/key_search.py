@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Odzyskiwanie zapomnianych haseł do własnych zaszyfrowanych danych
+
+Hasła ze słownika sprawdzane są równolegle w puli procesów. Dla każdego
+kandydata odszyfrowywany jest najpierw tylko fragment szyfrogramu:
+- szyfr strumieniowy (stream_encrypt): pierwsze bajty muszą być poprawnym
+  UTF-8 bez znaków sterujących,
+- AES (AES.encrypt): ostatni blok musi mieć poprawny padding PKCS#7,
+  a pierwszy blok musi być poprawnym UTF-8 (bloki szyfrowane są niezależnie).
+Pełne odszyfrowanie wykonywane jest tylko dla kandydatów, którzy przejdą
+ten test. Postęp zapisywany jest w pliku punktu kontrolnego, więc przerwane
+wyszukiwanie można wznowić.
+
+Użycie:
+    python -m utils.key_search --cipher aes --ciphertext-file dane.txt --wordlist slownik.txt
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from utils.atomic_write import atomic_open
+from utils.preview import decode_text
+
+CIPHERS = ("stream", "aes")
+
+# Liczba haseł przekazywanych do procesu naraz
+DEFAULT_CHUNK_SIZE = 500
+
+# Minimalny odstęp między zapisami punktu kontrolnego [s]
+CHECKPOINT_INTERVAL = 5.0
+
+# Liczba bajtów szyfru strumieniowego sprawdzanych przed pełnym odszyfrowaniem
+_STREAM_PROBE = 32
+
+_ALLOWED_CONTROLS = {'\t', '\n', '\r'}
+
+
+def _plausible_text(text):
+    return text is not None and all(
+        char >= ' ' or char in _ALLOWED_CONTROLS for char in text)
+
+
+class _StreamTarget:
+    """Sprawdzanie haseł dla szyfrogramu stream_encrypt"""
+
+    def __init__(self, ciphertext):
+        self.ciphertext = ciphertext
+        self.encrypted = bytes.fromhex(ciphertext)
+        self.probe = self.encrypted[:_STREAM_PROBE]
+
+    def check(self, password):
+        if not password.strip():
+            return False
+        # Pierwsze 32 bajty strumienia klucza to jeden skrót SHA-256 (licznik 0)
+        key_stream = hashlib.sha256(password.encode('utf-8') + (0).to_bytes(4, 'big')).digest()
+        head = bytes(byte ^ key for byte, key in zip(self.probe, key_stream))
+        if not _plausible_text(decode_text(head)):
+            return False
+        from utils.stream_cipher import stream_decrypt
+        try:
+            return _plausible_text(stream_decrypt(self.ciphertext, password))
+        except (ValueError, UnicodeDecodeError):
+            return False
+
+
+class _AESTarget:
+    """Sprawdzanie haseł dla szyfrogramu AES.encrypt"""
+
+    def __init__(self, ciphertext, key_size):
+        from utils.aes_cipher import AES
+        self.ciphertext = ciphertext
+        self.encrypted = bytes.fromhex(ciphertext)
+        self.aes = AES(key_size)
+
+    def check(self, password):
+        aes = self.aes
+        key_bytes, offset = aes._decryption_key(self.encrypted, password)
+        if len(self.encrypted) - offset < 16:
+            return False
+        round_keys = aes._key_expansion(key_bytes)
+        last = aes._decrypt_block(self.encrypted[-16:], round_keys)
+        padding_length = aes._padding_length(last)
+        if not padding_length:
+            return False
+        if len(self.encrypted) - offset > 16:
+            first = aes._decrypt_block(self.encrypted[offset:offset + 16], round_keys)
+        else:
+            first = last[:-padding_length]
+        if not _plausible_text(decode_text(first)):
+            return False
+        try:
+            return _plausible_text(aes.decrypt(self.ciphertext, password))
+        except (ValueError, UnicodeDecodeError):
+            return False
+
+
+_target = None
+
+
+def _init_worker(cipher, ciphertext, key_size):
+    global _target
+    if cipher == "aes":
+        _target = _AESTarget(ciphertext, key_size)
+    else:
+        _target = _StreamTarget(ciphertext)
+
+
+def _check_chunk(start, passwords):
+    return start, len(passwords), [password for password in passwords if _target.check(password)]
+
+
+def _read_chunks(wordlist, skip, chunk_size):
+    """Dzieli słownik na porcje (numer pierwszej linii, hasła), pomijając skip linii"""
+    with open(wordlist, 'r', encoding='utf-8', errors='surrogateescape') as file:
+        lines = itertools.islice(file, skip, None)
+        start = skip
+        while True:
+            chunk = [line.rstrip('\r\n') for line in itertools.islice(lines, chunk_size)]
+            if not chunk:
+                return
+            yield start, chunk
+            start += len(chunk)
+
+
+class Checkpoint:
+    """Punkt kontrolny wyszukiwania zapisywany jako JSON"""
+
+    def __init__(self, path, job_id):
+        self.path = path
+        self.job_id = job_id
+        self.position = 0
+        self.found = []
+        self._saved_at = 0.0
+
+    def load(self):
+        """Wczytuje zapisany postęp tego samego zadania (jeśli istnieje)"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as file:
+            state = json.load(file)
+        if state.get("job") != self.job_id:
+            raise ValueError("Punkt kontrolny dotyczy innego szyfrogramu lub słownika")
+        self.position = int(state.get("position", 0))
+        self.found = list(state.get("found", []))
+
+    def add_found(self, passwords):
+        """
+        Dopisuje znalezione hasła bez powtórzeń
+
+        Porcje kończą się w dowolnej kolejności, więc hasła z porcji za
+        zapisaną pozycją mogą być już w punkcie kontrolnym, a po wznowieniu
+        ich porcja jest sprawdzana ponownie.
+        """
+        for password in passwords:
+            if password not in self.found:
+                self.found.append(password)
+
+    def save(self, force=False):
+        """Zapisuje postęp (najczęściej co CHECKPOINT_INTERVAL sekund)"""
+        if not self.path:
+            return
+        now = time.monotonic()
+        if not force and now - self._saved_at < CHECKPOINT_INTERVAL:
+            return
+        with atomic_open(self.path, 'w', encoding='utf-8') as file:
+            json.dump({"job": self.job_id, "position": self.position, "found": self.found}, file)
+        self._saved_at = now
+
+
+def job_id(cipher, ciphertext, wordlist, key_size):
+    """Identyfikator zadania zapisywany w punkcie kontrolnym"""
+    data = f"{cipher}:{key_size}:{os.path.abspath(wordlist)}:{ciphertext}".encode('utf-8')
+    return hashlib.sha256(data).hexdigest()
+
+
+def search_keys(cipher, ciphertext, wordlist, workers=None, key_size=128,
+                chunk_size=DEFAULT_CHUNK_SIZE, checkpoint_path=None,
+                stop_on_first=True, progress=None):
+    """
+    Sprawdza hasła ze słownika w puli procesów
+
+    Args:
+        cipher: "stream" lub "aes"
+        ciphertext: Szyfrogram (hex)
+        wordlist: Ścieżka do słownika (jedno hasło w linii)
+        workers: Liczba procesów (domyślnie liczba procesorów)
+        key_size: Rozmiar klucza AES (128, 192, 256)
+        chunk_size: Liczba haseł w porcji przekazywanej do procesu
+        checkpoint_path: Plik punktu kontrolnego (wznawianie po przerwaniu)
+        stop_on_first: Zakończ po znalezieniu pierwszego hasła
+        progress: Opcjonalna funkcja (sprawdzone_linie, znalezione) po każdej porcji
+
+    Returns:
+        list: Znalezione hasła
+    """
+    if cipher not in CIPHERS:
+        raise ValueError(f"Nieznany szyfr: {cipher}")
+    ciphertext = ciphertext.strip()
+    bytes.fromhex(ciphertext)  # ValueError dla nieprawidłowego hex
+
+    checkpoint = Checkpoint(checkpoint_path, job_id(cipher, ciphertext, wordlist, key_size))
+    checkpoint.load()
+    if checkpoint.found and stop_on_first:
+        return checkpoint.found
+
+    workers = workers or os.cpu_count() or 1
+    chunks = _read_chunks(wordlist, checkpoint.position, chunk_size)
+    # Porcje kończą się w dowolnej kolejności - punkt kontrolny przesuwa się
+    # tylko po ciągłym zakresie sprawdzonych linii
+    completed = {}
+    pending = set()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(cipher, ciphertext, key_size)) as executor:
+        try:
+            for start, passwords in itertools.islice(chunks, workers * 2):
+                pending.add(executor.submit(_check_chunk, start, passwords))
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, count, found = future.result()
+                    completed[start] = count
+                    checkpoint.add_found(found)
+                    while checkpoint.position in completed:
+                        checkpoint.position += completed.pop(checkpoint.position)
+                    if progress is not None:
+                        progress(checkpoint.position, list(checkpoint.found))
+                    if not (stop_on_first and checkpoint.found):
+                        for start, passwords in itertools.islice(chunks, 1):
+                            pending.add(executor.submit(_check_chunk, start, passwords))
+
+                checkpoint.save(force=bool(checkpoint.found))
+                if stop_on_first and checkpoint.found:
+                    for future in pending:
+                        future.cancel()
+                    break
+        finally:
+            checkpoint.save(force=True)
+
+    return checkpoint.found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Odzyskiwanie hasła do szyfrogramu stream_encrypt/AES.encrypt ze słownika")
+    parser.add_argument("--cipher", choices=CIPHERS, required=True, help="Rodzaj szyfru")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--ciphertext", help="Szyfrogram (hex)")
+    source.add_argument("--ciphertext-file", help="Plik z szyfrogramem (hex)")
+    parser.add_argument("--wordlist", required=True, help="Słownik haseł (jedno w linii)")
+    parser.add_argument("--key-size", type=int, choices=(128, 192, 256), default=128,
+                        help="Rozmiar klucza AES")
+    parser.add_argument("--workers", type=int, default=None, help="Liczba procesów")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Liczba haseł w porcji")
+    parser.add_argument("--checkpoint", help="Plik punktu kontrolnego (wznawianie)")
+    parser.add_argument("--all", action="store_true", help="Szukaj dalej po znalezieniu hasła")
+    args = parser.parse_args(argv)
+
+    if args.ciphertext_file:
+        with open(args.ciphertext_file, 'r', encoding='utf-8') as file:
+            ciphertext = file.read()
+    else:
+        ciphertext = args.ciphertext
+
+    def report(position, found):
+        print(f"\rSprawdzono {position} haseł, znaleziono {len(found)}", end="", file=sys.stderr)
+
+    try:
+        found = search_keys(args.cipher, ciphertext, args.wordlist, args.workers, args.key_size,
+                            args.chunk_size, args.checkpoint, not args.all, report)
+    except KeyboardInterrupt:
+        print("\nPrzerwano - postęp zapisano w punkcie kontrolnym", file=sys.stderr)
+        return 130
+    except (OSError, ValueError) as e:
+        print(f"\nBłąd: {e}", file=sys.stderr)
+        return 1
+
+    print(file=sys.stderr)
+    for password in found:
+        print(password)
+    return 0 if found else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
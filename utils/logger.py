@@ -1,101 +1,545 @@
 """
 Moduł do logowania działań aplikacji
 """
+import atexit
+import json
 import logging
+import os
+import queue
 import sys
+import threading
+import time
+from bisect import bisect_left
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
-class AppLogger:
-    """Klasa do zarządzania logami aplikacji"""
+LOG_FORMAT = '%(asctime)s | %(levelname)s | %(message)s'
+LOG_DATE_FORMAT = '%H:%M:%S'
+
+# Nazwa głównego loggera aplikacji - moduły używają loggerów potomnych
+ROOT_LOGGER_NAME = 'ktk_app'
+
+# Domyślne parametry rotacji pliku logów
+LOG_FILE_MAX_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUP_COUNT = 3
+
+# Poziom wyłączający logowanie modułu
+OFF = logging.CRITICAL + 10
+
+
+def _parse_level(level):
+    """Zamienia nazwę poziomu ("WARNING", "OFF") lub liczbę na poziom logging"""
+    if isinstance(level, int):
+        return level
+    name = str(level).strip().upper()
+    if name == 'OFF':
+        return OFF
+    value = logging.getLevelName(name)
+    if not isinstance(value, int):
+        raise ValueError(f"Nieznany poziom logowania: {level}")
+    return value
+
+
+def set_module_level(module, level):
+    """
+    Ustawia poziom logowania dla jednego modułu (np. "aes")
     
-    def __init__(self):
-        self.logger = logging.getLogger('ktk_app')
-        self.logger.setLevel(logging.INFO)
+    Args:
+        module: Nazwa modułu (logger "ktk_app.<module>")
+        level: Poziom logging, nazwa poziomu lub "OFF" aby wyłączyć logi
+    """
+    logging.getLogger(f"{ROOT_LOGGER_NAME}.{module}").setLevel(_parse_level(level))
+
+
+def _apply_env_levels():
+    """Ustawia poziomy modułów ze zmiennej KTK_LOG_LEVELS (np. aes=OFF,stream=WARNING)"""
+    for item in os.environ.get('KTK_LOG_LEVELS', '').split(','):
+        if '=' in item:
+            module, level = item.split('=', 1)
+            set_module_level(module.strip(), level)
+
+
+# Aktywny wątek zapisujący (jeden na proces)
+_listener = None
+_config_lock = threading.Lock()
+
+
+def configure_logging(stream=None, log_file=None, max_bytes=LOG_FILE_MAX_BYTES,
+                      backup_count=LOG_FILE_BACKUP_COUNT):
+    """
+    Konfiguruje ujście logów aplikacji (wywoływane raz, przy pierwszym loggerze)
+    
+    Ponowne wywołanie zastępuje poprzednią konfigurację - oczekujące rekordy
+    są najpierw zapisywane przez stary wątek.
+    
+    Args:
+        stream: Strumień konsoli (domyślnie sys.stdout, False aby wyłączyć)
+        log_file: Opcjonalna ścieżka pliku logów z rotacją
+                  (domyślnie zmienna środowiskowa KTK_LOG_FILE)
+        max_bytes: Maksymalny rozmiar pliku logów przed rotacją
+        backup_count: Liczba zachowywanych plików archiwalnych
+    """
+    global _listener
+    with _config_lock:
+        root_logger = logging.getLogger(ROOT_LOGGER_NAME)
+        root_logger.setLevel(logging.INFO)
+        
+        # Zatrzymaj poprzedni wątek zapisujący (opróżnia kolejkę)
+        _stop_listener()
         
         # Usuń istniejące handlery żeby uniknąć duplikatów
-        for handler in self.logger.handlers[:]:
-            self.logger.removeHandler(handler)
+        for handler in root_logger.handlers[:]:
+            root_logger.removeHandler(handler)
+        
+        # Format logów
+        formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+        handlers = []
         
         # Handler do konsoli
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setLevel(logging.INFO)
+        if stream is not False:
+            console_handler = logging.StreamHandler(stream or sys.stdout)
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(formatter)
+            handlers.append(console_handler)
         
-        # Format logów
-        formatter = logging.Formatter(
-            '%(asctime)s | %(levelname)s | %(message)s',
-            datefmt='%H:%M:%S'
-        )
-        console_handler.setFormatter(formatter)
+        # Opcjonalny plik logów z rotacją
+        log_file = log_file or os.environ.get('KTK_LOG_FILE')
+        if log_file:
+            file_handler = RotatingFileHandler(
+                log_file, maxBytes=max_bytes, backupCount=backup_count,
+                encoding='utf-8', delay=True
+            )
+            file_handler.setLevel(logging.INFO)
+            file_handler.setFormatter(formatter)
+            handlers.append(file_handler)
+        
+        # Kolejka między wątkiem wywołującym a wątkiem zapisującym
+        log_queue = queue.SimpleQueue()
+        root_logger.addHandler(QueueHandler(log_queue))
         
-        self.logger.addHandler(console_handler)
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
         
         # Wyłącz propagację do root logger
-        self.logger.propagate = False
+        root_logger.propagate = False
+        _apply_env_levels()
+
+
+def _stop_listener():
+    global _listener
+    listener = _listener
+    if listener is not None:
+        _listener = None
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+class AppLogger:
+    """Klasa do zarządzania logami aplikacji
+    
+    Rekordy trafiają do kolejki (QueueHandler), a zapis na konsolę i do pliku
+    wykonuje wątek w tle (QueueListener), więc wywołujący nie czeka na I/O.
+    Wszystkie metody przyjmują komunikat w stylu '%' z argumentami, które są
+    formatowane dopiero gdy dany poziom jest włączony.
+    
+    Zamiast tworzyć instancje bezpośrednio, używaj get_logger() - zwraca
+    współdzieloną instancję i nie konfiguruje handlerów ponownie.
+    """
+    
+    def __init__(self, module=None, log_file=None, max_bytes=LOG_FILE_MAX_BYTES,
+                 backup_count=LOG_FILE_BACKUP_COUNT):
+        """
+        Args:
+            module: Opcjonalna nazwa modułu - logger "ktk_app.<module>"
+                    z własnym, konfigurowalnym poziomem
+            log_file: Opcjonalna ścieżka pliku logów - rekonfiguruje ujście
+            max_bytes: Maksymalny rozmiar pliku logów przed rotacją
+            backup_count: Liczba zachowywanych plików archiwalnych
+        """
+        if log_file:
+            configure_logging(log_file=log_file, max_bytes=max_bytes,
+                              backup_count=backup_count)
+        elif _listener is None:
+            configure_logging()
+        
+        if module:
+            self.logger = logging.getLogger(f"{ROOT_LOGGER_NAME}.{module}")
+        else:
+            self.logger = logging.getLogger(ROOT_LOGGER_NAME)
     
-    def info(self, message):
+    @classmethod
+    def shutdown(cls):
+        """Zatrzymuje wątek zapisujący po zapisaniu oczekujących rekordów"""
+        with _config_lock:
+            _stop_listener()
+    
+    def is_enabled_for(self, level):
+        """Sprawdza czy komunikaty danego poziomu zostaną zapisane"""
+        return self.logger.isEnabledFor(level)
+    
+    def set_level(self, level):
+        """Ustawia poziom logowania tego loggera (nazwa, liczba lub "OFF")"""
+        self.logger.setLevel(_parse_level(level))
+    
+    def info(self, message, *args):
         """Log informacyjny"""
-        self.logger.info(message)
+        self.logger.info(message, *args)
     
-    def warning(self, message):
+    def warning(self, message, *args):
         """Log ostrzeżenia"""
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
     
-    def error(self, message):
+    def error(self, message, *args):
         """Log błędu"""
-        self.logger.error(message)
+        self.logger.error(message, *args)
     
-    def debug(self, message):
+    def debug(self, message, *args):
         """Log debug"""
-        self.logger.debug(message)
+        self.logger.debug(message, *args)
     
     def log_app_start(self):
         """Log uruchomienia aplikacji"""
         self.info("Aplikacja KTK uruchomiona")
-        self.info("Data: " + datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        if self.is_enabled_for(logging.INFO):
+            self.info("Data: %s", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
     
     def log_window_open(self, window_name):
         """Log otwarcia okna"""
-        self.info(f"Otwarto okno: {window_name}")
+        self.info("Otwarto okno: %s", window_name)
     
     def log_encryption_start(self, text_type, shift):
         """Log rozpoczęcia szyfrowania"""
-        self.info(f"Rozpoczęto szyfrowanie {text_type} z przesunięciem {shift}")
+        self.info("Rozpoczęto szyfrowanie %s z przesunięciem %s", text_type, shift)
     
     def log_encryption_success(self, text_type, result_length):
         """Log udanego szyfrowania"""
-        self.info(f"Szyfrowanie {text_type} zakończone pomyślnie (długość: {result_length} znaków)")
+        self.info("Szyfrowanie %s zakończone pomyślnie (długość: %s znaków)", text_type, result_length)
     
     def log_decryption_start(self, text_type, shift):
         """Log rozpoczęcia deszyfrowania"""
-        self.info(f"Rozpoczęto deszyfrowanie {text_type} z przesunięciem {shift}")
+        self.info("Rozpoczęto deszyfrowanie %s z przesunięciem %s", text_type, shift)
     
     def log_decryption_success(self, text_type, result_length):
         """Log udanego deszyfrowania"""
-        self.info(f"Deszyfrowanie {text_type} zakończone pomyślnie (długość: {result_length} znaków)")
+        self.info("Deszyfrowanie %s zakończone pomyślnie (długość: %s znaków)", text_type, result_length)
     
     def log_file_operation(self, operation, file_path, shift):
         """Log operacji na pliku"""
-        self.info(f"{operation} pliku: {file_path} (przesunięcie: {shift})")
+        self.info("%s pliku: %s (przesunięcie: %s)", operation, file_path, shift)
     
     def log_file_success(self, operation, input_file, output_file):
         """Log udanej operacji na pliku"""
-        self.info(f"{operation} pliku zakończone: {input_file} -> {output_file}")
+        self.info("%s pliku zakończone: %s -> %s", operation, input_file, output_file)
     
     def log_preview(self, operation, file_path, shift):
         """Log podglądu operacji"""
-        self.info(f"Podgląd {operation} pliku: {file_path} (przesunięcie: {shift})")
+        self.info("Podgląd %s pliku: %s (przesunięcie: %s)", operation, file_path, shift)
     
     def log_error(self, operation, error_msg):
         """Log błędu"""
-        self.error(f"Błąd podczas {operation}: {error_msg}")
+        self.error("Błąd podczas %s: %s", operation, error_msg)
     
     def log_validation_error(self, field, value):
         """Log błędu walidacji"""
-        self.warning(f"Błąd walidacji {field}: {value}")
+        self.warning("Błąd walidacji %s: %s", field, value)
     
     def log_user_action(self, action):
         """Log akcji użytkownika"""
-        self.info(f"Użytkownik: {action}")
+        self.info("Użytkownik: %s", action)
+
+# Domyślne przedziały histogramów: czas operacji [s] i rozmiar danych [B]
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0, 300.0)
+SIZE_BUCKETS = tuple(1024 * 4 ** i for i in range(12))  # 1 KB ... 4 GB
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+class Counter:
+    """Licznik rosnący (np. liczba operacji, liczba bajtów)"""
+    
+    def __init__(self, name, description=""):
+        self.name = name
+        self.description = description
+        self._values = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, amount=1, **labels):
+        """Zwiększa licznik dla podanych etykiet"""
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def snapshot(self):
+        with self._lock:
+            return [{"labels": dict(key), "value": value} for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    """Wartość chwilowa (np. liczba zadań w toku)"""
+    
+    def dec(self, amount=1, **labels):
+        """Zmniejsza wartość dla podanych etykiet"""
+        self.inc(-amount, **labels)
+    
+    def set(self, value, **labels):
+        """Ustawia wartość dla podanych etykiet"""
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+
+class Histogram:
+    """Rozkład wartości w przedziałach (np. czas operacji, rozmiar danych)"""
+    
+    def __init__(self, name, buckets, description=""):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value, **labels):
+        """Dodaje obserwację dla podanych etykiet"""
+        key = _label_key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {
+                    "count": 0, "sum": 0.0, "min": value, "max": value,
+                    "buckets": [0] * (len(self.buckets) + 1),
+                }
+            series["count"] += 1
+            series["sum"] += value
+            series["min"] = min(series["min"], value)
+            series["max"] = max(series["max"], value)
+            series["buckets"][index] += 1
+    
+    def snapshot(self):
+        bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+        with self._lock:
+            return [
+                {
+                    "labels": dict(key),
+                    "count": series["count"],
+                    "sum": series["sum"],
+                    "min": series["min"],
+                    "max": series["max"],
+                    "buckets": dict(zip(bounds, series["buckets"])),
+                }
+                for key, series in self._series.items()
+            ]
+
+
+class SnapshotExporter:
+    """Eksporter trzymający ostatnią migawkę metryk w pamięci procesu"""
+    
+    def __init__(self):
+        self.latest = None
+    
+    def export(self, snapshot):
+        self.latest = snapshot
+
+
+class JsonLinesExporter:
+    """Eksporter dopisujący migawki metryk do pliku JSON Lines"""
+    
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+    
+    def export(self, snapshot):
+        line = json.dumps(snapshot, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as file:
+                file.write(line + "\n")
+
+
+class _OperationTracker:
+    """Kontekst mierzący pojedynczą operację szyfru (zob. MetricsRegistry.track)"""
+    
+    __slots__ = ("registry", "cipher", "operation", "size", "start", "failed")
+    
+    def __init__(self, registry, cipher, operation, size):
+        self.registry = registry
+        self.cipher = cipher
+        self.operation = operation
+        self.size = size
+        self.start = 0.0
+        self.failed = False
+    
+    def __enter__(self):
+        self.registry.in_flight.inc(cipher=self.cipher)
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        registry = self.registry
+        status = "error" if exc_type is not None or self.failed else "ok"
+        registry.in_flight.dec(cipher=self.cipher)
+        registry.operations.inc(cipher=self.cipher, operation=self.operation, status=status)
+        registry.latency.observe(elapsed, cipher=self.cipher, operation=self.operation)
+        if self.size:
+            registry.bytes_total.inc(self.size, cipher=self.cipher, operation=self.operation)
+            registry.sizes.observe(self.size, cipher=self.cipher, operation=self.operation)
+        return False
+
+
+class MetricsRegistry:
+    """Rejestr metryk strukturalnych z podłączanymi eksporterami
+    
+    Zbieranie jest wyłączone, dopóki nie wywołamy enable() albo nie ustawimy
+    zmiennej KTK_METRICS_FILE (plik JSON Lines z migawkami).
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self.exporters = []
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._timer = None
+        self.operations = self.counter("cipher_operations_total", "Liczba operacji szyfrowania/deszyfrowania")
+        self.bytes_total = self.counter("cipher_bytes_total", "Liczba przetworzonych bajtów")
+        self.latency = self.histogram("cipher_operation_seconds", LATENCY_BUCKETS, "Czas operacji")
+        self.sizes = self.histogram("cipher_operation_bytes", SIZE_BUCKETS, "Rozmiar danych operacji")
+        self.in_flight = self.gauge("cipher_operations_in_flight", "Operacje w toku")
+    
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+    
+    def counter(self, name, description=""):
+        """Zwraca (lub tworzy) licznik o podanej nazwie"""
+        return self._register(Counter(name, description))
+    
+    def gauge(self, name, description=""):
+        """Zwraca (lub tworzy) wskaźnik o podanej nazwie"""
+        return self._register(Gauge(name, description))
+    
+    def histogram(self, name, buckets=LATENCY_BUCKETS, description=""):
+        """Zwraca (lub tworzy) histogram o podanej nazwie"""
+        return self._register(Histogram(name, buckets, description))
+    
+    def enable(self, enabled=True):
+        """Włącza lub wyłącza zbieranie metryk"""
+        self.enabled = bool(enabled)
+    
+    def add_exporter(self, exporter):
+        """Dodaje eksporter (obiekt z metodą export(snapshot))"""
+        self.exporters.append(exporter)
+        return exporter
+    
+    def track(self, cipher, operation, size=0):
+        """
+        Zwraca kontekst mierzący jedną operację
+        
+        Args:
+            cipher: Nazwa szyfru (np. "aes")
+            operation: Nazwa operacji (np. "encrypt_file")
+            size: Liczba przetwarzanych bajtów
+        """
+        return _OperationTracker(self, cipher, operation, size)
+    
+    def snapshot(self):
+        """
+        Zwraca bieżący stan wszystkich metryk
+        
+        Returns:
+            dict: {"timestamp", "counters", "gauges", "histograms"}
+        """
+        result = {"timestamp": time.time(), "counters": {}, "gauges": {}, "histograms": {}}
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            if isinstance(metric, Histogram):
+                result["histograms"][metric.name] = metric.snapshot()
+            elif isinstance(metric, Gauge):
+                result["gauges"][metric.name] = metric.snapshot()
+            else:
+                result["counters"][metric.name] = metric.snapshot()
+        return result
+    
+    def throughput(self):
+        """
+        Przepustowość per szyfr i operacja na podstawie zebranych metryk
+        
+        Returns:
+            dict: (szyfr, operacja) -> MB/s
+        """
+        seconds = {
+            (item["labels"]["cipher"], item["labels"]["operation"]): item["sum"]
+            for item in self.latency.snapshot()
+        }
+        result = {}
+        for item in self.bytes_total.snapshot():
+            key = (item["labels"]["cipher"], item["labels"]["operation"])
+            if seconds.get(key):
+                result[key] = item["value"] / seconds[key] / (1024 * 1024)
+        return result
+    
+    def export(self):
+        """Przekazuje migawkę do wszystkich eksporterów"""
+        if not self.exporters:
+            return
+        snapshot = self.snapshot()
+        for exporter in self.exporters:
+            try:
+                exporter.export(snapshot)
+            except Exception as e:
+                app_logger.error("Błąd eksportu metryk: %s", e)
+    
+    def start_periodic_export(self, interval=60.0):
+        """Uruchamia eksport migawek co interval sekund w wątku w tle"""
+        self.stop_periodic_export()
+        
+        def run():
+            self.export()
+            self.start_periodic_export(interval)
+        
+        self._timer = threading.Timer(interval, run)
+        self._timer.daemon = True
+        self._timer.start()
+    
+    def stop_periodic_export(self):
+        """Zatrzymuje okresowy eksport"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+_loggers = {}
+
+
+def get_logger(module=None):
+    """
+    Zwraca współdzieloną instancję AppLogger (jedną na moduł)
+    
+    Args:
+        module: Opcjonalna nazwa modułu (np. "aes")
+        
+    Returns:
+        AppLogger
+    """
+    logger = _loggers.get(module)
+    if logger is None:
+        logger = _loggers.setdefault(module, AppLogger(module))
+    return logger
+
 
 # Globalna instancja loggera
-app_logger = AppLogger()
+app_logger = get_logger()
+
+# Zapisz oczekujące logi przy zamknięciu aplikacji
+atexit.register(AppLogger.shutdown)
+
+# Globalny rejestr metryk
+metrics = MetricsRegistry()
+if os.environ.get('KTK_METRICS_FILE'):
+    metrics.add_exporter(JsonLinesExporter(os.environ['KTK_METRICS_FILE']))
+    metrics.enable()
+    metrics.start_periodic_export(float(os.environ.get('KTK_METRICS_INTERVAL', '60')))
+    atexit.register(metrics.export)
+
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Potok plikowy: odczyt -> szyfr -> zapis w osobnych wątkach
+
+Wątek odczytu wypełnia bufory (readinto), bieżący wątek przekształca je
+w miejscu, a wątek zapisu zapisuje je do pliku wynikowego (atomowo,
+utils.atomic_write). Bufory (bytearray o stałym rozmiarze) krążą między
+etapami w ograniczonych kolejkach i są używane ponownie, więc pamięć nie
+rośnie z rozmiarem pliku, a odczyt i zapis dysku odbywają się równolegle
+z obliczeniami szyfru.
+
+Przekształcenie to obiekt z metodą process(bufor, długość, pozycja, ostatni)
+zmieniającą pierwsze `długość` bajtów bufora w miejscu i zwracającą nową
+długość danych (bufor ma OVERHEAD bajtów zapasu, np. na padding AES).
+Przekształcenia dla szyfrów z utils znajdują się poniżej (ByteShiftTransform
+dla Cezara i Vigenère, XorStreamTransform dla szyfru strumieniowego,
+BlockTransform dla AES).
+"""
+
+import os
+import queue
+import threading
+import numpy as np
+from utils.atomic_write import atomic_open, check_cancelled
+from utils.profiler import io_section, section
+
+# Rozmiar bufora - wielokrotność bloku AES i skrótu strumienia klucza
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+# Liczba buforów w obiegu (ogranicza zużycie pamięci i wyprzedzenie odczytu)
+DEFAULT_DEPTH = 4
+
+# Zapas bufora na dane dłuższe od wejścia (padding AES)
+OVERHEAD = 16
+
+# Pliki od tego rozmiaru funkcje plikowe szyfrów przetwarzają potokiem
+PIPELINE_THRESHOLD = 4 << 20
+
+_POLL_INTERVAL = 0.1
+
+
+class ByteShiftTransform:
+    """Przesunięcie bajtów modulo 256 według powtarzanego wzorca (Cezar, Vigenère)"""
+
+    def __init__(self, shifts, decrypt=False):
+        if not shifts:
+            raise ValueError("Klucz musi zawierać przynajmniej jedną literę")
+        shifts = np.array([(-shift if decrypt else shift) % 256 for shift in shifts], dtype=np.uint8)
+        self.period = len(shifts)
+        self.pattern = shifts
+        self._tiled = None
+
+    def process(self, buffer, length, offset, final):
+        if self._tiled is None or len(self._tiled) < length + self.period:
+            repeats = -(-(len(buffer) + self.period) // self.period)
+            self._tiled = np.tile(self.pattern, repeats)
+        data = np.frombuffer(buffer, dtype=np.uint8, count=length)
+        phase = offset % self.period
+        data += self._tiled[phase:phase + length]
+        return length
+
+
+class XorStreamTransform:
+    """XOR ze strumieniem klucza od pozycji danych (szyfr strumieniowy)"""
+
+    def __init__(self, seed):
+        self.seed = seed
+
+    def process(self, buffer, length, offset, final):
+        from utils.stream_cipher import generate_key_stream
+        if length:
+            data = np.frombuffer(buffer, dtype=np.uint8, count=length)
+            key_stream = np.frombuffer(generate_key_stream(self.seed, length, offset), dtype=np.uint8)
+            np.bitwise_xor(data, key_stream, out=data)
+        return length
+
+
+class BlockTransform:
+    """Bloki AES szyfrowane niezależnie (padding PKCS#7 w ostatnim buforze)"""
+
+    def __init__(self, aes, round_keys, decrypt=False):
+        self.aes = aes
+        self.round_keys = round_keys
+        self.decrypt = decrypt
+
+    def process(self, buffer, length, offset, final):
+        aes = self.aes
+        if self.decrypt:
+            if not length or length % 16 != 0:
+                raise ValueError("Nieprawidłowa długość danych (wymagana wielokrotność 16 bajtów)")
+            transform_block = aes._decrypt_block
+        else:
+            if final:
+                padding_length = 16 - length % 16
+                buffer[length:length + padding_length] = bytes([padding_length]) * padding_length
+                length += padding_length
+            transform_block = aes._encrypt_block
+
+        view = memoryview(buffer)
+        round_keys = self.round_keys
+        with section("aes.blocks"):
+            for i in range(0, length, 16):
+                buffer[i:i+16] = transform_block(view[i:i+16], round_keys)
+
+        if self.decrypt and final:
+            padding_length = aes._padding_length(view[length - 16:length])
+            if not padding_length:
+                raise ValueError("Nieprawidłowy padding - błędny klucz lub uszkodzone dane")
+            length -= padding_length
+        return length
+
+
+class _Stopped(Exception):
+    pass
+
+
+def _get(items, stop):
+    while True:
+        try:
+            return items.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            if stop.is_set():
+                raise _Stopped()
+
+
+def _put(items, item, stop):
+    while True:
+        try:
+            items.put(item, timeout=_POLL_INTERVAL)
+            return
+        except queue.Full:
+            if stop.is_set():
+                raise _Stopped()
+
+
+class _Stage(threading.Thread):
+    """Wątek etapu potoku; wyjątek zatrzymuje cały potok"""
+
+    def __init__(self, name, target, stop):
+        super().__init__(name=name, daemon=True)
+        self._target_stage = target
+        self.stop = stop
+        self.error = None
+
+    def run(self):
+        try:
+            self._target_stage()
+        except _Stopped:
+            pass
+        except BaseException as e:
+            self.error = e
+            self.stop.set()
+
+
+def use_pipeline(size):
+    """Czy plik o podanym rozmiarze przetwarzać potokiem"""
+    return size >= PIPELINE_THRESHOLD
+
+
+def run_pipeline(input_file, output_file, transform, prefix=b"", input_offset=0,
+                 expected_length=None, buffer_size=DEFAULT_BUFFER_SIZE, depth=DEFAULT_DEPTH):
+    """
+    Przetwarza plik potokiem odczyt -> przekształcenie -> zapis
+
+    Args:
+        input_file: Ścieżka do pliku wejściowego
+        output_file: Ścieżka do pliku wyjściowego (zapis atomowy)
+        transform: Przekształcenie z metodą process()
+        prefix: Dane zapisywane przed wynikiem (np. nagłówek pliku)
+        input_offset: Pozycja początku danych w pliku wejściowym (np. za nagłówkiem)
+        expected_length: Oczekiwana długość wyniku (np. z nagłówka) - przy
+            niezgodności plik wynikowy nie jest zapisywany
+        buffer_size: Rozmiar bufora (wielokrotność 16 bajtów)
+        depth: Liczba buforów w obiegu
+
+    Returns:
+        int: Liczba bajtów wyniku (bez prefix)
+    """
+    if buffer_size <= 0 or buffer_size % 16:
+        raise ValueError("Rozmiar bufora musi być dodatnią wielokrotnością 16 bajtów")
+    depth = max(2, depth)
+    free = queue.Queue()
+    for _ in range(depth):
+        free.put(bytearray(buffer_size + OVERHEAD))
+    # Elementy kolejek: (bufor, długość, pozycja, ostatni); None kończy zapis
+    filled = queue.Queue(maxsize=depth)
+    processed = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    written = [0]
+
+    with open(input_file, 'rb') as f_in, atomic_open(output_file) as f_out:
+        remaining = os.fstat(f_in.fileno()).st_size - input_offset
+        if remaining < 0:
+            raise ValueError("Plik jest krótszy niż nagłówek")
+        f_in.seek(input_offset)
+
+        def read():
+            offset = 0
+            left = remaining
+            while True:
+                buffer = _get(free, stop)
+                size = min(buffer_size, left)
+                view = memoryview(buffer)[:size]
+                length = 0
+                while length < size:
+                    count = f_in.readinto(view[length:])
+                    if not count:
+                        raise ValueError("Plik wejściowy skrócił się podczas odczytu")
+                    length += count
+                left -= length
+                _put(filled, (buffer, length, offset, left == 0), stop)
+                if left == 0:
+                    return
+                offset += length
+
+        def write():
+            f_out.write(prefix)
+            while True:
+                item = _get(processed, stop)
+                if item is None:
+                    return
+                buffer, length = item
+                f_out.write(memoryview(buffer)[:length])
+                written[0] += length
+                free.put(buffer)
+
+        reader = _Stage("pipeline-reader", read, stop)
+        writer = _Stage("pipeline-writer", write, stop)
+        reader.start()
+        writer.start()
+        try:
+            while True:
+                with io_section():
+                    buffer, length, offset, final = _get(filled, stop)
+                check_cancelled()
+                length = transform.process(buffer, length, offset, final)
+                with io_section():
+                    _put(processed, (buffer, length), stop)
+                if final:
+                    break
+            with io_section():
+                _put(processed, None, stop)
+                writer.join()
+            if expected_length is not None and written[0] != expected_length:
+                raise ValueError("Długość odszyfrowanych danych nie zgadza się z nagłówkiem - plik uszkodzony")
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            stop.set()
+            reader.join()
+            writer.join()
+            # Błąd etapu ma pierwszeństwo przed _Stopped bieżącego wątku
+            for stage in (reader, writer):
+                if stage.error is not None:
+                    raise stage.error
+    return written[0]
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Podgląd plików - czyta tylko początek pliku
+
+Podgląd nie wczytuje całego pliku: z dysku czytane jest co najwyżej
+max_chars * 4 bajtów (najdłuższy znak UTF-8), urwany na końcu znak
+wielobajtowy jest odcinany, a pliki binarne pokazywane są jako zrzut hex.
+"""
+
+import os
+from utils.file_header import peek_header
+from utils.profiler import io_section
+
+# Domyślna liczba znaków pokazywanych w podglądzie
+PREVIEW_CHARS = 500
+
+# Liczba bajtów pokazywanych w zrzucie hex pliku binarnego
+HEX_DUMP_BYTES = 256
+
+# Maksymalna długość znaku w UTF-8
+_MAX_UTF8_BYTES = 4
+
+
+class FilePreview:
+    """Początek pliku przygotowany do podglądu"""
+
+    __slots__ = ("path", "size", "data", "text", "truncated", "header")
+
+    def __init__(self, path, size, data, text, truncated, header=None):
+        self.path = path
+        self.size = size
+        self.data = data
+        self.text = text
+        self.truncated = truncated
+        self.header = header
+
+    @property
+    def is_binary(self):
+        return self.text is None
+
+
+def read_head(path, limit, offset=0):
+    """
+    Czyta pierwsze bajty pliku
+
+    Args:
+        path: Ścieżka do pliku
+        limit: Maksymalna liczba bajtów
+        offset: Liczba bajtów pomijanych na początku (np. nagłówek)
+
+    Returns:
+        bytes: Początek pliku
+    """
+    with io_section():
+        with open(path, 'rb') as file:
+            file.seek(offset)
+            return file.read(limit)
+
+
+def trim_utf8(data):
+    """
+    Odcina niepełny znak UTF-8 z końca danych
+
+    Args:
+        data: Bajty ucięte w dowolnym miejscu
+
+    Returns:
+        bytes: Dane kończące się na granicy znaku
+    """
+    # Szukaj bajtu początkowego ostatniego znaku (najwyżej 3 bajty kontynuacji)
+    for back in range(1, min(_MAX_UTF8_BYTES, len(data)) + 1):
+        byte = data[-back]
+        if byte & 0xC0 == 0x80:
+            continue
+        if byte < 0x80:
+            length = 1
+        elif byte >= 0xF0:
+            length = 4
+        elif byte >= 0xE0:
+            length = 3
+        else:
+            length = 2
+        return data if length <= back else data[:-back]
+    return data
+
+
+def decode_text(data):
+    """
+    Dekoduje początek pliku jako UTF-8
+
+    Returns:
+        str lub None: Tekst albo None, jeśli dane wyglądają na binarne
+    """
+    if b'\x00' in data:
+        return None
+    try:
+        return trim_utf8(data).decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+
+
+def hex_dump(data, width=16):
+    """
+    Formatuje bajty jako zrzut szesnastkowy (offset, hex, ASCII)
+
+    Args:
+        data: Bajty do pokazania
+        width: Liczba bajtów w wierszu
+
+    Returns:
+        str: Zrzut hex
+    """
+    lines = []
+    for offset in range(0, len(data), width):
+        row = data[offset:offset + width]
+        hex_part = ' '.join(f"{byte:02x}" for byte in row)
+        ascii_part = ''.join(chr(byte) if 32 <= byte < 127 else '.' for byte in row)
+        lines.append(f"{offset:08x}  {hex_part:<{width * 3 - 1}}  {ascii_part}")
+    return '\n'.join(lines)
+
+
+def format_size(size):
+    """Zwraca rozmiar w czytelnej postaci (B, KB, MB, GB)"""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{int(size)} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def load_preview(path, max_chars=PREVIEW_CHARS, binary=False):
+    """
+    Wczytuje początek pliku do podglądu
+
+    Zaszyfrowane pliki z nagłówkiem (utils.file_header) pokazywane są bez
+    nagłówka, w trybie w nim zapisanym.
+
+    Args:
+        path: Ścieżka do pliku
+        max_chars: Maksymalna liczba znaków tekstu
+        binary: True wymusza podgląd binarny (np. plik rozpoznany po rozszerzeniu)
+
+    Returns:
+        FilePreview: Początek pliku (text=None dla plików binarnych)
+    """
+    size = os.path.getsize(path)
+    header = peek_header(path)
+    offset = header.size if header is not None else 0
+    if header is not None:
+        binary = header.binary
+    payload_size = size - offset
+
+    if binary:
+        data = read_head(path, HEX_DUMP_BYTES, offset)
+        return FilePreview(path, size, data, None, payload_size > len(data), header)
+
+    data = read_head(path, max_chars * _MAX_UTF8_BYTES, offset)
+    text = decode_text(data)
+    if text is None:
+        return FilePreview(path, size, data[:HEX_DUMP_BYTES], None,
+                           payload_size > HEX_DUMP_BYTES, header)
+
+    truncated = len(text) > max_chars or payload_size > len(data)
+    return FilePreview(path, size, data, text[:max_chars], truncated, header)
+
+
+def render_preview(preview, transform, title, details, source_label, result_label, hint,
+                   binary_transform=None):
+    """
+    Buduje tekst podglądu szyfrowania/deszyfrowania pliku
+
+    Args:
+        preview: FilePreview z load_preview()
+        transform: Funkcja szyfrująca/deszyfrująca tekst podglądu
+        title: Nagłówek podglądu
+        details: Lista wierszy z parametrami (np. klucz, przesunięcie)
+        source_label: Opis tekstu z pliku
+        result_label: Opis tekstu po przekształceniu
+        hint: Podpowiedź na końcu podglądu
+        binary_transform: Funkcja przekształcająca bajty (tryb binarny) lub None
+
+    Returns:
+        str: Tekst do wyświetlenia w oknie
+    """
+    lines = [title, "", f"📁 Plik: {os.path.basename(preview.path)}"]
+    lines += details
+    lines += [f"📏 Rozmiar pliku: {format_size(preview.size)}", ""]
+
+    if preview.is_binary:
+        more = ["... (plik jest dłuższy)"] if preview.truncated else []
+        lines += [f"{source_label} - zrzut hex (pierwsze {len(preview.data)} bajtów):",
+                  hex_dump(preview.data)] + more + [""]
+        if binary_transform is None:
+            lines.append("⚠️ Plik nie jest tekstem UTF-8 - wybierz plik tekstowy "
+                         "lub plik z rozszerzeniem obsługiwanym w trybie binarnym")
+            return "\n".join(lines)
+        lines += [f"{result_label} - zrzut hex:",
+                  hex_dump(binary_transform(preview.data))] + more + ["", hint]
+        return "\n".join(lines)
+
+    source = preview.text
+    if preview.truncated:
+        source += "\n... (plik jest dłuższy)"
+    lines += [
+        f"{source_label} (pierwsze {len(preview.text)} znaków):",
+        source,
+        "",
+        f"{result_label}:",
+        transform(preview.text),
+        "",
+        hint,
+    ]
+    return "\n".join(lines)
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Opcjonalna instrumentacja funkcji szyfrujących
+
+Włączana zmienną środowiskową KTK_PROFILE=1 albo funkcją enable_profiling().
+Gdy jest wyłączona, dekorator instrumented() wywołuje funkcję bezpośrednio,
+a section() zwraca pusty kontekst - koszt to jedno sprawdzenie flagi.
+"""
+
+import functools
+import io
+import os
+import threading
+import time
+from contextlib import contextmanager
+from utils.logger import metrics
+
+_enabled = os.environ.get("KTK_PROFILE", "").strip() not in ("", "0")
+_lock = threading.Lock()
+_stats = {}
+_local = threading.local()
+
+# Nazwa sekcji, której czas traktowany jest jako I/O (reszta to obliczenia)
+IO_SECTION = "io"
+
+
+class OperationStats:
+    """Statystyki pojedynczej instrumentowanej operacji"""
+
+    __slots__ = ("name", "calls", "bytes", "wall_time", "sections")
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.bytes = 0
+        self.wall_time = 0.0
+        self.sections = {}
+
+    @property
+    def io_time(self):
+        return self.sections.get(IO_SECTION, 0.0)
+
+    @property
+    def compute_time(self):
+        return max(self.wall_time - self.io_time, 0.0)
+
+    def as_dict(self):
+        """Zwraca statystyki jako słownik"""
+        return {
+            "calls": self.calls,
+            "bytes": self.bytes,
+            "wall_time": self.wall_time,
+            "io_time": self.io_time,
+            "compute_time": self.compute_time,
+            "sections": dict(self.sections),
+        }
+
+
+class _NullSection:
+    """Pusty kontekst używany, gdy profilowanie jest wyłączone"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section:
+    """Kontekst mierzący czas nazwanej sekcji w bieżących operacjach"""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        # Czas sekcji doliczany jest do wszystkich aktywnych operacji (zagnieżdżenia)
+        for frame in getattr(_local, "stack", ()):
+            frame[self.name] = frame.get(self.name, 0.0) + elapsed
+        return False
+
+
+def enable_profiling(enabled=True):
+    """
+    Włącza lub wyłącza zbieranie statystyk
+
+    Args:
+        enabled: True aby włączyć instrumentację
+    """
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_profiling_enabled():
+    """Zwraca True jeśli instrumentacja jest włączona"""
+    return _enabled
+
+
+def reset_stats():
+    """Czyści zebrane statystyki"""
+    with _lock:
+        _stats.clear()
+
+
+def get_stats():
+    """
+    Zwraca migawkę zebranych statystyk
+
+    Returns:
+        dict: nazwa operacji -> słownik ze statystykami
+    """
+    with _lock:
+        return {name: stats.as_dict() for name, stats in _stats.items()}
+
+
+def section(name):
+    """
+    Mierzy czas fragmentu kodu wewnątrz instrumentowanej operacji
+
+    Args:
+        name: Nazwa sekcji (IO_SECTION dla operacji dyskowych)
+
+    Returns:
+        Menedżer kontekstu
+    """
+    if not _enabled:
+        return _NULL_SECTION
+    return _Section(name)
+
+
+def io_section():
+    """Skrót dla section(IO_SECTION)"""
+    return section(IO_SECTION)
+
+
+def _default_size(*args, **kwargs):
+    """Rozmiar danych z pierwszego argumentu (tekst lub bajty)"""
+    if args and isinstance(args[0], (str, bytes, bytearray, memoryview)):
+        return len(args[0])
+    return 0
+
+
+def file_size(input_file, *args, **kwargs):
+    """Rozmiar pliku wejściowego przekazanego jako pierwszy argument"""
+    try:
+        return os.path.getsize(input_file)
+    except (OSError, TypeError):
+        return 0
+
+
+def method_size(self, data, *args, **kwargs):
+    """Rozmiar danych dla metod (pomija argument self)"""
+    return _default_size(data)
+
+
+def method_file_size(self, input_file, *args, **kwargs):
+    """Rozmiar pliku wejściowego dla metod (pomija argument self)"""
+    return file_size(input_file)
+
+
+def _record(name, size, wall_time, sections):
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = OperationStats(name)
+        stats.calls += 1
+        stats.bytes += size
+        stats.wall_time += wall_time
+        for section_name, elapsed in sections.items():
+            stats.sections[section_name] = stats.sections.get(section_name, 0.0) + elapsed
+
+
+def returned_false(result):
+    """Domyślny test błędu: funkcja zwróciła False"""
+    return result is False
+
+
+def status_failed(result):
+    """Test błędu dla funkcji zwracających krotkę (sukces, ...)"""
+    return isinstance(result, tuple) and bool(result) and result[0] is False
+
+
+def instrumented(name, size=_default_size, failed=returned_false):
+    """
+    Dekorator zbierający liczbę wywołań, rozmiar danych i czasy operacji
+
+    Gdy włączone są metryki (utils.logger.metrics), operacje najwyższego
+    poziomu zasilają też liczniki i histogramy per szyfr. Błędem jest
+    zgłoszony wyjątek albo wynik, dla którego failed() zwraca True.
+
+    Args:
+        name: Nazwa operacji w statystykach (np. "aes.encrypt_file")
+        size: Funkcja wyliczająca liczbę bajtów z argumentów wywołania
+        failed: Funkcja rozpoznająca błąd po wyniku (domyślnie wynik False)
+
+    Returns:
+        Dekorator
+    """
+    cipher, _, operation = name.partition(".")
+    cipher = cipher.lower()
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            track = metrics.enabled
+            if not (_enabled or track):
+                return func(*args, **kwargs)
+
+            stack = getattr(_local, "stack", None)
+            if stack is None:
+                stack = _local.stack = []
+            try:
+                processed = size(*args, **kwargs)
+            except Exception:
+                processed = 0
+
+            # Metryki liczone są tylko dla operacji najwyższego poziomu
+            tracker = None
+            if track and not stack:
+                tracker = metrics.track(cipher, operation, processed)
+                tracker.__enter__()
+
+            frame = {}
+            stack.append(frame)
+            outcome_failed = True
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+                outcome_failed = failed(result)
+                return result
+            finally:
+                wall_time = time.perf_counter() - start
+                stack.pop()
+                if _enabled:
+                    _record(name, processed, wall_time, frame)
+                if tracker is not None:
+                    tracker.failed = outcome_failed
+                    tracker.__exit__(None, None, None)
+        return wrapper
+    return decorator
+
+
+class CaptureResult:
+    """Wynik przechwycenia profilu pojedynczej operacji"""
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.report = ""
+        self.wall_time = 0.0
+        self.peak_memory = None
+
+
+@contextmanager
+def capture(mode="cprofile", sort="cumulative", limit=25):
+    """
+    Przechwytuje szczegółowy profil pojedynczej operacji
+
+    Args:
+        mode: "cprofile" (czas per funkcja) lub "tracemalloc" (alokacje)
+        sort: Klucz sortowania raportu cProfile
+        limit: Liczba pozycji w raporcie
+
+    Yields:
+        CaptureResult: uzupełniany raportem po wyjściu z bloku
+    """
+    if mode not in ("cprofile", "tracemalloc"):
+        raise ValueError("Tryb musi być 'cprofile' lub 'tracemalloc'")
+
+    # Moduły profilujące importowane są dopiero tutaj - nie spowalniają startu
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    result = CaptureResult(mode)
+    start = time.perf_counter()
+
+    if mode == "cprofile":
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield result
+        finally:
+            profiler.disable()
+            result.wall_time = time.perf_counter() - start
+            buffer = io.StringIO()
+            pstats.Stats(profiler, stream=buffer).sort_stats(sort).print_stats(limit)
+            result.report = buffer.getvalue()
+    else:
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        try:
+            yield result
+        finally:
+            result.wall_time = time.perf_counter() - start
+            after = tracemalloc.take_snapshot()
+            result.peak_memory = tracemalloc.get_traced_memory()[1]
+            if not was_tracing:
+                tracemalloc.stop()
+            lines = [f"Szczytowe zużycie pamięci: {result.peak_memory:,} B"]
+            for stat in after.compare_to(before, "lineno")[:limit]:
+                lines.append(str(stat))
+            result.report = "\n".join(lines)
+
+
+def profile_call(func, *args, mode="cprofile", **kwargs):
+    """
+    Wywołuje funkcję w trybie przechwytywania profilu
+
+    Args:
+        func: Funkcja do wywołania
+        mode: "cprofile" lub "tracemalloc"
+
+    Returns:
+        tuple: (wynik_funkcji, CaptureResult)
+    """
+    with capture(mode) as result:
+        value = func(*args, **kwargs)
+    return value, result
+
+
+def _format_bytes(size):
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def format_stats(stats=None):
+    """
+    Formatuje statystyki jako tabelę tekstową
+
+    Args:
+        stats: Migawka z get_stats() (domyślnie bieżące statystyki)
+
+    Returns:
+        str: Tabela do wyświetlenia w oknie lub logu
+    """
+    if stats is None:
+        stats = get_stats()
+    if not stats:
+        return "Brak zebranych statystyk"
+
+    lines = [
+        f"{'Operacja':<32}{'Wywołania':>10}{'Dane':>12}{'Czas [s]':>10}"
+        f"{'I/O [s]':>10}{'CPU [s]':>10}{'MB/s':>9}"
+    ]
+    for name in sorted(stats):
+        item = stats[name]
+        throughput = item["bytes"] / item["wall_time"] / (1024 * 1024) if item["wall_time"] else 0.0
+        lines.append(
+            f"{name:<32}{item['calls']:>10}{_format_bytes(item['bytes']):>12}"
+            f"{item['wall_time']:>10.4f}{item['io_time']:>10.4f}"
+            f"{item['compute_time']:>10.4f}{throughput:>9.2f}"
+        )
+        for section_name, elapsed in sorted(item["sections"].items()):
+            if section_name != IO_SECTION:
+                lines.append(f"    └ {section_name:<26}{'':>32}{elapsed:>10.4f}")
+    return "\n".join(lines)
@@ -6,15 +6,24 @@ Implementacja szyfru z kluczem bieżącym (Stream Cipher)
 
 import os
 import hashlib
+from utils import chunked_file
+from utils.atomic_write import atomic_open
+from utils.file_header import (MODE_BINARY, MODE_TEXT, new_header, peek_header, check_header,
+                               check_length, read_encrypted, text_payload, write_encrypted,
+                               write_output)
+from utils.pipeline import XorStreamTransform, run_pipeline, use_pipeline
+from utils.profiler import instrumented, io_section, file_size
 
 
-def generate_key_stream(seed, length):
+@instrumented("stream.generate_key_stream", size=lambda seed, length, offset=0: length)
+def generate_key_stream(seed, length, offset=0):
     """
     Generuje strumień klucza na podstawie ziarna
     
     Args:
         seed: Ziarno do generowania klucza
         length: Długość strumienia klucza
+        offset: Pozycja w strumieniu, od której zaczyna się wynik
         
     Returns:
         bytes: Strumień klucza
@@ -29,19 +38,21 @@ def generate_key_stream(seed, length):
         seed_bytes = seed
     
     # Użyj SHA-256 do generowania deterministycznego strumienia
+    # Każdy skrót to 32 bajty strumienia - zacznij od skrótu zawierającego offset
     key_stream = bytearray()
-    counter = 0
+    counter, skip = divmod(offset, 32)
     
-    while len(key_stream) < length:
+    while len(key_stream) < skip + length:
         # Utwórz hash z ziarna + licznik
         data = seed_bytes + counter.to_bytes(4, 'big')
         hash_result = hashlib.sha256(data).digest()
         key_stream.extend(hash_result)
         counter += 1
     
-    return bytes(key_stream[:length])
+    return bytes(key_stream[skip:skip + length])
 
 
+@instrumented("stream.encrypt")
 def stream_encrypt(text, key):
     """
     Szyfruje tekst szyfrem z kluczem bieżącym
@@ -74,6 +85,7 @@ def stream_encrypt(text, key):
     return encrypted_bytes.hex()
 
 
+@instrumented("stream.decrypt")
 def stream_decrypt(encrypted_hex, key):
     """
     Deszyfruje tekst szyfrem z kluczem bieżącym
@@ -109,6 +121,33 @@ def stream_decrypt(encrypted_hex, key):
     return decrypted_bytes.decode('utf-8')
 
 
+def _decrypt_with_header(header, input_file, output_file, key):
+    """Deszyfruje plik z nagłówkiem w trybie zapisanym w nagłówku"""
+    check_header(header, "stream", key)
+    if header.chunked:
+        chunked_file.decrypt_file(input_file, output_file, key)
+        return True
+    if header.binary and use_pipeline(header.plaintext_length):
+        run_pipeline(input_file, output_file, XorStreamTransform(key),
+                     input_offset=header.size, expected_length=header.plaintext_length)
+        return True
+    
+    with io_section():
+        _, content = read_encrypted(input_file)
+    
+    if header.binary:
+        key_stream = generate_key_stream(key, len(content))
+        decrypted = bytes(byte ^ key_stream[i] for i, byte in enumerate(content))
+        check_length(header, decrypted)
+    else:
+        decrypted = stream_decrypt(text_payload(content), key)
+    
+    with io_section():
+        write_output(output_file, decrypted)
+    return True
+
+
+@instrumented("stream.encrypt_file", size=file_size)
 def stream_encrypt_file(input_file, output_file, key):
     """
     Szyfruje plik szyfrem z kluczem bieżącym
@@ -124,12 +163,14 @@ def stream_encrypt_file(input_file, output_file, key):
     try:
         # Sprawdź czy plik jest tekstowy czy binarny
         try:
-            with open(input_file, 'r', encoding='utf-8') as file:
-                content = file.read()
+            with io_section():
+                with open(input_file, 'r', encoding='utf-8') as file:
+                    content = file.read()
             # Jeśli udało się odczytać jako tekst, szyfruj jako tekst
             encrypted_content = stream_encrypt(content, key)
-            with open(output_file, 'w', encoding='utf-8') as file:
-                file.write(encrypted_content)
+            header = new_header("stream", MODE_TEXT, key, os.path.getsize(input_file))
+            with io_section():
+                write_encrypted(output_file, header, encrypted_content)
         except UnicodeDecodeError:
             # Jeśli nie można odczytać jako tekst, traktuj jako binarny
             return stream_encrypt_binary_file(input_file, output_file, key)
@@ -142,6 +183,7 @@ def stream_encrypt_file(input_file, output_file, key):
         return False
 
 
+@instrumented("stream.decrypt_file", size=file_size)
 def stream_decrypt_file(input_file, output_file, key):
     """
     Deszyfruje plik szyfrem z kluczem bieżącym
@@ -155,14 +197,20 @@ def stream_decrypt_file(input_file, output_file, key):
         bool: True jeśli sukces, False jeśli błąd
     """
     try:
+        header = peek_header(input_file)
+        if header is not None:
+            return _decrypt_with_header(header, input_file, output_file, key)
+        
         # Sprawdź czy plik jest tekstowy czy binarny
         try:
-            with open(input_file, 'r', encoding='utf-8') as file:
-                content = file.read()
+            with io_section():
+                with open(input_file, 'r', encoding='utf-8') as file:
+                    content = file.read()
             # Jeśli udało się odczytać jako tekst, deszyfruj jako tekst
             decrypted_content = stream_decrypt(content, key)
-            with open(output_file, 'w', encoding='utf-8') as file:
-                file.write(decrypted_content)
+            with io_section():
+                with atomic_open(output_file, 'w', encoding='utf-8') as file:
+                    file.write(decrypted_content)
         except UnicodeDecodeError:
             # Jeśli nie można odczytać jako tekst, traktuj jako binarny
             return stream_decrypt_binary_file(input_file, output_file, key)
@@ -175,6 +223,7 @@ def stream_decrypt_file(input_file, output_file, key):
         return False
 
 
+@instrumented("stream.encrypt_binary_file", size=file_size)
 def stream_encrypt_binary_file(input_file, output_file, key):
     """
     Szyfruje plik binarny (PDF, obrazy, itp.) szyfrem z kluczem bieżącym
@@ -188,8 +237,15 @@ def stream_encrypt_binary_file(input_file, output_file, key):
         bool: True jeśli sukces, False jeśli błąd
     """
     try:
-        with open(input_file, 'rb') as file:
-            content = file.read()
+        size = os.path.getsize(input_file)
+        if use_pipeline(size):
+            header = new_header("stream", MODE_BINARY, key, size)
+            run_pipeline(input_file, output_file, XorStreamTransform(key), header.pack())
+            return True
+        
+        with io_section():
+            with open(input_file, 'rb') as file:
+                content = file.read()
         
         # Wygeneruj strumień klucza
         key_stream = generate_key_stream(key, len(content))
@@ -198,9 +254,10 @@ def stream_encrypt_binary_file(input_file, output_file, key):
         encrypted_bytes = bytearray()
         for i, byte in enumerate(content):
             encrypted_bytes.append(byte ^ key_stream[i])
+        header = new_header("stream", MODE_BINARY, key, len(content))
         
-        with open(output_file, 'wb') as file:
-            file.write(encrypted_bytes)
+        with io_section():
+            write_encrypted(output_file, header, bytes(encrypted_bytes))
         
         return True
     except Exception as e:
@@ -208,6 +265,32 @@ def stream_encrypt_binary_file(input_file, output_file, key):
         return False
 
 
+@instrumented("stream.encrypt_file_chunked", size=file_size)
+def stream_encrypt_file_chunked(input_file, output_file, key, resume=True):
+    """
+    Szyfruje plik porcjami z sumami kontrolnymi (utils.chunked_file)
+    
+    Przerwane szyfrowanie wznawiane jest od ostatniej poprawnej porcji,
+    a uszkodzenie pliku obejmuje tylko jedną porcję.
+    
+    Args:
+        input_file: Ścieżka do pliku wejściowego
+        output_file: Ścieżka do pliku wyjściowego
+        key: Klucz szyfrowania
+        resume: Wznów przerwane szyfrowanie
+        
+    Returns:
+        bool: True jeśli sukces, False jeśli błąd
+    """
+    try:
+        chunked_file.encrypt_file(input_file, output_file, key, "stream", resume=resume)
+        return True
+    except Exception as e:
+        print(f"Błąd podczas szyfrowania pliku: {e}")
+        return False
+
+
+@instrumented("stream.decrypt_binary_file", size=file_size)
 def stream_decrypt_binary_file(input_file, output_file, key):
     """
     Deszyfruje plik binarny (PDF, obrazy, itp.) szyfrem z kluczem bieżącym
@@ -221,8 +304,13 @@ def stream_decrypt_binary_file(input_file, output_file, key):
         bool: True jeśli sukces, False jeśli błąd
     """
     try:
-        with open(input_file, 'rb') as file:
-            content = file.read()
+        header = peek_header(input_file)
+        if header is not None:
+            return _decrypt_with_header(header, input_file, output_file, key)
+        
+        with io_section():
+            with open(input_file, 'rb') as file:
+                content = file.read()
         
         # Wygeneruj strumień klucza
         key_stream = generate_key_stream(key, len(content))
@@ -232,8 +320,9 @@ def stream_decrypt_binary_file(input_file, output_file, key):
         for i, byte in enumerate(content):
             decrypted_bytes.append(byte ^ key_stream[i])
         
-        with open(output_file, 'wb') as file:
-            file.write(decrypted_bytes)
+        with io_section():
+            with atomic_open(output_file) as file:
+                file.write(decrypted_bytes)
         
         return True
     except Exception as e:
@@ -241,6 +330,7 @@ def stream_decrypt_binary_file(input_file, output_file, key):
         return False
 
 
+@instrumented("stream.generate_random_key")
 def generate_random_key(length=32):
     """
     Generuje losowy klucz o określonej długości
@@ -254,6 +344,7 @@ def generate_random_key(length=32):
     return os.urandom(length).hex()
 
 
+@instrumented("stream.validate_key")
 def validate_key(key):
     """
     Sprawdza czy klucz jest prawidłowy
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kryptoanaliza szyfru Vigenère - odtwarzanie klucza
+
+Długość klucza szacowana jest indeksem zgodności (IoC) kolumn i metodą
+Kasiskiego (odległości powtórzonych trigramów), a każda litera klucza
+wyznaczana jest testem chi-kwadrat histogramu kolumny wobec profilu języka
+(utils.caesar_analysis). Histogramy liczone są w NumPy na widokach
+kolumnowych tablicy kodów liter, więc megabajtowe szyfrogramy analizowane
+są w ułamku sekundy.
+"""
+
+import numpy as np
+from utils.caesar_analysis import LANGUAGE_PROFILES
+from utils.profiler import instrumented, section
+
+# Najdłuższy sprawdzany klucz
+DEFAULT_MAX_KEY_LENGTH = 20
+
+# Liczba długości klucza, dla których odtwarzane są klucze
+DEFAULT_LENGTH_CANDIDATES = 3
+
+# Długości, których IoC jest co najmniej tak bliski najlepszemu, uznawane są za
+# równie dobre - wybierana jest najkrótsza (wielokrotności klucza też mają wysoki IoC)
+_IOC_TOLERANCE = 0.9
+
+# Spośród nich pierwszeństwo mają długości, których udział odległości Kasiskiego
+# jest co najmniej tak bliski najlepszemu (przypadkowy wysoki IoC zwykle go nie ma)
+_KASISKI_TOLERANCE = 0.8
+
+_RANDOM_IOC = 1 / 26
+
+# Chi-kwadrat dla wszystkich przesunięć: E[s, c] = p[(c - s) mod 26]
+_SHIFTED_PROFILES = {
+    language: np.array([np.roll(profile, shift) for shift in range(26)])
+    for language, profile in LANGUAGE_PROFILES.items()
+}
+
+
+class KeyCandidate:
+    """Kandydat na klucz z oceną i względną pewnością"""
+
+    __slots__ = ("key", "language", "score", "confidence")
+
+    def __init__(self, key, language, score, confidence=0.0):
+        self.key = key
+        self.language = language
+        self.score = score
+        self.confidence = confidence
+
+    def __repr__(self):
+        return (f"KeyCandidate(key={self.key!r}, language={self.language!r}, "
+                f"score={self.score:.2f}, confidence={self.confidence:.2f})")
+
+
+def letter_codes(text):
+    """
+    Zamienia litery tekstu na kody 0-25
+
+    Klucz przesuwa się na każdej literze (str.isalpha), więc litery spoza
+    A-Z zachowują swoją pozycję z kodem -1.
+
+    Args:
+        text: Szyfrogram
+
+    Returns:
+        np.ndarray: Kody liter (int16)
+    """
+    letters = ''.join(filter(str.isalpha, text))
+    chars = np.frombuffer(letters.encode('utf-32-le'), dtype=np.uint32)
+    codes = np.full(chars.shape, -1, dtype=np.int16)
+    upper = (chars >= ord('A')) & (chars <= ord('Z'))
+    lower = (chars >= ord('a')) & (chars <= ord('z'))
+    codes[upper] = chars[upper] - ord('A')
+    codes[lower] = chars[lower] - ord('a')
+    return codes
+
+
+def column_histograms(codes, length):
+    """
+    Histogramy liter w kolumnach odpowiadających pozycjom klucza
+
+    Args:
+        codes: Kody liter (letter_codes)
+        length: Długość klucza
+
+    Returns:
+        np.ndarray: Macierz length x 26
+    """
+    usable = len(codes) - len(codes) % length
+    # Wiersz macierzy to jeden obrót klucza, kolumna to widok co length-ty znak
+    columns = codes[:usable].reshape(-1, length)
+    offsets = np.arange(length, dtype=np.int32) * 26
+    valid = columns >= 0
+    indices = (columns + offsets)[valid]
+    histograms = np.bincount(indices, minlength=length * 26).reshape(length, 26)
+    # Niepełny ostatni obrót klucza
+    for column, code in enumerate(codes[usable:]):
+        if code >= 0:
+            histograms[column, code] += 1
+    return histograms
+
+
+def index_of_coincidence(histograms):
+    """
+    Średni indeks zgodności kolumn
+
+    Args:
+        histograms: Macierz histogramów kolumn
+
+    Returns:
+        float: IoC (ok. 0.038 dla tekstu losowego, ok. 0.06-0.07 dla języka)
+    """
+    totals = histograms.sum(axis=1)
+    pairs = (histograms * (histograms - 1)).sum(axis=1)
+    usable = totals > 1
+    if not usable.any():
+        return 0.0
+    return float(np.mean(pairs[usable] / (totals[usable] * (totals[usable] - 1))))
+
+
+def kasiski_distances(codes):
+    """
+    Odległości między kolejnymi wystąpieniami powtórzonych trigramów
+
+    Args:
+        codes: Kody liter (letter_codes)
+
+    Returns:
+        np.ndarray: Odległości
+    """
+    if len(codes) < 3:
+        return np.array([], dtype=np.int64)
+    values = codes.astype(np.int32)
+    trigrams = values[:-2] * 676 + values[1:-1] * 26 + values[2:]
+    positions = np.flatnonzero((values[:-2] >= 0) & (values[1:-1] >= 0) & (values[2:] >= 0))
+    trigrams = trigrams[positions]
+    order = np.argsort(trigrams, kind='stable')
+    sorted_trigrams = trigrams[order]
+    sorted_positions = positions[order]
+    repeated = sorted_trigrams[1:] == sorted_trigrams[:-1]
+    return (sorted_positions[1:] - sorted_positions[:-1])[repeated]
+
+
+@instrumented("vigenere.estimate_key_lengths")
+def estimate_key_lengths(codes, max_length=DEFAULT_MAX_KEY_LENGTH):
+    """
+    Szacuje długość klucza (IoC + metoda Kasiskiego)
+
+    Args:
+        codes: Kody liter (letter_codes)
+        max_length: Najdłuższy sprawdzany klucz
+
+    Returns:
+        list: Krotki (długość, IoC, udział odległości Kasiskiego) od najbardziej
+              prawdopodobnej
+    """
+    max_length = max(1, min(max_length, len(codes) // 2 or 1))
+    with section("vigenere.ioc"):
+        iocs = {length: index_of_coincidence(column_histograms(codes, length))
+                for length in range(1, max_length + 1)}
+    with section("vigenere.kasiski"):
+        distances = kasiski_distances(codes)
+        kasiski = {length: float(np.mean(distances % length == 0)) if len(distances) else 0.0
+                   for length in iocs}
+
+    best_ioc = max(iocs.values())
+    threshold = _RANDOM_IOC + _IOC_TOLERANCE * (best_ioc - _RANDOM_IOC)
+    best_kasiski = max(kasiski[length] for length in iocs if iocs[length] >= threshold)
+
+    def rank(length):
+        # Najpierw długości o IoC bliskim najlepszemu, wśród nich te potwierdzone
+        # metodą Kasiskiego, a dalej najkrótsze
+        return (iocs[length] < threshold,
+                kasiski[length] < _KASISKI_TOLERANCE * best_kasiski,
+                length)
+
+    return [(length, iocs[length], kasiski[length]) for length in sorted(iocs, key=rank)]
+
+
+def _minimal_period(key):
+    for period in range(1, len(key)):
+        if len(key) % period == 0 and key[:period] * (len(key) // period) == key:
+            return key[:period]
+    return key
+
+
+def recover_key(codes, length, language):
+    """
+    Odtwarza klucz o podanej długości dla języka
+
+    Args:
+        codes: Kody liter (letter_codes)
+        length: Długość klucza
+        language: Klucz LANGUAGE_PROFILES
+
+    Returns:
+        tuple: (klucz, średni chi-kwadrat na kolumnę)
+    """
+    histograms = column_histograms(codes, length).astype(np.float64)
+    totals = histograms.sum(axis=1, keepdims=True)
+    totals[totals == 0] = 1
+    # expected[kolumna, przesunięcie, litera]
+    expected = totals[:, None, :] * _SHIFTED_PROFILES[language][None, :, :]
+    scores = ((histograms[:, None, :] - expected) ** 2 / expected).sum(axis=2)
+    shifts = scores.argmin(axis=1)
+    key = ''.join(chr(ord('A') + shift) for shift in shifts)
+    return key, float(scores[np.arange(length), shifts].mean())
+
+
+@instrumented("vigenere.crack")
+def rank_keys(text, languages=("pl", "en"), max_length=DEFAULT_MAX_KEY_LENGTH,
+              length_candidates=DEFAULT_LENGTH_CANDIDATES):
+    """
+    Wyznacza kandydatów na klucz szyfrogramu Vigenère
+
+    Args:
+        text: Szyfrogram
+        languages: Klucze LANGUAGE_PROFILES
+        max_length: Najdłuższy sprawdzany klucz
+        length_candidates: Liczba najbardziej prawdopodobnych długości klucza
+
+    Returns:
+        list: KeyCandidate od najlepszego; pewności sumują się do 1
+
+    Raises:
+        ValueError: Gdy tekst nie zawiera liter lub język jest nieznany
+    """
+    for language in languages:
+        if language not in LANGUAGE_PROFILES:
+            raise ValueError(f"Nieznany język: {language}")
+    codes = letter_codes(text)
+    if not (codes >= 0).any():
+        raise ValueError("Tekst nie zawiera liter do analizy")
+
+    lengths = estimate_key_lengths(codes, max_length)[:length_candidates]
+    candidates = {}
+    for rank, (length, _, _) in enumerate(lengths):
+        for language in languages:
+            key, score = recover_key(codes, length, language)
+            key = _minimal_period(key)
+            # Kolejność długości z estymacji liczy się przy zbliżonych wynikach
+            score *= 1 + 0.1 * rank
+            if key not in candidates or score < candidates[key].score:
+                candidates[key] = KeyCandidate(key, language, score)
+
+    ranked = sorted(candidates.values(), key=lambda candidate: candidate.score)
+    # Pewność względna: wagi maleją wykładniczo z wynikiem względem najlepszego
+    best = max(ranked[0].score, 1e-9)
+    weights = [np.exp(-4 * (candidate.score / best - 1)) for candidate in ranked]
+    total = sum(weights)
+    for candidate, weight in zip(ranked, weights):
+        candidate.confidence = float(weight / total)
+    return ranked
@@ -4,6 +4,16 @@
 Implementacja szyfru Vigenère
 """
 
+import os
+from utils.atomic_write import atomic_open
+from utils.file_header import (MODE_BINARY, MODE_TEXT, new_header, peek_header, check_header,
+                               check_length, read_encrypted, text_payload, write_encrypted,
+                               write_output)
+from utils.pipeline import ByteShiftTransform, run_pipeline, use_pipeline
+from utils.profiler import instrumented, io_section, file_size
+
+
+@instrumented("vigenere.encrypt")
 def vigenere_encrypt(text, key):
     """
     Szyfruje tekst szyfrem Vigenère
@@ -45,6 +55,7 @@ def vigenere_encrypt(text, key):
     return result
 
 
+@instrumented("vigenere.decrypt")
 def vigenere_decrypt(text, key):
     """
     Deszyfruje tekst szyfrem Vigenère
@@ -86,6 +97,68 @@ def vigenere_decrypt(text, key):
     return result
 
 
+def vigenere_shift_bytes(data, key, decrypt=False):
+    """
+    Przesuwa bajty zgodnie z kluczem Vigenère modulo 256 (pliki binarne)
+    
+    Args:
+        data: Bajty do przekształcenia
+        key: Klucz (liczą się tylko litery)
+        decrypt: True dla przesunięcia odwrotnego
+        
+    Returns:
+        bytes: Przekształcone bajty
+    """
+    letters = clean_key(key)
+    if not letters:
+        raise ValueError("Klucz musi zawierać przynajmniej jedną literę")
+    
+    data = bytes(data)
+    result = bytearray(len(data))
+    step = len(letters)
+    # Bajty o tej samej pozycji klucza przesuwane są jedną tablicą
+    for index, letter in enumerate(letters):
+        shift = ord(letter) - ord('A')
+        if decrypt:
+            shift = -shift
+        table = bytes((byte + shift) % 256 for byte in range(256))
+        result[index::step] = data[index::step].translate(table)
+    return bytes(result)
+
+
+def clean_key(key):
+    """Klucz w postaci używanej do szyfrowania - tylko litery, wielkie"""
+    return ''.join(c.upper() for c in key if c.isalpha())
+
+
+def _shift_transform(key, decrypt=False):
+    """Przekształcenie potoku (utils.pipeline) dla plików binarnych"""
+    return ByteShiftTransform([ord(letter) - ord('A') for letter in clean_key(key)], decrypt)
+
+
+def _decrypt_with_header(header, input_file, output_file, key):
+    """Deszyfruje plik z nagłówkiem w trybie zapisanym w nagłówku"""
+    check_header(header, "vigenere", clean_key(key))
+    if header.binary and use_pipeline(header.plaintext_length):
+        run_pipeline(input_file, output_file, _shift_transform(key, decrypt=True),
+                     input_offset=header.size, expected_length=header.plaintext_length)
+        return True
+    
+    with io_section():
+        _, content = read_encrypted(input_file)
+    
+    if header.binary:
+        decrypted = vigenere_shift_bytes(content, key, decrypt=True)
+        check_length(header, decrypted)
+    else:
+        decrypted = vigenere_decrypt(text_payload(content), key)
+    
+    with io_section():
+        write_output(output_file, decrypted)
+    return True
+
+
+@instrumented("vigenere.encrypt_file", size=file_size)
 def vigenere_encrypt_file(input_file, output_file, key):
     """
     Szyfruje plik szyfrem Vigenère
@@ -99,13 +172,15 @@ def vigenere_encrypt_file(input_file, output_file, key):
         bool: True jeśli sukces, False jeśli błąd
     """
     try:
-        with open(input_file, 'r', encoding='utf-8') as file:
-            content = file.read()
+        with io_section():
+            with open(input_file, 'r', encoding='utf-8') as file:
+                content = file.read()
         
         encrypted_content = vigenere_encrypt(content, key)
+        header = new_header("vigenere", MODE_TEXT, clean_key(key), os.path.getsize(input_file))
         
-        with open(output_file, 'w', encoding='utf-8') as file:
-            file.write(encrypted_content)
+        with io_section():
+            write_encrypted(output_file, header, encrypted_content)
         
         return True
     except Exception as e:
@@ -113,6 +188,7 @@ def vigenere_encrypt_file(input_file, output_file, key):
         return False
 
 
+@instrumented("vigenere.decrypt_file", size=file_size)
 def vigenere_decrypt_file(input_file, output_file, key):
     """
     Deszyfruje plik szyfrem Vigenère
@@ -126,13 +202,19 @@ def vigenere_decrypt_file(input_file, output_file, key):
         bool: True jeśli sukces, False jeśli błąd
     """
     try:
-        with open(input_file, 'r', encoding='utf-8') as file:
-            content = file.read()
+        header = peek_header(input_file)
+        if header is not None:
+            return _decrypt_with_header(header, input_file, output_file, key)
+        
+        with io_section():
+            with open(input_file, 'r', encoding='utf-8') as file:
+                content = file.read()
         
         decrypted_content = vigenere_decrypt(content, key)
         
-        with open(output_file, 'w', encoding='utf-8') as file:
-            file.write(decrypted_content)
+        with io_section():
+            with atomic_open(output_file, 'w', encoding='utf-8') as file:
+                file.write(decrypted_content)
         
         return True
     except Exception as e:
@@ -140,6 +222,7 @@ def vigenere_decrypt_file(input_file, output_file, key):
         return False
 
 
+@instrumented("vigenere.encrypt_binary_file", size=file_size)
 def vigenere_encrypt_binary_file(input_file, output_file, key):
     """
     Szyfruje plik binarny (PDF, obrazy, itp.) szyfrem Vigenère na poziomie bajtów
@@ -153,27 +236,22 @@ def vigenere_encrypt_binary_file(input_file, output_file, key):
         bool: True jeśli sukces, False jeśli błąd
     """
     try:
-        with open(input_file, 'rb') as file:
-            content = file.read()
-        
-        # Oczyść klucz - tylko litery
-        clean_key = ''.join(c.upper() for c in key if c.isalpha())
-        if not clean_key:
-            raise ValueError("Klucz musi zawierać przynajmniej jedną literę")
-        
-        # Szyfruj każdy bajt osobno
-        encrypted_bytes = bytearray()
-        key_index = 0
-        
-        for byte in content:
-            # Zastosuj przesunięcie na podstawie klucza
-            shift = ord(clean_key[key_index % len(clean_key)]) - ord('A')
-            encrypted_byte = (byte + shift) % 256
-            encrypted_bytes.append(encrypted_byte)
-            key_index += 1
+        size = os.path.getsize(input_file)
+        if use_pipeline(size):
+            header = new_header("vigenere", MODE_BINARY, clean_key(key), size)
+            run_pipeline(input_file, output_file, _shift_transform(key), header.pack())
+            return True
+        
+        with io_section():
+            with open(input_file, 'rb') as file:
+                content = file.read()
+        
+        # Szyfruj każdy bajt przesunięciem z klucza
+        encrypted_bytes = vigenere_shift_bytes(content, key)
+        header = new_header("vigenere", MODE_BINARY, clean_key(key), len(content))
         
-        with open(output_file, 'wb') as file:
-            file.write(encrypted_bytes)
+        with io_section():
+            write_encrypted(output_file, header, encrypted_bytes)
         
         return True
     except Exception as e:
@@ -181,6 +259,7 @@ def vigenere_encrypt_binary_file(input_file, output_file, key):
         return False
 
 
+@instrumented("vigenere.decrypt_binary_file", size=file_size)
 def vigenere_decrypt_binary_file(input_file, output_file, key):
     """
     Deszyfruje plik binarny (PDF, obrazy, itp.) szyfrem Vigenère na poziomie bajtów
@@ -194,27 +273,20 @@ def vigenere_decrypt_binary_file(input_file, output_file, key):
         bool: True jeśli sukces, False jeśli błąd
     """
     try:
-        with open(input_file, 'rb') as file:
-            content = file.read()
-        
-        # Oczyść klucz - tylko litery
-        clean_key = ''.join(c.upper() for c in key if c.isalpha())
-        if not clean_key:
-            raise ValueError("Klucz musi zawierać przynajmniej jedną literę")
-        
-        # Deszyfruj każdy bajt osobno
-        decrypted_bytes = bytearray()
-        key_index = 0
-        
-        for byte in content:
-            # Zastosuj odwrotne przesunięcie na podstawie klucza
-            shift = ord(clean_key[key_index % len(clean_key)]) - ord('A')
-            decrypted_byte = (byte - shift) % 256
-            decrypted_bytes.append(decrypted_byte)
-            key_index += 1
+        header = peek_header(input_file)
+        if header is not None:
+            return _decrypt_with_header(header, input_file, output_file, key)
+        
+        with io_section():
+            with open(input_file, 'rb') as file:
+                content = file.read()
+        
+        # Deszyfruj każdy bajt odwrotnym przesunięciem z klucza
+        decrypted_bytes = vigenere_shift_bytes(content, key, decrypt=True)
         
-        with open(output_file, 'wb') as file:
-            file.write(decrypted_bytes)
+        with io_section():
+            with atomic_open(output_file) as file:
+                file.write(decrypted_bytes)
         
         return True
     except Exception as e:
@@ -1,2 +1,66 @@
 # Views package
+"""
+Leniwe ładowanie okien aplikacji
 
+Moduły widoków (i ich zależności, np. implementacje szyfrów) są importowane
+dopiero przy pierwszym otwarciu okna, dzięki czemu przed pierwszym
+wyświetleniem głównego okna ładowany jest tylko CryptoApp.
+"""
+
+import importlib
+
+# (szyfr, typ danych, operacja) -> (moduł, klasa okna)
+CIPHER_VIEWS = {
+    ("caesar", "text", "encrypt"): ("views.encrypt_text", "EncryptTextWindow"),
+    ("caesar", "text", "decrypt"): ("views.decrypt_text", "DecryptTextWindow"),
+    ("caesar", "file", "encrypt"): ("views.encrypt_file", "EncryptFileWindow"),
+    ("caesar", "file", "decrypt"): ("views.decrypt_file", "DecryptFileWindow"),
+    ("vigenere", "text", "encrypt"): ("views.encrypt_text_vigenere", "EncryptTextVigenereWindow"),
+    ("vigenere", "text", "decrypt"): ("views.decrypt_text_vigenere", "DecryptTextVigenereWindow"),
+    ("vigenere", "file", "encrypt"): ("views.encrypt_file_vigenere", "EncryptFileVigenereWindow"),
+    ("vigenere", "file", "decrypt"): ("views.decrypt_file_vigenere", "DecryptFileVigenereWindow"),
+    ("stream", "text", "encrypt"): ("views.encrypt_text_stream", "EncryptTextStreamWindow"),
+    ("stream", "text", "decrypt"): ("views.decrypt_text_stream", "DecryptTextStreamWindow"),
+    ("stream", "file", "encrypt"): ("views.encrypt_file_stream", "EncryptFileStreamWindow"),
+    ("stream", "file", "decrypt"): ("views.decrypt_file_stream", "DecryptFileStreamWindow"),
+    ("aes", "text", "encrypt"): ("views.encrypt_text_aes", "AESEncryptTextWindow"),
+    ("aes", "text", "decrypt"): ("views.decrypt_text_aes", "AESDecryptTextWindow"),
+    ("aes", "file", "encrypt"): ("views.encrypt_file_aes", "AESEncryptFileWindow"),
+    ("aes", "file", "decrypt"): ("views.decrypt_file_aes", "AESDecryptFileWindow"),
+}
+
+_loaded = {}
+
+
+def load_class(module_name, class_name):
+    """
+    Importuje moduł przy pierwszym użyciu i zwraca klasę okna
+    
+    Args:
+        module_name: Pełna nazwa modułu (np. "views.choice_window")
+        class_name: Nazwa klasy w module
+        
+    Returns:
+        Klasa okna
+    """
+    key = (module_name, class_name)
+    view_class = _loaded.get(key)
+    if view_class is None:
+        module = importlib.import_module(module_name)
+        view_class = _loaded[key] = getattr(module, class_name)
+    return view_class
+
+
+def load_cipher_view(cipher, data_type, operation_type):
+    """
+    Zwraca klasę okna dla szyfru, typu danych i operacji
+    
+    Args:
+        cipher: "caesar", "vigenere", "stream" lub "aes"
+        data_type: "text" lub "file"
+        operation_type: "encrypt" lub "decrypt"
+        
+    Returns:
+        Klasa okna
+    """
+    return load_class(*CIPHER_VIEWS[(cipher, data_type, operation_type)])
@@ -4,10 +4,10 @@
 Okno wyboru między szyfrowaniem/deszyfrowaniem tekstu a pliku
 """
 
-from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QPushButton, QLabel, QFrame)
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QLabel)
 from PyQt5.QtGui import QFont
+from views.theme import make_button, make_title, make_frame, set_variant
 from utils.logger import app_logger
 
 
@@ -19,7 +19,6 @@ class ChoiceWindow(QMainWindow):
         self.parent = parent
         self.operation_type = operation_type  # "encrypt" lub "decrypt"
         self.init_ui()
-        self.setup_styles()
         
     def init_ui(self):
         """Inicjalizacja interfejsu użytkownika"""
@@ -40,32 +39,11 @@ class ChoiceWindow(QMainWindow):
         
         # Tytuł
         icon = "🔒" if self.operation_type == "encrypt" else "🔓"
-        title_label = QLabel(f"{icon} {operation_name}")
-        title_label.setAlignment(Qt.AlignCenter)
-        title_label.setFont(QFont("Arial", 20, QFont.Bold))
-        title_label.setStyleSheet("""
-            QLabel {
-                color: #2c3e50;
-                margin: 20px 0;
-                padding: 15px;
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #3498db, stop:1 #2980b9);
-                border-radius: 10px;
-                color: white;
-            }
-        """)
+        title_label = make_title(f"{icon} {operation_name}", "banner", font_size=20)
         main_layout.addWidget(title_label)
         
         # Ramka z opcjami
-        options_frame = QFrame()
-        options_frame.setFrameStyle(QFrame.StyledPanel)
-        options_frame.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 15px;
-             
-            }
-        """)
+        options_frame = make_frame()
         options_layout = QVBoxLayout(options_frame)
         options_layout.setSpacing(20)
         options_layout.setContentsMargins(40, 30, 40, 30)
@@ -73,33 +51,13 @@ class ChoiceWindow(QMainWindow):
         # Opcja tekst
         text_option_layout = QHBoxLayout()
         
-        self.text_btn = QPushButton("📝 Tekst")
-        self.text_btn.setMinimumSize(150, 80)
-        self.text_btn.setFont(QFont("Arial", 14, QFont.Bold))
-        self.text_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #27ae60, stop:1 #229954);
-                color: white;
-                border: none;
-                border-radius: 15px;
-                padding: 15px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #229954, stop:1 #1e8449);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #1e8449, stop:1 #196f3d);
-            }
-        """)
+        self.text_btn = make_button("📝 Tekst", "tile-green", min_size=(150, 80), font_size=14)
         self.text_btn.clicked.connect(self.open_text_window)
         text_option_layout.addWidget(self.text_btn)
         
         text_desc = QLabel("Szyfruj/deszyfruj bezpośrednio tekst w aplikacji")
         text_desc.setFont(QFont("Arial", 10))
-        text_desc.setStyleSheet("QLabel { color: #7f8c8d; }")
+        set_variant(text_desc, "muted")
         text_desc.setWordWrap(True)
         text_option_layout.addWidget(text_desc)
         
@@ -108,33 +66,13 @@ class ChoiceWindow(QMainWindow):
         # Opcja plik
         file_option_layout = QHBoxLayout()
         
-        self.file_btn = QPushButton("📁 Plik")
-        self.file_btn.setMinimumSize(150, 80)
-        self.file_btn.setFont(QFont("Arial", 14, QFont.Bold))
-        self.file_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #e74c3c, stop:1 #c0392b);
-                color: white;
-                border: none;
-                border-radius: 15px;
-                padding: 15px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #c0392b, stop:1 #a93226);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #a93226, stop:1 #922b21);
-            }
-        """)
+        self.file_btn = make_button("📁 Plik", "tile-red", min_size=(150, 80), font_size=14)
         self.file_btn.clicked.connect(self.open_file_window)
         file_option_layout.addWidget(self.file_btn)
         
         file_desc = QLabel("Szyfruj/deszyfruj pliki z dysku")
         file_desc.setFont(QFont("Arial", 10))
-        file_desc.setStyleSheet("QLabel { color: #7f8c8d; }")
+        set_variant(file_desc, "muted")
         file_desc.setWordWrap(True)
         file_option_layout.addWidget(file_desc)
         
@@ -145,44 +83,21 @@ class ChoiceWindow(QMainWindow):
         # Przycisk powrotu
         back_layout = QHBoxLayout()
         
-        self.back_btn = QPushButton("⬅️ Powrót")
-        self.back_btn.setMinimumSize(120, 40)
-        self.back_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.back_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #95a5a6, stop:1 #7f8c8d);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #7f8c8d, stop:1 #6c7b7d);
-            }
-        """)
+        self.back_btn = make_button("⬅️ Powrót", "gray")
         self.back_btn.clicked.connect(self.go_back)
         back_layout.addWidget(self.back_btn)
         
         back_layout.addStretch()
         main_layout.addLayout(back_layout)
         
-    def setup_styles(self):
-        """Ustawienie stylów okna"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #ecf0f1, stop:1 #bdc3c7);
-            }
-        """)
-        
     def open_text_window(self):
         """Otwiera okno wyboru szyfru dla tekstu"""
         app_logger.log_user_action(f"wybrano {self.operation_type} tekstu")
         app_logger.log_window_open("CipherChoiceWindow (tekst)")
         from .cipher_choice_window import CipherChoiceWindow
-        self.cipher_choice_window = CipherChoiceWindow(self, self.operation_type, "text")
+        from .navigator import window_registry
+        self.cipher_choice_window = window_registry.get(
+            self, "text", lambda: CipherChoiceWindow(self, self.operation_type, "text"))
         self.cipher_choice_window.show()
         self.hide()
         
@@ -191,7 +106,9 @@ class ChoiceWindow(QMainWindow):
         app_logger.log_user_action(f"wybrano {self.operation_type} pliku")
         app_logger.log_window_open("CipherChoiceWindow (plik)")
         from .cipher_choice_window import CipherChoiceWindow
-        self.cipher_choice_window = CipherChoiceWindow(self, self.operation_type, "file")
+        from .navigator import window_registry
+        self.cipher_choice_window = window_registry.get(
+            self, "file", lambda: CipherChoiceWindow(self, self.operation_type, "file"))
         self.cipher_choice_window.show()
         self.hide()
         
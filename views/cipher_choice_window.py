@@ -4,10 +4,9 @@
 Okno wyboru typu szyfrowania
 """
 
-from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QPushButton, QLabel, QFrame, QGridLayout)
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QGridLayout)
+from views.theme import make_button, make_title, make_frame
 
 
 class CipherChoiceWindow(QMainWindow):
@@ -19,7 +18,6 @@ class CipherChoiceWindow(QMainWindow):
         self.operation_type = operation_type  # "encrypt" lub "decrypt"
         self.data_type = data_type  # "text" lub "file"
         self.init_ui()
-        self.setup_styles()
         
     def init_ui(self):
         """Inicjalizacja interfejsu użytkownika"""
@@ -43,136 +41,32 @@ class CipherChoiceWindow(QMainWindow):
         # Tytuł
         icon = "🔒" if self.operation_type == "encrypt" else "🔓"
         data_icon = "📝" if self.data_type == "text" else "📁"
-        title_label = QLabel(f"{icon} {operation_name} {data_name}")
-        title_label.setAlignment(Qt.AlignCenter)
-        title_label.setFont(QFont("Arial", 20, QFont.Bold))
-        title_label.setStyleSheet("""
-            QLabel {
-                color: #2c3e50;
-                margin: 20px 0;
-                padding: 15px;
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #3498db, stop:1 #2980b9);
-                border-radius: 10px;
-                color: white;
-            }
-        """)
+        title_label = make_title(f"{icon} {operation_name} {data_name}", "banner", font_size=20)
         main_layout.addWidget(title_label)
         
         # Ramka z opcjami szyfrowania
-        options_frame = QFrame()
-        options_frame.setFrameStyle(QFrame.StyledPanel)
-        options_frame.setStyleSheet("""
-            QFrame {
-                background: white;
-                border-radius: 15px;
-            }
-        """)
+        options_frame = make_frame()
         options_layout = QGridLayout(options_frame)
         options_layout.setSpacing(30)
         options_layout.setContentsMargins(40, 30, 40, 30)
         
         # Szyfr Cezara
-        self.caesar_btn = QPushButton("Szyfr Cezara")
-        self.caesar_btn.setMinimumSize(200, 150)
-        self.caesar_btn.setFont(QFont("Arial", 16, QFont.Bold))
-        self.caesar_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #27ae60, stop:1 #229954);
-                color: white;
-                border: none;
-                border-radius: 15px;
-                padding: 20px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #229954, stop:1 #1e8449);
-                transform: scale(1.05);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #1e8449, stop:1 #196f3d);
-            }
-        """)
+        self.caesar_btn = make_button("Szyfr Cezara", "tile-green", min_size=(200, 150), font_size=16)
         self.caesar_btn.clicked.connect(self.open_caesar_window)
         options_layout.addWidget(self.caesar_btn, 0, 0)
         
         # Szyfr Vigenère
-        self.vigenere_btn = QPushButton("Szyfr Vigenère")
-        self.vigenere_btn.setMinimumSize(200, 150)
-        self.vigenere_btn.setFont(QFont("Arial", 16, QFont.Bold))
-        self.vigenere_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #9b59b6, stop:1 #8e44ad);
-                color: white;
-                border: none;
-                border-radius: 15px;
-                padding: 20px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #8e44ad, stop:1 #7d3c98);
-                transform: scale(1.05);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #7d3c98, stop:1 #6c3483);
-            }
-        """)
+        self.vigenere_btn = make_button("Szyfr Vigenère", "tile-purple", min_size=(200, 150), font_size=16)
         self.vigenere_btn.clicked.connect(self.open_vigenere_window)
         options_layout.addWidget(self.vigenere_btn, 0, 1)
         
         # Szyfr z kluczem bieżącym
-        self.stream_btn = QPushButton("Szyfr z kluczem\nbieżącym")
-        self.stream_btn.setMinimumSize(200, 150)
-        self.stream_btn.setFont(QFont("Arial", 16, QFont.Bold))
-        self.stream_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #e67e22, stop:1 #d35400);
-                color: white;
-                border: none;
-                border-radius: 15px;
-                padding: 20px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #d35400, stop:1 #ba4a00);
-                transform: scale(1.05);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #ba4a00, stop:1 #a04000);
-            }
-        """)
+        self.stream_btn = make_button("Szyfr z kluczem\nbieżącym", "tile-carrot", min_size=(200, 150), font_size=16)
         self.stream_btn.clicked.connect(self.open_stream_window)
         options_layout.addWidget(self.stream_btn, 0, 2)
         
         # Szyfr AES
-        self.aes_btn = QPushButton("🔐 AES")
-        self.aes_btn.setMinimumSize(200, 150)
-        self.aes_btn.setFont(QFont("Arial", 16, QFont.Bold))
-        self.aes_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #e74c3c, stop:1 #c0392b);
-                color: white;
-                border: none;
-                border-radius: 15px;
-                padding: 20px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #c0392b, stop:1 #a93226);
-                transform: scale(1.05);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #a93226, stop:1 #922b21);
-            }
-        """)
+        self.aes_btn = make_button("🔐 AES", "tile-red", min_size=(200, 150), font_size=16)
         self.aes_btn.clicked.connect(self.open_aes_window)
         options_layout.addWidget(self.aes_btn, 1, 0)
         
@@ -243,114 +137,35 @@ class CipherChoiceWindow(QMainWindow):
         # Przycisk powrotu
         back_layout = QHBoxLayout()
         
-        self.back_btn = QPushButton("⬅️ Powrót")
-        self.back_btn.setMinimumSize(120, 40)
-        self.back_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.back_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #95a5a6, stop:1 #7f8c8d);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #7f8c8d, stop:1 #6c7b7d);
-            }
-        """)
+        self.back_btn = make_button("⬅️ Powrót", "gray")
         self.back_btn.clicked.connect(self.go_back)
         back_layout.addWidget(self.back_btn)
         
         back_layout.addStretch()
         main_layout.addLayout(back_layout)
         
-    def setup_styles(self):
-        """Ustawienie stylów okna"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #ecf0f1, stop:1 #bdc3c7);
-            }
-        """)
-        
     def open_caesar_window(self):
         """Otwiera okno szyfrowania/deszyfrowania szyfrem Cezara"""
-        if self.data_type == "text":
-            if self.operation_type == "encrypt":
-                from .encrypt_text import EncryptTextWindow
-                self.cipher_window = EncryptTextWindow(self)
-            else:
-                from .decrypt_text import DecryptTextWindow
-                self.cipher_window = DecryptTextWindow(self)
-        else:  # file
-            if self.operation_type == "encrypt":
-                from .encrypt_file import EncryptFileWindow
-                self.cipher_window = EncryptFileWindow(self)
-            else:
-                from .decrypt_file import DecryptFileWindow
-                self.cipher_window = DecryptFileWindow(self)
-        
-        self.cipher_window.show()
-        self.hide()
+        self.open_cipher_window("caesar")
         
     def open_vigenere_window(self):
         """Otwiera okno szyfrowania/deszyfrowania szyfrem Vigenère"""
-        if self.data_type == "text":
-            if self.operation_type == "encrypt":
-                from .encrypt_text_vigenere import EncryptTextVigenereWindow
-                self.cipher_window = EncryptTextVigenereWindow(self)
-            else:
-                from .decrypt_text_vigenere import DecryptTextVigenereWindow
-                self.cipher_window = DecryptTextVigenereWindow(self)
-        else:  # file
-            if self.operation_type == "encrypt":
-                from .encrypt_file_vigenere import EncryptFileVigenereWindow
-                self.cipher_window = EncryptFileVigenereWindow(self)
-            else:
-                from .decrypt_file_vigenere import DecryptFileVigenereWindow
-                self.cipher_window = DecryptFileVigenereWindow(self)
-        
-        self.cipher_window.show()
-        self.hide()
+        self.open_cipher_window("vigenere")
         
     def open_stream_window(self):
         """Otwiera okno szyfrowania/deszyfrowania szyfrem z kluczem bieżącym"""
-        if self.data_type == "text":
-            if self.operation_type == "encrypt":
-                from .encrypt_text_stream import EncryptTextStreamWindow
-                self.cipher_window = EncryptTextStreamWindow(self)
-            else:
-                from .decrypt_text_stream import DecryptTextStreamWindow
-                self.cipher_window = DecryptTextStreamWindow(self)
-        else:  # file
-            if self.operation_type == "encrypt":
-                from .encrypt_file_stream import EncryptFileStreamWindow
-                self.cipher_window = EncryptFileStreamWindow(self)
-            else:
-                from .decrypt_file_stream import DecryptFileStreamWindow
-                self.cipher_window = DecryptFileStreamWindow(self)
-        
-        self.cipher_window.show()
-        self.hide()
+        self.open_cipher_window("stream")
         
     def open_aes_window(self):
         """Otwiera okno szyfrowania/deszyfrowania szyfrem AES"""
-        if self.data_type == "text":
-            if self.operation_type == "encrypt":
-                from .encrypt_text_aes import AESEncryptTextWindow
-                self.cipher_window = AESEncryptTextWindow()
-            else:
-                from .decrypt_text_aes import AESDecryptTextWindow
-                self.cipher_window = AESDecryptTextWindow()
-        else:  # file
-            if self.operation_type == "encrypt":
-                from .encrypt_file_aes import AESEncryptFileWindow
-                self.cipher_window = AESEncryptFileWindow()
-            else:
-                from .decrypt_file_aes import AESDecryptFileWindow
-                self.cipher_window = AESDecryptFileWindow()
+        self.open_cipher_window("aes")
+        
+    def open_cipher_window(self, cipher):
+        """Pokazuje okno wybranego szyfru (tworzone i ładowane przy pierwszym użyciu)"""
+        from views import load_cipher_view
+        from views.navigator import window_registry
+        window_class = load_cipher_view(cipher, self.data_type, self.operation_type)
+        self.cipher_window = window_registry.get(self, cipher, lambda: window_class(self))
         
         self.cipher_window.show()
         self.hide()
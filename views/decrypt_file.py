@@ -5,23 +5,27 @@ Okno deszyfrowania pliku
 """
 
 import os
-from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QPushButton, QLabel, QLineEdit, QFileDialog, 
-                             QMessageBox, QApplication, QTextEdit, QComboBox,
-                             QGroupBox, QGridLayout)
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QLabel, QFileDialog, QMessageBox)
 from PyQt5.QtGui import QFont
+from views.theme import (make_button, make_title, make_line_edit,
+                         make_text_edit, make_group)
+from views.file_drop import FileDropMixin
 from utils.caesar_cipher import caesar_decrypt_file, caesar_decrypt_binary_file
+from utils.preview import load_preview, render_preview
 
 
-class DecryptFileWindow(QMainWindow):
+class DecryptFileWindow(FileDropMixin, QMainWindow):
     """Okno deszyfrowania pliku"""
     
+    batch_cipher = "caesar"
+    batch_operation = "decrypt"
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
         self.init_ui()
-        self.setup_styles()
+        self.enable_file_drop(self.file_input, self.shift_input)
         
     def is_binary_file(self, file_path):
         """Sprawdza czy plik jest binarny (PDF, obrazy, itp.)"""
@@ -48,38 +52,12 @@ class DecryptFileWindow(QMainWindow):
         layout.setContentsMargins(30, 30, 30, 30)
         
         # Tytuł
-        title = QLabel("🔓 Deszyfrowanie Pliku")
-        title.setAlignment(Qt.AlignCenter)
-        title.setFont(QFont("Arial", 18, QFont.Bold))
-        title.setStyleSheet("""
-            QLabel {
-                color: #e74c3c;
-                padding: 10px;
-                background: white;
-                border-radius: 10px;
-                border: 2px solid #e74c3c;
-            }
-        """)
+        title = make_title("🔓 Deszyfrowanie Pliku", "title-red")
         layout.addWidget(title)
         
         # Sekcja wyboru pliku
-        file_group = QGroupBox("📁 Wybór pliku")
+        file_group = make_group("📁 Wybór pliku")
         file_group.setFont(QFont("Arial", 12, QFont.Bold))
-        file_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #bdc3c7;
-                border-radius: 10px;
-                margin-top: 10px;
-                padding-top: 10px;
-                background: white;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """)
         file_layout = QVBoxLayout(file_group)
         file_layout.setSpacing(10)
         
@@ -89,37 +67,11 @@ class DecryptFileWindow(QMainWindow):
         
         file_input_layout = QHBoxLayout()
         
-        self.file_input = QLineEdit()
-        self.file_input.setPlaceholderText("Wybierz zaszyfrowany plik...")
+        self.file_input = make_line_edit("Wybierz zaszyfrowany plik...")
         self.file_input.setReadOnly(True)
-        self.file_input.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #bdc3c7;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 12px;
-                background: white;
-            }
-        """)
         file_input_layout.addWidget(self.file_input)
         
-        self.browse_btn = QPushButton("📁 Przeglądaj")
-        self.browse_btn.setMinimumSize(120, 40)
-        self.browse_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.browse_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #3498db, stop:1 #2980b9);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #2980b9, stop:1 #21618c);
-            }
-        """)
+        self.browse_btn = make_button("📁 Przeglądaj", "blue")
         self.browse_btn.clicked.connect(self.browse_file)
         file_input_layout.addWidget(self.browse_btn)
         
@@ -127,23 +79,8 @@ class DecryptFileWindow(QMainWindow):
         layout.addWidget(file_group)
         
         # Sekcja opcji szyfru Cezara
-        cipher_group = QGroupBox("🔤 Opcje szyfru Cezara")
+        cipher_group = make_group("🔤 Opcje szyfru Cezara")
         cipher_group.setFont(QFont("Arial", 12, QFont.Bold))
-        cipher_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #bdc3c7;
-                border-radius: 10px;
-                margin-top: 10px;
-                padding-top: 10px;
-                background: white;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """)
         cipher_layout = QVBoxLayout(cipher_group)
         cipher_layout.setSpacing(10)
         
@@ -152,22 +89,8 @@ class DecryptFileWindow(QMainWindow):
         cipher_layout.addWidget(shift_label)
         
         shift_layout = QHBoxLayout()
-        self.shift_input = QLineEdit()
-        self.shift_input.setPlaceholderText("Wprowadź przesunięcie (1-25)")
+        self.shift_input = make_line_edit("Wprowadź przesunięcie (1-25)", max_width=150)
         self.shift_input.setText("3")
-        self.shift_input.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #bdc3c7;
-                border-radius: 8px;
-                padding: 8px;
-                font-size: 11px;
-                background: white;
-                max-width: 150px;
-            }
-            QLineEdit:focus {
-                border-color: #3498db;
-            }
-        """)
         shift_layout.addWidget(self.shift_input)
         shift_layout.addStretch()
         cipher_layout.addLayout(shift_layout)
@@ -178,86 +101,23 @@ class DecryptFileWindow(QMainWindow):
         buttons_layout = QHBoxLayout()
         buttons_layout.setSpacing(15)
         
-        self.preview_btn = QPushButton("👁️ Podgląd")
-        self.preview_btn.setMinimumSize(120, 40)
-        self.preview_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.preview_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #f39c12, stop:1 #e67e22);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #e67e22, stop:1 #d35400);
-            }
-        """)
+        self.preview_btn = make_button("👁️ Podgląd", "orange")
         self.preview_btn.clicked.connect(self.preview_decryption)
         buttons_layout.addWidget(self.preview_btn)
         
-        self.decrypt_btn = QPushButton("🔓 Deszyfruj plik")
-        self.decrypt_btn.setMinimumSize(150, 40)
-        self.decrypt_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.decrypt_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #e74c3c, stop:1 #c0392b);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #c0392b, stop:1 #a93226);
-            }
-        """)
+        self.decrypt_btn = make_button("🔓 Deszyfruj plik", "red", min_size=(150, 40))
         self.decrypt_btn.clicked.connect(self.decrypt_file)
         buttons_layout.addWidget(self.decrypt_btn)
         
-        self.clear_btn = QPushButton("🗑️ Wyczyść")
-        self.clear_btn.setMinimumSize(120, 40)
-        self.clear_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.clear_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #95a5a6, stop:1 #7f8c8d);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #7f8c8d, stop:1 #6c7b7d);
-            }
-        """)
+        self.clear_btn = make_button("🗑️ Wyczyść", "gray")
         self.clear_btn.clicked.connect(self.clear_fields)
         buttons_layout.addWidget(self.clear_btn)
         
         layout.addLayout(buttons_layout)
         
         # Sekcja wyników
-        result_group = QGroupBox("📊 Wynik")
+        result_group = make_group("📊 Wynik")
         result_group.setFont(QFont("Arial", 12, QFont.Bold))
-        result_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #bdc3c7;
-                border-radius: 10px;
-                margin-top: 10px;
-                padding-top: 10px;
-                background: white;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """)
         result_layout = QVBoxLayout(result_group)
         result_layout.setSpacing(10)
         
@@ -265,20 +125,9 @@ class DecryptFileWindow(QMainWindow):
         result_label.setFont(QFont("Arial", 11, QFont.Bold))
         result_layout.addWidget(result_label)
         
-        self.result_output = QTextEdit()
-        self.result_output.setReadOnly(True)
+        self.result_output = make_text_edit(variant="output-red", read_only=True)
         self.result_output.setMinimumHeight(200)
         self.result_output.setMaximumHeight(300)
-        self.result_output.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #e74c3c;
-                border-radius: 8px;
-                padding: 15px;
-                font-size: 12px;
-                background: #f8f9fa;
-                line-height: 1.4;
-            }
-        """)
         result_layout.addWidget(self.result_output)
         
         layout.addWidget(result_group)
@@ -287,37 +136,12 @@ class DecryptFileWindow(QMainWindow):
         back_layout = QHBoxLayout()
         back_layout.addStretch()
         
-        self.back_btn = QPushButton("⬅️ Powrót")
-        self.back_btn.setMinimumSize(120, 40)
-        self.back_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.back_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #95a5a6, stop:1 #7f8c8d);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #7f8c8d, stop:1 #6c7b7d);
-            }
-        """)
+        self.back_btn = make_button("⬅️ Powrót", "gray")
         self.back_btn.clicked.connect(self.go_back)
         back_layout.addWidget(self.back_btn)
         
         layout.addLayout(back_layout)
         
-    def setup_styles(self):
-        """Ustawienie stylów okna deszyfrowania pliku"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #ecf0f1, stop:1 #bdc3c7);
-            }
-        """)
-        
     def browse_file(self):
         """Otwiera dialog wyboru pliku"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -346,31 +170,22 @@ class DecryptFileWindow(QMainWindow):
                 QMessageBox.warning(self, "Błąd", "Przesunięcie musi być liczbą od 1 do 25!")
                 return
                 
-            # Wczytaj początek pliku do podglądu
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-            
-            # Ogranicz do pierwszych 500 znaków dla podglądu
-            preview_content = content[:500]
-            if len(content) > 500:
-                preview_content += "\n... (plik jest dłuższy)"
+            # Wczytaj tylko początek pliku (pliki binarne jako zrzut hex)
+            binary = self.is_binary_file(file_path)
+            preview = load_preview(file_path, binary=binary)
+            if preview.header is not None:
+                # Tryb zapisany w nagłówku pliku ma pierwszeństwo przed rozszerzeniem
+                binary = preview.header.binary
             
-            # Odszyfruj podgląd
-            from utils.caesar_cipher import caesar_decrypt
-            decrypted_preview = caesar_decrypt(preview_content, shift)
-            
-            # Wyświetl podgląd
-            self.result_output.setPlainText(
-                f"👁️ PODGLĄD DESZYFROWANIA PLIKU\n\n"
-                f"📁 Plik: {os.path.basename(file_path)}\n"
-                f"🔢 Przesunięcie: {shift}\n"
-                f"📏 Rozmiar pliku: {len(content)} znaków\n\n"
-                f"🔒 Zaszyfrowany tekst (pierwsze 500 znaków):\n"
-                f"{preview_content}\n\n"
-                f"📝 Odszyfrowany tekst:\n"
-                f"{decrypted_preview}\n\n"
-                f"💡 Kliknij 'Deszyfruj plik' aby zapisać pełny odszyfrowany plik"
-            )
+            from utils.caesar_cipher import caesar_decrypt, caesar_shift_bytes
+            self.result_output.setPlainText(render_preview(
+                preview, lambda text: caesar_decrypt(text, shift),
+                "👁️ PODGLĄD DESZYFROWANIA PLIKU",
+                [f"🔢 Przesunięcie: {shift}"],
+                "🔒 Zaszyfrowany tekst", "📝 Odszyfrowany tekst",
+                "💡 Kliknij 'Deszyfruj plik' aby zapisać pełny odszyfrowany plik",
+                binary_transform=(lambda data: caesar_shift_bytes(data, -shift)) if binary else None
+            ))
             
         except ValueError:
             QMessageBox.warning(self, "Błąd", "Przesunięcie musi być liczbą całkowitą!")
@@ -3,16 +3,15 @@ Okno deszyfrowania tekstu AES
 """
 
 import sys
-import traceback
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
-                             QWidget, QLabel, QTextEdit, QLineEdit, QPushButton, 
-                             QComboBox, QMessageBox, QFrame)
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout,
+                             QHBoxLayout, QWidget, QLabel, QLineEdit,
+                             QComboBox, QMessageBox)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve
-from PyQt5.QtGui import QFont, QIcon, QPalette, QColor, QLinearGradient, QBrush
+from PyQt5.QtGui import QFont
+from views.theme import (make_button, make_line_edit, make_text_edit,
+                         make_frame, set_variant)
 from utils.aes_cipher import aes_decrypt_text
-from utils.logger import AppLogger
-
-app_logger = AppLogger()
+from utils.logger import app_logger
 
 class AESDecryptWorker(QThread):
     """Wątek do deszyfrowania AES"""
@@ -35,8 +34,9 @@ class AESDecryptWorker(QThread):
 class AESDecryptTextWindow(QMainWindow):
     """Okno deszyfrowania tekstu AES"""
     
-    def __init__(self):
+    def __init__(self, parent=None):
         super().__init__()
+        self.parent = parent
         self.worker = None
         self.init_ui()
         
@@ -63,118 +63,51 @@ class AESDecryptTextWindow(QMainWindow):
         title_font.setPointSize(18)
         title_font.setBold(True)
         title_label.setFont(title_font)
-        title_label.setStyleSheet("color: #2c3e50; margin-bottom: 20px;")
+        set_variant(title_label, "aes-title")
         main_layout.addWidget(title_label)
         
         # Opis
         desc_label = QLabel("Wprowadź zaszyfrowany tekst (hex) i klucz. Wybierz rozmiar klucza AES.")
         desc_label.setAlignment(Qt.AlignCenter)
-        desc_label.setStyleSheet("color: #7f8c8d; margin-bottom: 20px;")
+        set_variant(desc_label, "aes-desc")
         main_layout.addWidget(desc_label)
         
         # Sekcja tekstu wejściowego
-        input_frame = QFrame()
-        input_frame.setFrameStyle(QFrame.StyledPanel)
-        input_frame.setStyleSheet("""
-            QFrame {
-                background-color: #f8f9fa;
-                border: 2px solid #e9ecef;
-                border-radius: 10px;
-                padding: 15px;
-            }
-        """)
+        input_frame = make_frame("aes-section")
         input_layout = QVBoxLayout(input_frame)
         
         input_label = QLabel("🔒 Zaszyfrowany tekst (hex):")
-        input_label.setStyleSheet("font-weight: bold; color: #2c3e50; margin-bottom: 10px;")
+        set_variant(input_label, "aes-heading")
         input_layout.addWidget(input_label)
         
-        self.ciphertext_input = QTextEdit()
-        self.ciphertext_input.setPlaceholderText("Wprowadź zaszyfrowany tekst w formacie hex...")
-        self.ciphertext_input.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 14px;
-                background-color: white;
-                font-family: 'Courier New', monospace;
-            }
-            QTextEdit:focus {
-                border-color: #007bff;
-            }
-        """)
+        self.ciphertext_input = make_text_edit("Wprowadź zaszyfrowany tekst w formacie hex...", "aes-input", mono=True)
         self.ciphertext_input.setMinimumHeight(120)
         input_layout.addWidget(self.ciphertext_input)
         
         main_layout.addWidget(input_frame)
         
         # Sekcja klucza
-        key_frame = QFrame()
-        key_frame.setFrameStyle(QFrame.StyledPanel)
-        key_frame.setStyleSheet("""
-            QFrame {
-                background-color: #f8f9fa;
-                border: 2px solid #e9ecef;
-                border-radius: 10px;
-                padding: 15px;
-            }
-        """)
+        key_frame = make_frame("aes-section")
         key_layout = QVBoxLayout(key_frame)
         
         key_label = QLabel("🔑 Klucz deszyfrowania:")
-        key_label.setStyleSheet("font-weight: bold; color: #2c3e50; margin-bottom: 10px;")
+        set_variant(key_label, "aes-heading")
         key_layout.addWidget(key_label)
         
-        self.key_input = QLineEdit()
-        self.key_input.setPlaceholderText("Wprowadź klucz deszyfrowania...")
+        self.key_input = make_line_edit("Wprowadź klucz deszyfrowania...", "aes-input")
         self.key_input.setEchoMode(QLineEdit.Password)
-        self.key_input.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 14px;
-                background-color: white;
-            }
-            QLineEdit:focus {
-                border-color: #007bff;
-            }
-        """)
         key_layout.addWidget(self.key_input)
         
         # Rozmiar klucza
         key_size_layout = QHBoxLayout()
         key_size_label = QLabel("🔧 Rozmiar klucza:")
-        key_size_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
+        set_variant(key_size_label, "aes-label")
         key_size_layout.addWidget(key_size_label)
         
         self.key_size_combo = QComboBox()
         self.key_size_combo.addItems(["128 bitów (AES-128)", "192 bity (AES-192)", "256 bitów (AES-256)"])
         self.key_size_combo.setCurrentIndex(0)  # Domyślnie AES-128
-        self.key_size_combo.setStyleSheet("""
-            QComboBox {
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                padding: 8px;
-                font-size: 14px;
-                background-color: white;
-                min-width: 200px;
-            }
-            QComboBox:focus {
-                border-color: #007bff;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid #6c757d;
-                margin-right: 10px;
-            }
-        """)
+        set_variant(self.key_size_combo, "aes-input")
         key_size_layout.addWidget(self.key_size_combo)
         key_size_layout.addStretch()
         
@@ -184,82 +117,15 @@ class AESDecryptTextWindow(QMainWindow):
         # Przyciski
         button_layout = QHBoxLayout()
         
-        self.decrypt_button = QPushButton("🔓 Deszyfruj")
-        self.decrypt_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #dc3545, stop:1 #c82333);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 24px;
-                font-size: 16px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #c82333, stop:1 #bd2130);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #bd2130, stop:1 #a71e2a);
-            }
-            QPushButton:disabled {
-                background: #6c757d;
-                color: #adb5bd;
-            }
-        """)
+        self.decrypt_button = make_button("🔓 Deszyfruj", "aes-danger", min_size=None, font_size=None)
         self.decrypt_button.clicked.connect(self.decrypt_text)
         button_layout.addWidget(self.decrypt_button)
         
-        self.clear_button = QPushButton("🗑️ Wyczyść")
-        self.clear_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #6c757d, stop:1 #495057);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 24px;
-                font-size: 16px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #495057, stop:1 #343a40);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #343a40, stop:1 #212529);
-            }
-        """)
+        self.clear_button = make_button("🗑️ Wyczyść", "aes-secondary", min_size=None, font_size=None)
         self.clear_button.clicked.connect(self.clear_all)
         button_layout.addWidget(self.clear_button)
         
-        self.back_button = QPushButton("⬅️ Wróć")
-        self.back_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #28a745, stop:1 #1e7e34);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 24px;
-                font-size: 16px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #1e7e34, stop:1 #155724);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #155724, stop:1 #0c4a1a);
-            }
-        """)
+        self.back_button = make_button("⬅️ Wróć", "aes-success", min_size=None, font_size=None)
         self.back_button.clicked.connect(self.go_back)
         button_layout.addWidget(self.back_button)
         
@@ -267,34 +133,14 @@ class AESDecryptTextWindow(QMainWindow):
         main_layout.addLayout(button_layout)
         
         # Sekcja wyniku
-        result_frame = QFrame()
-        result_frame.setFrameStyle(QFrame.StyledPanel)
-        result_frame.setStyleSheet("""
-            QFrame {
-                background-color: #f8f9fa;
-                border: 2px solid #e9ecef;
-                border-radius: 10px;
-                padding: 15px;
-            }
-        """)
+        result_frame = make_frame("aes-section")
         result_layout = QVBoxLayout(result_frame)
         
         result_label = QLabel("📝 Odszyfrowany tekst:")
-        result_label.setStyleSheet("font-weight: bold; color: #2c3e50; margin-bottom: 10px;")
+        set_variant(result_label, "aes-heading")
         result_layout.addWidget(result_label)
         
-        self.result_output = QTextEdit()
-        self.result_output.setPlaceholderText("Odszyfrowany tekst pojawi się tutaj...")
-        self.result_output.setReadOnly(True)
-        self.result_output.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 14px;
-                background-color: white;
-            }
-        """)
+        self.result_output = make_text_edit("Odszyfrowany tekst pojawi się tutaj...", "aes-output", read_only=True)
         self.result_output.setMinimumHeight(120)
         result_layout.addWidget(self.result_output)
         
@@ -302,31 +148,7 @@ class AESDecryptTextWindow(QMainWindow):
         copy_layout = QHBoxLayout()
         copy_layout.addStretch()
         
-        self.copy_button = QPushButton("📋 Kopiuj wynik")
-        self.copy_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #17a2b8, stop:1 #138496);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px 20px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #138496, stop:1 #0f6674);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #0f6674, stop:1 #0b4d56);
-            }
-            QPushButton:disabled {
-                background: #6c757d;
-                color: #adb5bd;
-            }
-        """)
+        self.copy_button = make_button("📋 Kopiuj wynik", "aes-info", min_size=None, font_size=None)
         self.copy_button.clicked.connect(self.copy_result)
         self.copy_button.setEnabled(False)
         copy_layout.addWidget(self.copy_button)
@@ -334,13 +156,8 @@ class AESDecryptTextWindow(QMainWindow):
         result_layout.addLayout(copy_layout)
         main_layout.addWidget(result_frame)
         
-        # Ustawienie stylu głównego okna
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #f8f9fa, stop:1 #e9ecef);
-            }
-        """)
+        # Tło okna AES
+        set_variant(self, "aes")
         
         app_logger.info("AES decrypt text window initialized")
     
@@ -462,10 +279,15 @@ class AESDecryptTextWindow(QMainWindow):
     def _open_cipher_window(self):
         """Otwiera okno wyboru szyfru po animacji"""
         try:
-            from views.cipher_choice_window import CipherChoiceWindow
-            self.cipher_window = CipherChoiceWindow()
-            self.cipher_window.show()
+            if self.parent:
+                self.parent.show()
+            else:
+                from views.cipher_choice_window import CipherChoiceWindow
+                self.cipher_window = CipherChoiceWindow()
+                self.cipher_window.show()
             self.close()
+            # Okno wraca do puli - przywróć widoczność po animacji
+            self.setWindowOpacity(1.0)
             app_logger.info("Returned to cipher choice window")
         except Exception as e:
             app_logger.error(f"Open cipher window error: {str(e)}")
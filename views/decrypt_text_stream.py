@@ -4,11 +4,11 @@
 Okno deszyfrowania tekstu szyfrem z kluczem bieżącym
 """
 
-from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QPushButton, QLabel, QTextEdit, QLineEdit, 
-                             QMessageBox, QApplication)
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QLabel, QMessageBox, QApplication)
 from PyQt5.QtGui import QFont
+from views.theme import make_button, make_title, make_line_edit, make_text_edit
+from views.live_preview import LivePreview, make_preview_controls
 from utils.stream_cipher import stream_decrypt, validate_key
 from utils.logger import app_logger
 
@@ -19,9 +19,11 @@ class DecryptTextStreamWindow(QMainWindow):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
+        # Wynik z przycisku "Deszyfruj" potwierdzany jest komunikatem
+        self.announce_result = False
         app_logger.log_window_open("DecryptTextStreamWindow")
+        self.preview = LivePreview(self, self.prepare_preview)
         self.init_ui()
-        self.setup_styles()
         
     def init_ui(self):
         """Inicjalizacja interfejsu okna deszyfrowania"""
@@ -38,18 +40,7 @@ class DecryptTextStreamWindow(QMainWindow):
         layout.setContentsMargins(20, 20, 20, 20)
         
         # Tytuł
-        title = QLabel("🔓 Deszyfrowanie Tekstu - Szyfr z kluczem bieżącym")
-        title.setAlignment(Qt.AlignCenter)
-        title.setFont(QFont("Arial", 18, QFont.Bold))
-        title.setStyleSheet("""
-            QLabel {
-                color: #e74c3c;
-                padding: 10px;
-                background: white;
-                border-radius: 10px;
-                border: 2px solid #e74c3c;
-            }
-        """)
+        title = make_title("🔓 Deszyfrowanie Tekstu - Szyfr z kluczem bieżącym", "title-red")
         layout.addWidget(title)
         
         # Pole na zaszyfrowany tekst
@@ -57,22 +48,8 @@ class DecryptTextStreamWindow(QMainWindow):
         text_label.setFont(QFont("Arial", 12, QFont.Bold))
         layout.addWidget(text_label)
         
-        self.text_input = QTextEdit()
-        self.text_input.setPlaceholderText("Wprowadź zaszyfrowany tekst w formacie hex...")
+        self.text_input = make_text_edit("Wprowadź zaszyfrowany tekst w formacie hex...", "input-red", mono=True)
         self.text_input.setMaximumHeight(120)
-        self.text_input.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #bdc3c7;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 12px;
-                background: white;
-                font-family: 'Courier New', monospace;
-            }
-            QTextEdit:focus {
-                border-color: #e74c3c;
-            }
-        """)
         layout.addWidget(self.text_input)
         
         # Pole klucza
@@ -80,139 +57,60 @@ class DecryptTextStreamWindow(QMainWindow):
         key_label.setFont(QFont("Arial", 12, QFont.Bold))
         layout.addWidget(key_label)
         
-        self.key_input = QLineEdit()
-        self.key_input.setPlaceholderText("Wprowadź klucz deszyfrowania (minimum 4 znaki)")
-        self.key_input.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #bdc3c7;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 12px;
-                background: white;
-            }
-            QLineEdit:focus {
-                border-color: #e74c3c;
-            }
-        """)
+        self.key_input = make_line_edit("Wprowadź klucz deszyfrowania (minimum 4 znaki)", "input-red")
         layout.addWidget(self.key_input)
         
         # Przyciski
         buttons_layout = QHBoxLayout()
         
-        self.decrypt_btn = QPushButton("🔓 Deszyfruj")
-        self.decrypt_btn.setMinimumSize(120, 40)
-        self.decrypt_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.decrypt_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #e74c3c, stop:1 #c0392b);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #c0392b, stop:1 #a93226);
-            }
-        """)
+        self.decrypt_btn = make_button("🔓 Deszyfruj", "red")
         self.decrypt_btn.clicked.connect(self.decrypt_text)
         buttons_layout.addWidget(self.decrypt_btn)
         
-        self.clear_btn = QPushButton("🗑️ Wyczyść")
-        self.clear_btn.setMinimumSize(120, 40)
-        self.clear_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.clear_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #95a5a6, stop:1 #7f8c8d);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #7f8c8d, stop:1 #6c7b7d);
-            }
-        """)
+        self.clear_btn = make_button("🗑️ Wyczyść", "gray")
         self.clear_btn.clicked.connect(self.clear_fields)
         buttons_layout.addWidget(self.clear_btn)
         
         layout.addLayout(buttons_layout)
         
+        # Podgląd na żywo - deszyfrowanie w tle po każdej zmianie
+        preview_layout, self.live_preview_check, self.preview_status = \
+            make_preview_controls(self.preview)
+        layout.addLayout(preview_layout)
+        self.preview.watch(self.text_input.textChanged, self.key_input.textChanged)
+        self.preview.result_ready.connect(self.show_result)
+        self.preview.failed.connect(self.show_error)
+        self.preview.cleared.connect(self.clear_result)
+        
         # Wynik deszyfrowania
         result_label = QLabel("Odszyfrowany tekst:")
         result_label.setFont(QFont("Arial", 12, QFont.Bold))
         layout.addWidget(result_label)
         
-        self.result_output = QTextEdit()
-        self.result_output.setReadOnly(True)
+        self.result_output = make_text_edit(variant="output-red", read_only=True)
         self.result_output.setMaximumHeight(120)
-        self.result_output.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #e74c3c;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 12px;
-                background: #f8f9fa;
-            }
-        """)
         layout.addWidget(self.result_output)
         
         # Przycisk kopiowania
-        self.copy_btn = QPushButton("📋 Kopiuj wynik")
-        self.copy_btn.setMinimumSize(150, 40)
-        self.copy_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.copy_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #3498db, stop:1 #2980b9);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #2980b9, stop:1 #21618c);
-            }
-        """)
+        self.copy_btn = make_button("📋 Kopiuj wynik", "blue", min_size=(150, 40))
         self.copy_btn.clicked.connect(self.copy_result)
         layout.addWidget(self.copy_btn)
         
         # Przycisk powrotu
-        self.back_btn = QPushButton("⬅️ Powrót")
-        self.back_btn.setMinimumSize(120, 40)
-        self.back_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.back_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #95a5a6, stop:1 #7f8c8d);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #7f8c8d, stop:1 #6c7b7d);
-            }
-        """)
+        self.back_btn = make_button("⬅️ Powrót", "gray")
         self.back_btn.clicked.connect(self.go_back)
         layout.addWidget(self.back_btn)
         
-    def setup_styles(self):
-        """Ustawienie stylów okna deszyfrowania"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #ecf0f1, stop:1 #bdc3c7);
-            }
-        """)
+    def prepare_preview(self):
+        """Dane dla zadania w tle: (funkcja, argumenty) lub None przy niepełnych danych"""
+        text = self.text_input.toPlainText().strip()
+        key = self.key_input.text().strip()
+        if not text or not validate_key(key):
+            return None
+        return stream_decrypt, (text, key)
         
     def decrypt_text(self):
-        """Deszyfruje wprowadzony tekst szyfrem z kluczem bieżącym"""
+        """Deszyfruje wprowadzony tekst szyfrem z kluczem bieżącym (w tle)"""
         text = self.text_input.toPlainText().strip()
         if not text:
             app_logger.log_validation_error("tekst", "pusty tekst")
@@ -225,23 +123,36 @@ class DecryptTextStreamWindow(QMainWindow):
             QMessageBox.warning(self, "Błąd", "Klucz musi mieć minimum 4 znaki!")
             return
                 
-        try:
-            app_logger.log_encryption_start("tekst", "stream cipher decrypt")
-            decrypted_text = stream_decrypt(text, key)
+        app_logger.log_encryption_start("tekst", "stream cipher decrypt")
+        self.announce_result = True
+        self.preview.run_now()
+        
+    def show_result(self, decrypted_text):
+        """Wyświetla wynik zadania w tle"""
+        self.result_output.setPlainText(decrypted_text)
+        if self.announce_result:
+            self.announce_result = False
             app_logger.log_encryption_success("tekst", len(decrypted_text))
-            
-            # Wyświetl odszyfrowany tekst
-            self.result_output.setPlainText(decrypted_text)
-            
             QMessageBox.information(self, "Sukces", 
                 "Tekst został odszyfrowany szyfrem z kluczem bieżącym!")
             
-        except ValueError as e:
+    def show_error(self, error):
+        """Obsługuje błąd zadania w tle"""
+        self.result_output.clear()
+        if not self.announce_result:
+            return
+        self.announce_result = False
+        if isinstance(error, ValueError):
             app_logger.log_validation_error("tekst", "nieprawidłowy format hex")
             QMessageBox.warning(self, "Błąd", "Nieprawidłowy format hex lub nieprawidłowy klucz!")
-        except Exception as e:
-            app_logger.log_error("deszyfrowanie tekstu", str(e))
-            QMessageBox.critical(self, "Błąd", f"Wystąpił błąd podczas deszyfrowania: {str(e)}")
+        else:
+            app_logger.log_error("deszyfrowanie tekstu", str(error))
+            QMessageBox.critical(self, "Błąd", f"Wystąpił błąd podczas deszyfrowania: {str(error)}")
+            
+    def clear_result(self):
+        """Czyści wynik, gdy dane wejściowe są niepełne"""
+        self.result_output.clear()
+        self.announce_result = False
             
     def clear_fields(self):
         """Czyści wszystkie pola"""
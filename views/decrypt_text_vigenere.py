@@ -4,11 +4,10 @@
 Okno deszyfrowania tekstu szyfrem Vigenère
 """
 
-from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QPushButton, QLabel, QTextEdit, QLineEdit, 
-                             QMessageBox, QApplication)
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QLabel, QMessageBox, QApplication)
 from PyQt5.QtGui import QFont
+from views.theme import make_button, make_title, make_line_edit, make_text_edit
 from utils.vigenere_cipher import vigenere_decrypt
 from utils.logger import app_logger
 
@@ -21,7 +20,6 @@ class DecryptTextVigenereWindow(QMainWindow):
         self.parent = parent
         app_logger.log_window_open("DecryptTextVigenereWindow")
         self.init_ui()
-        self.setup_styles()
         
     def init_ui(self):
         """Inicjalizacja interfejsu okna deszyfrowania"""
@@ -38,18 +36,7 @@ class DecryptTextVigenereWindow(QMainWindow):
         layout.setContentsMargins(20, 20, 20, 20)
         
         # Tytuł
-        title = QLabel("🔓 Deszyfrowanie Tekstu - Vigenère")
-        title.setAlignment(Qt.AlignCenter)
-        title.setFont(QFont("Arial", 18, QFont.Bold))
-        title.setStyleSheet("""
-            QLabel {
-                color: #9b59b6;
-                padding: 10px;
-                background: white;
-                border-radius: 10px;
-                border: 2px solid #9b59b6;
-            }
-        """)
+        title = make_title("🔓 Deszyfrowanie Tekstu - Vigenère", "title-purple")
         layout.addWidget(title)
         
         # Pole na zaszyfrowany tekst
@@ -57,21 +44,8 @@ class DecryptTextVigenereWindow(QMainWindow):
         text_label.setFont(QFont("Arial", 12, QFont.Bold))
         layout.addWidget(text_label)
         
-        self.text_input = QTextEdit()
-        self.text_input.setPlaceholderText("Wprowadź zaszyfrowany tekst...")
+        self.text_input = make_text_edit("Wprowadź zaszyfrowany tekst...")
         self.text_input.setMaximumHeight(120)
-        self.text_input.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #bdc3c7;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 12px;
-                background: white;
-            }
-            QTextEdit:focus {
-                border-color: #3498db;
-            }
-        """)
         layout.addWidget(self.text_input)
         
         # Pole klucza
@@ -79,64 +53,18 @@ class DecryptTextVigenereWindow(QMainWindow):
         key_label.setFont(QFont("Arial", 12, QFont.Bold))
         layout.addWidget(key_label)
         
-        self.key_input = QLineEdit()
-        self.key_input.setPlaceholderText("Wprowadź klucz (tylko litery)...")
+        self.key_input = make_line_edit("Wprowadź klucz (tylko litery)...", max_width=200)
         self.key_input.setText("SECRET")
-        self.key_input.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #bdc3c7;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 12px;
-                background: white;
-                max-width: 200px;
-            }
-            QLineEdit:focus {
-                border-color: #3498db;
-            }
-        """)
         layout.addWidget(self.key_input)
         
         # Przyciski
         buttons_layout = QHBoxLayout()
         
-        self.decrypt_btn = QPushButton("🔓 Deszyfruj")
-        self.decrypt_btn.setMinimumSize(120, 40)
-        self.decrypt_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.decrypt_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #9b59b6, stop:1 #8e44ad);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #8e44ad, stop:1 #7d3c98);
-            }
-        """)
+        self.decrypt_btn = make_button("🔓 Deszyfruj", "purple")
         self.decrypt_btn.clicked.connect(self.decrypt_text)
         buttons_layout.addWidget(self.decrypt_btn)
         
-        self.clear_btn = QPushButton("🗑️ Wyczyść")
-        self.clear_btn.setMinimumSize(120, 40)
-        self.clear_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.clear_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #95a5a6, stop:1 #7f8c8d);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #7f8c8d, stop:1 #6c7b7d);
-            }
-        """)
+        self.clear_btn = make_button("🗑️ Wyczyść", "gray")
         self.clear_btn.clicked.connect(self.clear_fields)
         buttons_layout.addWidget(self.clear_btn)
         
@@ -147,71 +75,20 @@ class DecryptTextVigenereWindow(QMainWindow):
         result_label.setFont(QFont("Arial", 12, QFont.Bold))
         layout.addWidget(result_label)
         
-        self.result_output = QTextEdit()
-        self.result_output.setReadOnly(True)
+        self.result_output = make_text_edit(variant="output-purple", read_only=True)
         self.result_output.setMaximumHeight(120)
-        self.result_output.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #9b59b6;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 12px;
-                background: #f8f9fa;
-            }
-        """)
         layout.addWidget(self.result_output)
         
         # Przycisk kopiowania
-        self.copy_btn = QPushButton("📋 Kopiuj wynik")
-        self.copy_btn.setMinimumSize(150, 40)
-        self.copy_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.copy_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #3498db, stop:1 #2980b9);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #2980b9, stop:1 #21618c);
-            }
-        """)
+        self.copy_btn = make_button("📋 Kopiuj wynik", "blue", min_size=(150, 40))
         self.copy_btn.clicked.connect(self.copy_result)
         layout.addWidget(self.copy_btn)
         
         # Przycisk powrotu
-        self.back_btn = QPushButton("⬅️ Powrót")
-        self.back_btn.setMinimumSize(120, 40)
-        self.back_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.back_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #95a5a6, stop:1 #7f8c8d);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #7f8c8d, stop:1 #6c7b7d);
-            }
-        """)
+        self.back_btn = make_button("⬅️ Powrót", "gray")
         self.back_btn.clicked.connect(self.go_back)
         layout.addWidget(self.back_btn)
         
-    def setup_styles(self):
-        """Ustawienie stylów okna deszyfrowania"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #ecf0f1, stop:1 #bdc3c7);
-            }
-        """)
-        
     def decrypt_text(self):
         """Deszyfruje wprowadzony tekst szyfrem Vigenère"""
         text = self.text_input.toPlainText().strip()
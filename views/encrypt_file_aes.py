@@ -4,16 +4,16 @@ Okno szyfrowania plików AES
 
 import sys
 import os
-import traceback
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
-                             QWidget, QLabel, QLineEdit, QPushButton, QFileDialog,
-                             QComboBox, QMessageBox, QFrame, QProgressBar)
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout,
+                             QHBoxLayout, QWidget, QLabel, QLineEdit,
+                             QFileDialog, QComboBox, QMessageBox,
+                             QProgressBar)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve
-from PyQt5.QtGui import QFont, QIcon, QPalette, QColor, QLinearGradient, QBrush
+from PyQt5.QtGui import QFont
+from views.theme import make_button, make_line_edit, make_frame, set_variant
+from views.file_drop import FileDropMixin
 from utils.aes_cipher import aes_encrypt_file
-from utils.logger import AppLogger
-
-app_logger = AppLogger()
+from utils.logger import app_logger
 
 class AESFileEncryptWorker(QThread):
     """Wątek do szyfrowania plików AES"""
@@ -37,13 +37,18 @@ class AESFileEncryptWorker(QThread):
         except Exception as e:
             self.error.emit(str(e))
 
-class AESEncryptFileWindow(QMainWindow):
+class AESEncryptFileWindow(FileDropMixin, QMainWindow):
     """Okno szyfrowania plików AES"""
     
-    def __init__(self):
+    batch_cipher = "aes"
+    batch_operation = "encrypt"
+    
+    def __init__(self, parent=None):
         super().__init__()
+        self.parent = parent
         self.worker = None
         self.init_ui()
+        self.enable_file_drop(self.input_file_path, self.key_input)
         
     def init_ui(self):
         """Inicjalizacja interfejsu użytkownika"""
@@ -68,69 +73,29 @@ class AESEncryptFileWindow(QMainWindow):
         title_font.setPointSize(18)
         title_font.setBold(True)
         title_label.setFont(title_font)
-        title_label.setStyleSheet("color: #2c3e50; margin-bottom: 20px;")
+        set_variant(title_label, "aes-title")
         main_layout.addWidget(title_label)
         
         # Opis
         desc_label = QLabel("Wybierz plik do zaszyfrowania, podaj klucz i wybierz lokalizację zapisu.")
         desc_label.setAlignment(Qt.AlignCenter)
-        desc_label.setStyleSheet("color: #7f8c8d; margin-bottom: 20px;")
+        set_variant(desc_label, "aes-desc")
         main_layout.addWidget(desc_label)
         
         # Sekcja pliku wejściowego
-        input_frame = QFrame()
-        input_frame.setFrameStyle(QFrame.StyledPanel)
-        input_frame.setStyleSheet("""
-            QFrame {
-                background-color: #f8f9fa;
-                border: 2px solid #e9ecef;
-                border-radius: 10px;
-                padding: 15px;
-            }
-        """)
+        input_frame = make_frame("aes-section")
         input_layout = QVBoxLayout(input_frame)
         
         input_label = QLabel("📁 Plik do zaszyfrowania:")
-        input_label.setStyleSheet("font-weight: bold; color: #2c3e50; margin-bottom: 10px;")
+        set_variant(input_label, "aes-heading")
         input_layout.addWidget(input_label)
         
         file_layout = QHBoxLayout()
-        self.input_file_path = QLineEdit()
-        self.input_file_path.setPlaceholderText("Wybierz plik do zaszyfrowania...")
+        self.input_file_path = make_line_edit("Wybierz plik do zaszyfrowania...", "aes-input")
         self.input_file_path.setReadOnly(True)
-        self.input_file_path.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 14px;
-                background-color: white;
-            }
-        """)
         file_layout.addWidget(self.input_file_path)
         
-        self.browse_input_button = QPushButton("📂 Przeglądaj")
-        self.browse_input_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #17a2b8, stop:1 #138496);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px 20px;
-                font-size: 14px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #138496, stop:1 #0f6674);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #0f6674, stop:1 #0b4d56);
-            }
-        """)
+        self.browse_input_button = make_button("📂 Przeglądaj", "aes-info", min_size=None, font_size=None)
         self.browse_input_button.clicked.connect(self.browse_input_file)
         file_layout.addWidget(self.browse_input_button)
         
@@ -138,59 +103,19 @@ class AESEncryptFileWindow(QMainWindow):
         main_layout.addWidget(input_frame)
         
         # Sekcja pliku wyjściowego
-        output_frame = QFrame()
-        output_frame.setFrameStyle(QFrame.StyledPanel)
-        output_frame.setStyleSheet("""
-            QFrame {
-                background-color: #f8f9fa;
-                border: 2px solid #e9ecef;
-                border-radius: 10px;
-                padding: 15px;
-            }
-        """)
+        output_frame = make_frame("aes-section")
         output_layout = QVBoxLayout(output_frame)
         
         output_label = QLabel("💾 Lokalizacja zapisu:")
-        output_label.setStyleSheet("font-weight: bold; color: #2c3e50; margin-bottom: 10px;")
+        set_variant(output_label, "aes-heading")
         output_layout.addWidget(output_label)
         
         output_file_layout = QHBoxLayout()
-        self.output_file_path = QLineEdit()
-        self.output_file_path.setPlaceholderText("Wybierz lokalizację zapisu zaszyfrowanego pliku...")
+        self.output_file_path = make_line_edit("Wybierz lokalizację zapisu zaszyfrowanego pliku...", "aes-input")
         self.output_file_path.setReadOnly(True)
-        self.output_file_path.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 14px;
-                background-color: white;
-            }
-        """)
         output_file_layout.addWidget(self.output_file_path)
         
-        self.browse_output_button = QPushButton("📂 Przeglądaj")
-        self.browse_output_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #17a2b8, stop:1 #138496);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px 20px;
-                font-size: 14px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #138496, stop:1 #0f6674);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #0f6674, stop:1 #0b4d56);
-            }
-        """)
+        self.browse_output_button = make_button("📂 Przeglądaj", "aes-info", min_size=None, font_size=None)
         self.browse_output_button.clicked.connect(self.browse_output_file)
         output_file_layout.addWidget(self.browse_output_button)
         
@@ -198,71 +123,27 @@ class AESEncryptFileWindow(QMainWindow):
         main_layout.addWidget(output_frame)
         
         # Sekcja klucza
-        key_frame = QFrame()
-        key_frame.setFrameStyle(QFrame.StyledPanel)
-        key_frame.setStyleSheet("""
-            QFrame {
-                background-color: #f8f9fa;
-                border: 2px solid #e9ecef;
-                border-radius: 10px;
-                padding: 15px;
-            }
-        """)
+        key_frame = make_frame("aes-section")
         key_layout = QVBoxLayout(key_frame)
         
         key_label = QLabel("🔑 Klucz szyfrowania:")
-        key_label.setStyleSheet("font-weight: bold; color: #2c3e50; margin-bottom: 10px;")
+        set_variant(key_label, "aes-heading")
         key_layout.addWidget(key_label)
         
-        self.key_input = QLineEdit()
-        self.key_input.setPlaceholderText("Wprowadź klucz szyfrowania...")
+        self.key_input = make_line_edit("Wprowadź klucz szyfrowania...", "aes-input")
         self.key_input.setEchoMode(QLineEdit.Password)
-        self.key_input.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 14px;
-                background-color: white;
-            }
-            QLineEdit:focus {
-                border-color: #007bff;
-            }
-        """)
         key_layout.addWidget(self.key_input)
         
         # Rozmiar klucza
         key_size_layout = QHBoxLayout()
         key_size_label = QLabel("🔧 Rozmiar klucza:")
-        key_size_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
+        set_variant(key_size_label, "aes-label")
         key_size_layout.addWidget(key_size_label)
         
         self.key_size_combo = QComboBox()
         self.key_size_combo.addItems(["128 bitów (AES-128)", "192 bity (AES-192)", "256 bitów (AES-256)"])
         self.key_size_combo.setCurrentIndex(0)  # Domyślnie AES-128
-        self.key_size_combo.setStyleSheet("""
-            QComboBox {
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                padding: 8px;
-                font-size: 14px;
-                background-color: white;
-                min-width: 200px;
-            }
-            QComboBox:focus {
-                border-color: #007bff;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid #6c757d;
-                margin-right: 10px;
-            }
-        """)
+        set_variant(self.key_size_combo, "aes-input")
         key_size_layout.addWidget(self.key_size_combo)
         key_size_layout.addStretch()
         
@@ -272,113 +153,29 @@ class AESEncryptFileWindow(QMainWindow):
         # Pasek postępu
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                text-align: center;
-                background-color: #f8f9fa;
-            }
-            QProgressBar::chunk {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #007bff, stop:1 #0056b3);
-                border-radius: 6px;
-            }
-        """)
+        set_variant(self.progress_bar, "aes-primary")
         main_layout.addWidget(self.progress_bar)
         
         # Przyciski
         button_layout = QHBoxLayout()
         
-        self.encrypt_button = QPushButton("🔐 Szyfruj plik")
-        self.encrypt_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #007bff, stop:1 #0056b3);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 24px;
-                font-size: 16px;
-                font-weight: bold;
-                min-width: 140px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #0056b3, stop:1 #004085);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #004085, stop:1 #002752);
-            }
-            QPushButton:disabled {
-                background: #6c757d;
-                color: #adb5bd;
-            }
-        """)
+        self.encrypt_button = make_button("🔐 Szyfruj plik", "aes-primary", min_size=None, font_size=None)
         self.encrypt_button.clicked.connect(self.encrypt_file)
         button_layout.addWidget(self.encrypt_button)
         
-        self.clear_button = QPushButton("🗑️ Wyczyść")
-        self.clear_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #6c757d, stop:1 #495057);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 24px;
-                font-size: 16px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #495057, stop:1 #343a40);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #343a40, stop:1 #212529);
-            }
-        """)
+        self.clear_button = make_button("🗑️ Wyczyść", "aes-secondary", min_size=None, font_size=None)
         self.clear_button.clicked.connect(self.clear_all)
         button_layout.addWidget(self.clear_button)
         
-        self.back_button = QPushButton("⬅️ Wróć")
-        self.back_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #28a745, stop:1 #1e7e34);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 24px;
-                font-size: 16px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #1e7e34, stop:1 #155724);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #155724, stop:1 #0c4a1a);
-            }
-        """)
+        self.back_button = make_button("⬅️ Wróć", "aes-success", min_size=None, font_size=None)
         self.back_button.clicked.connect(self.go_back)
         button_layout.addWidget(self.back_button)
         
         button_layout.addStretch()
         main_layout.addLayout(button_layout)
         
-        # Ustawienie stylu głównego okna
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #f8f9fa, stop:1 #e9ecef);
-            }
-        """)
+        # Tło okna AES
+        set_variant(self, "aes")
         
         app_logger.info("AES encrypt file window initialized")
     
@@ -393,6 +190,18 @@ class AESEncryptFileWindow(QMainWindow):
             return 256
         return 128
     
+    def batch_options(self):
+        """Opcje szyfru dla przetwarzania wsadowego"""
+        return {"key_size": self.get_key_size()}
+    
+    def set_input_file(self, file_path):
+        """Ustawia plik wejściowy i proponuje ścieżkę wyjściową"""
+        self.input_file_path.setText(file_path)
+        # Automatyczne ustawienie ścieżki wyjściowej
+        base_name = os.path.splitext(file_path)[0]
+        self.output_file_path.setText(f"{base_name}_encrypted.aes")
+        app_logger.info(f"Input file selected: {file_path}")
+    
     def browse_input_file(self):
         """Otwiera dialog wyboru pliku wejściowego"""
         try:
@@ -403,11 +212,7 @@ class AESEncryptFileWindow(QMainWindow):
                 "Wszystkie pliki (*.*)"
             )
             if file_path:
-                self.input_file_path.setText(file_path)
-                # Automatyczne ustawienie ścieżki wyjściowej
-                base_name = os.path.splitext(file_path)[0]
-                self.output_file_path.setText(f"{base_name}_encrypted.aes")
-                app_logger.info(f"Input file selected: {file_path}")
+                self.set_input_file(file_path)
         except Exception as e:
             app_logger.error(f"Browse input file error: {str(e)}")
             QMessageBox.critical(self, "Błąd", f"Wystąpił błąd podczas wyboru pliku:\n{str(e)}")
@@ -547,10 +352,15 @@ class AESEncryptFileWindow(QMainWindow):
     def _open_cipher_window(self):
         """Otwiera okno wyboru szyfru po animacji"""
         try:
-            from views.cipher_choice_window import CipherChoiceWindow
-            self.cipher_window = CipherChoiceWindow()
-            self.cipher_window.show()
+            if self.parent:
+                self.parent.show()
+            else:
+                from views.cipher_choice_window import CipherChoiceWindow
+                self.cipher_window = CipherChoiceWindow()
+                self.cipher_window.show()
             self.close()
+            # Okno wraca do puli - przywróć widoczność po animacji
+            self.setWindowOpacity(1.0)
             app_logger.info("Returned to cipher choice window")
         except Exception as e:
             app_logger.error(f"Open cipher window error: {str(e)}")
@@ -5,11 +5,13 @@ Okno szyfrowania pliku szyfrem z kluczem bieżącym
 """
 
 import os
-from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QPushButton, QLabel, QLineEdit, QFileDialog, 
-                             QMessageBox, QApplication, QProgressBar, QTextEdit)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QLabel, QFileDialog, QMessageBox, QProgressBar)
+from PyQt5.QtCore import QThread, pyqtSignal
 from PyQt5.QtGui import QFont
+from views.theme import (make_button, make_title, make_line_edit,
+                         make_text_edit, set_variant)
+from views.file_drop import FileDropMixin
 from utils.stream_cipher import stream_encrypt_file, stream_encrypt_binary_file, generate_random_key, validate_key
 from utils.logger import app_logger
 
@@ -40,16 +42,19 @@ class EncryptionThread(QThread):
             self.finished.emit(False, str(e))
 
 
-class EncryptFileStreamWindow(QMainWindow):
+class EncryptFileStreamWindow(FileDropMixin, QMainWindow):
     """Okno szyfrowania pliku szyfrem z kluczem bieżącym"""
     
+    batch_cipher = "stream"
+    batch_operation = "encrypt"
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
         self.encryption_thread = None
         app_logger.log_window_open("EncryptFileStreamWindow")
         self.init_ui()
-        self.setup_styles()
+        self.enable_file_drop(self.input_file_path, self.key_input)
         
     def init_ui(self):
         """Inicjalizacja interfejsu okna szyfrowania pliku"""
@@ -66,18 +71,7 @@ class EncryptFileStreamWindow(QMainWindow):
         layout.setContentsMargins(20, 20, 20, 20)
         
         # Tytuł
-        title = QLabel("🔒 Szyfrowanie Pliku - Szyfr z kluczem bieżącym")
-        title.setAlignment(Qt.AlignCenter)
-        title.setFont(QFont("Arial", 18, QFont.Bold))
-        title.setStyleSheet("""
-            QLabel {
-                color: #e67e22;
-                padding: 10px;
-                background: white;
-                border-radius: 10px;
-                border: 2px solid #e67e22;
-            }
-        """)
+        title = make_title("🔒 Szyfrowanie Pliku - Szyfr z kluczem bieżącym", "title-carrot")
         layout.addWidget(title)
         
         # Wybór pliku wejściowego
@@ -87,37 +81,11 @@ class EncryptFileStreamWindow(QMainWindow):
         
         input_layout = QHBoxLayout()
         
-        self.input_file_path = QLineEdit()
-        self.input_file_path.setPlaceholderText("Kliknij 'Przeglądaj' aby wybrać plik...")
+        self.input_file_path = make_line_edit("Kliknij 'Przeglądaj' aby wybrać plik...", "input-muted")
         self.input_file_path.setReadOnly(True)
-        self.input_file_path.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #bdc3c7;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 12px;
-                background: #f8f9fa;
-            }
-        """)
         input_layout.addWidget(self.input_file_path)
         
-        self.browse_input_btn = QPushButton("📁 Przeglądaj")
-        self.browse_input_btn.setMinimumSize(120, 40)
-        self.browse_input_btn.setFont(QFont("Arial", 10, QFont.Bold))
-        self.browse_input_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #3498db, stop:1 #2980b9);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #2980b9, stop:1 #21618c);
-            }
-        """)
+        self.browse_input_btn = make_button("📁 Przeglądaj", "blue", font_size=10)
         self.browse_input_btn.clicked.connect(self.browse_input_file)
         input_layout.addWidget(self.browse_input_btn)
         
@@ -130,37 +98,11 @@ class EncryptFileStreamWindow(QMainWindow):
         
         output_layout = QHBoxLayout()
         
-        self.output_file_path = QLineEdit()
-        self.output_file_path.setPlaceholderText("Kliknij 'Zapisz jako' aby wybrać lokalizację...")
+        self.output_file_path = make_line_edit("Kliknij 'Zapisz jako' aby wybrać lokalizację...", "input-muted")
         self.output_file_path.setReadOnly(True)
-        self.output_file_path.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #bdc3c7;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 12px;
-                background: #f8f9fa;
-            }
-        """)
         output_layout.addWidget(self.output_file_path)
         
-        self.browse_output_btn = QPushButton("💾 Zapisz jako")
-        self.browse_output_btn.setMinimumSize(120, 40)
-        self.browse_output_btn.setFont(QFont("Arial", 10, QFont.Bold))
-        self.browse_output_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #27ae60, stop:1 #229954);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #229954, stop:1 #1e8449);
-            }
-        """)
+        self.browse_output_btn = make_button("💾 Zapisz jako", "green", font_size=10)
         self.browse_output_btn.clicked.connect(self.browse_output_file)
         output_layout.addWidget(self.browse_output_btn)
         
@@ -173,39 +115,10 @@ class EncryptFileStreamWindow(QMainWindow):
         
         key_layout = QHBoxLayout()
         
-        self.key_input = QLineEdit()
-        self.key_input.setPlaceholderText("Wprowadź klucz szyfrowania (minimum 4 znaki)")
-        self.key_input.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #bdc3c7;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 12px;
-                background: white;
-            }
-            QLineEdit:focus {
-                border-color: #e67e22;
-            }
-        """)
+        self.key_input = make_line_edit("Wprowadź klucz szyfrowania (minimum 4 znaki)", "input-carrot")
         key_layout.addWidget(self.key_input)
         
-        self.generate_key_btn = QPushButton("🎲 Generuj losowy klucz")
-        self.generate_key_btn.setMinimumSize(180, 40)
-        self.generate_key_btn.setFont(QFont("Arial", 10, QFont.Bold))
-        self.generate_key_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #9b59b6, stop:1 #8e44ad);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #8e44ad, stop:1 #7d3c98);
-            }
-        """)
+        self.generate_key_btn = make_button("🎲 Generuj losowy klucz", "purple", min_size=(180, 40), font_size=10)
         self.generate_key_btn.clicked.connect(self.generate_random_key)
         key_layout.addWidget(self.generate_key_btn)
         
@@ -214,116 +127,33 @@ class EncryptFileStreamWindow(QMainWindow):
         # Pasek postępu
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
-        self.progress_bar.setStyleSheet("""
-            QProgressBar {
-                border: 2px solid #bdc3c7;
-                border-radius: 8px;
-                text-align: center;
-                background: white;
-            }
-            QProgressBar::chunk {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                    stop:0 #e67e22, stop:1 #d35400);
-                border-radius: 6px;
-            }
-        """)
+        set_variant(self.progress_bar, "carrot")
         layout.addWidget(self.progress_bar)
         
         # Przyciski
         buttons_layout = QHBoxLayout()
         
-        self.encrypt_btn = QPushButton("🔒 Szyfruj plik")
-        self.encrypt_btn.setMinimumSize(150, 40)
-        self.encrypt_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.encrypt_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #e67e22, stop:1 #d35400);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #d35400, stop:1 #ba4a00);
-            }
-            QPushButton:disabled {
-                background: #95a5a6;
-            }
-        """)
+        self.encrypt_btn = make_button("🔒 Szyfruj plik", "carrot", min_size=(150, 40))
         self.encrypt_btn.clicked.connect(self.encrypt_file)
         buttons_layout.addWidget(self.encrypt_btn)
         
-        self.clear_btn = QPushButton("🗑️ Wyczyść")
-        self.clear_btn.setMinimumSize(120, 40)
-        self.clear_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.clear_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #95a5a6, stop:1 #7f8c8d);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #7f8c8d, stop:1 #6c7b7d);
-            }
-        """)
+        self.clear_btn = make_button("🗑️ Wyczyść", "gray")
         self.clear_btn.clicked.connect(self.clear_fields)
         buttons_layout.addWidget(self.clear_btn)
         
         layout.addLayout(buttons_layout)
         
         # Informacje o pliku
-        self.file_info = QTextEdit()
-        self.file_info.setReadOnly(True)
+        self.file_info = make_text_edit(variant="output", read_only=True, mono=True)
         self.file_info.setMaximumHeight(100)
-        self.file_info.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #bdc3c7;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 11px;
-                background: #f8f9fa;
-                font-family: 'Courier New', monospace;
-            }
-        """)
         self.file_info.setPlaceholderText("Informacje o wybranym pliku pojawią się tutaj...")
         layout.addWidget(self.file_info)
         
         # Przycisk powrotu
-        self.back_btn = QPushButton("⬅️ Powrót")
-        self.back_btn.setMinimumSize(120, 40)
-        self.back_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.back_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #95a5a6, stop:1 #7f8c8d);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #7f8c8d, stop:1 #6c7b7d);
-            }
-        """)
+        self.back_btn = make_button("⬅️ Powrót", "gray")
         self.back_btn.clicked.connect(self.go_back)
         layout.addWidget(self.back_btn)
         
-    def setup_styles(self):
-        """Ustawienie stylów okna szyfrowania pliku"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #ecf0f1, stop:1 #bdc3c7);
-            }
-        """)
-        
     def browse_input_file(self):
         """Przeglądanie pliku wejściowego"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -334,8 +164,7 @@ class EncryptFileStreamWindow(QMainWindow):
         )
         
         if file_path:
-            self.input_file_path.setText(file_path)
-            self.update_file_info(file_path)
+            self.set_input_file(file_path)
             app_logger.log_user_action("wybrano plik wejściowy")
             
     def browse_output_file(self):
@@ -360,6 +189,11 @@ class EncryptFileStreamWindow(QMainWindow):
             self.output_file_path.setText(file_path)
             app_logger.log_user_action("wybrano plik wyjściowy")
             
+    def set_input_file(self, file_path):
+        """Ustawia plik wejściowy i pokazuje informacje o nim"""
+        self.input_file_path.setText(file_path)
+        self.update_file_info(file_path)
+        
     def update_file_info(self, file_path):
         """Aktualizuje informacje o pliku"""
         try:
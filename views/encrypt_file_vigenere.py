@@ -5,25 +5,30 @@ Okno szyfrowania pliku szyfrem Vigenère
 """
 
 import os
-from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QPushButton, QLabel, QLineEdit, QFileDialog, 
-                             QMessageBox, QApplication, QTextEdit, QComboBox,
-                             QGroupBox, QGridLayout)
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QLabel, QFileDialog, QMessageBox)
 from PyQt5.QtGui import QFont
-from utils.vigenere_cipher import vigenere_encrypt_file, vigenere_encrypt_binary_file, vigenere_encrypt
+from views.theme import (make_button, make_title, make_line_edit,
+                         make_text_edit, make_group)
+from views.file_drop import FileDropMixin
+from utils.vigenere_cipher import (vigenere_encrypt_file, vigenere_encrypt_binary_file,
+                                    vigenere_encrypt, vigenere_shift_bytes)
+from utils.preview import load_preview, render_preview
 from utils.logger import app_logger
 
 
-class EncryptFileVigenereWindow(QMainWindow):
+class EncryptFileVigenereWindow(FileDropMixin, QMainWindow):
     """Okno szyfrowania pliku szyfrem Vigenère"""
     
+    batch_cipher = "vigenere"
+    batch_operation = "encrypt"
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
         app_logger.log_window_open("EncryptFileVigenereWindow")
         self.init_ui()
-        self.setup_styles()
+        self.enable_file_drop(self.file_input, self.key_input)
         
     def is_binary_file(self, file_path):
         """Sprawdza czy plik jest binarny (PDF, obrazy, itp.)"""
@@ -50,38 +55,12 @@ class EncryptFileVigenereWindow(QMainWindow):
         layout.setContentsMargins(30, 30, 30, 30)
         
         # Tytuł
-        title = QLabel("🔑 Szyfrowanie Pliku - Vigenère")
-        title.setAlignment(Qt.AlignCenter)
-        title.setFont(QFont("Arial", 18, QFont.Bold))
-        title.setStyleSheet("""
-            QLabel {
-                color: #9b59b6;
-                padding: 10px;
-                background: white;
-                border-radius: 10px;
-                border: 2px solid #9b59b6;
-            }
-        """)
+        title = make_title("🔑 Szyfrowanie Pliku - Vigenère", "title-purple")
         layout.addWidget(title)
         
         # Sekcja wyboru pliku
-        file_group = QGroupBox("📁 Wybór pliku")
+        file_group = make_group("📁 Wybór pliku")
         file_group.setFont(QFont("Arial", 12, QFont.Bold))
-        file_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #bdc3c7;
-                border-radius: 10px;
-                margin-top: 10px;
-                padding-top: 10px;
-                background: white;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """)
         file_layout = QVBoxLayout(file_group)
         file_layout.setSpacing(10)
         
@@ -91,37 +70,11 @@ class EncryptFileVigenereWindow(QMainWindow):
         
         file_input_layout = QHBoxLayout()
         
-        self.file_input = QLineEdit()
-        self.file_input.setPlaceholderText("Wybierz plik do szyfrowania...")
+        self.file_input = make_line_edit("Wybierz plik do szyfrowania...")
         self.file_input.setReadOnly(True)
-        self.file_input.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #bdc3c7;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 12px;
-                background: white;
-            }
-        """)
         file_input_layout.addWidget(self.file_input)
         
-        self.browse_btn = QPushButton("📁 Przeglądaj")
-        self.browse_btn.setMinimumSize(120, 40)
-        self.browse_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.browse_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #3498db, stop:1 #2980b9);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #2980b9, stop:1 #21618c);
-            }
-        """)
+        self.browse_btn = make_button("📁 Przeglądaj", "blue")
         self.browse_btn.clicked.connect(self.browse_file)
         file_input_layout.addWidget(self.browse_btn)
         
@@ -129,23 +82,8 @@ class EncryptFileVigenereWindow(QMainWindow):
         layout.addWidget(file_group)
         
         # Sekcja opcji szyfru Vigenère
-        cipher_group = QGroupBox("🔑 Opcje szyfru Vigenère")
+        cipher_group = make_group("🔑 Opcje szyfru Vigenère")
         cipher_group.setFont(QFont("Arial", 12, QFont.Bold))
-        cipher_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #bdc3c7;
-                border-radius: 10px;
-                margin-top: 10px;
-                padding-top: 10px;
-                background: white;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """)
         cipher_layout = QVBoxLayout(cipher_group)
         cipher_layout.setSpacing(10)
         
@@ -154,22 +92,8 @@ class EncryptFileVigenereWindow(QMainWindow):
         cipher_layout.addWidget(key_label)
         
         key_layout = QHBoxLayout()
-        self.key_input = QLineEdit()
-        self.key_input.setPlaceholderText("Wprowadź klucz (tylko litery)...")
+        self.key_input = make_line_edit("Wprowadź klucz (tylko litery)...", max_width=200)
         self.key_input.setText("SECRET")
-        self.key_input.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #bdc3c7;
-                border-radius: 8px;
-                padding: 8px;
-                font-size: 11px;
-                background: white;
-                max-width: 200px;
-            }
-            QLineEdit:focus {
-                border-color: #3498db;
-            }
-        """)
         key_layout.addWidget(self.key_input)
         key_layout.addStretch()
         cipher_layout.addLayout(key_layout)
@@ -181,66 +105,19 @@ class EncryptFileVigenereWindow(QMainWindow):
         buttons_layout.setSpacing(15)
         
         
-        self.encrypt_btn = QPushButton("🔑 Szyfruj plik")
-        self.encrypt_btn.setMinimumSize(150, 40)
-        self.encrypt_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.encrypt_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #9b59b6, stop:1 #8e44ad);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #8e44ad, stop:1 #7d3c98);
-            }
-        """)
+        self.encrypt_btn = make_button("🔑 Szyfruj plik", "purple", min_size=(150, 40))
         self.encrypt_btn.clicked.connect(self.encrypt_file)
         buttons_layout.addWidget(self.encrypt_btn)
         
-        self.clear_btn = QPushButton("🗑️ Wyczyść")
-        self.clear_btn.setMinimumSize(120, 40)
-        self.clear_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.clear_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #95a5a6, stop:1 #7f8c8d);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #7f8c8d, stop:1 #6c7b7d);
-            }
-        """)
+        self.clear_btn = make_button("🗑️ Wyczyść", "gray")
         self.clear_btn.clicked.connect(self.clear_fields)
         buttons_layout.addWidget(self.clear_btn)
         
         layout.addLayout(buttons_layout)
         
         # Sekcja wyników
-        result_group = QGroupBox("📊 Wynik")
+        result_group = make_group("📊 Wynik")
         result_group.setFont(QFont("Arial", 12, QFont.Bold))
-        result_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #bdc3c7;
-                border-radius: 10px;
-                margin-top: 10px;
-                padding-top: 10px;
-                background: white;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }
-        """)
         result_layout = QVBoxLayout(result_group)
         result_layout.setSpacing(10)
         
@@ -248,20 +125,9 @@ class EncryptFileVigenereWindow(QMainWindow):
         result_label.setFont(QFont("Arial", 11, QFont.Bold))
         result_layout.addWidget(result_label)
         
-        self.result_output = QTextEdit()
-        self.result_output.setReadOnly(True)
+        self.result_output = make_text_edit(variant="output-purple", read_only=True)
         self.result_output.setMinimumHeight(200)
         self.result_output.setMaximumHeight(300)
-        self.result_output.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #9b59b6;
-                border-radius: 8px;
-                padding: 15px;
-                font-size: 12px;
-                background: #f8f9fa;
-                line-height: 1.4;
-            }
-        """)
         result_layout.addWidget(self.result_output)
         
         layout.addWidget(result_group)
@@ -270,37 +136,12 @@ class EncryptFileVigenereWindow(QMainWindow):
         back_layout = QHBoxLayout()
         back_layout.addStretch()
         
-        self.back_btn = QPushButton("⬅️ Powrót")
-        self.back_btn.setMinimumSize(120, 40)
-        self.back_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.back_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #95a5a6, stop:1 #7f8c8d);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #7f8c8d, stop:1 #6c7b7d);
-            }
-        """)
+        self.back_btn = make_button("⬅️ Powrót", "gray")
         self.back_btn.clicked.connect(self.go_back)
         back_layout.addWidget(self.back_btn)
         
         layout.addLayout(back_layout)
         
-    def setup_styles(self):
-        """Ustawienie stylów okna szyfrowania pliku"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #ecf0f1, stop:1 #bdc3c7);
-            }
-        """)
-        
     def browse_file(self):
         """Otwiera dialog wyboru pliku"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -334,30 +175,18 @@ class EncryptFileVigenereWindow(QMainWindow):
         try:
             app_logger.log_preview("szyfrowania Vigenère", file_path, key)
             
-            # Wczytaj początek pliku do podglądu
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-            
-            # Ogranicz do pierwszych 500 znaków dla podglądu
-            preview_content = content[:500]
-            if len(content) > 500:
-                preview_content += "\n... (plik jest dłuższy)"
+            # Wczytaj tylko początek pliku (pliki binarne jako zrzut hex)
+            binary = self.is_binary_file(file_path)
+            preview = load_preview(file_path, binary=binary)
             
-            # Zaszyfruj podgląd
-            encrypted_preview = vigenere_encrypt(preview_content, key)
-            
-            # Wyświetl podgląd
-            self.result_output.setPlainText(
-                f"👁️ PODGLĄD SZYFROWANIA PLIKU VIGENÈRE\n\n"
-                f"📁 Plik: {os.path.basename(file_path)}\n"
-                f"🔑 Klucz: {key}\n"
-                f"📏 Rozmiar pliku: {len(content)} znaków\n\n"
-                f"📝 Oryginalny tekst (pierwsze 500 znaków):\n"
-                f"{preview_content}\n\n"
-                f"🔒 Zaszyfrowany tekst:\n"
-                f"{encrypted_preview}\n\n"
-                f"💡 Kliknij 'Szyfruj plik' aby zapisać pełny zaszyfrowany plik"
-            )
+            self.result_output.setPlainText(render_preview(
+                preview, lambda text: vigenere_encrypt(text, key),
+                "👁️ PODGLĄD SZYFROWANIA PLIKU VIGENÈRE",
+                [f"🔑 Klucz: {key}"],
+                "📝 Oryginalny tekst", "🔒 Zaszyfrowany tekst",
+                "💡 Kliknij 'Szyfruj plik' aby zapisać pełny zaszyfrowany plik",
+                binary_transform=(lambda data: vigenere_shift_bytes(data, key)) if binary else None
+            ))
             
         except ValueError as e:
             app_logger.log_validation_error("klucz", str(e))
@@ -4,11 +4,11 @@
 Okno szyfrowania tekstu
 """
 
-from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QPushButton, QLabel, QTextEdit, QLineEdit, 
-                             QMessageBox, QApplication)
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QLabel, QMessageBox, QApplication)
 from PyQt5.QtGui import QFont
+from views.theme import make_button, make_title, make_line_edit, make_text_edit
+from views.live_preview import LivePreview, make_preview_controls
 from utils.caesar_cipher import caesar_encrypt
 from utils.logger import app_logger
 
@@ -19,9 +19,11 @@ class EncryptTextWindow(QMainWindow):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.parent = parent
+        # Wynik z przycisku "Szyfruj" potwierdzany jest komunikatem
+        self.announce_result = False
         app_logger.log_window_open("EncryptTextWindow")
+        self.preview = LivePreview(self, self.prepare_preview)
         self.init_ui()
-        self.setup_styles()
         
     def init_ui(self):
         """Inicjalizacja interfejsu okna szyfrowania"""
@@ -38,18 +40,7 @@ class EncryptTextWindow(QMainWindow):
         layout.setContentsMargins(20, 20, 20, 20)
         
         # Tytuł
-        title = QLabel("🔒 Szyfrowanie Tekstu")
-        title.setAlignment(Qt.AlignCenter)
-        title.setFont(QFont("Arial", 18, QFont.Bold))
-        title.setStyleSheet("""
-            QLabel {
-                color: #27ae60;
-                padding: 10px;
-                background: white;
-                border-radius: 10px;
-                border: 2px solid #27ae60;
-            }
-        """)
+        title = make_title("🔒 Szyfrowanie Tekstu", "title-green")
         layout.addWidget(title)
         
         # Pole na tekst do szyfrowania
@@ -57,21 +48,8 @@ class EncryptTextWindow(QMainWindow):
         text_label.setFont(QFont("Arial", 12, QFont.Bold))
         layout.addWidget(text_label)
         
-        self.text_input = QTextEdit()
-        self.text_input.setPlaceholderText("Wprowadź tekst do szyfrowania...")
+        self.text_input = make_text_edit("Wprowadź tekst do szyfrowania...")
         self.text_input.setMaximumHeight(120)
-        self.text_input.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #bdc3c7;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 12px;
-                background: white;
-            }
-            QTextEdit:focus {
-                border-color: #3498db;
-            }
-        """)
         layout.addWidget(self.text_input)
         
         # Pole przesunięcia
@@ -79,141 +57,69 @@ class EncryptTextWindow(QMainWindow):
         shift_label.setFont(QFont("Arial", 12, QFont.Bold))
         layout.addWidget(shift_label)
         
-        self.shift_input = QLineEdit()
-        self.shift_input.setPlaceholderText("Wprowadź przesunięcie (1-25)")
+        self.shift_input = make_line_edit("Wprowadź przesunięcie (1-25)", max_width=150)
         self.shift_input.setText("3")
-        self.shift_input.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #bdc3c7;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 12px;
-                background: white;
-                max-width: 150px;
-            }
-            QLineEdit:focus {
-                border-color: #3498db;
-            }
-        """)
         layout.addWidget(self.shift_input)
         
         # Przyciski
         buttons_layout = QHBoxLayout()
         
-        self.encrypt_btn = QPushButton("🔒 Szyfruj")
-        self.encrypt_btn.setMinimumSize(120, 40)
-        self.encrypt_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.encrypt_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #27ae60, stop:1 #229954);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #229954, stop:1 #1e8449);
-            }
-        """)
+        self.encrypt_btn = make_button("🔒 Szyfruj", "green")
         self.encrypt_btn.clicked.connect(self.encrypt_text)
         buttons_layout.addWidget(self.encrypt_btn)
         
-        self.clear_btn = QPushButton("🗑️ Wyczyść")
-        self.clear_btn.setMinimumSize(120, 40)
-        self.clear_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.clear_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #95a5a6, stop:1 #7f8c8d);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #7f8c8d, stop:1 #6c7b7d);
-            }
-        """)
+        self.clear_btn = make_button("🗑️ Wyczyść", "gray")
         self.clear_btn.clicked.connect(self.clear_fields)
         buttons_layout.addWidget(self.clear_btn)
         
         layout.addLayout(buttons_layout)
         
+        # Podgląd na żywo - szyfrowanie w tle po każdej zmianie
+        preview_layout, self.live_preview_check, self.preview_status = \
+            make_preview_controls(self.preview)
+        layout.addLayout(preview_layout)
+        self.preview.watch(self.text_input.textChanged, self.shift_input.textChanged)
+        self.preview.result_ready.connect(self.show_result)
+        self.preview.failed.connect(self.show_error)
+        self.preview.cleared.connect(self.clear_result)
+        
         # Wynik szyfrowania
         result_label = QLabel("Zaszyfrowany tekst:")
         result_label.setFont(QFont("Arial", 12, QFont.Bold))
         layout.addWidget(result_label)
         
-        self.result_output = QTextEdit()
-        self.result_output.setReadOnly(True)
+        self.result_output = make_text_edit(variant="output-green", read_only=True)
         self.result_output.setMaximumHeight(120)
-        self.result_output.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #27ae60;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 12px;
-                background: #f8f9fa;
-            }
-        """)
         layout.addWidget(self.result_output)
         
         # Przycisk kopiowania
-        self.copy_btn = QPushButton("📋 Kopiuj wynik")
-        self.copy_btn.setMinimumSize(150, 40)
-        self.copy_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.copy_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #3498db, stop:1 #2980b9);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #2980b9, stop:1 #21618c);
-            }
-        """)
+        self.copy_btn = make_button("📋 Kopiuj wynik", "blue", min_size=(150, 40))
         self.copy_btn.clicked.connect(self.copy_result)
         layout.addWidget(self.copy_btn)
         
         # Przycisk powrotu
-        self.back_btn = QPushButton("⬅️ Powrót")
-        self.back_btn.setMinimumSize(120, 40)
-        self.back_btn.setFont(QFont("Arial", 12, QFont.Bold))
-        self.back_btn.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #95a5a6, stop:1 #7f8c8d);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                    stop:0 #7f8c8d, stop:1 #6c7b7d);
-            }
-        """)
+        self.back_btn = make_button("⬅️ Powrót", "gray")
         self.back_btn.clicked.connect(self.go_back)
         layout.addWidget(self.back_btn)
         
-    def setup_styles(self):
-        """Ustawienie stylów okna szyfrowania"""
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #ecf0f1, stop:1 #bdc3c7);
-            }
-        """)
+    def parse_shift(self):
+        """Zwraca przesunięcie z pola albo None, gdy jest nieprawidłowe"""
+        try:
+            shift = int(self.shift_input.text().strip())
+        except ValueError:
+            return None
+        return shift if 1 <= shift <= 25 else None
+        
+    def prepare_preview(self):
+        """Dane dla zadania w tle: (funkcja, argumenty) lub None przy niepełnych danych"""
+        text = self.text_input.toPlainText().strip()
+        shift = self.parse_shift()
+        if not text or shift is None:
+            return None
+        return caesar_encrypt, (text, shift)
         
     def encrypt_text(self):
-        """Szyfruje wprowadzony tekst szyfrem Cezara"""
+        """Szyfruje wprowadzony tekst szyfrem Cezara (w tle)"""
         text = self.text_input.toPlainText().strip()
         if not text:
             app_logger.log_validation_error("tekst", "pusty tekst")
@@ -222,27 +128,40 @@ class EncryptTextWindow(QMainWindow):
             
         try:
             shift = int(self.shift_input.text().strip())
-            if shift < 1 or shift > 25:
-                app_logger.log_validation_error("przesunięcie", f"poza zakresem: {shift}")
-                QMessageBox.warning(self, "Błąd", "Przesunięcie musi być liczbą od 1 do 25!")
-                return
-                
-            app_logger.log_encryption_start("tekst", shift)
-            encrypted_text = caesar_encrypt(text, shift)
-            app_logger.log_encryption_success("tekst", len(encrypted_text))
-            
-            # Wyświetl zaszyfrowany tekst
-            self.result_output.setPlainText(encrypted_text)
-            
-            QMessageBox.information(self, "Sukces", 
-                f"Tekst został zaszyfrowany szyfrem Cezara z przesunięciem {shift}!")
-            
         except ValueError:
             app_logger.log_validation_error("przesunięcie", "nieprawidłowy format")
             QMessageBox.warning(self, "Błąd", "Przesunięcie musi być liczbą całkowitą!")
-        except Exception as e:
-            app_logger.log_error("szyfrowanie tekstu", str(e))
-            QMessageBox.critical(self, "Błąd", f"Wystąpił błąd podczas szyfrowania: {str(e)}")
+            return
+        if shift < 1 or shift > 25:
+            app_logger.log_validation_error("przesunięcie", f"poza zakresem: {shift}")
+            QMessageBox.warning(self, "Błąd", "Przesunięcie musi być liczbą od 1 do 25!")
+            return
+            
+        app_logger.log_encryption_start("tekst", shift)
+        self.announce_result = True
+        self.preview.run_now()
+        
+    def show_result(self, encrypted_text):
+        """Wyświetla wynik zadania w tle"""
+        self.result_output.setPlainText(encrypted_text)
+        if self.announce_result:
+            self.announce_result = False
+            app_logger.log_encryption_success("tekst", len(encrypted_text))
+            QMessageBox.information(self, "Sukces", 
+                f"Tekst został zaszyfrowany szyfrem Cezara z przesunięciem {self.parse_shift()}!")
+            
+    def show_error(self, error):
+        """Obsługuje błąd zadania w tle"""
+        self.result_output.clear()
+        if self.announce_result:
+            self.announce_result = False
+            app_logger.log_error("szyfrowanie tekstu", str(error))
+            QMessageBox.critical(self, "Błąd", f"Wystąpił błąd podczas szyfrowania: {str(error)}")
+            
+    def clear_result(self):
+        """Czyści wynik, gdy dane wejściowe są niepełne"""
+        self.result_output.clear()
+        self.announce_result = False
             
     def clear_fields(self):
         """Czyści wszystkie pola"""
@@ -3,41 +3,26 @@ Okno szyfrowania tekstu AES
 """
 
 import sys
-import traceback
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
-                             QWidget, QLabel, QTextEdit, QLineEdit, QPushButton, 
-                             QComboBox, QMessageBox, QFrame)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QPropertyAnimation, QEasingCurve
-from PyQt5.QtGui import QFont, QIcon, QPalette, QColor, QLinearGradient, QBrush
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout,
+                             QHBoxLayout, QWidget, QLabel, QLineEdit,
+                             QComboBox, QMessageBox)
+from PyQt5.QtCore import Qt, QPropertyAnimation, QEasingCurve
+from PyQt5.QtGui import QFont
+from views.theme import (make_button, make_line_edit, make_text_edit,
+                         make_frame, set_variant)
+from views.live_preview import LivePreview, make_preview_controls
 from utils.aes_cipher import aes_encrypt_text
-from utils.logger import AppLogger
-
-app_logger = AppLogger()
-
-class AESEncryptWorker(QThread):
-    """Wątek do szyfrowania AES"""
-    finished = pyqtSignal(str)
-    error = pyqtSignal(str)
-    
-    def __init__(self, text, key, key_size):
-        super().__init__()
-        self.text = text
-        self.key = key
-        self.key_size = key_size
-    
-    def run(self):
-        try:
-            result = aes_encrypt_text(text, key, key_size)
-            self.finished.emit(result)
-        except Exception as e:
-            self.error.emit(str(e))
+from utils.logger import app_logger
 
 class AESEncryptTextWindow(QMainWindow):
     """Okno szyfrowania tekstu AES"""
     
-    def __init__(self):
+    def __init__(self, parent=None):
         super().__init__()
-        self.worker = None
+        self.parent = parent
+        # Wynik z przycisku "Szyfruj" potwierdzany jest komunikatem
+        self.announce_result = False
+        self.preview = LivePreview(self, self.prepare_preview)
         self.init_ui()
         
     def init_ui(self):
@@ -63,117 +48,51 @@ class AESEncryptTextWindow(QMainWindow):
         title_font.setPointSize(18)
         title_font.setBold(True)
         title_label.setFont(title_font)
-        title_label.setStyleSheet("color: #2c3e50; margin-bottom: 20px;")
+        set_variant(title_label, "aes-title")
         main_layout.addWidget(title_label)
         
         # Opis
         desc_label = QLabel("Wprowadź tekst do zaszyfrowania i klucz. Wybierz rozmiar klucza AES.")
         desc_label.setAlignment(Qt.AlignCenter)
-        desc_label.setStyleSheet("color: #7f8c8d; margin-bottom: 20px;")
+        set_variant(desc_label, "aes-desc")
         main_layout.addWidget(desc_label)
         
         # Sekcja tekstu wejściowego
-        input_frame = QFrame()
-        input_frame.setFrameStyle(QFrame.StyledPanel)
-        input_frame.setStyleSheet("""
-            QFrame {
-                background-color: #f8f9fa;
-                border: 2px solid #e9ecef;
-                border-radius: 10px;
-                padding: 15px;
-            }
-        """)
+        input_frame = make_frame("aes-section")
         input_layout = QVBoxLayout(input_frame)
         
         input_label = QLabel("📝 Tekst do zaszyfrowania:")
-        input_label.setStyleSheet("font-weight: bold; color: #2c3e50; margin-bottom: 10px;")
+        set_variant(input_label, "aes-heading")
         input_layout.addWidget(input_label)
         
-        self.text_input = QTextEdit()
-        self.text_input.setPlaceholderText("Wprowadź tekst do zaszyfrowania...")
-        self.text_input.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 14px;
-                background-color: white;
-            }
-            QTextEdit:focus {
-                border-color: #007bff;
-            }
-        """)
+        self.text_input = make_text_edit("Wprowadź tekst do zaszyfrowania...", "aes-input")
         self.text_input.setMinimumHeight(120)
         input_layout.addWidget(self.text_input)
         
         main_layout.addWidget(input_frame)
         
         # Sekcja klucza
-        key_frame = QFrame()
-        key_frame.setFrameStyle(QFrame.StyledPanel)
-        key_frame.setStyleSheet("""
-            QFrame {
-                background-color: #f8f9fa;
-                border: 2px solid #e9ecef;
-                border-radius: 10px;
-                padding: 15px;
-            }
-        """)
+        key_frame = make_frame("aes-section")
         key_layout = QVBoxLayout(key_frame)
         
         key_label = QLabel("🔑 Klucz szyfrowania:")
-        key_label.setStyleSheet("font-weight: bold; color: #2c3e50; margin-bottom: 10px;")
+        set_variant(key_label, "aes-heading")
         key_layout.addWidget(key_label)
         
-        self.key_input = QLineEdit()
-        self.key_input.setPlaceholderText("Wprowadź klucz szyfrowania...")
+        self.key_input = make_line_edit("Wprowadź klucz szyfrowania...", "aes-input")
         self.key_input.setEchoMode(QLineEdit.Password)
-        self.key_input.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 14px;
-                background-color: white;
-            }
-            QLineEdit:focus {
-                border-color: #007bff;
-            }
-        """)
         key_layout.addWidget(self.key_input)
         
         # Rozmiar klucza
         key_size_layout = QHBoxLayout()
         key_size_label = QLabel("🔧 Rozmiar klucza:")
-        key_size_label.setStyleSheet("font-weight: bold; color: #2c3e50;")
+        set_variant(key_size_label, "aes-label")
         key_size_layout.addWidget(key_size_label)
         
         self.key_size_combo = QComboBox()
         self.key_size_combo.addItems(["128 bitów (AES-128)", "192 bity (AES-192)", "256 bitów (AES-256)"])
         self.key_size_combo.setCurrentIndex(0)  # Domyślnie AES-128
-        self.key_size_combo.setStyleSheet("""
-            QComboBox {
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                padding: 8px;
-                font-size: 14px;
-                background-color: white;
-                min-width: 200px;
-            }
-            QComboBox:focus {
-                border-color: #007bff;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-            QComboBox::down-arrow {
-                image: none;
-                border-left: 5px solid transparent;
-                border-right: 5px solid transparent;
-                border-top: 5px solid #6c757d;
-                margin-right: 10px;
-            }
-        """)
+        set_variant(self.key_size_combo, "aes-input")
         key_size_layout.addWidget(self.key_size_combo)
         key_size_layout.addStretch()
         
@@ -183,118 +102,40 @@ class AESEncryptTextWindow(QMainWindow):
         # Przyciski
         button_layout = QHBoxLayout()
         
-        self.encrypt_button = QPushButton("🔐 Szyfruj")
-        self.encrypt_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #007bff, stop:1 #0056b3);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 24px;
-                font-size: 16px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #0056b3, stop:1 #004085);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #004085, stop:1 #002752);
-            }
-            QPushButton:disabled {
-                background: #6c757d;
-                color: #adb5bd;
-            }
-        """)
+        self.encrypt_button = make_button("🔐 Szyfruj", "aes-primary", min_size=None, font_size=None)
         self.encrypt_button.clicked.connect(self.encrypt_text)
         button_layout.addWidget(self.encrypt_button)
         
-        self.clear_button = QPushButton("🗑️ Wyczyść")
-        self.clear_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #6c757d, stop:1 #495057);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 24px;
-                font-size: 16px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #495057, stop:1 #343a40);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #343a40, stop:1 #212529);
-            }
-        """)
+        self.clear_button = make_button("🗑️ Wyczyść", "aes-secondary", min_size=None, font_size=None)
         self.clear_button.clicked.connect(self.clear_all)
         button_layout.addWidget(self.clear_button)
         
-        self.back_button = QPushButton("⬅️ Wróć")
-        self.back_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #28a745, stop:1 #1e7e34);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 12px 24px;
-                font-size: 16px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #1e7e34, stop:1 #155724);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #155724, stop:1 #0c4a1a);
-            }
-        """)
+        self.back_button = make_button("⬅️ Wróć", "aes-success", min_size=None, font_size=None)
         self.back_button.clicked.connect(self.go_back)
         button_layout.addWidget(self.back_button)
         
         button_layout.addStretch()
         main_layout.addLayout(button_layout)
         
+        # Podgląd na żywo - szyfrowanie w tle po każdej zmianie
+        preview_layout, self.live_preview_check, self.preview_status = \
+            make_preview_controls(self.preview)
+        main_layout.addLayout(preview_layout)
+        self.preview.watch(self.text_input.textChanged, self.key_input.textChanged,
+                           self.key_size_combo.currentIndexChanged)
+        self.preview.result_ready.connect(self.on_encryption_finished)
+        self.preview.failed.connect(self.on_encryption_error)
+        self.preview.cleared.connect(self.clear_result)
+        
         # Sekcja wyniku
-        result_frame = QFrame()
-        result_frame.setFrameStyle(QFrame.StyledPanel)
-        result_frame.setStyleSheet("""
-            QFrame {
-                background-color: #f8f9fa;
-                border: 2px solid #e9ecef;
-                border-radius: 10px;
-                padding: 15px;
-            }
-        """)
+        result_frame = make_frame("aes-section")
         result_layout = QVBoxLayout(result_frame)
         
         result_label = QLabel("🔒 Zaszyfrowany tekst:")
-        result_label.setStyleSheet("font-weight: bold; color: #2c3e50; margin-bottom: 10px;")
+        set_variant(result_label, "aes-heading")
         result_layout.addWidget(result_label)
         
-        self.result_output = QTextEdit()
-        self.result_output.setPlaceholderText("Zaszyfrowany tekst pojawi się tutaj...")
-        self.result_output.setReadOnly(True)
-        self.result_output.setStyleSheet("""
-            QTextEdit {
-                border: 2px solid #dee2e6;
-                border-radius: 8px;
-                padding: 10px;
-                font-size: 14px;
-                background-color: white;
-                font-family: 'Courier New', monospace;
-            }
-        """)
+        self.result_output = make_text_edit("Zaszyfrowany tekst pojawi się tutaj...", "aes-output", read_only=True, mono=True)
         self.result_output.setMinimumHeight(120)
         result_layout.addWidget(self.result_output)
         
@@ -302,31 +143,7 @@ class AESEncryptTextWindow(QMainWindow):
         copy_layout = QHBoxLayout()
         copy_layout.addStretch()
         
-        self.copy_button = QPushButton("📋 Kopiuj wynik")
-        self.copy_button.setStyleSheet("""
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #17a2b8, stop:1 #138496);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                padding: 10px 20px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #138496, stop:1 #0f6674);
-            }
-            QPushButton:pressed {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #0f6674, stop:1 #0b4d56);
-            }
-            QPushButton:disabled {
-                background: #6c757d;
-                color: #adb5bd;
-            }
-        """)
+        self.copy_button = make_button("📋 Kopiuj wynik", "aes-info", min_size=None, font_size=None)
         self.copy_button.clicked.connect(self.copy_result)
         self.copy_button.setEnabled(False)
         copy_layout.addWidget(self.copy_button)
@@ -334,13 +151,8 @@ class AESEncryptTextWindow(QMainWindow):
         result_layout.addLayout(copy_layout)
         main_layout.addWidget(result_frame)
         
-        # Ustawienie stylu głównego okna
-        self.setStyleSheet("""
-            QMainWindow {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #f8f9fa, stop:1 #e9ecef);
-            }
-        """)
+        # Tło okna AES
+        set_variant(self, "aes")
         
         app_logger.info("AES encrypt text window initialized")
     
@@ -355,61 +167,68 @@ class AESEncryptTextWindow(QMainWindow):
             return 256
         return 128
     
+    def prepare_preview(self):
+        """Dane dla zadania w tle: (funkcja, argumenty) lub None przy niepełnych danych"""
+        text = self.text_input.toPlainText().strip()
+        key = self.key_input.text().strip()
+        if not text or not key:
+            return None
+        return aes_encrypt_text, (text, key, self.get_key_size())
+    
     def encrypt_text(self):
         """Szyfruje tekst"""
-        try:
-            text = self.text_input.toPlainText().strip()
-            key = self.key_input.text().strip()
-            
-            if not text:
-                QMessageBox.warning(self, "Błąd", "Wprowadź tekst do zaszyfrowania!")
-                return
-            
-            if not key:
-                QMessageBox.warning(self, "Błąd", "Wprowadź klucz szyfrowania!")
-                return
-            
-            # Wyłączenie przycisku podczas szyfrowania
-            self.encrypt_button.setEnabled(False)
-            self.encrypt_button.setText("⏳ Szyfrowanie...")
-            
-            # Uruchomienie wątku szyfrowania
-            self.worker = AESEncryptWorker(text, key, self.get_key_size())
-            self.worker.finished.connect(self.on_encryption_finished)
-            self.worker.error.connect(self.on_encryption_error)
-            self.worker.start()
-            
-            app_logger.info(f"AES text encryption started with key size {self.get_key_size()}")
-            
-        except Exception as e:
-            app_logger.error(f"AES text encryption error: {str(e)}")
-            QMessageBox.critical(self, "Błąd", f"Wystąpił błąd podczas szyfrowania:\n{str(e)}")
-            self.encrypt_button.setEnabled(True)
-            self.encrypt_button.setText("🔐 Szyfruj")
+        text = self.text_input.toPlainText().strip()
+        key = self.key_input.text().strip()
+        
+        if not text:
+            QMessageBox.warning(self, "Błąd", "Wprowadź tekst do zaszyfrowania!")
+            return
+        
+        if not key:
+            QMessageBox.warning(self, "Błąd", "Wprowadź klucz szyfrowania!")
+            return
+        
+        # Wyłączenie przycisku podczas szyfrowania
+        self.encrypt_button.setEnabled(False)
+        self.encrypt_button.setText("⏳ Szyfrowanie...")
+        
+        # Szyfrowanie w puli wątków podglądu
+        self.announce_result = True
+        self.preview.run_now()
+        
+        app_logger.info("AES text encryption started with key size %s", self.get_key_size())
+    
+    def _restore_encrypt_button(self):
+        self.encrypt_button.setEnabled(True)
+        self.encrypt_button.setText("🔐 Szyfruj")
     
     def on_encryption_finished(self, result):
         """Obsługuje zakończenie szyfrowania"""
-        try:
-            self.result_output.setPlainText(result)
-            self.copy_button.setEnabled(True)
-            self.encrypt_button.setEnabled(True)
-            self.encrypt_button.setText("🔐 Szyfruj")
-            
+        self.result_output.setPlainText(result)
+        self.copy_button.setEnabled(True)
+        if self.announce_result:
+            self.announce_result = False
+            self._restore_encrypt_button()
             app_logger.info("AES text encryption completed successfully")
             QMessageBox.information(self, "Sukces", "Tekst został zaszyfrowany pomyślnie!")
-            
-        except Exception as e:
-            app_logger.error(f"AES encryption finish error: {str(e)}")
-            QMessageBox.critical(self, "Błąd", f"Wystąpił błąd:\n{str(e)}")
-            self.encrypt_button.setEnabled(True)
-            self.encrypt_button.setText("🔐 Szyfruj")
     
-    def on_encryption_error(self, error_msg):
+    def on_encryption_error(self, error):
         """Obsługuje błąd szyfrowania"""
-        app_logger.error(f"AES encryption error: {error_msg}")
-        QMessageBox.critical(self, "Błąd szyfrowania", f"Wystąpił błąd podczas szyfrowania:\n{error_msg}")
-        self.encrypt_button.setEnabled(True)
-        self.encrypt_button.setText("🔐 Szyfruj")
+        self.result_output.clear()
+        self.copy_button.setEnabled(False)
+        if self.announce_result:
+            self.announce_result = False
+            self._restore_encrypt_button()
+            app_logger.error("AES encryption error: %s", error)
+            QMessageBox.critical(self, "Błąd szyfrowania", f"Wystąpił błąd podczas szyfrowania:\n{str(error)}")
+    
+    def clear_result(self):
+        """Czyści wynik, gdy dane wejściowe są niepełne"""
+        self.result_output.clear()
+        self.copy_button.setEnabled(False)
+        if self.announce_result:
+            self.announce_result = False
+            self._restore_encrypt_button()
     
     def copy_result(self):
         """Kopiuje wynik do schowka"""
@@ -455,10 +274,15 @@ class AESEncryptTextWindow(QMainWindow):
     def _open_cipher_window(self):
         """Otwiera okno wyboru szyfru po animacji"""
         try:
-            from views.cipher_choice_window import CipherChoiceWindow
-            self.cipher_window = CipherChoiceWindow()
-            self.cipher_window.show()
+            if self.parent:
+                self.parent.show()
+            else:
+                from views.cipher_choice_window import CipherChoiceWindow
+                self.cipher_window = CipherChoiceWindow()
+                self.cipher_window.show()
             self.close()
+            # Okno wraca do puli - przywróć widoczność po animacji
+            self.setWindowOpacity(1.0)
             app_logger.info("Returned to cipher choice window")
         except Exception as e:
             app_logger.error(f"Open cipher window error: {str(e)}")
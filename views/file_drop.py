@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Przeciąganie plików i folderów do okien plikowych
+
+Pojedynczy upuszczony plik trafia do pola pliku wejściowego okna. Wiele
+plików lub folder przetwarzane są wsadowo (utils.batch) z ustawieniami
+wpisanymi w oknie, a wyniki zapisywane obok plików źródłowych.
+"""
+
+import os
+from PyQt5.QtWidgets import QMessageBox, QLineEdit, QTextEdit
+from PyQt5.QtCore import QThread, pyqtSignal
+from utils.batch import collect_files, plan_outputs, run_batch
+from utils.file_ciphers import get_file_cipher
+from utils.logger import app_logger
+
+
+class BatchWorker(QThread):
+    """Wątek przetwarzania wsadowego"""
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(list)
+
+    def __init__(self, cipher, operation, tasks, key, options):
+        super().__init__()
+        self.cipher = cipher
+        self.operation = operation
+        self.tasks = tasks
+        self.key = key
+        self.options = options
+        self.done = 0
+
+    def process(self, input_file, output_file):
+        return self.cipher.run(self.operation, input_file, output_file, self.key, **self.options)
+
+    def on_result(self, result):
+        self.done += 1
+        self.progress.emit(self.done, len(self.tasks))
+
+    def run(self):
+        results = run_batch(self.tasks, self.process, on_result=self.on_result)
+        self.finished.emit(results)
+
+
+class FileDropMixin:
+    """
+    Obsługa upuszczania plików dla okien plikowych
+
+    Okno ustawia batch_cipher i batch_operation (klucze rejestru
+    utils.file_ciphers) i wywołuje enable_file_drop() po zbudowaniu
+    interfejsu. Opcje szyfru (np. rozmiar klucza AES) zwraca batch_options().
+    """
+
+    batch_cipher = None
+    batch_operation = None
+
+    def enable_file_drop(self, drop_field, key_field):
+        """
+        Włącza przyjmowanie upuszczanych plików i folderów
+
+        Args:
+            drop_field: Pole pliku wejściowego (dla pojedynczego pliku)
+            key_field: Pole klucza używanego przy przetwarzaniu wsadowym
+        """
+        self.drop_field = drop_field
+        self.key_field = key_field
+        self.batch_worker = None
+        self.setAcceptDrops(True)
+        # Pola tekstowe przyjęłyby upuszczone ścieżki jako tekst - zdarzenie trafia do okna
+        for widget in self.findChildren((QLineEdit, QTextEdit)):
+            widget.setAcceptDrops(False)
+        self.statusBar().showMessage("Przeciągnij pliki lub foldery, aby przetworzyć je wsadowo")
+
+    def set_input_file(self, file_path):
+        """Ustawia plik wejściowy okna (także po upuszczeniu pojedynczego pliku)"""
+        self.drop_field.setText(file_path)
+
+    def batch_options(self):
+        """Opcje szyfru dla przetwarzania wsadowego"""
+        return {}
+
+    def batch_settings(self):
+        """
+        Sprawdza klucz wpisany w oknie
+
+        Returns:
+            tuple: (klucz, opcje) lub None, gdy klucz jest nieprawidłowy
+        """
+        try:
+            key = get_file_cipher(self.batch_cipher).parse_key(self.key_field.text())
+        except ValueError as e:
+            app_logger.log_validation_error("klucz", str(e))
+            QMessageBox.warning(self, "Błąd", str(e))
+            return None
+        return key, self.batch_options()
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    def dropEvent(self, event):
+        paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        if not paths:
+            event.ignore()
+            return
+        event.acceptProposedAction()
+        self.handle_dropped_paths(paths)
+
+    def handle_dropped_paths(self, paths):
+        """
+        Obsługuje upuszczone ścieżki
+
+        Args:
+            paths: Lista ścieżek plików i folderów
+        """
+        if len(paths) == 1 and os.path.isfile(paths[0]):
+            self.set_input_file(paths[0])
+            app_logger.log_user_action("upuszczono plik wejściowy")
+            return
+
+        files = collect_files(paths)
+        if not files:
+            QMessageBox.warning(self, "Błąd", "Upuszczone foldery nie zawierają plików!")
+            return
+        self.start_batch(files)
+
+    def start_batch(self, files):
+        """
+        Uruchamia przetwarzanie wsadowe plików
+
+        Args:
+            files: Lista plików wejściowych
+        """
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            QMessageBox.warning(self, "Błąd", "Przetwarzanie wsadowe już trwa!")
+            return
+
+        settings = self.batch_settings()
+        if settings is None:
+            return
+        key, options = settings
+
+        cipher = get_file_cipher(self.batch_cipher)
+        tasks = plan_outputs(cipher, files, self.batch_operation)
+        app_logger.log_user_action(f"przetwarzanie wsadowe {len(tasks)} plików ({cipher.label})")
+
+        self.batch_worker = BatchWorker(cipher, self.batch_operation, tasks, key, options)
+        self.batch_worker.progress.connect(self.batch_progress)
+        self.batch_worker.finished.connect(self.batch_finished)
+        self.setAcceptDrops(False)
+        self.statusBar().showMessage(f"📦 Przetwarzanie wsadowe: 0/{len(tasks)}")
+        self.batch_worker.start()
+
+    def batch_progress(self, done, total):
+        """Aktualizuje postęp przetwarzania wsadowego"""
+        self.statusBar().showMessage(f"📦 Przetwarzanie wsadowe: {done}/{total}")
+
+    def batch_finished(self, results):
+        """Pokazuje podsumowanie przetwarzania wsadowego"""
+        self.setAcceptDrops(True)
+        succeeded = [result for result in results if result.success]
+        failed = [result for result in results if not result.success]
+        self.statusBar().showMessage(
+            f"📦 Zakończono: {len(succeeded)}/{len(results)} plików")
+
+        summary = f"Przetworzono pomyślnie {len(succeeded)} z {len(results)} plików."
+        if failed:
+            summary += "\n\nBłędy:\n" + "\n".join(
+                f"• {os.path.basename(result.input_file)}: {result.error}"
+                for result in failed[:10])
+            if len(failed) > 10:
+                summary += f"\n... i {len(failed) - 10} więcej"
+            QMessageBox.warning(self, "Przetwarzanie wsadowe", summary)
+        else:
+            QMessageBox.information(self, "Przetwarzanie wsadowe", summary)
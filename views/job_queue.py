@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Kolejka zadań plikowych wykonywanych w puli wątków
+
+Zadania czekają w kolejce i są przekazywane do QThreadPool, dopóki liczba
+uruchomionych zadań nie osiągnie limitu współbieżności. Wstrzymanie dotyczy
+zadań oczekujących (lub całej kolejki). Anulowanie zadania w toku przerywa
+najbliższy zapis pliku wynikowego (utils.atomic_write), a plik tymczasowy
+jest usuwany; funkcje zapisujące wynik jednym blokiem kończą obliczenia,
+a ich plik wynikowy jest usuwany.
+"""
+
+import itertools
+import os
+import time
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from utils.atomic_write import bytes_written, cancellation
+from utils.file_ciphers import get_file_cipher
+from utils.logger import app_logger
+
+# Domyślna liczba zadań wykonywanych równocześnie
+DEFAULT_CONCURRENCY = 2
+
+QUEUED = "queued"
+PAUSED = "paused"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+STATUS_LABELS = {
+    QUEUED: "⏳ W kolejce",
+    PAUSED: "⏸️ Wstrzymane",
+    RUNNING: "⚙️ W toku",
+    DONE: "✅ Zakończone",
+    FAILED: "❌ Błąd",
+    CANCELLED: "🚫 Anulowane",
+}
+
+_job_ids = itertools.count(1)
+
+
+class FileJob:
+    """Pojedyncza operacja szyfrowania/deszyfrowania pliku"""
+
+    def __init__(self, cipher, operation, input_file, output_file, key, options=None):
+        self.id = next(_job_ids)
+        self.cipher = cipher
+        self.operation = operation
+        self.input_file = input_file
+        self.output_file = output_file
+        self.key = key
+        self.options = options or {}
+        self.status = QUEUED
+        self.error = ""
+        self.cancel_requested = False
+        self.started_at = None
+        self.finished_at = None
+        try:
+            self.size = os.path.getsize(input_file)
+        except OSError:
+            self.size = 0
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATES
+
+    def elapsed(self):
+        """Czas wykonania zadania [s]"""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at
+
+    def processed_bytes(self):
+        """Liczba przetworzonych bajtów (w toku - szacowana z danych zapisanych do wyniku)"""
+        if self.status == DONE:
+            return self.size
+        if self.status != RUNNING:
+            return 0
+        written = bytes_written(self.output_file)
+        return min(written, self.size) if written is not None else 0
+
+    def progress(self):
+        """Postęp w procentach (100 dopiero po zakończeniu zadania)"""
+        if self.status == DONE:
+            return 100
+        if self.status != RUNNING or not self.size:
+            return 0
+        return min(99, self.processed_bytes() * 100 // self.size)
+
+    def throughput(self):
+        """Przepustowość [B/s]"""
+        elapsed = self.elapsed()
+        return self.processed_bytes() / elapsed if elapsed > 0 else 0.0
+
+
+class _JobSignals(QObject):
+    """Sygnały zadań (dostarczane do wątku GUI)"""
+    finished = pyqtSignal(int, bool, str)
+
+
+class _JobRunnable(QRunnable):
+    """Wykonanie zadania w puli wątków"""
+
+    def __init__(self, job, signals):
+        super().__init__()
+        self.job = job
+        self.signals = signals
+
+    def run(self):
+        job = self.job
+        try:
+            with cancellation(lambda: job.cancel_requested):
+                success = bool(job.cipher.run(job.operation, job.input_file, job.output_file,
+                                              job.key, **job.options))
+            error = "" if success else "Operacja nie powiodła się"
+        except Exception as e:
+            success, error = False, str(e)
+        self.signals.finished.emit(job.id, success, error)
+
+
+class JobQueue(QObject):
+    """Kolejka zadań plikowych z ograniczoną współbieżnością"""
+
+    job_added = pyqtSignal(object)
+    job_changed = pyqtSignal(object)
+    jobs_removed = pyqtSignal()
+
+    def __init__(self, parent=None, concurrency=DEFAULT_CONCURRENCY):
+        super().__init__(parent)
+        self.jobs = []
+        self.paused = False
+        self.concurrency = max(1, int(concurrency))
+
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(self.concurrency)
+        self._signals = _JobSignals(self)
+        self._signals.finished.connect(self._on_finished)
+
+    def add(self, cipher_name, operation, input_file, output_file, key, **options):
+        """
+        Dodaje zadanie do kolejki
+
+        Args:
+            cipher_name: Nazwa szyfru z utils.file_ciphers.FILE_CIPHERS
+            operation: "encrypt" lub "decrypt"
+            input_file: Ścieżka do pliku wejściowego
+            output_file: Ścieżka do pliku wynikowego
+            key: Klucz po parse_key() szyfru
+            options: Opcje szyfru (np. key_size dla AES)
+
+        Returns:
+            FileJob: Dodane zadanie
+        """
+        job = FileJob(get_file_cipher(cipher_name), operation, input_file,
+                      output_file, key, options)
+        self.jobs.append(job)
+        app_logger.info("Kolejka: dodano zadanie %d (%s %s: %s)", job.id,
+                        cipher_name, operation, input_file)
+        self.job_added.emit(job)
+        self._dispatch()
+        return job
+
+    def running_count(self):
+        """Liczba zadań w toku"""
+        return sum(1 for job in self.jobs if job.status == RUNNING)
+
+    def pending_count(self):
+        """Liczba zadań czekających na uruchomienie (także wstrzymanych)"""
+        return sum(1 for job in self.jobs if job.status in (QUEUED, PAUSED))
+
+    def set_concurrency(self, concurrency):
+        """
+        Zmienia liczbę zadań wykonywanych równocześnie
+
+        Args:
+            concurrency: Limit zadań w toku (min. 1)
+        """
+        self.concurrency = max(1, int(concurrency))
+        self._pool.setMaxThreadCount(self.concurrency)
+        self._dispatch()
+
+    def set_paused(self, paused):
+        """Wstrzymuje lub wznawia uruchamianie kolejnych zadań (zadania w toku kończą pracę)"""
+        self.paused = bool(paused)
+        app_logger.info("Kolejka %s", "wstrzymana" if self.paused else "wznowiona")
+        self._dispatch()
+
+    def pause(self, job):
+        """Wstrzymuje oczekujące zadanie"""
+        if job.status == QUEUED:
+            self._set_status(job, PAUSED)
+
+    def resume(self, job):
+        """Wznawia wstrzymane zadanie"""
+        if job.status == PAUSED:
+            self._set_status(job, QUEUED)
+            self._dispatch()
+
+    def cancel(self, job):
+        """Anuluje zadanie; zadanie w toku zostanie anulowane po zakończeniu pracy"""
+        if job.status in (QUEUED, PAUSED):
+            self._set_status(job, CANCELLED)
+        elif job.status == RUNNING and not job.cancel_requested:
+            job.cancel_requested = True
+            self.job_changed.emit(job)
+
+    def remove_finished(self):
+        """Usuwa z listy zakończone zadania"""
+        self.jobs = [job for job in self.jobs if not job.finished]
+        self.jobs_removed.emit()
+
+    def wait_for_done(self, msecs=-1):
+        """Czeka na zakończenie zadań w toku (np. przy zamykaniu aplikacji)"""
+        return self._pool.waitForDone(msecs)
+
+    def _set_status(self, job, status):
+        job.status = status
+        if status in FINISHED_STATES and job.started_at is not None:
+            job.finished_at = time.perf_counter()
+        self.job_changed.emit(job)
+
+    def _dispatch(self):
+        if self.paused:
+            return
+        free = self.concurrency - self.running_count()
+        for job in self.jobs:
+            if free <= 0:
+                break
+            if job.status != QUEUED:
+                continue
+            job.started_at = time.perf_counter()
+            self._set_status(job, RUNNING)
+            self._pool.start(_JobRunnable(job, self._signals))
+            free -= 1
+
+    def _find(self, job_id):
+        for job in self.jobs:
+            if job.id == job_id:
+                return job
+        return None
+
+    def _on_finished(self, job_id, success, error):
+        job = self._find(job_id)
+        if job is None:
+            self._dispatch()
+            return
+
+        if job.cancel_requested:
+            # Wynik anulowanego zadania nie jest pozostawiany na dysku
+            if os.path.exists(job.output_file):
+                os.remove(job.output_file)
+            self._set_status(job, CANCELLED)
+        elif success:
+            self._set_status(job, DONE)
+            app_logger.log_file_success(job.operation, job.input_file, job.output_file)
+        else:
+            job.error = error
+            self._set_status(job, FAILED)
+            app_logger.log_error(f"zadania {job.id} w kolejce", error)
+        self._dispatch()
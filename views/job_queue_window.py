@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Okno kolejki zadań plikowych
+"""
+
+import os
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QLabel, QComboBox, QSpinBox, QFileDialog,
+                             QMessageBox, QTableWidget, QTableWidgetItem,
+                             QHeaderView, QAbstractItemView, QProgressBar,
+                             QLineEdit)
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QFont
+from views.theme import (make_button, make_title, make_line_edit, make_group,
+                         set_variant)
+from views.job_queue import (JobQueue, DEFAULT_CONCURRENCY, STATUS_LABELS,
+                             QUEUED, PAUSED, RUNNING, FAILED)
+from utils.file_ciphers import FILE_CIPHERS, AES_KEY_SIZES, get_file_cipher
+from utils.preview import format_size
+from utils.logger import app_logger
+
+# Odświeżanie postępu zadań w toku [ms]
+REFRESH_INTERVAL_MS = 500
+
+OPERATION_LABELS = {"encrypt": "🔒 Szyfrowanie", "decrypt": "🔓 Deszyfrowanie"}
+
+COLUMNS = ("Plik", "Szyfr", "Operacja", "Status", "Postęp", "Przepustowość", "Czas")
+COL_FILE, COL_CIPHER, COL_OPERATION, COL_STATUS, COL_PROGRESS, COL_SPEED, COL_TIME = range(7)
+
+
+class JobQueueWindow(QMainWindow):
+    """Okno kolejki zadań - wiele operacji plikowych wykonywanych w tle"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.queue = JobQueue(self)
+        self._rows = {}
+        app_logger.log_window_open("JobQueueWindow")
+        self.init_ui()
+
+        self.queue.job_added.connect(self.add_row)
+        self.queue.job_changed.connect(self.update_row)
+        self.queue.jobs_removed.connect(self.rebuild_table)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh_running)
+        self.refresh_timer.start()
+
+    def init_ui(self):
+        """Inicjalizacja interfejsu okna kolejki"""
+        self.setWindowTitle("Kolejka zadań")
+        self.setGeometry(150, 150, 1000, 650)
+        self.setMinimumSize(800, 500)
+
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+
+        layout = QVBoxLayout(central_widget)
+        layout.setSpacing(15)
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        # Tytuł
+        title = make_title("📋 Kolejka zadań", "title-blue")
+        layout.addWidget(title)
+
+        # Nowe zadania
+        add_group = make_group("➕ Nowe zadania")
+        add_group.setFont(QFont("Arial", 12, QFont.Bold))
+        add_layout = QVBoxLayout(add_group)
+
+        options_layout = QHBoxLayout()
+        self.cipher_combo = QComboBox()
+        for name, cipher in FILE_CIPHERS.items():
+            self.cipher_combo.addItem(cipher.label, name)
+        self.cipher_combo.currentIndexChanged.connect(self.update_cipher_options)
+        options_layout.addWidget(QLabel("Szyfr:"))
+        options_layout.addWidget(self.cipher_combo)
+
+        self.operation_combo = QComboBox()
+        for operation, label in OPERATION_LABELS.items():
+            self.operation_combo.addItem(label, operation)
+        options_layout.addWidget(QLabel("Operacja:"))
+        options_layout.addWidget(self.operation_combo)
+
+        self.key_size_combo = QComboBox()
+        for key_size in AES_KEY_SIZES:
+            self.key_size_combo.addItem(f"AES-{key_size}", key_size)
+        options_layout.addWidget(self.key_size_combo)
+        options_layout.addStretch()
+        add_layout.addLayout(options_layout)
+
+        key_layout = QHBoxLayout()
+        self.key_label = QLabel()
+        key_layout.addWidget(self.key_label)
+        self.key_input = make_line_edit(variant="input-blue")
+        self.key_input.setEchoMode(QLineEdit.Password)
+        key_layout.addWidget(self.key_input)
+        add_layout.addLayout(key_layout)
+
+        output_layout = QHBoxLayout()
+        output_layout.addWidget(QLabel("Katalog wynikowy:"))
+        self.output_dir_input = make_line_edit("Domyślnie katalog pliku wejściowego",
+                                               "input-muted")
+        self.output_dir_input.setReadOnly(True)
+        output_layout.addWidget(self.output_dir_input)
+        self.output_dir_btn = make_button("📂 Wybierz", "blue", min_size=(100, 35), font_size=10)
+        self.output_dir_btn.clicked.connect(self.browse_output_dir)
+        output_layout.addWidget(self.output_dir_btn)
+        add_layout.addLayout(output_layout)
+
+        self.add_files_btn = make_button("➕ Dodaj pliki do kolejki", "green", min_size=(200, 40))
+        self.add_files_btn.clicked.connect(self.add_files)
+        add_layout.addWidget(self.add_files_btn)
+
+        layout.addWidget(add_group)
+
+        # Lista zadań
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels(COLUMNS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(COL_FILE, QHeaderView.Stretch)
+        header.setSectionResizeMode(COL_PROGRESS, QHeaderView.Fixed)
+        self.table.setColumnWidth(COL_PROGRESS, 160)
+        layout.addWidget(self.table)
+
+        # Sterowanie kolejką
+        controls_layout = QHBoxLayout()
+
+        self.pause_btn = make_button("⏸️ Wstrzymaj", "orange")
+        self.pause_btn.clicked.connect(self.pause_selected)
+        controls_layout.addWidget(self.pause_btn)
+
+        self.resume_btn = make_button("▶️ Wznów", "green")
+        self.resume_btn.clicked.connect(self.resume_selected)
+        controls_layout.addWidget(self.resume_btn)
+
+        self.cancel_btn = make_button("✖️ Anuluj", "red")
+        self.cancel_btn.clicked.connect(self.cancel_selected)
+        controls_layout.addWidget(self.cancel_btn)
+
+        self.clear_btn = make_button("🧹 Usuń zakończone", "gray", min_size=(160, 40))
+        self.clear_btn.clicked.connect(self.queue.remove_finished)
+        controls_layout.addWidget(self.clear_btn)
+
+        controls_layout.addStretch()
+
+        controls_layout.addWidget(QLabel("Równoległe zadania:"))
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, max(1, os.cpu_count() or 1) * 2)
+        self.concurrency_spin.setValue(DEFAULT_CONCURRENCY)
+        self.concurrency_spin.valueChanged.connect(self.queue.set_concurrency)
+        controls_layout.addWidget(self.concurrency_spin)
+
+        self.pause_queue_btn = make_button("⏯️ Wstrzymaj kolejkę", "purple", min_size=(180, 40))
+        self.pause_queue_btn.setCheckable(True)
+        self.pause_queue_btn.toggled.connect(self.toggle_queue)
+        controls_layout.addWidget(self.pause_queue_btn)
+
+        layout.addLayout(controls_layout)
+
+        # Podsumowanie i powrót
+        bottom_layout = QHBoxLayout()
+        self.summary_label = QLabel()
+        self.summary_label.setFont(QFont("Arial", 10))
+        set_variant(self.summary_label, "muted")
+        bottom_layout.addWidget(self.summary_label)
+        bottom_layout.addStretch()
+
+        self.back_btn = make_button("⬅️ Zamknij", "gray")
+        self.back_btn.clicked.connect(self.close)
+        bottom_layout.addWidget(self.back_btn)
+        layout.addLayout(bottom_layout)
+
+        self.update_cipher_options()
+        self.update_summary()
+
+    def selected_cipher(self):
+        """Zwraca wybrany szyfr plikowy"""
+        return get_file_cipher(self.cipher_combo.currentData())
+
+    def update_cipher_options(self):
+        """Dopasowuje pole klucza i opcje do wybranego szyfru"""
+        cipher = self.selected_cipher()
+        self.key_label.setText(f"{cipher.key_label}:")
+        # Przesunięcie Cezara nie jest tajne - pokaż je jawnie
+        self.key_input.setEchoMode(QLineEdit.Normal if cipher.name == "caesar"
+                                   else QLineEdit.Password)
+        self.key_size_combo.setVisible(cipher.name == "aes")
+
+    def browse_output_dir(self):
+        """Wybór katalogu dla plików wynikowych"""
+        directory = QFileDialog.getExistingDirectory(self, "Wybierz katalog wynikowy")
+        if directory:
+            self.output_dir_input.setText(directory)
+
+    def add_files(self):
+        """Dodaje wybrane pliki do kolejki z bieżącymi ustawieniami"""
+        cipher = self.selected_cipher()
+        try:
+            key = cipher.parse_key(self.key_input.text())
+        except ValueError as e:
+            app_logger.log_validation_error("klucz", str(e))
+            QMessageBox.warning(self, "Błąd", str(e))
+            return
+
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self, "Wybierz pliki", "", "Wszystkie pliki (*.*)")
+        if not file_paths:
+            return
+        self.enqueue_files(file_paths, cipher, key)
+
+    def enqueue_files(self, file_paths, cipher, key):
+        """
+        Dodaje pliki do kolejki
+
+        Args:
+            file_paths: Lista ścieżek plików wejściowych
+            cipher: FileCipher wybrany w oknie
+            key: Klucz po parse_key()
+        """
+        operation = self.operation_combo.currentData()
+        output_dir = self.output_dir_input.text().strip() or None
+        options = {}
+        if cipher.name == "aes":
+            options["key_size"] = self.key_size_combo.currentData()
+
+        reserved = {job.output_file for job in self.queue.jobs}
+        for file_path in file_paths:
+            output_file = cipher.output_path(file_path, operation, output_dir, reserved)
+            reserved.add(output_file)
+            self.queue.add(cipher.name, operation, file_path, output_file, key, **options)
+        app_logger.log_user_action(f"dodano {len(file_paths)} plików do kolejki")
+
+    def selected_jobs(self):
+        """Zwraca zadania zaznaczone w tabeli"""
+        rows = {index.row() for index in self.table.selectionModel().selectedRows()}
+        return [job for job in self.queue.jobs if self._rows.get(job.id) in rows]
+
+    def pause_selected(self):
+        """Wstrzymuje zaznaczone zadania oczekujące"""
+        for job in self.selected_jobs():
+            self.queue.pause(job)
+
+    def resume_selected(self):
+        """Wznawia zaznaczone zadania"""
+        for job in self.selected_jobs():
+            self.queue.resume(job)
+
+    def cancel_selected(self):
+        """Anuluje zaznaczone zadania"""
+        for job in self.selected_jobs():
+            self.queue.cancel(job)
+
+    def toggle_queue(self, paused):
+        """Wstrzymuje lub wznawia uruchamianie kolejnych zadań"""
+        self.queue.set_paused(paused)
+        self.pause_queue_btn.setText("▶️ Wznów kolejkę" if paused else "⏯️ Wstrzymaj kolejkę")
+        self.update_summary()
+
+    def add_row(self, job):
+        """Dodaje wiersz zadania do tabeli"""
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self._rows[job.id] = row
+
+        file_item = QTableWidgetItem(os.path.basename(job.input_file))
+        file_item.setToolTip(f"{job.input_file}\n→ {job.output_file}")
+        self.table.setItem(row, COL_FILE, file_item)
+        self.table.setItem(row, COL_CIPHER, QTableWidgetItem(job.cipher.label))
+        self.table.setItem(row, COL_OPERATION, QTableWidgetItem(OPERATION_LABELS[job.operation]))
+        for column in (COL_STATUS, COL_SPEED, COL_TIME):
+            self.table.setItem(row, column, QTableWidgetItem())
+
+        progress = QProgressBar()
+        progress.setRange(0, 100)
+        set_variant(progress, "blue")
+        self.table.setCellWidget(row, COL_PROGRESS, progress)
+        self.update_row(job)
+
+    def update_row(self, job):
+        """Odświeża wiersz zadania"""
+        row = self._rows.get(job.id)
+        if row is None:
+            return
+
+        status = STATUS_LABELS[job.status]
+        if job.status == RUNNING and job.cancel_requested:
+            status = "🚫 Anulowanie..."
+        status_item = self.table.item(row, COL_STATUS)
+        status_item.setText(status)
+        status_item.setToolTip(job.error if job.status == FAILED else "")
+
+        self.table.cellWidget(row, COL_PROGRESS).setValue(job.progress())
+        throughput = job.throughput()
+        self.table.item(row, COL_SPEED).setText(
+            f"{format_size(throughput)}/s" if throughput else "")
+        self.table.item(row, COL_TIME).setText(
+            f"{job.elapsed():.1f} s" if job.started_at is not None else "")
+        self.update_summary()
+
+    def refresh_running(self):
+        """Odświeża postęp zadań w toku"""
+        for job in self.queue.jobs:
+            if job.status == RUNNING:
+                self.update_row(job)
+
+    def rebuild_table(self):
+        """Buduje tabelę od nowa (po usunięciu zakończonych zadań)"""
+        self.table.setRowCount(0)
+        self._rows.clear()
+        for job in self.queue.jobs:
+            self.add_row(job)
+        self.update_summary()
+
+    def update_summary(self):
+        """Aktualizuje podsumowanie kolejki"""
+        jobs = self.queue.jobs
+        waiting = sum(1 for job in jobs if job.status in (QUEUED, PAUSED))
+        finished = sum(1 for job in jobs if job.finished)
+        text = (f"W toku: {self.queue.running_count()}  •  Oczekuje: {waiting}  •  "
+                f"Zakończone: {finished}/{len(jobs)}")
+        if self.queue.paused:
+            text += "  •  Kolejka wstrzymana"
+        self.summary_label.setText(text)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Podgląd wyniku na żywo dla okien tekstowych
+
+Każda zmiana pola tylko restartuje QTimer (debounce). Dopiero po chwili bez
+zmian dane są pobierane z okna, a szyfr uruchamiany jest w puli wątków.
+Każde zadanie dostaje numer generacji - zadania czekające w kolejce, które
+zdezaktualizowały się przed startem, są pomijane, a wyniki zadań
+nieaktualnych w chwili zakończenia są odrzucane. Wyjątkiem jest zadanie
+zlecone przez run_now() - jego wynik zawsze dociera do okna, bo okno czeka
+na niego (np. z wyłączonym przyciskiem).
+"""
+
+from PyQt5.QtWidgets import QHBoxLayout, QCheckBox, QLabel
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont
+from views.theme import set_variant
+from utils.logger import app_logger
+
+# Opóźnienie od ostatniej zmiany do uruchomienia podglądu [ms]
+PREVIEW_DELAY_MS = 300
+
+
+class _JobSignals(QObject):
+    """Sygnały zadań podglądu (dostarczane do wątku GUI)"""
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, object)
+
+
+class _PreviewJob(QRunnable):
+    """Pojedyncze obliczenie podglądu w puli wątków"""
+
+    def __init__(self, preview, generation, func, args):
+        super().__init__()
+        self.preview = preview
+        self.generation = generation
+        self.func = func
+        self.args = args
+        self.signals = preview._signals
+
+    def run(self):
+        # Nowsze dane pojawiły się, zanim zadanie wystartowało - pomiń
+        if not self.preview._is_current(self.generation):
+            return
+        try:
+            result = self.func(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(self.generation, e)
+        else:
+            self.signals.finished.emit(self.generation, result)
+
+
+class LivePreview(QObject):
+    """
+    Opóźniony podgląd wyniku liczony poza wątkiem GUI
+
+    Funkcja prepare() wywoływana jest w wątku GUI po upływie opóźnienia
+    i zwraca (funkcja, argumenty) do uruchomienia w tle albo None, gdy dane
+    są niekompletne (wtedy emitowany jest sygnał cleared).
+    """
+
+    result_ready = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    started = pyqtSignal()
+    cleared = pyqtSignal()
+
+    def __init__(self, parent, prepare, delay_ms=PREVIEW_DELAY_MS):
+        super().__init__(parent)
+        self.prepare = prepare
+        self.enabled = True
+        self.generation = 0
+        # Generacja zadania z run_now(), na którego wynik czeka okno
+        self._requested = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._start_job)
+
+        # Jeden wątek - nieaktualne zadania z kolejki kończą się natychmiast
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+        self._signals = _JobSignals(self)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+
+    def schedule(self):
+        """Zgłasza zmianę danych - podgląd zostanie przeliczony po opóźnieniu"""
+        if not self.enabled:
+            return
+        # Zadanie w toku staje się nieaktualne już teraz
+        self.generation += 1
+        self._timer.start()
+
+    def run_now(self):
+        """Przelicza wynik od razu, także przy wyłączonym podglądzie (np. przycisk "Szyfruj")"""
+        self.generation += 1
+        self._timer.stop()
+        self._requested = self.generation
+        self._start_job()
+
+    def watch(self, *signals):
+        """
+        Przelicza podgląd po każdym sygnale zmiany danych
+
+        Args:
+            signals: Sygnały pól wejściowych (np. textChanged)
+        """
+        for signal in signals:
+            signal.connect(lambda *args: self.schedule())
+
+    def cancel(self):
+        """Anuluje oczekujący podgląd i unieważnia zadania w toku (poza zleconym przez run_now)"""
+        self.generation += 1
+        self._timer.stop()
+
+    def set_enabled(self, enabled):
+        """
+        Włącza lub wyłącza podgląd na żywo
+
+        Args:
+            enabled: True aby przeliczać wynik przy każdej zmianie
+        """
+        self.enabled = bool(enabled)
+        if self.enabled:
+            self.schedule()
+        else:
+            self.cancel()
+
+    def is_busy(self):
+        """Zwraca True jeśli podgląd czeka na uruchomienie lub jest liczony"""
+        return self._timer.isActive() or self._pool.activeThreadCount() > 0
+
+    def _is_current(self, generation):
+        return generation == self.generation or generation == self._requested
+
+    def _take_result(self, generation):
+        """Sprawdza, czy wynik zadania jest aktualny (i zdejmuje zlecenie run_now)"""
+        current = self._is_current(generation)
+        if generation == self._requested:
+            self._requested = None
+        return current
+
+    def _start_job(self):
+        job = self.prepare()
+        if job is None:
+            if self._requested == self.generation:
+                self._requested = None
+            self.cleared.emit()
+            return
+        func, args = job
+        app_logger.debug("Podgląd na żywo: zadanie %d (%s)", self.generation, func.__name__)
+        self.started.emit()
+        self._pool.start(_PreviewJob(self, self.generation, func, args))
+
+    def _on_finished(self, generation, result):
+        # Wynik nieaktualnego zadania jest odrzucany
+        if self._take_result(generation):
+            self.result_ready.emit(result)
+
+    def _on_failed(self, generation, error):
+        if self._take_result(generation):
+            self.failed.emit(error)
+
+
+def make_preview_controls(preview):
+    """
+    Tworzy przełącznik podglądu na żywo i etykietę stanu obliczeń
+
+    Args:
+        preview: Instancja LivePreview
+
+    Returns:
+        tuple: (QHBoxLayout, QCheckBox, QLabel)
+    """
+    layout = QHBoxLayout()
+
+    checkbox = QCheckBox("⚡ Podgląd na żywo")
+    checkbox.setFont(QFont("Arial", 10))
+    checkbox.setChecked(preview.enabled)
+    checkbox.toggled.connect(preview.set_enabled)
+    layout.addWidget(checkbox)
+
+    status = QLabel()
+    status.setFont(QFont("Arial", 10))
+    set_variant(status, "muted")
+    layout.addWidget(status)
+    layout.addStretch()
+
+    preview.started.connect(lambda: status.setText("⏳ Obliczanie wyniku..."))
+    preview.result_ready.connect(lambda result: status.clear())
+    preview.cleared.connect(status.clear)
+    preview.failed.connect(lambda error: status.setText(f"⚠️ {error}"))
+    return layout, checkbox, status
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Rejestr okien - każde okno jest tworzone raz i ponownie używane przy nawigacji
+"""
+
+from utils.logger import app_logger
+
+
+def reset_window(window):
+    """
+    Przywraca okno do stanu początkowego przed ponownym pokazaniem
+
+    Używa metody reset_state(), a jeśli jej brak - clear_fields() / clear_all().
+    Okno z trwającą operacją w tle nie jest czyszczone.
+    """
+    for attr in ("worker", "encryption_thread", "decryption_thread", "batch_worker"):
+        thread = getattr(window, attr, None)
+        if thread is not None and thread.isRunning():
+            return
+
+    window.setWindowOpacity(1.0)
+    for name in ("reset_state", "clear_fields", "clear_all"):
+        reset = getattr(window, name, None)
+        if reset is not None:
+            reset()
+            return
+
+
+class WindowRegistry:
+    """Pula okien przypisanych do okna nadrzędnego"""
+
+    def __init__(self):
+        # Okno nadrzędne -> {klucz: okno}. Okna z puli trzymają self.parent,
+        # więc wpis usuwany jest jawnie, gdy Qt niszczy okno nadrzędne
+        # (razem z nim niszczone są okna z puli - jego dzieci)
+        self._windows = {}
+
+    def get(self, owner, key, factory):
+        """
+        Zwraca okno z puli lub tworzy je przy pierwszym użyciu
+
+        Args:
+            owner: Okno nadrzędne (do niego wraca przycisk "Powrót")
+            key: Klucz okna, np. ("aes", "file", "encrypt")
+            factory: Funkcja bez argumentów tworząca nowe okno
+
+        Returns:
+            Okno gotowe do pokazania
+        """
+        windows = self._windows.get(owner)
+        if windows is None:
+            windows = self._windows[owner] = {}
+            owner.destroyed.connect(lambda *args: self._evict(owner))
+        window = windows.get(key)
+        if window is None:
+            window = windows[key] = factory()
+        else:
+            app_logger.debug("Ponowne użycie okna: %s", key)
+            reset_window(window)
+        return window
+
+    def _evict(self, owner):
+        """Usuwa z puli okna zniszczonego okna nadrzędnego"""
+        self._windows.pop(owner, None)
+
+    def clear(self):
+        """Zamyka i usuwa wszystkie okna z puli"""
+        for windows in list(self._windows.values()):
+            for window in windows.values():
+                window.close()
+                window.deleteLater()
+        self._windows.clear()
+
+
+# Globalny rejestr okien
+window_registry = WindowRegistry()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Okno statystyk instrumentacji funkcji szyfrujących
+"""
+
+from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+                             QLabel, QTextEdit)
+from PyQt5.QtGui import QFont
+from views.theme import make_button, make_title, make_text_edit, set_variant
+from utils.profiler import format_stats, reset_stats, is_profiling_enabled
+from utils.logger import app_logger
+
+
+class ProfilingWindow(QMainWindow):
+    """Okno pokazujące liczbę wywołań, dane oraz podział czasu I/O / obliczenia"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.init_ui()
+        self.refresh_stats()
+
+    def init_ui(self):
+        """Inicjalizacja interfejsu okna statystyk"""
+        self.setWindowTitle("Statystyki wydajności")
+        self.setGeometry(200, 200, 900, 500)
+        self.setMinimumSize(700, 400)
+
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+
+        layout = QVBoxLayout(central_widget)
+        layout.setSpacing(15)
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        # Tytuł
+        title = make_title("📊 Statystyki wydajności", "title-blue")
+        layout.addWidget(title)
+
+        self.status_label = QLabel()
+        self.status_label.setFont(QFont("Arial", 10))
+        set_variant(self.status_label, "muted")
+        layout.addWidget(self.status_label)
+
+        self.stats_output = make_text_edit(variant="output", read_only=True)
+        self.stats_output.setFont(QFont("Courier New", 10))
+        self.stats_output.setLineWrapMode(QTextEdit.NoWrap)
+        layout.addWidget(self.stats_output)
+
+        # Przyciski
+        buttons_layout = QHBoxLayout()
+
+        self.refresh_btn = make_button("🔄 Odśwież", "blue")
+        self.refresh_btn.clicked.connect(self.refresh_stats)
+        buttons_layout.addWidget(self.refresh_btn)
+
+        self.reset_btn = make_button("🗑️ Wyzeruj", "gray")
+        self.reset_btn.clicked.connect(self.reset_stats)
+        buttons_layout.addWidget(self.reset_btn)
+
+        buttons_layout.addStretch()
+
+        self.close_btn = make_button("⬅️ Zamknij", "gray")
+        self.close_btn.clicked.connect(self.close)
+        buttons_layout.addWidget(self.close_btn)
+
+        layout.addLayout(buttons_layout)
+
+    def refresh_stats(self):
+        """Odświeża tabelę statystyk"""
+        if is_profiling_enabled():
+            self.status_label.setText("Instrumentacja włączona (KTK_PROFILE)")
+        else:
+            self.status_label.setText("Instrumentacja wyłączona - ustaw KTK_PROFILE=1")
+        self.stats_output.setPlainText(format_stats())
+
+    def reset_stats(self):
+        """Zeruje zebrane statystyki"""
+        reset_stats()
+        app_logger.log_user_action("wyzerowano statystyki wydajności")
+        self.refresh_stats()
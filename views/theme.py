@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Wspólny motyw aplikacji
+
+Cały wygląd okien opisany jest jednym arkuszem stylów ustawianym raz na
+poziomie QApplication (apply_theme). Widżety wybierają wariant wyglądu
+dynamiczną właściwością "variant" zamiast własnych arkuszy stylów, więc Qt
+parsuje style tylko raz, a nie przy tworzeniu każdego przycisku.
+"""
+
+from PyQt5.QtWidgets import (QPushButton, QLabel, QLineEdit, QTextEdit,
+                             QFrame, QGroupBox)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont
+
+# Kolory przycisków: (tło, tło dolne / hover, hover dolne / pressed, pressed dolne)
+BUTTON_COLORS = {
+    "green": ("#27ae60", "#229954", "#1e8449", "#196f3d"),
+    "red": ("#e74c3c", "#c0392b", "#a93226", "#922b21"),
+    "blue": ("#3498db", "#2980b9", "#21618c", "#1b4f72"),
+    "gray": ("#95a5a6", "#7f8c8d", "#6c7b7d", "#5d6d7e"),
+    "purple": ("#9b59b6", "#8e44ad", "#7d3c98", "#6c3483"),
+    "orange": ("#f39c12", "#e67e22", "#d35400", "#ba4a00"),
+    "carrot": ("#e67e22", "#d35400", "#ba4a00", "#a04000"),
+}
+
+# Kolory przycisków okien AES
+AES_BUTTON_COLORS = {
+    "primary": ("#007bff", "#0056b3", "#004085", "#002752"),
+    "danger": ("#dc3545", "#c82333", "#bd2130", "#a71e2a"),
+    "info": ("#17a2b8", "#138496", "#0f6674", "#0b4d56"),
+    "secondary": ("#6c757d", "#495057", "#343a40", "#212529"),
+    "success": ("#28a745", "#1e7e34", "#155724", "#0c4a1a"),
+}
+
+# Kolory akcentu (ramka tytułu, wyniku, fokus pól) dla wariantów "*-<kolor>"
+ACCENT_COLORS = {
+    "green": "#27ae60",
+    "red": "#e74c3c",
+    "purple": "#9b59b6",
+    "carrot": "#e67e22",
+    "blue": "#3498db",
+}
+
+_GRADIENT = "qlineargradient(x1:0, y1:0, x2:0, y2:1, stop:0 {0}, stop:1 {1})"
+
+_BASE_STYLESHEET = """
+QMainWindow {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+        stop:0 #ecf0f1, stop:1 #bdc3c7);
+}
+QMainWindow[variant="aes"] {
+    background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+        stop:0 #f8f9fa, stop:1 #e9ecef);
+}
+
+QLabel[variant="banner"] {
+    margin: 20px 0;
+    padding: 15px;
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 #3498db, stop:1 #2980b9);
+    border-radius: 10px;
+    color: white;
+}
+QLabel[variant="muted"] {
+    color: #7f8c8d;
+}
+QLabel[variant="hint"] {
+    color: #7f8c8d;
+    padding: 10px;
+}
+QLabel[variant="aes-title"] {
+    color: #2c3e50;
+    margin-bottom: 20px;
+}
+QLabel[variant="aes-desc"] {
+    color: #7f8c8d;
+    margin-bottom: 20px;
+}
+QLabel[variant="aes-heading"] {
+    font-weight: bold;
+    color: #2c3e50;
+    margin-bottom: 10px;
+}
+QLabel[variant="aes-label"] {
+    font-weight: bold;
+    color: #2c3e50;
+}
+
+QFrame[variant="card"] {
+    background: white;
+    border-radius: 15px;
+}
+QFrame[variant="panel"] {
+    background: white;
+    border-radius: 15px;
+    border: 2px solid #bdc3c7;
+}
+QFrame[variant="aes-section"] {
+    background-color: #f8f9fa;
+    border: 2px solid #e9ecef;
+    border-radius: 10px;
+    padding: 15px;
+}
+QGroupBox[variant="group"] {
+    font-weight: bold;
+    border: 2px solid #bdc3c7;
+    border-radius: 10px;
+    margin-top: 10px;
+    padding-top: 10px;
+    background: white;
+}
+QGroupBox[variant="group"]::title {
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 5px 0 5px;
+}
+
+QLineEdit[variant="aes-input"], QTextEdit[variant="aes-input"],
+QTextEdit[variant="aes-output"], QComboBox[variant="aes-input"] {
+    border: 2px solid #dee2e6;
+    border-radius: 8px;
+    padding: 10px;
+    font-size: 14px;
+    background-color: white;
+}
+QLineEdit[variant="aes-input"]:focus, QTextEdit[variant="aes-input"]:focus,
+QComboBox[variant="aes-input"]:focus {
+    border-color: #007bff;
+}
+QComboBox[variant="aes-input"] {
+    padding: 8px;
+    min-width: 200px;
+}
+QComboBox[variant="aes-input"]::drop-down {
+    border: none;
+}
+QComboBox[variant="aes-input"]::down-arrow {
+    image: none;
+    border-left: 5px solid transparent;
+    border-right: 5px solid transparent;
+    border-top: 5px solid #6c757d;
+    margin-right: 10px;
+}
+
+QLineEdit[mono="true"], QTextEdit[mono="true"] {
+    font-family: 'Courier New', monospace;
+}
+
+QProgressBar::chunk {
+    border-radius: 6px;
+}
+"""
+
+
+def _selectors(widgets, variants):
+    return ",\n".join(f'{widget}[variant="{variant}"]'
+                      for variant in variants for widget in widgets)
+
+
+def _button_rules(selector, colors, rules, disabled):
+    top, bottom, hover, pressed = colors
+    return (
+        f"{selector} {{ background: {_GRADIENT.format(top, bottom)}; "
+        f"color: white; border: none; border-radius: 8px; {rules} }}\n"
+        f"{selector}:hover {{ background: {_GRADIENT.format(bottom, hover)}; }}\n"
+        f"{selector}:pressed {{ background: {_GRADIENT.format(hover, pressed)}; }}\n"
+        f"{selector}:disabled {{ {disabled} }}\n"
+    )
+
+
+def build_stylesheet():
+    """
+    Składa arkusz stylów całej aplikacji
+
+    Returns:
+        str: Arkusz stylów dla QApplication.setStyleSheet()
+    """
+    parts = [_BASE_STYLESHEET]
+
+    # Pola i wyniki okien Cezara, Vigenère'a i strumieniowych (akcent nadpisywany niżej)
+    inputs = ["input", "input-muted"] + [f"input-{name}" for name in ACCENT_COLORS]
+    outputs = ["output"] + [f"output-{name}" for name in ACCENT_COLORS]
+    parts.append(
+        _selectors(("QLineEdit", "QTextEdit"), inputs)
+        + " { border: 2px solid #bdc3c7; border-radius: 8px; padding: 10px; "
+          "font-size: 12px; background: white; }\n"
+        + _selectors(("QTextEdit",), outputs)
+        + " { border: 2px solid #bdc3c7; border-radius: 8px; padding: 10px; "
+          "font-size: 12px; background: #f8f9fa; }\n"
+        + 'QLineEdit[variant="input-muted"] { background: #f8f9fa; }\n'
+    )
+
+    progress = list(ACCENT_COLORS) + [f"aes-{name}" for name in AES_BUTTON_COLORS]
+    parts.append(
+        _selectors(("QProgressBar",), progress)
+        + " { border: 2px solid #bdc3c7; border-radius: 8px; text-align: center; "
+          "background: white; }\n"
+        + _selectors(("QProgressBar",), progress[len(ACCENT_COLORS):])
+        + " { border-color: #dee2e6; background-color: #f8f9fa; }\n"
+    )
+
+    for name, colors in BUTTON_COLORS.items():
+        parts.append(_button_rules(f'QPushButton[variant="{name}"]', colors,
+                                   "padding: 10px;", "background: #95a5a6;"))
+        parts.append(_button_rules(f'QPushButton[variant="tile-{name}"]', colors,
+                                   "border-radius: 15px; padding: 15px;",
+                                   "background: #95a5a6;"))
+
+    for name, colors in AES_BUTTON_COLORS.items():
+        if name == "info":
+            rules = "padding: 10px 20px; font-size: 14px; font-weight: bold;"
+        else:
+            rules = ("padding: 12px 24px; font-size: 16px; font-weight: bold; "
+                     "min-width: 120px;")
+        parts.append(_button_rules(f'QPushButton[variant="aes-{name}"]', colors,
+                                   rules, "background: #6c757d; color: #adb5bd;"))
+        parts.append(f'QProgressBar[variant="aes-{name}"]::chunk {{ '
+                     f'background: {_GRADIENT.format(*colors[:2])}; }}\n')
+
+    for name, color in ACCENT_COLORS.items():
+        parts.append(
+            f'QLabel[variant="title-{name}"] {{ color: {color}; padding: 10px; '
+            f'background: white; border-radius: 10px; border: 2px solid {color}; }}\n'
+            f'QTextEdit[variant="output-{name}"] {{ border-color: {color}; }}\n'
+            f'QLineEdit[variant="input-{name}"]:focus, '
+            f'QTextEdit[variant="input-{name}"]:focus {{ border-color: {color}; }}\n'
+            f'QProgressBar[variant="{name}"]::chunk {{ background: qlineargradient('
+            f'x1:0, y1:0, x2:1, y2:0, stop:0 {color}, '
+            f'stop:1 {BUTTON_COLORS[name][1]}); }}\n'
+        )
+    # Pola bez koloru w nazwie wariantu mają niebieski fokus
+    parts.append('QLineEdit[variant="input"]:focus, QTextEdit[variant="input"]:focus '
+                 '{ border-color: #3498db; }\n')
+    # Tytuł okna statystyk ma ciemny tekst na niebieskiej ramce
+    parts.append('QLabel[variant="title-blue"] { color: #2c3e50; }\n')
+    return "".join(parts)
+
+
+# Arkusz stylów budowany raz przy imporcie modułu
+APP_STYLESHEET = build_stylesheet()
+
+
+def apply_theme(app):
+    """
+    Ustawia wspólny arkusz stylów dla całej aplikacji
+
+    Args:
+        app: Instancja QApplication
+    """
+    app.setStyleSheet(APP_STYLESHEET)
+
+
+def set_variant(widget, variant):
+    """
+    Ustawia wariant wyglądu widżetu
+
+    Args:
+        widget: Dowolny widżet Qt
+        variant: Nazwa wariantu z APP_STYLESHEET (np. "green", "input-red")
+    """
+    widget.setProperty("variant", variant)
+    # Widżet już wyświetlony trzeba przepolerować, aby przeliczył styl
+    if widget.isVisible():
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+
+
+def make_button(text, variant, min_size=(120, 40), font_size=12):
+    """
+    Tworzy przycisk w wariancie motywu
+
+    Args:
+        text: Tekst przycisku
+        variant: Wariant koloru (np. "green", "tile-red", "aes-primary")
+        min_size: Minimalny rozmiar (szerokość, wysokość) lub None
+        font_size: Rozmiar pogrubionej czcionki Arial lub None (czcionka z arkusza)
+
+    Returns:
+        QPushButton
+    """
+    button = QPushButton(text)
+    if min_size is not None:
+        button.setMinimumSize(*min_size)
+    if font_size is not None:
+        button.setFont(QFont("Arial", font_size, QFont.Bold))
+    button.setProperty("variant", variant)
+    return button
+
+
+def make_title(text, variant, font_size=18):
+    """
+    Tworzy wyśrodkowany nagłówek okna
+
+    Args:
+        text: Treść nagłówka
+        variant: Wariant (np. "title-green", "banner")
+        font_size: Rozmiar pogrubionej czcionki Arial
+
+    Returns:
+        QLabel
+    """
+    label = QLabel(text)
+    label.setAlignment(Qt.AlignCenter)
+    label.setFont(QFont("Arial", font_size, QFont.Bold))
+    label.setProperty("variant", variant)
+    return label
+
+
+def make_line_edit(placeholder="", variant="input", max_width=None):
+    """
+    Tworzy jednowierszowe pole tekstowe
+
+    Args:
+        placeholder: Tekst podpowiedzi
+        variant: Wariant pola (np. "input", "input-red", "aes-input")
+        max_width: Maksymalna szerokość w pikselach
+
+    Returns:
+        QLineEdit
+    """
+    line_edit = QLineEdit()
+    if placeholder:
+        line_edit.setPlaceholderText(placeholder)
+    if max_width is not None:
+        line_edit.setMaximumWidth(max_width)
+    line_edit.setProperty("variant", variant)
+    return line_edit
+
+
+def make_text_edit(placeholder="", variant="input", read_only=False, mono=False):
+    """
+    Tworzy wielowierszowe pole tekstowe
+
+    Args:
+        placeholder: Tekst podpowiedzi
+        variant: Wariant pola (np. "input", "output-green", "aes-output")
+        read_only: Pole tylko do odczytu
+        mono: Czcionka o stałej szerokości (np. dla danych hex)
+
+    Returns:
+        QTextEdit
+    """
+    text_edit = QTextEdit()
+    if placeholder:
+        text_edit.setPlaceholderText(placeholder)
+    text_edit.setReadOnly(read_only)
+    if mono:
+        text_edit.setProperty("mono", "true")
+    text_edit.setProperty("variant", variant)
+    return text_edit
+
+
+def make_frame(variant="card"):
+    """
+    Tworzy ramkę sekcji okna
+
+    Args:
+        variant: "card", "panel" lub "aes-section"
+
+    Returns:
+        QFrame
+    """
+    frame = QFrame()
+    frame.setFrameStyle(QFrame.StyledPanel)
+    frame.setProperty("variant", variant)
+    return frame
+
+
+def make_group(title):
+    """
+    Tworzy grupę z tytułem (okna plików Cezara i Vigenère'a)
+
+    Args:
+        title: Tytuł grupy
+
+    Returns:
+        QGroupBox
+    """
+    group = QGroupBox(title)
+    group.setProperty("variant", "group")
+    return group